@@ -0,0 +1,30 @@
+"""etl_log.parent_id para cargas com fan-out por UF
+
+Revision ID: 0002_etl_log_parent_id
+Revises: 0001_server_default_uuid
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_etl_log_parent_id'
+down_revision: Union[str, Sequence[str], None] = '0001_server_default_uuid'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # init_db() roda create_all antes das migrations: em bancos novos a coluna já existe
+    op.execute("ALTER TABLE etl_log ADD COLUMN IF NOT EXISTS parent_id UUID REFERENCES etl_log (id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_etl_log_parent_id ON etl_log (parent_id)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_etl_log_parent_id")
+    op.execute("ALTER TABLE etl_log DROP COLUMN IF EXISTS parent_id")
@@ -0,0 +1,45 @@
+"""etl_manifest: geração e fingerprint carregados por tabela, ano e UF
+
+Revision ID: 0003_etl_manifest
+Revises: 0002_etl_log_parent_id
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_etl_manifest'
+down_revision: Union[str, Sequence[str], None] = '0002_etl_log_parent_id'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table("etl_manifest"):
+        return
+
+    op.create_table(
+        "etl_manifest",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("table_name", sa.String(100), nullable=False),
+        sa.Column("ano", sa.Integer(), nullable=False),
+        sa.Column("uf", sa.String(2), nullable=False),
+        sa.Column("dt_geracao", sa.String(10), nullable=True),
+        sa.Column("hh_geracao", sa.String(8), nullable=True),
+        sa.Column("fingerprint", sa.String(80), nullable=True),
+        sa.Column("records_loaded", sa.Integer(), nullable=True),
+        sa.Column("log_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("etl_log.id"), nullable=True),
+        sa.Column("loaded_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("table_name", "ano", "uf", name="uq_etl_manifest_partition"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("etl_manifest")
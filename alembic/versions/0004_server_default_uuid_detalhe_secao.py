@@ -0,0 +1,28 @@
+"""server default gen_random_uuid() para detalhe_votacao_secao
+
+Revision ID: 0004_server_default_uuid_secao
+Revises: 0003_etl_manifest
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_server_default_uuid_secao'
+down_revision: Union[str, Sequence[str], None] = '0003_etl_manifest'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column("detalhe_votacao_secao", "id", server_default=sa.text("gen_random_uuid()"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column("detalhe_votacao_secao", "id", server_default=None)
@@ -0,0 +1,131 @@
+"""particionamento por ano_eleicao/sg_uf das tabelas de resultados
+
+Revision ID: 0005_partition_resultados
+Revises: 0004_server_default_uuid_secao
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_partition_resultados'
+down_revision: Union[str, Sequence[str], None] = '0004_server_default_uuid_secao'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("detalhe_votacao_secao", "votacao_candidato_munzona", "votacao_partido_munzona")
+
+UFS = (
+    "AC", "AL", "AP", "AM", "BA", "CE", "DF", "ES", "GO", "MA", "MT", "MS", "MG", "PA",
+    "PB", "PR", "PE", "PI", "RJ", "RN", "RS", "RO", "RR", "SC", "SP", "SE", "TO",
+)
+
+
+def _is_partitioned(table: str) -> bool:
+    return bool(op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+        {"table": table},
+    ).scalar())
+
+
+def _create_year_partition(table: str, ano: int) -> None:
+    op.execute(
+        f"CREATE TABLE IF NOT EXISTS {table}_{ano} PARTITION OF {table} "
+        f"FOR VALUES IN ({ano}) PARTITION BY LIST (sg_uf)"
+    )
+    for uf in UFS:
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS {table}_{ano}_{uf.lower()} "
+            f"PARTITION OF {table}_{ano} FOR VALUES IN ('{uf}')"
+        )
+    op.execute(f"CREATE TABLE IF NOT EXISTS {table}_{ano}_default PARTITION OF {table}_{ano} DEFAULT")
+
+
+def _secondary_indexes(table: str) -> List[str]:
+    """Definições das constraints UNIQUE e dos índices da tabela, exceto a PK."""
+    bind = op.get_bind()
+    constraints = bind.execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(:table) AND contype = 'u'"
+        ),
+        {"table": table},
+    ).all()
+    indexes = bind.execute(
+        sa.text(
+            "SELECT pg_get_indexdef(x.indexrelid) FROM pg_index x "
+            "WHERE x.indrelid = to_regclass(:table) "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)"
+        ),
+        {"table": table},
+    ).scalars().all()
+    return (
+        [f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}" for name, definition in constraints]
+        + list(indexes)
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        # init_db() já cria as tabelas particionadas em bancos novos
+        if _is_partitioned(table):
+            continue
+
+        # Linhas sem ano/UF não têm partição (e não existem nos arquivos do TSE):
+        # a migração para antes de mexer na tabela em vez de descartá-las
+        orphans = op.get_bind().execute(
+            sa.text(f"SELECT count(*) FROM {table} WHERE ano_eleicao IS NULL OR sg_uf IS NULL")
+        ).scalar()
+        if orphans:
+            raise RuntimeError(
+                f"{table}: {orphans} linhas com ano_eleicao ou sg_uf nulo não cabem em nenhuma partição; "
+                f"corrija ou remova essas linhas e rode a migração de novo"
+            )
+
+        # Índices criados fora da PK (à mão ou por migrações): recriados na tabela
+        # particionada depois da cópia, já que o LIKE abaixo não os leva
+        indexes = _secondary_indexes(table)
+
+        legacy = f"{table}_unpartitioned"
+        op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        op.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey")
+
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY LIST (ano_eleicao)"
+        )
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN ano_eleicao SET NOT NULL, ALTER COLUMN sg_uf SET NOT NULL")
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, ano_eleicao, sg_uf)")
+
+        years = op.get_bind().execute(
+            sa.text(f"SELECT DISTINCT ano_eleicao FROM {legacy} WHERE ano_eleicao IS NOT NULL")
+        ).scalars().all()
+        for ano in years:
+            _create_year_partition(table, int(ano))
+
+        op.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+        op.execute(f"DROP TABLE {legacy}")
+        # O DROP libera os nomes; as definições já apontam para o nome original da tabela
+        for definition in indexes:
+            op.execute(definition)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        if not _is_partitioned(table):
+            continue
+
+        partitioned = f"{table}_partitioned"
+        op.execute(f"ALTER TABLE {table} RENAME TO {partitioned}")
+        op.execute(f"ALTER TABLE {partitioned} RENAME CONSTRAINT {table}_pkey TO {partitioned}_pkey")
+
+        op.execute(f"CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS)")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN ano_eleicao DROP NOT NULL, ALTER COLUMN sg_uf DROP NOT NULL")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {partitioned}")
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)")
+        op.execute(f"DROP TABLE {partitioned} CASCADE")
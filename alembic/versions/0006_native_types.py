@@ -0,0 +1,315 @@
+"""datas, horas e valores com tipos nativos (DATE/TIME/TIMESTAMP/NUMERIC)
+
+Revision ID: 0006_native_types
+Revises: 0005_partition_resultados
+Create Date: 2026-10-18 14:00:00.000000
+
+Conversão online: em vez de ALTER COLUMN ... TYPE (que reescreve a tabela
+com ACCESS EXCLUSIVE durante toda a conversão), cada coluna ganha uma coluna
+tipada ao lado, preenchida em lotes com commit a cada lote. Só a troca final
+(DROP da coluna antiga + RENAME) acontece sob lock, em uma transação curta.
+Valores que não convertem (ex: "#NULO#") viram NULL.
+
+"""
+from typing import Dict, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_native_types'
+down_revision: Union[str, Sequence[str], None] = '0005_partition_resultados'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 50_000
+TYPED_SUFFIX = "__typed"
+FIRST_ID = "00000000-0000-0000-0000-000000000000"
+
+SQL_TYPES = {
+    "date": "DATE",
+    "time": "TIME",
+    "timestamp": "TIMESTAMP",
+    "numeric": "NUMERIC(15, 2)",
+}
+
+# Conversões tolerantes a valores inválidos (retornam NULL), criadas no schema
+# temporário da sessão da migration.
+FUNCTIONS = (
+    """
+    CREATE OR REPLACE FUNCTION pg_temp.br_date(value text) RETURNS date
+    LANGUAGE plpgsql IMMUTABLE AS $$
+    BEGIN
+        RETURN to_date(value, 'DD/MM/YYYY');
+    EXCEPTION WHEN others THEN
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION pg_temp.br_time(value text) RETURNS time
+    LANGUAGE plpgsql IMMUTABLE AS $$
+    BEGIN
+        RETURN value::time;
+    EXCEPTION WHEN others THEN
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION pg_temp.br_timestamp(value text) RETURNS timestamp
+    LANGUAGE plpgsql IMMUTABLE AS $$
+    BEGIN
+        RETURN to_timestamp(value, 'DD/MM/YYYY HH24:MI:SS')::timestamp;
+    EXCEPTION WHEN others THEN
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION pg_temp.br_numeric(value text) RETURNS numeric
+    LANGUAGE plpgsql IMMUTABLE AS $$
+    BEGIN
+        IF position(',' in value) > 0 THEN
+            value := replace(replace(value, '.', ''), ',', '.');
+        END IF;
+        RETURN value::numeric(15, 2);
+    EXCEPTION WHEN others THEN
+        RETURN NULL;
+    END $$
+    """,
+)
+
+TEXT_TYPES = {
+    "date": "VARCHAR(10)",
+    "time": "VARCHAR(8)",
+    "timestamp": "VARCHAR(19)",
+    "numeric": "TEXT",
+}
+
+FORMATS = {
+    "date": "to_char({column}, 'DD/MM/YYYY')",
+    "time": "to_char({column}, 'HH24:MI:SS')",
+    "timestamp": "to_char({column}, 'DD/MM/YYYY HH24:MI:SS')",
+    "numeric": "replace({column}::text, '.', ',')",
+}
+
+CONVERSIONS = {
+    "bem_cand": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "dt_eleicao": "date",
+        "vr_bem_candidato": "numeric",
+        "dt_ult_atual_bem_candidato": "date",
+        "hh_ult_atual_bem_candidato": "time",
+    },
+    "consulta_cand": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "dt_eleicao": "date",
+        "dt_nascimento": "date",
+    },
+    "consulta_cand_complementar": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "vr_despesa_max_campanha": "numeric",
+    },
+    "consulta_coligacao": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "dt_eleicao": "date",
+    },
+    "consulta_vagas": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "dt_eleicao": "date",
+        "dt_posse": "date",
+    },
+    "despesa_anual": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+    },
+    "despesa_anual_partidaria_nf": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "vr_documento": "numeric",
+    },
+    "despesas_contratadas_candidatos": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "dt_eleicao": "date",
+        "dt_prestacao_contas": "date",
+        "dt_despesa": "date",
+        "vr_despesa_contratada": "numeric",
+    },
+    "despesas_contratadas_orgaos_partidarios": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "dt_prestacao_contas": "date",
+        "dt_despesa": "date",
+        "vr_despesa_contratada": "numeric",
+    },
+    "despesas_pagas_candidatos": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "dt_eleicao": "date",
+        "dt_prestacao_contas": "date",
+        "dt_pagto_despesa": "date",
+        "vr_pagto_despesa": "numeric",
+    },
+    "detalhe_votacao_munzona": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "dt_eleicao": "date",
+        "hh_ultima_totalizacao": "time",
+        "dt_ultima_totalizacao": "date",
+    },
+    "detalhe_votacao_secao": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "dt_eleicao": "date",
+        "dt_recebimento_bu_hor_tse": "timestamp",
+        "dt_prim_tot_parcial_hor_tse": "timestamp",
+    },
+    "eleitorado_local_votacao": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "dt_eleicao": "date",
+    },
+    "extrato_bancario_partido": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "dt_lancamento": "date",
+        "vr_lancamento": "numeric",
+    },
+    "motivo_cassacao": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+    },
+    "perfil_comparecimento_abstencao": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+    },
+    "perfil_comparecimento_abstencao_eleitor_deficiencia": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+    },
+    "perfil_comparecimento_abstencao_eleitor_tte": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+    },
+    "perfil_eleitor_deficiencia": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+    },
+    "perfil_eleitorado": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+    },
+    "rede_social_cand": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+    },
+    "transferencia_temporaria": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+    },
+    "transferencia_temporaria_secao": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+    },
+    "votacao_candidato_munzona": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "dt_eleicao": "date",
+    },
+    "votacao_partido_munzona": {
+        "dt_geracao": "date",
+        "hh_geracao": "time",
+        "dt_eleicao": "date",
+    },
+}
+
+
+def _text_columns(table: str, columns: Dict[str, str]) -> Dict[str, str]:
+    """Colunas da lista que ainda são texto (bancos novos já nascem com os tipos nativos)."""
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table "
+            "AND data_type IN ('character varying', 'text')"
+        ),
+        {"table": table},
+    ).scalars().all()
+    return {column: kind for column, kind in columns.items() if column in rows}
+
+
+def _backfill(table: str, columns: Dict[str, str]) -> int:
+    """Preenche as colunas tipadas em lotes por id, com commit a cada lote."""
+    bind = op.get_bind()
+    assignments = ", ".join(
+        f"{column}{TYPED_SUFFIX} = pg_temp.br_{kind}({column})" for column, kind in columns.items()
+    )
+    statement = sa.text(
+        f"UPDATE {table} AS t SET {assignments} "
+        f"FROM (SELECT id FROM {table} WHERE id > CAST(:last AS uuid) ORDER BY id LIMIT :size) AS batch "
+        f"WHERE t.id = batch.id RETURNING CAST(t.id AS text)"
+    )
+
+    last, total = FIRST_ID, 0
+    while True:
+        ids = bind.execute(statement, {"last": last, "size": BATCH_SIZE}).scalars().all()
+        if not ids:
+            return total
+        last = max(ids)
+        total += len(ids)
+
+
+def _swap(table: str, columns: Dict[str, str]) -> None:
+    """
+    Troca as colunas em uma transação curta. Antes, reconverte as linhas cujo
+    valor tipado não bate com o texto: gravadas durante o backfill ou
+    alteradas depois que o seu lote foi convertido. A primeira passada roda
+    sem lock e pega quase tudo; a segunda, já com o lock, só o que mudou entre
+    as duas.
+    """
+    catch_up = ", ".join(
+        f"{column}{TYPED_SUFFIX} = pg_temp.br_{kind}({column})" for column, kind in columns.items()
+    )
+    stale = " OR ".join(
+        f"{column}{TYPED_SUFFIX} IS DISTINCT FROM pg_temp.br_{kind}({column})" for column, kind in columns.items()
+    )
+
+    op.execute(f"UPDATE {table} SET {catch_up} WHERE {stale}")
+    op.execute("BEGIN")
+    op.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+    op.execute(f"UPDATE {table} SET {catch_up} WHERE {stale}")
+    for column in columns:
+        op.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+        op.execute(f"ALTER TABLE {table} RENAME COLUMN {column}{TYPED_SUFFIX} TO {column}")
+    op.execute("COMMIT")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for function in FUNCTIONS:
+            op.execute(function)
+
+        for table, columns in CONVERSIONS.items():
+            columns = _text_columns(table, columns)
+            if not columns:
+                continue
+
+            for column, kind in columns.items():
+                op.execute(
+                    f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column}{TYPED_SUFFIX} {SQL_TYPES[kind]}"
+                )
+            _backfill(table, columns)
+            _swap(table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, columns in CONVERSIONS.items():
+        for column, kind in columns.items():
+            using = FORMATS[kind].format(column=column)
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {TEXT_TYPES[kind]} USING {using}")
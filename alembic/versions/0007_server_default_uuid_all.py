@@ -0,0 +1,55 @@
+"""server default gen_random_uuid() para todas as tabelas carregadas via COPY
+
+Revision ID: 0007_server_default_uuid_all
+Revises: 0006_native_types
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_server_default_uuid_all'
+down_revision: Union[str, Sequence[str], None] = '0006_native_types'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    "bem_cand",
+    "consulta_cand",
+    "consulta_cand_complementar",
+    "consulta_coligacao",
+    "consulta_vagas",
+    "motivo_cassacao",
+    "rede_social_cand",
+    "perfil_comparecimento_abstencao",
+    "perfil_comparecimento_abstencao_eleitor_deficiencia",
+    "perfil_comparecimento_abstencao_eleitor_tte",
+    "eleitorado_local_votacao",
+    "perfil_eleitor_deficiencia",
+    "perfil_eleitorado",
+    "transferencia_temporaria",
+    "transferencia_temporaria_secao",
+    "despesa_anual",
+    "despesa_anual_partidaria_nf",
+    "despesas_contratadas_candidatos",
+    "despesas_contratadas_orgaos_partidarios",
+    "despesas_pagas_candidatos",
+    "extrato_bancario_partido",
+    "detalhe_votacao_munzona",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=sa.text("gen_random_uuid()"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=None)
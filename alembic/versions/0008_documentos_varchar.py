@@ -0,0 +1,78 @@
+"""CPF/CNPJ como VARCHAR (estouravam o INTEGER e perdiam zeros à esquerda)
+
+Revision ID: 0008_documentos_varchar
+Revises: 0007_server_default_uuid_all
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_documentos_varchar'
+down_revision: Union[str, Sequence[str], None] = '0007_server_default_uuid_all'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (tabela, coluna, tamanho) -- tipos apontados pelo profiler de generate_model_from_csv
+COLUMNS = (
+    ("consulta_cand", "nr_cpf_candidato", 11),
+    ("despesa_anual", "nr_cnpj_prestador_conta", 14),
+    ("despesa_anual", "nr_cpf_cnpj_fornecedor", 14),
+    ("despesa_anual_partidaria_nf", "nr_cnpj_prestador_conta", 14),
+    ("despesa_anual_partidaria_nf", "nr_cpf_cnpj_fornecedor", 14),
+    ("despesas_contratadas_candidatos", "nr_cnpj_prestador_conta", 14),
+    ("despesas_contratadas_candidatos", "nr_cpf_candidato", 11),
+    ("despesas_contratadas_candidatos", "nr_cpf_vice_candidato", 11),
+    ("despesas_contratadas_candidatos", "nr_cpf_cnpj_fornecedor", 14),
+    ("despesas_contratadas_orgaos_partidarios", "nr_cnpj_prestador_conta", 14),
+    ("despesas_contratadas_orgaos_partidarios", "nr_cpf_cnpj_fornecedor", 14),
+    ("extrato_bancario_partido", "nr_cnpj", 14),
+    ("extrato_bancario_partido", "nr_cpf_cnpj_contraparte", 14),
+)
+
+
+def _column_type(table: str, column: str):
+    return op.get_bind().execute(
+        sa.text(
+            "SELECT data_type, character_maximum_length FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+        ),
+        {"table": table, "column": column},
+    ).first()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, length in COLUMNS:
+        current = _column_type(table, column)
+        # init_db() já cria as colunas como VARCHAR em bancos novos
+        if current is None or (current[0] == "character varying" and current[1] == length):
+            continue
+
+        if current[0] == "integer":
+            # Marcadores negativos do TSE (-1, -4) ficam como estão; documentos ganham os zeros à esquerda
+            using = f"CASE WHEN {column} >= 0 THEN lpad({column}::text, {length}, '0') ELSE {column}::text END"
+        else:
+            using = f"{column}::text"
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR({length}) USING {using}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, _ in COLUMNS:
+        current = _column_type(table, column)
+        if current is None or current[0] != "character varying":
+            continue
+
+        if (table, column) == ("despesa_anual", "nr_cpf_cnpj_fornecedor"):
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR(6) USING left({column}, 6)")
+            continue
+        # Valores que não cabem no INTEGER (a maioria dos CPFs/CNPJs) viram NULL
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE INTEGER USING "
+            f"CASE WHEN {column} ~ '^-?[0-9]{{1,9}}$' THEN {column}::integer END"
+        )
@@ -0,0 +1,31 @@
+"""etl_log: colunas de progresso (stage, bytes_read, heartbeat_at)
+
+Revision ID: 0009_etl_log_progress
+Revises: 0008_documentos_varchar
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_etl_log_progress'
+down_revision: Union[str, Sequence[str], None] = '0008_documentos_varchar'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE etl_log ADD COLUMN IF NOT EXISTS stage VARCHAR(30)")
+    op.execute("ALTER TABLE etl_log ADD COLUMN IF NOT EXISTS bytes_read BIGINT")
+    op.execute("ALTER TABLE etl_log ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP WITHOUT TIME ZONE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE etl_log DROP COLUMN IF EXISTS heartbeat_at")
+    op.execute("ALTER TABLE etl_log DROP COLUMN IF EXISTS bytes_read")
+    op.execute("ALTER TABLE etl_log DROP COLUMN IF EXISTS stage")
@@ -0,0 +1,61 @@
+"""etl_log: bytes_total, stage_timings e NOTIFY etl_progress a cada mudança
+
+Revision ID: 0010_etl_log_notify
+Revises: 0009_etl_log_progress
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010_etl_log_notify'
+down_revision: Union[str, Sequence[str], None] = '0009_etl_log_progress'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE etl_log ADD COLUMN IF NOT EXISTS bytes_total BIGINT")
+    op.execute("ALTER TABLE etl_log ADD COLUMN IF NOT EXISTS stage_timings JSONB")
+
+    # Cada heartbeat/mudança de status vira um NOTIFY: a API repassa aos clientes
+    # conectados (SSE) sem que cada um precise consultar a tabela
+    op.execute("""
+        CREATE OR REPLACE FUNCTION etl_log_notify() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('etl_progress', json_build_object(
+                'id', NEW.id,
+                'parent_id', NEW.parent_id,
+                'process_name', NEW.process_name,
+                'status', NEW.status,
+                'stage', NEW.stage,
+                'records_processed', NEW.records_processed,
+                'bytes_read', NEW.bytes_read,
+                'bytes_total', NEW.bytes_total,
+                'stage_timings', NEW.stage_timings,
+                'start_time', NEW.start_time,
+                'end_time', NEW.end_time,
+                'heartbeat_at', NEW.heartbeat_at,
+                'error_message', left(NEW.error_message, 200)
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS etl_log_notify ON etl_log")
+    op.execute(
+        "CREATE TRIGGER etl_log_notify AFTER INSERT OR UPDATE ON etl_log "
+        "FOR EACH ROW EXECUTE FUNCTION etl_log_notify()"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS etl_log_notify ON etl_log")
+    op.execute("DROP FUNCTION IF EXISTS etl_log_notify()")
+    op.execute("ALTER TABLE etl_log DROP COLUMN IF EXISTS stage_timings")
+    op.execute("ALTER TABLE etl_log DROP COLUMN IF EXISTS bytes_total")
@@ -0,0 +1,54 @@
+"""etl_log: records_rejected (linhas desviadas para a quarentena)
+
+Revision ID: 0011_etl_log_rejected
+Revises: 0010_etl_log_notify
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011_etl_log_rejected'
+down_revision: Union[str, Sequence[str], None] = '0010_etl_log_notify'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _notify_function(extra: str) -> str:
+    return f"""
+        CREATE OR REPLACE FUNCTION etl_log_notify() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('etl_progress', json_build_object(
+                'id', NEW.id,
+                'parent_id', NEW.parent_id,
+                'process_name', NEW.process_name,
+                'status', NEW.status,
+                'stage', NEW.stage,
+                'records_processed', NEW.records_processed,{extra}
+                'bytes_read', NEW.bytes_read,
+                'bytes_total', NEW.bytes_total,
+                'stage_timings', NEW.stage_timings,
+                'start_time', NEW.start_time,
+                'end_time', NEW.end_time,
+                'heartbeat_at', NEW.heartbeat_at,
+                'error_message', left(NEW.error_message, 200)
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE etl_log ADD COLUMN IF NOT EXISTS records_rejected INTEGER")
+    op.execute(_notify_function("\n                'records_rejected', NEW.records_rejected,"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(_notify_function(""))
+    op.execute("ALTER TABLE etl_log DROP COLUMN IF EXISTS records_rejected")
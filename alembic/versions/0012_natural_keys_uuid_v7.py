@@ -0,0 +1,98 @@
+"""ids UUIDv7 (ordenados no tempo) e chaves naturais para o modo merge
+
+Revision ID: 0012_natural_keys_uuid_v7
+Revises: 0011_etl_log_rejected
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.ids import UUID_V7_FUNCTION
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012_natural_keys_uuid_v7'
+down_revision: Union[str, Sequence[str], None] = '0011_etl_log_rejected'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    "bem_cand",
+    "consulta_cand",
+    "consulta_cand_complementar",
+    "consulta_coligacao",
+    "consulta_vagas",
+    "motivo_cassacao",
+    "rede_social_cand",
+    "perfil_comparecimento_abstencao",
+    "perfil_comparecimento_abstencao_eleitor_deficiencia",
+    "perfil_comparecimento_abstencao_eleitor_tte",
+    "eleitorado_local_votacao",
+    "perfil_eleitor_deficiencia",
+    "perfil_eleitorado",
+    "transferencia_temporaria",
+    "transferencia_temporaria_secao",
+    "despesa_anual",
+    "despesa_anual_partidaria_nf",
+    "despesas_contratadas_candidatos",
+    "despesas_contratadas_orgaos_partidarios",
+    "despesas_pagas_candidatos",
+    "extrato_bancario_partido",
+    "detalhe_votacao_munzona",
+    "detalhe_votacao_secao",
+    "votacao_candidato_munzona",
+    "votacao_partido_munzona",
+)
+
+NATURAL_KEYS = {
+    "votacao_candidato_munzona": ("ano_eleicao", "sg_uf", "nr_turno", "cd_municipio", "nr_zona", "sq_candidato"),
+    "votacao_partido_munzona": (
+        "ano_eleicao", "sg_uf", "cd_eleicao", "nr_turno", "cd_municipio", "nr_zona", "cd_cargo", "nr_partido"
+    ),
+    "detalhe_votacao_secao": (
+        "ano_eleicao", "sg_uf", "cd_eleicao", "nr_turno", "cd_municipio", "nr_zona", "nr_secao", "cd_cargo"
+    ),
+    "detalhe_votacao_munzona": (
+        "ano_eleicao", "sg_uf", "cd_eleicao", "nr_turno", "cd_municipio", "nr_zona", "cd_cargo"
+    ),
+    "consulta_cand": ("ano_eleicao", "sg_uf", "cd_eleicao", "nr_turno", "sq_candidato"),
+    "bem_cand": ("ano_eleicao", "sg_uf", "sq_candidato", "nr_ordem_bem_candidato"),
+    "rede_social_cand": ("aa_eleicao", "sg_uf", "sq_candidato", "nr_ordem_rede_social"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(UUID_V7_FUNCTION)
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=sa.text("uuid_generate_v7()"))
+
+    # Idempotente (o init_db já cria as constraints em bancos novos). Com
+    # duplicatas na chave a migração falha: sem a constraint, o ON CONFLICT do
+    # modo merge quebraria depois, longe da causa
+    for table, columns in NATURAL_KEYS.items():
+        name = f"{table}_natural_key"
+        op.execute(f"""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = '{name}') THEN
+                    ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE ({', '.join(columns)});
+                END IF;
+            EXCEPTION WHEN unique_violation THEN
+                RAISE EXCEPTION '{table}: linhas duplicadas na chave natural ({', '.join(columns)})'
+                    USING HINT = 'Remova as duplicatas (ou recarregue a tabela) e rode a migração de novo';
+            END
+            $$
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in NATURAL_KEYS:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_natural_key")
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=sa.text("gen_random_uuid()"))
+    op.execute("DROP FUNCTION IF EXISTS uuid_generate_v7()")
@@ -0,0 +1,27 @@
+"""etl_log: checkpoint (último lote confirmado, para retomar a carga)
+
+Revision ID: 0013_etl_log_checkpoint
+Revises: 0012_natural_keys_uuid_v7
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013_etl_log_checkpoint'
+down_revision: Union[str, Sequence[str], None] = '0012_natural_keys_uuid_v7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE etl_log ADD COLUMN IF NOT EXISTS checkpoint JSONB")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE etl_log DROP COLUMN IF EXISTS checkpoint")
@@ -0,0 +1,81 @@
+"""tabelas de totais de votação (candidato x UE/UF, partido x município/UF)
+
+Revision ID: 0014_vote_rollups
+Revises: 0013_etl_log_checkpoint
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0014_vote_rollups'
+down_revision: Union[str, Sequence[str], None] = '0013_etl_log_checkpoint'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmas tabelas de app.models.resultados.totais_votacao: (origem, grão, atributos, somas)
+ROLLUPS = {
+    "total_votacao_candidato_ue": (
+        "votacao_candidato_munzona",
+        {"ano_eleicao": "integer", "sg_uf": "varchar(2)", "cd_eleicao": "integer", "nr_turno": "integer",
+         "sg_ue": "integer", "sq_candidato": "bigint"},
+        {"nm_ue": "varchar(32)", "cd_cargo": "integer", "ds_cargo": "varchar(8)", "nr_candidato": "integer",
+         "nm_urna_candidato": "varchar(30)", "sg_partido": "varchar(13)", "ds_sit_tot_turno": "varchar(50)"},
+        ("qt_votos_nominais", "qt_votos_nominais_validos"),
+    ),
+    "total_votacao_candidato_uf": (
+        "votacao_candidato_munzona",
+        {"ano_eleicao": "integer", "sg_uf": "varchar(2)", "cd_eleicao": "integer", "nr_turno": "integer",
+         "sq_candidato": "bigint"},
+        {"cd_cargo": "integer", "ds_cargo": "varchar(8)", "nr_candidato": "integer",
+         "nm_urna_candidato": "varchar(30)", "sg_partido": "varchar(13)"},
+        ("qt_votos_nominais", "qt_votos_nominais_validos"),
+    ),
+    "total_votacao_partido_municipio": (
+        "votacao_partido_munzona",
+        {"ano_eleicao": "integer", "sg_uf": "varchar(2)", "cd_eleicao": "integer", "nr_turno": "integer",
+         "cd_municipio": "integer", "cd_cargo": "integer", "nr_partido": "integer"},
+        {"nm_municipio": "varchar(32)", "ds_cargo": "varchar(8)", "sg_partido": "varchar(13)",
+         "nm_partido": "varchar(46)"},
+        ("qt_votos_nominais_validos", "qt_votos_legenda_validos", "qt_total_votos_leg_validos"),
+    ),
+    "total_votacao_partido_uf": (
+        "votacao_partido_munzona",
+        {"ano_eleicao": "integer", "sg_uf": "varchar(2)", "cd_eleicao": "integer", "nr_turno": "integer",
+         "cd_cargo": "integer", "nr_partido": "integer"},
+        {"ds_cargo": "varchar(8)", "sg_partido": "varchar(13)", "nm_partido": "varchar(46)"},
+        ("qt_votos_nominais_validos", "qt_votos_legenda_validos", "qt_total_votos_leg_validos"),
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (source, keys, labels, sums) in ROLLUPS.items():
+        # Idempotente (o init_db já cria as tabelas)
+        columns = [f"{name} {kind} NOT NULL" for name, kind in keys.items()]
+        columns += [f"{name} {kind}" for name, kind in labels.items()]
+        columns += [f"{name} bigint" for name in sums]
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)}, PRIMARY KEY ({', '.join(keys)}))"
+        )
+
+        # Totais dos dados já carregados; as cargas seguintes os mantêm
+        group = ", ".join(keys)
+        select = [*keys, *(f"MAX({name})" for name in labels), *(f"SUM({name})" for name in sums)]
+        op.execute(
+            f"INSERT INTO {table} ({', '.join([*keys, *labels, *sums])}) "
+            f"SELECT {', '.join(select)} FROM {source} "
+            f"WHERE {' AND '.join(f'{name} IS NOT NULL' for name in keys)} "
+            f"AND NOT EXISTS (SELECT 1 FROM {table}) "
+            f"GROUP BY {group}"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ROLLUPS:
+        op.execute(f"DROP TABLE IF EXISTS {table}")
@@ -0,0 +1,77 @@
+"""espelho do catálogo do CKAN (ckan_package, ckan_resource)
+
+Revision ID: 0015_ckan_catalog
+Revises: 0014_vote_rollups
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0015_ckan_catalog'
+down_revision: Union[str, Sequence[str], None] = '0014_vote_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmos índices de app.models.ckan_catalog
+INDEXES = {
+    "ix_ckan_package_ano_tema": ("ckan_package", ("ano", "tema")),
+    "ix_ckan_package_tema": ("ckan_package", ("tema",)),
+    "ix_ckan_resource_package_id": ("ckan_resource", ("package_id",)),
+    "ix_ckan_resource_ano_tema_format": ("ckan_resource", ("ano", "tema", "format")),
+    "ix_ckan_resource_format": ("ckan_resource", ("format",)),
+    "ix_ckan_resource_last_modified": ("ckan_resource", ("last_modified",)),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Idempotente (o init_db já cria as tabelas)
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("ckan_package"):
+        op.create_table(
+            "ckan_package",
+            sa.Column("id", sa.String(64), primary_key=True),
+            sa.Column("name", sa.String(200), nullable=False, unique=True),
+            sa.Column("title", sa.Text(), nullable=True),
+            sa.Column("notes", sa.Text(), nullable=True),
+            sa.Column("ano", sa.Integer(), nullable=True),
+            sa.Column("tema", sa.String(200), nullable=True),
+            sa.Column("num_resources", sa.Integer(), nullable=True),
+            sa.Column("metadata_created", sa.DateTime(), nullable=True),
+            sa.Column("metadata_modified", sa.DateTime(), nullable=True),
+            sa.Column("synced_at", sa.DateTime(), nullable=False),
+        )
+    if not inspector.has_table("ckan_resource"):
+        op.create_table(
+            "ckan_resource",
+            sa.Column("id", sa.String(64), primary_key=True),
+            sa.Column(
+                "package_id", sa.String(64), sa.ForeignKey("ckan_package.id", ondelete="CASCADE"), nullable=False
+            ),
+            sa.Column("package_name", sa.String(200), nullable=False),
+            sa.Column("name", sa.Text(), nullable=True),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("format", sa.String(50), nullable=True),
+            sa.Column("mimetype", sa.String(100), nullable=True),
+            sa.Column("url", sa.Text(), nullable=True),
+            sa.Column("size", sa.BigInteger(), nullable=True),
+            sa.Column("ano", sa.Integer(), nullable=True),
+            sa.Column("tema", sa.String(200), nullable=True),
+            sa.Column("created", sa.DateTime(), nullable=True),
+            sa.Column("last_modified", sa.DateTime(), nullable=True),
+            sa.Column("synced_at", sa.DateTime(), nullable=False),
+        )
+
+    for name, (table, columns) in INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS ckan_resource")
+    op.execute("DROP TABLE IF EXISTS ckan_package")
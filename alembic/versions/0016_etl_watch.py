@@ -0,0 +1,47 @@
+"""etl_watch: última versão vista dos arquivos de origem, por tabela e ano
+
+Revision ID: 0016_etl_watch
+Revises: 0015_ckan_catalog
+Create Date: 2026-10-18 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0016_etl_watch'
+down_revision: Union[str, Sequence[str], None] = '0015_ckan_catalog'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table("etl_watch"):
+        return
+
+    op.create_table(
+        "etl_watch",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("table_name", sa.String(100), nullable=False),
+        sa.Column("ano", sa.Integer(), nullable=False),
+        sa.Column("resource_id", sa.String(64), nullable=True),
+        sa.Column("url", sa.Text(), nullable=True),
+        sa.Column("last_modified", sa.DateTime(), nullable=True),
+        sa.Column("size", sa.BigInteger(), nullable=True),
+        sa.Column("etag", sa.String(200), nullable=True),
+        sa.Column("http_last_modified", sa.String(64), nullable=True),
+        sa.Column("checked_at", sa.DateTime(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=True),
+        sa.Column("log_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("etl_log.id"), nullable=True),
+        sa.UniqueConstraint("table_name", "ano", name="uq_etl_watch_source"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("etl_watch")
@@ -0,0 +1,92 @@
+"""chaves naturais NOT NULL e st_voto_em_transito nas chaves da votação por zona
+
+Revision ID: 0017_natural_keys_not_null
+Revises: 0016_etl_watch
+Create Date: 2026-10-18 23:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0017_natural_keys_not_null'
+down_revision: Union[str, Sequence[str], None] = '0016_etl_watch'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmas chaves de app.models (ver natural_key)
+NATURAL_KEYS = {
+    "votacao_candidato_munzona": (
+        "ano_eleicao", "sg_uf", "nr_turno", "cd_municipio", "nr_zona", "sq_candidato", "st_voto_em_transito"
+    ),
+    "votacao_partido_munzona": (
+        "ano_eleicao", "sg_uf", "cd_eleicao", "nr_turno", "cd_municipio", "nr_zona", "cd_cargo", "nr_partido",
+        "st_voto_em_transito"
+    ),
+    "detalhe_votacao_secao": (
+        "ano_eleicao", "sg_uf", "cd_eleicao", "nr_turno", "cd_municipio", "nr_zona", "nr_secao", "cd_cargo"
+    ),
+    "detalhe_votacao_munzona": (
+        "ano_eleicao", "sg_uf", "cd_eleicao", "nr_turno", "cd_municipio", "nr_zona", "cd_cargo", "st_voto_em_transito"
+    ),
+    "consulta_cand": ("ano_eleicao", "sg_uf", "cd_eleicao", "nr_turno", "sq_candidato"),
+    "bem_cand": ("ano_eleicao", "sg_uf", "sq_candidato", "nr_ordem_bem_candidato"),
+    "rede_social_cand": ("aa_eleicao", "sg_uf", "sq_candidato", "nr_ordem_rede_social"),
+}
+
+# Tabelas cuja chave ganhou st_voto_em_transito: o TSE publica as linhas do voto
+# em trânsito separadas, com o restante da chave igual
+TRANSITO = ("votacao_candidato_munzona", "votacao_partido_munzona", "detalhe_votacao_munzona")
+
+
+def _not_null(table: str, columns: Sequence[str], nullable: bool = False) -> None:
+    action = "DROP NOT NULL" if nullable else "SET NOT NULL"
+    op.execute(f"""
+        DO $$
+        BEGIN
+            ALTER TABLE {table} {', '.join(f'ALTER COLUMN {column} {action}' for column in columns)};
+        EXCEPTION WHEN not_null_violation THEN
+            RAISE EXCEPTION '{table}: linhas com a chave natural nula ({', '.join(columns)})'
+                USING HINT = 'Remova essas linhas (ou recarregue a tabela) e rode a migração de novo';
+        END
+        $$
+    """)
+
+
+def _natural_key(table: str, columns: Sequence[str]) -> None:
+    name = f"{table}_natural_key"
+    op.execute(f"""
+        DO $$
+        BEGIN
+            ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name};
+            ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE ({', '.join(columns)});
+        EXCEPTION WHEN unique_violation THEN
+            RAISE EXCEPTION '{table}: linhas duplicadas na chave natural ({', '.join(columns)})'
+                USING HINT = 'Remova as duplicatas (ou recarregue a tabela) e rode a migração de novo';
+        END
+        $$
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Idempotente (o init_db já cria as tabelas assim em bancos novos). Com NULLs
+    # ou duplicatas na chave a migração falha: sem a constraint, o ON CONFLICT
+    # do modo merge quebraria depois, longe da causa
+    for table, columns in NATURAL_KEYS.items():
+        _not_null(table, columns)
+    for table in TRANSITO:
+        _natural_key(table, NATURAL_KEYS[table])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TRANSITO:
+        _natural_key(table, [column for column in NATURAL_KEYS[table] if column != "st_voto_em_transito"])
+    for table, columns in NATURAL_KEYS.items():
+        # ano_eleicao e sg_uf das tabelas particionadas já eram NOT NULL (fazem parte da PK)
+        if table in ("votacao_candidato_munzona", "votacao_partido_munzona", "detalhe_votacao_secao"):
+            columns = [column for column in columns if column not in ("ano_eleicao", "sg_uf")]
+        _not_null(table, columns, nullable=True)
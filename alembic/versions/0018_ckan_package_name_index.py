@@ -0,0 +1,31 @@
+"""ckan_package.name: índice comum no lugar do UNIQUE
+
+Revision ID: 0018_ckan_package_name_index
+Revises: 0017_natural_keys_not_null
+Create Date: 2026-10-18 23:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0018_ckan_package_name_index'
+down_revision: Union[str, Sequence[str], None] = '0017_natural_keys_not_null'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # O upsert do catálogo resolve conflitos só pelo id: um package recriado no
+    # portal (id novo, mesmo nome) violava o UNIQUE e abortava a sincronização
+    op.execute("ALTER TABLE ckan_package DROP CONSTRAINT IF EXISTS ckan_package_name_key")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_ckan_package_name ON ckan_package (name)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_ckan_package_name")
+    op.execute("ALTER TABLE ckan_package ADD CONSTRAINT ckan_package_name_key UNIQUE (name)")
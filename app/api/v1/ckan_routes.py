@@ -1,6 +1,18 @@
-from fastapi import APIRouter, HTTPException, Path, status
+from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi_filter import FilterDepends
+from fastapi_pagination import Page
+from fastapi_pagination.ext.sqlalchemy import paginate
 from loguru import logger
-
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db_session
+from app.filters.ckan_catalog_filters import CKANPackageFilter, CKANResourceFilter
+from app.models.ckan_catalog import CKANPackage, CKANResource
+from app.repository.catalog_repository import CKANCatalogRepository
+from app.schemas.ckan_catalog_schema import CKANBulkURLsRequest, CKANPackageResponse, CKANResourceResponse
+from app.services.catalog import enqueue_catalog_sync, match_packages
 from app.services.ckan_client import CKANTSEClient
 
 router = APIRouter(prefix="/ckan")
@@ -73,6 +85,44 @@ async def get_package_urls(package_id: str = Path(...)):
         raise HTTPException(404, str(e))
 
 
+@router.post("/packages/urls", summary="URLs de download de vários packages")
+async def get_bulk_package_urls(request: CKANBulkURLsRequest, db: AsyncSession = Depends(get_db_session)):
+    """
+    Resolve em uma requisição as URLs de download de vários packages, com
+    chamadas paralelas ao CKAN (no máximo CKAN_BULK_CONCURRENCY simultâneas).
+
+    Os packages são os de package_ids mais os do ano e/ou padrão informados
+    (ex: {"ano": 2024} para todos os packages de 2024). Um package com erro
+    não derruba o lote: o item traz success=false e a mensagem.
+    """
+    package_ids = list(request.package_ids)
+    if request.ano is not None or request.pattern:
+        try:
+            package_ids += await match_packages(db, client, request.ano, request.pattern)
+        except Exception as e:
+            logger.error(f"❌ Erro ao selecionar packages: {e}")
+            raise HTTPException(status.HTTP_502_BAD_GATEWAY, f"Erro ao selecionar packages: {str(e)}")
+    package_ids = list(dict.fromkeys(package_ids))
+
+    if len(package_ids) > settings.CKAN_BULK_MAX_PACKAGES:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            f"{len(package_ids)} packages selecionados; o limite por requisição é {settings.CKAN_BULK_MAX_PACKAGES}"
+        )
+
+    logger.info(f"🔍 Resolvendo URLs de {len(package_ids)} packages")
+    results = await client.get_many_download_urls(package_ids)
+    failed = sum(1 for result in results if not result["success"])
+
+    return {
+        "success": True,
+        "total": len(results),
+        "resolved": len(results) - failed,
+        "failed": failed,
+        "packages": results
+    }
+
+
 @router.get("/resources/{resource_id}", summary="Detalhes de um resource")
 async def get_resource_details(resource_id: str = Path(..., description="ID do resource (arquivo)")):
     """
@@ -92,3 +142,114 @@ async def get_resource_details(resource_id: str = Path(..., description="ID do r
     except Exception as e:
         logger.error(f"❌ Erro ao buscar resource '{resource_id}': {e}")
         raise HTTPException(status.HTTP_404_NOT_FOUND, f"Resource não encontrado: {str(e)}")
+
+
+@router.get("/cache", summary="Estatísticas do cache do CKAN")
+async def get_cache_stats():
+    """
+    Contadores do cache das chamadas ao CKAN: acertos (frescos e vencidos
+    servidos com revalidação), faltas, revalidações, erros e ocupação, e das
+    requisições agrupadas (chamadas idênticas simultâneas).
+    """
+    return {
+        "success": True,
+        "cache": client.cache.snapshot(),
+        "single_flight": client.flight.snapshot()
+    }
+
+
+@router.get("/catalog", summary="Situação do espelho do catálogo")
+async def get_catalog_summary(db: AsyncSession = Depends(get_db_session)):
+    """
+    Quantidade de packages e resources espelhados do CKAN e data da última
+    sincronização (feita periodicamente pelo celery beat).
+    """
+    try:
+        return {
+            "success": True,
+            **await CKANCatalogRepository(db).summary()
+        }
+    except Exception as e:
+        logger.error(f"❌ Erro ao consultar o catálogo: {e}")
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, f"Erro ao consultar o catálogo: {str(e)}")
+
+
+@router.post("/catalog/sync", status_code=status.HTTP_202_ACCEPTED, summary="Sincronizar o catálogo agora")
+async def sync_catalog():
+    """
+    Envia para a fila uma sincronização do espelho do catálogo, sem esperar o
+    agendamento. O andamento fica no ETLLog "ckan_catalog_sync".
+    """
+    try:
+        task_id = await enqueue_catalog_sync()
+        return {
+            "success": True,
+            "task_id": task_id
+        }
+    except Exception as e:
+        logger.error(f"❌ Erro ao enfileirar a sincronização do catálogo: {e}")
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, f"Erro ao enfileirar a sincronização: {str(e)}")
+
+
+@router.get("/catalog/temas", summary="Temas do catálogo")
+async def list_catalog_themes(db: AsyncSession = Depends(get_db_session)):
+    """
+    Temas do catálogo (nome do package sem o ano, ex: 'resultados',
+    'candidatos'), com a quantidade de packages e os anos de cada um.
+    """
+    try:
+        themes = await CKANCatalogRepository(db).themes()
+        return {
+            "success": True,
+            "total": len(themes),
+            "temas": themes
+        }
+    except Exception as e:
+        logger.error(f"❌ Erro ao listar temas do catálogo: {e}")
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, f"Erro ao listar temas: {str(e)}")
+
+
+@router.get(
+    "/catalog/packages",
+    response_model=Page[CKANPackageResponse],
+    summary="Buscar packages no catálogo",
+)
+async def search_catalog_packages(
+        package_filter: CKANPackageFilter = FilterDepends(CKANPackageFilter),
+        db: AsyncSession = Depends(get_db_session),
+) -> Page[CKANPackageResponse]:
+    """
+    Busca packages no espelho local do catálogo (por ano, tema ou nome), sem
+    chamadas ao CKAN.
+    """
+    try:
+        base_query = package_filter.filter(select(CKANPackage))
+        base_query = package_filter.sort(base_query)
+        return await paginate(db, base_query)
+    except Exception as e:
+        logger.error(f"❌ Erro na busca de packages do catálogo: {e}", exc_info=True)
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, f"Erro ao buscar packages: {str(e)}")
+
+
+@router.get(
+    "/catalog/resources",
+    response_model=Page[CKANResourceResponse],
+    summary="Buscar arquivos no catálogo",
+)
+async def search_catalog_resources(
+        resource_filter: CKANResourceFilter = FilterDepends(CKANResourceFilter),
+        db: AsyncSession = Depends(get_db_session),
+) -> Page[CKANResourceResponse]:
+    """
+    Busca resources (arquivos) no espelho local do catálogo, por ano, tema,
+    formato, package, tamanho ou data de modificação, sem chamadas ao CKAN.
+
+    Ex: todos os ZIPs de resultados de 2022: ?ano=2022&tema=resultados&format=ZIP
+    """
+    try:
+        base_query = resource_filter.filter(select(CKANResource))
+        base_query = resource_filter.sort(base_query)
+        return await paginate(db, base_query)
+    except Exception as e:
+        logger.error(f"❌ Erro na busca de resources do catálogo: {e}", exc_info=True)
+        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, f"Erro ao buscar resources: {str(e)}")
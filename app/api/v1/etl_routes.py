@@ -0,0 +1,218 @@
+import asyncio
+import json
+import uuid
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionMaker, get_db_session
+from app.repository.log_repository import ETLLogRepository
+from app.repository.watch_repository import ETLWatchRepository
+from app.schemas.etl_schemas import ETLLogResponse, ETLRequest, ETLResponse, ETLWatchResponse
+from app.services.etl.datasets import get_dataset
+from app.services.etl.loader import LOAD_MODES
+from app.services.etl.progress_stream import FINAL_STATUSES, progress_broadcaster
+from app.services.etl.tasks import enqueue_etl, enqueue_resume
+from app.services.etl.watcher import enqueue_watch
+
+router = APIRouter(prefix="/etl")
+
+# Comentário SSE enviado sem eventos novos, para manter proxies com a conexão aberta
+KEEPALIVE_SECONDS = 15
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post(
+    "/jobs",
+    response_model=ETLResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Enfileirar carga de ETL",
+)
+async def create_etl_job(
+        request: ETLRequest,
+        download: bool = Query(True, description="Lê o CSV do ZIP publicado no CKAN do TSE"),
+        mode: Optional[str] = Query(None, description="delete, swap ou merge (padrão: ETL_LOAD_MODE ou o da tabela)"),
+) -> ETLResponse:
+    """
+    Envia a carga para a fila de jobs e retorna imediatamente.
+
+    A carga roda nos workers (celery_worker), fora do processo da API; o
+    andamento é consultado em GET /etl/jobs/{log_id}.
+    """
+    if mode is not None and mode not in LOAD_MODES:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, f"Modo inválido: {mode}")
+    dataset = get_dataset(request.tipo)
+    if mode == "merge" and not dataset.key:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            f"{request.tipo.value} não tem chave natural; use o modo delete ou swap"
+        )
+    if request.uf is not None and not dataset.by_uf:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            f"{request.tipo.value} é publicado em arquivo nacional; não informe a UF"
+        )
+
+    try:
+        log = await enqueue_etl(request, download=download, mode=mode)
+    except Exception as e:
+        logger.error(f"❌ Erro ao enfileirar carga: {e}")
+        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, f"Fila de jobs indisponível: {str(e)}")
+
+    return ETLResponse(
+        status=log.status,
+        mensagem=f"Carga {log.process_name} enfileirada",
+        log_id=str(log.id),
+    )
+
+
+@router.post(
+    "/jobs/{log_id}/resume",
+    response_model=ETLResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Retomar uma carga de ETL interrompida",
+)
+async def resume_etl_job(
+        log_id: uuid.UUID = Path(..., description="ID do ETLLog da carga interrompida"),
+) -> ETLResponse:
+    """
+    Enfileira a retomada de uma carga que terminou com erro ou foi
+    interrompida, no mesmo log. Cargas de um arquivo continuam após o último
+    lote confirmado; no fan-out, só as UFs ainda não gravadas são carregadas.
+    """
+    try:
+        log = await enqueue_resume(log_id)
+    except LookupError:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, f"Job {log_id} não encontrado")
+    except ValueError as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, str(e))
+    except Exception as e:
+        logger.error(f"❌ Erro ao enfileirar retomada: {e}")
+        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, f"Fila de jobs indisponível: {str(e)}")
+
+    return ETLResponse(
+        status=log.status,
+        mensagem=f"Retomada de {log.process_name} enfileirada",
+        log_id=str(log.id),
+    )
+
+
+@router.get("/watch", summary="Arquivos acompanhados pelo watcher")
+async def list_watched_sources(db: AsyncSession = Depends(get_db_session)):
+    """
+    Última versão vista de cada arquivo de origem já carregado (metadados do
+    CKAN e validadores HTTP), quando mudou e a carga enfileirada por último.
+    """
+    sources = await ETLWatchRepository(db).list_all()
+    return {
+        "success": True,
+        "total": len(sources),
+        "sources": [ETLWatchResponse.model_validate(source) for source in sources],
+    }
+
+
+@router.post("/watch", status_code=status.HTTP_202_ACCEPTED, summary="Verificar mudanças nos arquivos agora")
+async def run_watch():
+    """
+    Envia para a fila uma verificação dos arquivos já carregados, sem esperar
+    o agendamento (ETL_WATCH_INTERVAL). Arquivos que mudaram geram cargas,
+    só das partições já carregadas.
+    """
+    try:
+        task_id = await enqueue_watch()
+    except Exception as e:
+        logger.error(f"❌ Erro ao enfileirar verificação: {e}")
+        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, f"Fila de jobs indisponível: {str(e)}")
+
+    return {
+        "success": True,
+        "task_id": task_id
+    }
+
+
+@router.get("/jobs/{log_id}", summary="Andamento de uma carga de ETL")
+async def get_etl_job(
+        log_id: uuid.UUID = Path(..., description="ID do ETLLog retornado ao enfileirar"),
+        db: AsyncSession = Depends(get_db_session),
+):
+    """
+    Estado da carga (pending, processing, done, skipped ou error) e, em cargas
+    nacionais, o estado de cada UF.
+    """
+    repository = ETLLogRepository(db)
+    log = await repository.get(log_id)
+    if log is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, f"Job {log_id} não encontrado")
+
+    children = await repository.list_children(log_id)
+    return {
+        "success": True,
+        "job": ETLLogResponse.from_log(log),
+        "ufs": [ETLLogResponse.from_log(child) for child in children],
+    }
+
+
+@router.get("/jobs/{log_id}/events", summary="Acompanhar uma carga de ETL ao vivo (SSE)")
+async def stream_etl_job(
+        request: Request,
+        log_id: uuid.UUID = Path(..., description="ID do ETLLog retornado ao enfileirar"),
+        db: AsyncSession = Depends(get_db_session),
+):
+    """
+    Server-sent events com o andamento da carga e de suas UFs.
+
+    - **snapshot**: estado atual da carga e das UFs, ao conectar
+    - **progress**: cada heartbeat ou mudança de status, com registros/s,
+      bytes/s, ETA (quando o tamanho do arquivo é conhecido) e o tempo por
+      etapa (download, parse, copy, index, swap, merge)
+    - **end**: a carga terminou (done, error ou skipped)
+
+    Os eventos vêm do NOTIFY disparado pelo próprio etl_log; os clientes não
+    consultam o banco depois do snapshot.
+    """
+    if await ETLLogRepository(db).get(log_id) is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, f"Job {log_id} não encontrado")
+    await db.close()
+
+    async def events() -> AsyncIterator[str]:
+        # A inscrição só existe enquanto o stream roda: um cliente que desconecta
+        # antes do primeiro evento não deixa a fila para trás. Ela vem antes do
+        # snapshot para não perder eventos entre os dois
+        async with progress_broadcaster.subscribe(str(log_id)) as queue:
+            async with AsyncSessionMaker() as session:
+                repository = ETLLogRepository(session)
+                log = await repository.get(log_id)
+                snapshot = {
+                    "job": log.to_dict(),
+                    "ufs": [child.to_dict() for child in await repository.list_children(log_id)],
+                }
+
+            yield _sse("snapshot", snapshot)
+            if snapshot["job"]["status"] in FINAL_STATUSES:
+                yield _sse("end", snapshot["job"])
+                return
+
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    await progress_broadcaster.ensure_listening()
+                    yield ": keepalive\n\n"
+                    continue
+
+                yield _sse("progress", event)
+                if event["id"] == str(log_id) and event.get("status") in FINAL_STATUSES:
+                    yield _sse("end", event)
+                    return
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
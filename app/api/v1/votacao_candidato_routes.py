@@ -9,8 +9,11 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db_session
+from app.filters.totais_votacao_filters import TotalVotacaoCandidatoUEFilter, TotalVotacaoCandidatoUFFilter
 from app.filters.votacao_candidato_filters import VotacaoCandidatoFilter
+from app.models.resultados.totais_votacao import TotalVotacaoCandidatoUE, TotalVotacaoCandidatoUF
 from app.models.resultados.votacao_candidato_munzona import VotacaoCandidatoMunZona
+from app.schemas.totais_votacao_schema import TotalVotacaoCandidatoUEResponse, TotalVotacaoCandidatoUFResponse
 from app.schemas.votacao_candidato_schema import VotacaoCandidatoMunZonaResponse
 
 router = APIRouter(prefix="/votacao_candidatos")
@@ -39,6 +42,51 @@ async def list_votation_candidates(
         raise HTTPException(500, f"Erro ao buscar votação: {str(e)}")
 
 
+# Declaradas antes de /{candidate_id}, que capturaria "totais"
+@router.get(
+    "/totais/uf",
+    response_model=Page[TotalVotacaoCandidatoUFResponse],
+    summary="Total de votos por candidato na UF",
+)
+async def list_candidate_totals_uf(
+        totals_filter: TotalVotacaoCandidatoUFFilter = FilterDepends(TotalVotacaoCandidatoUFFilter),
+        db: AsyncSession = Depends(get_db_session),
+) -> Page[TotalVotacaoCandidatoUFResponse]:
+    """
+    Total de votos de cada candidato na UF, lido da tabela de totais
+    recalculada ao fim de cada carga (sem agregar as zonas na consulta).
+    """
+    try:
+        base_query = totals_filter.filter(select(TotalVotacaoCandidatoUF))
+        base_query = totals_filter.sort(base_query)
+        return await paginate(db, base_query)
+    except Exception as e:
+        logger.error(f"Erro no endpoint de totais: {e}", exc_info=True)
+        raise HTTPException(500, f"Erro ao buscar totais de votação: {str(e)}")
+
+
+@router.get(
+    "/totais/ue",
+    response_model=Page[TotalVotacaoCandidatoUEResponse],
+    summary="Total de votos por candidato na unidade eleitoral",
+)
+async def list_candidate_totals_ue(
+        totals_filter: TotalVotacaoCandidatoUEFilter = FilterDepends(TotalVotacaoCandidatoUEFilter),
+        db: AsyncSession = Depends(get_db_session),
+) -> Page[TotalVotacaoCandidatoUEResponse]:
+    """
+    Total de votos de cada candidato na unidade eleitoral (município nas
+    eleições municipais), lido da tabela de totais.
+    """
+    try:
+        base_query = totals_filter.filter(select(TotalVotacaoCandidatoUE))
+        base_query = totals_filter.sort(base_query)
+        return await paginate(db, base_query)
+    except Exception as e:
+        logger.error(f"Erro no endpoint de totais: {e}", exc_info=True)
+        raise HTTPException(500, f"Erro ao buscar totais de votação: {str(e)}")
+
+
 @router.get("/{candidate_id}", response_model=VotacaoCandidatoMunZonaResponse)
 async def get_details_candidate(
         candidate_id: UUID,
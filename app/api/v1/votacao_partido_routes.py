@@ -9,8 +9,11 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db_session
+from app.filters.totais_votacao_filters import TotalVotacaoPartidoMunicipioFilter, TotalVotacaoPartidoUFFilter
 from app.filters.votacao_partido_filters import VotacaoPartidoFilter
+from app.models.resultados.totais_votacao import TotalVotacaoPartidoMunicipio, TotalVotacaoPartidoUF
 from app.models.resultados.votacao_partido_munzona import VotacaoPartidoMunZona
+from app.schemas.totais_votacao_schema import TotalVotacaoPartidoMunicipioResponse, TotalVotacaoPartidoUFResponse
 from app.schemas.votacao_partido_schema import VotacaoPartidoMunZonaResponse
 
 router = APIRouter(prefix="/votacao_partidos")
@@ -41,6 +44,57 @@ async def list_votation_parties(
         )
 
 
+# Declaradas antes de /{party_id}, que capturaria "totais"
+@router.get(
+    "/totais/uf",
+    response_model=Page[TotalVotacaoPartidoUFResponse],
+    summary="Total de votos por partido na UF",
+)
+async def list_party_totals_uf(
+        totals_filter: TotalVotacaoPartidoUFFilter = FilterDepends(TotalVotacaoPartidoUFFilter),
+        db: AsyncSession = Depends(get_db_session),
+) -> Page[TotalVotacaoPartidoUFResponse]:
+    """
+    Total de votos de cada partido, por cargo, na UF, lido da tabela de
+    totais recalculada ao fim de cada carga.
+    """
+    try:
+        base_query = totals_filter.filter(select(TotalVotacaoPartidoUF))
+        base_query = totals_filter.sort(base_query)
+        return await paginate(db, base_query)
+    except Exception as e:
+        logger.error(f"❌ Erro no endpoint de totais por partido: {e}", exc_info=True)
+        raise HTTPException(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            f"Erro ao buscar totais de votação por partido: {str(e)}"
+        )
+
+
+@router.get(
+    "/totais/municipio",
+    response_model=Page[TotalVotacaoPartidoMunicipioResponse],
+    summary="Total de votos por partido no município",
+)
+async def list_party_totals_municipio(
+        totals_filter: TotalVotacaoPartidoMunicipioFilter = FilterDepends(TotalVotacaoPartidoMunicipioFilter),
+        db: AsyncSession = Depends(get_db_session),
+) -> Page[TotalVotacaoPartidoMunicipioResponse]:
+    """
+    Total de votos de cada partido, por cargo, no município, lido da tabela
+    de totais.
+    """
+    try:
+        base_query = totals_filter.filter(select(TotalVotacaoPartidoMunicipio))
+        base_query = totals_filter.sort(base_query)
+        return await paginate(db, base_query)
+    except Exception as e:
+        logger.error(f"❌ Erro no endpoint de totais por partido: {e}", exc_info=True)
+        raise HTTPException(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            f"Erro ao buscar totais de votação por partido: {str(e)}"
+        )
+
+
 @router.get("/{party_id}", response_model=VotacaoPartidoMunZonaResponse)
 async def get_details_party_vote(
         party_id: UUID,
@@ -0,0 +1,92 @@
+import asyncio
+from typing import Any, Callable, Set
+
+from celery import Celery
+from loguru import logger
+
+from app.core.config import settings
+
+# Fila dos jobs periódicos curtos, separada das cargas longas da fila "etl"
+MAINTENANCE_QUEUE = "maintenance"
+
+celery_app = Celery(
+    "tse_api",
+    broker=settings.REDIS_URL,
+    backend=settings.REDIS_URL,
+    include=["app.services.etl.tasks", "app.services.etl.watcher", "app.services.catalog"],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    task_default_queue="etl",
+    task_track_started=True,
+    # Cada job roda em um processo próprio (ver app.services.etl.tasks): as threads
+    # do worker só acompanham os processos, e a concorrência é o número de cargas simultâneas
+    worker_pool="threads",
+    worker_concurrency=settings.ETL_WORKER_CONCURRENCY,
+    # Cargas são longas: um job por vez por slot, confirmado só ao terminar
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    broker_transport_options={"visibility_timeout": 12 * 3600},
+    result_expires=7 * 24 * 3600,
+    # Sem broker (desenvolvimento), o job roda no próprio processo que o enfileirou
+    task_always_eager=settings.ETL_TASK_ALWAYS_EAGER,
+    # Catálogo e watcher têm worker próprio (serviço celery_maintenance do
+    # docker-compose): na fila "etl" esperariam atrás de cargas de horas
+    task_routes={
+        "catalog.sync": {"queue": MAINTENANCE_QUEUE},
+        "etl.watch": {"queue": MAINTENANCE_QUEUE},
+    },
+    # Agendamentos do celery beat (serviço celery_beat do docker-compose). Uma
+    # execução não atendida até o próximo agendamento expira em vez de acumular
+    beat_schedule={
+        "ckan-catalog-sync": {
+            "task": "catalog.sync",
+            "schedule": settings.CKAN_CATALOG_SYNC_INTERVAL,
+            "options": {"expires": settings.CKAN_CATALOG_SYNC_INTERVAL},
+        },
+        "etl-watch": {
+            "task": "etl.watch",
+            "schedule": settings.ETL_WATCH_INTERVAL,
+            "options": {"expires": settings.ETL_WATCH_INTERVAL},
+        },
+    },
+)
+
+# Jobs em execução no modo eager: a referência evita que a future seja descartada
+_eager_jobs: Set[asyncio.Future] = set()
+
+
+def _eager_done(name: str, future: asyncio.Future) -> None:
+    _eager_jobs.discard(future)
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is None and future.result().failed():
+        error = future.result().result
+    if error is not None:
+        logger.opt(exception=error).error(f"❌ Job {name} falhou (modo eager): {error}")
+
+
+async def dispatch(send: Callable[[], Any], name: str) -> None:
+    """
+    Envia um job para a fila (send: apply_async já com os argumentos) sem
+    bloquear o event loop.
+
+    Sem broker (task_always_eager) o job roda na própria chamada: fica em uma
+    thread, sem segurar a resposta, e uma falha vai para o log.
+
+    Args:
+        send: Chamada que envia o job
+        name: Descrição do job nos logs
+    """
+    if not celery_app.conf.task_always_eager:
+        await asyncio.to_thread(send)
+        return
+
+    future = asyncio.get_running_loop().run_in_executor(None, send)
+    _eager_jobs.add(future)
+    future.add_done_callback(lambda done: _eager_done(name, done))
@@ -20,6 +20,52 @@ class Settings(BaseSettings):
 
     CORS_ORIGINS: list[str] = ["*"]
 
+    CKAN_URL: str = "https://dadosabertos.tse.jus.br/"
+    CKAN_TIMEOUT: float = 30.0
+    CKAN_CONNECT_TIMEOUT: float = 5.0
+    CKAN_MAX_CONNECTIONS: int = 20
+    CKAN_KEEPALIVE_EXPIRY: float = 30.0
+    CKAN_CACHE_MAX_ENTRIES: int = 1024
+    CKAN_CACHE_STALE_SECONDS: float = 3600.0
+    CKAN_CACHE_TTLS: dict[str, float] = {"package_list": 600.0, "package_show": 300.0, "resource_show": 300.0}
+    CKAN_CATALOG_SYNC_INTERVAL: float = 6 * 3600.0
+    CKAN_CATALOG_PAGE_SIZE: int = 500
+    CKAN_BULK_CONCURRENCY: int = 8
+    CKAN_BULK_MAX_PACKAGES: int = 200
+
+    ETL_DATA_DIR: str = "data"
+    ETL_CSV_ENCODING: str = "latin1"
+    ETL_CSV_SEPARATOR: str = ";"
+    ETL_CHUNK_SIZE: int = 50_000
+    ETL_PARSE_WORKERS: int = 4
+    ETL_COPY_WRITERS: int = 4
+    ETL_QUEUE_SIZE: int = 16
+    ETL_QUEUE_PUT_TIMEOUT: float = 600.0
+    ETL_DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024
+    ETL_DOWNLOAD_TIMEOUT: float = 60.0
+    ETL_DOWNLOAD_PREFETCH: int = 8
+    ETL_PIPELINE_DEPTH: int = 4
+    ETL_MEMORY_BUDGET_MB: int = 512
+
+    ETL_ARCHIVE_CACHE: bool = True
+    ETL_CACHE_DIR: str = "data/cache"
+    ETL_CACHE_MAX_BYTES: int = 20 * 1024 ** 3
+    ETL_CACHE_PARALLEL_THRESHOLD: int = 256 * 1024 ** 2
+    ETL_CACHE_PARALLEL_PARTS: int = 4
+
+    ETL_LOAD_MODE: str = ""  # vazio: o modo de cada tabela (ver Dataset.default_mode)
+    ETL_SWAP_LOCK_TIMEOUT: str = "10s"
+
+    REDIS_URL: str = "redis://localhost:6379/0"
+    ETL_WORKER_CONCURRENCY: int = 2
+    ETL_TASK_ALWAYS_EAGER: bool = False
+    ETL_PROGRESS_INTERVAL: float = 1.0
+    ETL_WATCH_INTERVAL: float = 3600.0
+    ETL_WATCH_CONCURRENCY: int = 4
+
+    ETL_QUARANTINE_DIR: str = "data/quarantine"
+    ETL_REJECT_BUDGET: int = 1000
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
 
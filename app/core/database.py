@@ -2,13 +2,35 @@ from typing import AsyncGenerator
 
 import asyncpg
 from loguru import logger
+from sqlalchemy import UniqueConstraint
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
 from app.core.config import settings
+from app.core.ids import UUID_V7_FUNCTION
 
 Base = declarative_base()
 
+NATURAL_KEY_SUFFIX = "_natural_key"
+
+
+def natural_key(table_name: str, *columns: str) -> UniqueConstraint:
+    """
+    Chave natural de uma tabela do TSE (ex: ano, UF, turno, município, zona e
+    candidato), declarada em __table_args__ e usada pelo upsert do modo merge.
+
+    As colunas da chave devem ser NOT NULL: o UNIQUE não compara NULLs, então
+    uma linha com chave nula nunca casaria com a já gravada no merge.
+
+    A chave natural é um UNIQUE à parte e não a PK: o id (UUIDv7) é o
+    identificador público das linhas (ex: GET /votacao_candidatos/{id}), o merge
+    o preserva nas linhas que não mudaram e, crescente, mantém as inserções no
+    fim do índice da PK. O custo é um segundo índice, mais largo, por tabela
+    com chave natural; trocar a PK mudaria os ids expostos pela API.
+    """
+    return UniqueConstraint(*columns, name=f"{table_name}{NATURAL_KEY_SUFFIX}")
+
+
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
@@ -44,9 +66,25 @@ async def init_db():
     import app.models  # noqa: F401
 
     async with engine.begin() as conn:
+        # Default dos ids das tabelas; precisa existir antes do CREATE TABLE
+        await conn.exec_driver_sql(UUID_V7_FUNCTION)
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def create_copy_connection() -> asyncpg.Connection:
+    """
+    Abre uma conexão asyncpg dedicada, usada pelas cargas via COPY.
+    O chamador é responsável por fechá-la.
+    """
+    return await asyncpg.connect(
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        database=settings.DB_NAME
+    )
+
+
 async def create_database_if_not_exists():
     """Cria o banco de dados se não existir."""
     try:
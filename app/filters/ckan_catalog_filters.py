@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import Optional, List
+
+from fastapi_filter.contrib.sqlalchemy import Filter
+from pydantic import Field
+
+from app.models.ckan_catalog import CKANPackage, CKANResource
+
+
+class CKANPackageFilter(Filter):
+    """Filtros para os packages do espelho do catálogo do CKAN."""
+
+    ano: Optional[int] = Field(None, description="Ano do package (ex: 2024)")
+    ano__gte: Optional[int] = Field(None, description="Ano >= valor")
+    ano__lte: Optional[int] = Field(None, description="Ano <= valor")
+    tema: Optional[str] = Field(None, description="Tema (nome do package sem o ano, ex: 'resultados')")
+    tema__ilike: Optional[str] = Field(None, description="Busca no tema")
+    name__ilike: Optional[str] = Field(None, description="Busca no nome do package")
+
+    order_by: Optional[List[str]] = Field(
+        default=["-ano", "name"],
+        description="Ordenação (ex: 'name', '-metadata_modified')"
+    )
+
+    search: Optional[str] = Field(
+        None,
+        description="Busca geral em nome e título do package"
+    )
+
+    class Constants(Filter.Constants):
+        model = CKANPackage
+
+        ordering_field_name = "order_by"
+        ordering_fields = ["ano", "name", "tema", "metadata_modified"]
+        search_field_name = "search"
+        search_model_fields = ["name", "title"]
+
+
+class CKANResourceFilter(Filter):
+    """Filtros para os resources (arquivos) do espelho do catálogo do CKAN."""
+
+    ano: Optional[int] = Field(None, description="Ano do package (ex: 2024)")
+    ano__gte: Optional[int] = Field(None, description="Ano >= valor")
+    ano__lte: Optional[int] = Field(None, description="Ano <= valor")
+    tema: Optional[str] = Field(None, description="Tema (nome do package sem o ano, ex: 'resultados')")
+    tema__ilike: Optional[str] = Field(None, description="Busca no tema")
+    format: Optional[str] = Field(None, description="Formato (ex: 'ZIP', 'CSV')")
+    package_id: Optional[str] = Field(None, description="ID do package")
+    package_name: Optional[str] = Field(None, description="Nome do package (ex: 'resultados-2024')")
+    name__ilike: Optional[str] = Field(None, description="Busca no nome do arquivo")
+
+    size__gte: Optional[int] = Field(None, description="Tamanho (bytes) >= valor")
+    size__lte: Optional[int] = Field(None, description="Tamanho (bytes) <= valor")
+    last_modified__gte: Optional[datetime] = Field(None, description="Modificado a partir de")
+
+    order_by: Optional[List[str]] = Field(
+        default=["-ano", "package_name", "name"],
+        description="Ordenação (ex: '-last_modified', '-size')"
+    )
+
+    search: Optional[str] = Field(
+        None,
+        description="Busca geral em nome do arquivo e do package"
+    )
+
+    class Constants(Filter.Constants):
+        model = CKANResource
+
+        ordering_field_name = "order_by"
+        ordering_fields = ["ano", "package_name", "name", "format", "size", "last_modified"]
+        search_field_name = "search"
+        search_model_fields = ["name", "package_name"]
@@ -1,3 +1,4 @@
+from datetime import date
 from typing import Optional, List
 
 from fastapi_filter.contrib.sqlalchemy import Filter
@@ -32,6 +33,19 @@ class ConsultaCandidatoFilter(Filter):
         None, description="Descrição do cargo (busca parcial, ILIKE)"
     )
 
+    dt_nascimento__gte: Optional[date] = Field(
+        None, description="Nascidos a partir da data (AAAA-MM-DD)"
+    )
+    dt_nascimento__lte: Optional[date] = Field(
+        None, description="Nascidos até a data (AAAA-MM-DD)"
+    )
+    dt_eleicao__gte: Optional[date] = Field(
+        None, description="Eleições a partir da data (AAAA-MM-DD)"
+    )
+    dt_eleicao__lte: Optional[date] = Field(
+        None, description="Eleições até a data (AAAA-MM-DD)"
+    )
+
     order_by: Optional[List[str]] = Field(
         default=["nm_candidato"],
         description="Ordenação (ex: 'nm_candidato', '-nr_candidato')",
@@ -0,0 +1,105 @@
+from typing import Optional, List
+
+from fastapi_filter.contrib.sqlalchemy import Filter
+from pydantic import Field
+
+from app.models.resultados.totais_votacao import (
+    TotalVotacaoCandidatoUE,
+    TotalVotacaoCandidatoUF,
+    TotalVotacaoPartidoMunicipio,
+    TotalVotacaoPartidoUF,
+)
+
+
+class TotalVotacaoCandidatoUFFilter(Filter):
+    """Filtros para os totais de votação por candidato na UF."""
+
+    ano_eleicao: Optional[int] = Field(None, description="Ano da eleição")
+    sg_uf: Optional[str] = Field(None, description="Sigla do estado")
+    nr_turno: Optional[int] = Field(None, description="Turno")
+    cd_cargo: Optional[int] = Field(None, description="Código do cargo")
+    sq_candidato: Optional[int] = Field(None, description="Sequencial do candidato")
+    nr_candidato: Optional[int] = Field(None, description="Número do candidato")
+    sg_partido: Optional[str] = Field(None, description="Sigla do partido")
+
+    qt_votos_nominais__gte: Optional[int] = Field(None, description="Votos >= valor")
+    qt_votos_nominais__lte: Optional[int] = Field(None, description="Votos <= valor")
+
+    order_by: Optional[List[str]] = Field(
+        default=["-qt_votos_nominais"],
+        description="Ordenação (ex: 'nm_urna_candidato', '-qt_votos_nominais')"
+    )
+
+    search: Optional[str] = Field(
+        None,
+        description="Busca geral em nome de urna do candidato"
+    )
+
+    class Constants(Filter.Constants):
+        model = TotalVotacaoCandidatoUF
+
+        ordering_field_name = "order_by"
+        ordering_fields = [
+            "nm_urna_candidato",
+            "sg_partido",
+            "qt_votos_nominais",
+            "qt_votos_nominais_validos",
+        ]
+        search_field_name = "search"
+        search_model_fields = ["nm_urna_candidato"]
+
+
+class TotalVotacaoCandidatoUEFilter(TotalVotacaoCandidatoUFFilter):
+    """Filtros para os totais de votação por candidato na unidade eleitoral."""
+
+    sg_ue: Optional[int] = Field(None, description="Código da unidade eleitoral")
+    nm_ue__ilike: Optional[str] = Field(None, description="Busca no nome da unidade eleitoral")
+
+    class Constants(TotalVotacaoCandidatoUFFilter.Constants):
+        model = TotalVotacaoCandidatoUE
+
+
+class TotalVotacaoPartidoUFFilter(Filter):
+    """Filtros para os totais de votação por partido na UF."""
+
+    ano_eleicao: Optional[int] = Field(None, description="Ano da eleição")
+    sg_uf: Optional[str] = Field(None, description="Sigla do estado")
+    nr_turno: Optional[int] = Field(None, description="Turno")
+    cd_cargo: Optional[int] = Field(None, description="Código do cargo")
+    sg_partido: Optional[str] = Field(None, description="Sigla do partido")
+
+    qt_total_votos_leg_validos__gte: Optional[int] = Field(None, description="Votos >= valor")
+    qt_total_votos_leg_validos__lte: Optional[int] = Field(None, description="Votos <= valor")
+
+    order_by: Optional[List[str]] = Field(
+        default=["-qt_total_votos_leg_validos"],
+        description="Ordenação (ex: 'sg_partido', '-qt_total_votos_leg_validos')",
+    )
+
+    search: Optional[str] = Field(
+        None,
+        description="Busca geral em sigla do partido"
+    )
+
+    class Constants(Filter.Constants):
+        model = TotalVotacaoPartidoUF
+
+        ordering_field_name = "order_by"
+        ordering_fields = [
+            "sg_partido",
+            "qt_votos_nominais_validos",
+            "qt_votos_legenda_validos",
+            "qt_total_votos_leg_validos",
+        ]
+        search_field_name = "search"
+        search_model_fields = ["sg_partido"]
+
+
+class TotalVotacaoPartidoMunicipioFilter(TotalVotacaoPartidoUFFilter):
+    """Filtros para os totais de votação por partido no município."""
+
+    cd_municipio: Optional[int] = Field(None, description="Código do município")
+    nm_municipio__ilike: Optional[str] = Field(None, description="Busca no nome do município")
+
+    class Constants(TotalVotacaoPartidoUFFilter.Constants):
+        model = TotalVotacaoPartidoMunicipio
@@ -1,3 +1,4 @@
+from datetime import date
 from typing import Optional, List
 
 from fastapi_filter.contrib.sqlalchemy import Filter
@@ -20,6 +21,9 @@ class VotacaoCandidatoFilter(Filter):
     qt_votos_nominais__gte: Optional[int] = Field(None, description="Votos >= valor")
     qt_votos_nominais__lte: Optional[int] = Field(None, description="Votos <= valor")
 
+    dt_eleicao__gte: Optional[date] = Field(None, description="Eleições a partir da data (AAAA-MM-DD)")
+    dt_eleicao__lte: Optional[date] = Field(None, description="Eleições até a data (AAAA-MM-DD)")
+
     order_by: Optional[List[str]] = Field(
         default=["-qt_votos_nominais"],
         description="Ordenação (ex: 'nm_candidato', '-qt_votos_nominais')"
@@ -1,3 +1,4 @@
+from datetime import date
 from typing import Optional, List
 
 from fastapi_filter.contrib.sqlalchemy import Filter
@@ -18,6 +19,9 @@ class VotacaoPartidoFilter(Filter):
     qt_votos_nominais_validos__gte: Optional[int] = Field(None, description="Votos >= valor")
     qt_votos_nominais_validos__lte: Optional[int] = Field(None, description="Votos <= valor")
 
+    dt_eleicao__gte: Optional[date] = Field(None, description="Eleições a partir da data (AAAA-MM-DD)")
+    dt_eleicao__lte: Optional[date] = Field(None, description="Eleições até a data (AAAA-MM-DD)")
+
     order_by: Optional[List[str]] = Field(
         default=["-qt_votos_nominais_validos"],
         description="Ordenação (ex: 'sg_partido', '-qt_votos_nominais_validos')",
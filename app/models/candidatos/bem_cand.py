@@ -1,32 +1,33 @@
-import uuid
-
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Date, Numeric, Time, text
 from sqlalchemy.dialects.postgresql import UUID
 
-from app.core.database import Base
+from app.core.database import Base, natural_key
+from app.core.ids import uuid7
 
 
 class BemCandidato(Base):
     __tablename__ = "bem_cand"
+    # Chave natural, usada pelo upsert do modo merge
+    __table_args__ = (natural_key("bem_cand", "ano_eleicao", "sg_uf", "sq_candidato", "nr_ordem_bem_candidato"),)
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("uuid_generate_v7()"))
 
-    dt_geracao = Column(String(10), nullable=True)
-    hh_geracao = Column(String(8), nullable=True)
-    ano_eleicao = Column(Integer, nullable=True)
+    dt_geracao = Column(Date, nullable=True)
+    hh_geracao = Column(Time, nullable=True)
+    ano_eleicao = Column(Integer, nullable=False)
     cd_tipo_eleicao = Column(Integer, nullable=True)
     nm_tipo_eleicao = Column(String(17), nullable=True)
     cd_eleicao = Column(Integer, nullable=True)
     ds_eleicao = Column(String(24), nullable=True)
-    dt_eleicao = Column(String(10), nullable=True)
-    sg_uf = Column(String(2), nullable=True)
+    dt_eleicao = Column(Date, nullable=True)
+    sg_uf = Column(String(2), nullable=False)
     sg_ue = Column(Integer, nullable=True)
     nm_ue = Column(String(32), nullable=True)
-    sq_candidato = Column(Integer, nullable=True)
-    nr_ordem_bem_candidato = Column(Integer, nullable=True)
+    sq_candidato = Column(Integer, nullable=False)
+    nr_ordem_bem_candidato = Column(Integer, nullable=False)
     cd_tipo_bem_candidato = Column(Integer, nullable=True)
     ds_tipo_bem_candidato = Column(String(112), nullable=True)
     ds_bem_candidato = Column(String(199), nullable=True)
-    vr_bem_candidato = Column(String(10), nullable=True)
-    dt_ult_atual_bem_candidato = Column(String(10), nullable=True)
-    hh_ult_atual_bem_candidato = Column(String(8), nullable=True)
+    vr_bem_candidato = Column(Numeric(15, 2), nullable=True)
+    dt_ult_atual_bem_candidato = Column(Date, nullable=True)
+    hh_ult_atual_bem_candidato = Column(Time, nullable=True)
@@ -1,18 +1,17 @@
-import uuid
-
-from sqlalchemy import Column, Integer, Text, DateTime, String
+from sqlalchemy import Column, Integer, Text, DateTime, String, Date, Numeric, Time, text
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.core.database import Base
+from app.core.ids import uuid7
 
 
 class ConsultaCandComplementar(Base):
     __tablename__ = "consulta_cand_complementar"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("uuid_generate_v7()"))
 
-    dt_geracao = Column(String(10), nullable=True)
-    hh_geracao = Column(String(8), nullable=True)
+    dt_geracao = Column(Date, nullable=True)
+    hh_geracao = Column(Time, nullable=True)
     ano_eleicao = Column(Integer, nullable=True)
     cd_eleicao = Column(Integer, nullable=True)
     sq_candidato = Column(Integer, nullable=True)
@@ -26,7 +25,7 @@ class ConsultaCandComplementar(Base):
     st_quilombola = Column(String(1), nullable=True)
     cd_etnia_indigena = Column(Integer, nullable=True)
     ds_etnia_indigena = Column(String(20), nullable=True)
-    vr_despesa_max_campanha = Column(Text, nullable=True)
+    vr_despesa_max_campanha = Column(Numeric(15, 2), nullable=True)
     st_reeleicao = Column(String(1), nullable=True)
     st_declarar_bens = Column(String(1), nullable=True)
     nr_protocolo_candidatura = Column(Integer, nullable=True)
@@ -1,37 +1,38 @@
-import uuid
-
-from sqlalchemy import Column, Integer, String, BigInteger
+from sqlalchemy import Column, Integer, String, BigInteger, Date, Time, text
 from sqlalchemy.dialects.postgresql import UUID
 
-from app.core.database import Base
+from app.core.database import Base, natural_key
+from app.core.ids import uuid7
 
 
 class ConsultaCandidatos(Base):
     __tablename__ = "consulta_cand"
+    # Chave natural, usada pelo upsert do modo merge
+    __table_args__ = (natural_key("consulta_cand", "ano_eleicao", "sg_uf", "cd_eleicao", "nr_turno", "sq_candidato"),)
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("uuid_generate_v7()"))
 
-    dt_geracao = Column(String(10), nullable=True)
-    hh_geracao = Column(String(8), nullable=True)
-    ano_eleicao = Column(Integer, nullable=True)
+    dt_geracao = Column(Date, nullable=True)
+    hh_geracao = Column(Time, nullable=True)
+    ano_eleicao = Column(Integer, nullable=False)
     cd_tipo_eleicao = Column(Integer, nullable=True)
     nm_tipo_eleicao = Column(String(19), nullable=True)
-    nr_turno = Column(Integer, nullable=True)
-    cd_eleicao = Column(Integer, nullable=True)
+    nr_turno = Column(Integer, nullable=False)
+    cd_eleicao = Column(Integer, nullable=False)
     ds_eleicao = Column(String(38), nullable=True)
-    dt_eleicao = Column(String(10), nullable=True)
+    dt_eleicao = Column(Date, nullable=True)
     tp_abrangencia = Column(String(9), nullable=True)
-    sg_uf = Column(String(2), nullable=True)
+    sg_uf = Column(String(2), nullable=False)
     sg_ue = Column(Integer, nullable=True)
     nm_ue = Column(String(32), nullable=True)
     cd_cargo = Column(BigInteger, nullable=True)
     ds_cargo = Column(String(20), nullable=True)
-    sq_candidato = Column(BigInteger, nullable=True)
+    sq_candidato = Column(BigInteger, nullable=False)
     nr_candidato = Column(BigInteger, nullable=True)
     nm_candidato = Column(String(100), nullable=True)
     nm_urna_candidato = Column(String(50), nullable=True)
     nm_social_candidato = Column(String(50), nullable=True)
-    nr_cpf_candidato = Column(Integer, nullable=True)
+    nr_cpf_candidato = Column(String(11), nullable=True)
     ds_email = Column(String(14), nullable=True)
     cd_situacao_candidatura = Column(Integer, nullable=True)
     ds_situacao_candidatura = Column(String(3), nullable=True)
@@ -47,7 +48,7 @@ class ConsultaCandidatos(Base):
     nm_coligacao = Column(String(100), nullable=True)
     ds_composicao_coligacao = Column(String(300), nullable=True)
     sg_uf_nascimento = Column(String(15), nullable=True)
-    dt_nascimento = Column(String(10), nullable=True)
+    dt_nascimento = Column(Date, nullable=True)
     nr_titulo_eleitoral_candidato = Column(BigInteger, nullable=True)
     cd_genero = Column(Integer, nullable=True)
     ds_genero = Column(String(20), nullable=True)
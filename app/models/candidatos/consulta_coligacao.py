@@ -1,25 +1,24 @@
-import uuid
-
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Date, Time, text
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.core.database import Base
+from app.core.ids import uuid7
 
 
 class ConsultaColigacao(Base):
     __tablename__ = "consulta_coligacao"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("uuid_generate_v7()"))
 
-    dt_geracao = Column(String(10), nullable=True)
-    hh_geracao = Column(String(8), nullable=True)
+    dt_geracao = Column(Date, nullable=True)
+    hh_geracao = Column(Time, nullable=True)
     ano_eleicao = Column(Integer, nullable=True)
     cd_tipo_eleicao = Column(Integer, nullable=True)
     nm_tipo_eleicao = Column(String(19), nullable=True)
     nr_turno = Column(Integer, nullable=True)
     cd_eleicao = Column(Integer, nullable=True)
     ds_eleicao = Column(String(38), nullable=True)
-    dt_eleicao = Column(String(10), nullable=True)
+    dt_eleicao = Column(Date, nullable=True)
     sg_uf = Column(String(2), nullable=True)
     sg_ue = Column(Integer, nullable=True)
     nm_ue = Column(String(32), nullable=True)
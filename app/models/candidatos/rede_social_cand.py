@@ -1,24 +1,25 @@
-import uuid
-
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Date, Time, text
 from sqlalchemy.dialects.postgresql import UUID
 
-from app.core.database import Base
+from app.core.database import Base, natural_key
+from app.core.ids import uuid7
 
 
 class RedeSocialCandidato(Base):
     __tablename__ = "rede_social_cand"
+    # Chave natural, usada pelo upsert do modo merge
+    __table_args__ = (natural_key("rede_social_cand", "aa_eleicao", "sg_uf", "sq_candidato", "nr_ordem_rede_social"),)
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("uuid_generate_v7()"))
 
-    dt_geracao = Column(String(10), nullable=True)
-    hh_geracao = Column(String(8), nullable=True)
-    aa_eleicao = Column(Integer, nullable=True)
-    sg_uf = Column(String(2), nullable=True)
+    dt_geracao = Column(Date, nullable=True)
+    hh_geracao = Column(Time, nullable=True)
+    aa_eleicao = Column(Integer, nullable=False)
+    sg_uf = Column(String(2), nullable=False)
     cd_tipo_eleicao = Column(Integer, nullable=True)
     nm_tipo_eleicao = Column(String(19), nullable=True)
     cd_eleicao = Column(Integer, nullable=True)
     ds_eleicao = Column(String(33), nullable=True)
-    sq_candidato = Column(Integer, nullable=True)
-    nr_ordem_rede_social = Column(Integer, nullable=True)
+    sq_candidato = Column(Integer, nullable=False)
+    nr_ordem_rede_social = Column(Integer, nullable=False)
     ds_url = Column(String(135), nullable=True)
@@ -0,0 +1,69 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, Index, Text
+
+from app.core.database import Base
+
+
+# Espelho do catálogo do CKAN do TSE, atualizado pela sincronização periódica
+# (ver app.services.catalog). Os ids são os do CKAN; ano e tema vêm do nome do
+# package (ex: "resultados-2024" -> 2024, "resultados") e são repetidos nos
+# resources para a busca de arquivos não precisar de JOIN.
+
+
+class CKANPackage(Base):
+    """Package (dataset) publicado no CKAN do TSE"""
+
+    __tablename__ = "ckan_package"
+    __table_args__ = (
+        Index("ix_ckan_package_ano_tema", "ano", "tema"),
+        Index("ix_ckan_package_tema", "tema"),
+    )
+
+    id = Column(String(64), primary_key=True)
+    # Sem UNIQUE: um package recriado no portal (id novo, mesmo nome) convive com
+    # o antigo até a sincronização completa removê-lo (ver CKANCatalogRepository.prune)
+    name = Column(String(200), nullable=False, index=True)
+    title = Column(Text, nullable=True)
+    notes = Column(Text, nullable=True)
+
+    ano = Column(Integer, nullable=True)
+    tema = Column(String(200), nullable=True)
+
+    num_resources = Column(Integer, nullable=True)
+    metadata_created = Column(DateTime, nullable=True)
+    metadata_modified = Column(DateTime, nullable=True)
+    synced_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<CKANPackage(name={self.name}, ano={self.ano}, tema={self.tema})>"
+
+
+class CKANResource(Base):
+    """Resource (arquivo) de um package do CKAN do TSE"""
+
+    __tablename__ = "ckan_resource"
+    __table_args__ = (
+        Index("ix_ckan_resource_ano_tema_format", "ano", "tema", "format"),
+        Index("ix_ckan_resource_format", "format"),
+        Index("ix_ckan_resource_last_modified", "last_modified"),
+    )
+
+    id = Column(String(64), primary_key=True)
+    package_id = Column(String(64), ForeignKey("ckan_package.id", ondelete="CASCADE"), nullable=False, index=True)
+    package_name = Column(String(200), nullable=False)
+
+    name = Column(Text, nullable=True)
+    description = Column(Text, nullable=True)
+    format = Column(String(50), nullable=True)
+    mimetype = Column(String(100), nullable=True)
+    url = Column(Text, nullable=True)
+    size = Column(BigInteger, nullable=True)
+
+    ano = Column(Integer, nullable=True)
+    tema = Column(String(200), nullable=True)
+
+    created = Column(DateTime, nullable=True)
+    last_modified = Column(DateTime, nullable=True)
+    synced_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<CKANResource(name={self.name}, package={self.package_name}, format={self.format})>"
@@ -1,9 +1,8 @@
-import uuid
-
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Date, Time, text
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.core.database import Base
+from app.core.ids import uuid7
 
 
 class PerfilComparecimentoAbstencaoEleitorDeficiencia(Base):
@@ -11,10 +10,10 @@ class PerfilComparecimentoAbstencaoEleitorDeficiencia(Base):
 
     __tablename__ = "perfil_comparecimento_abstencao_eleitor_deficiencia"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("uuid_generate_v7()"))
 
-    dt_geracao = Column(String(10), nullable=True)
-    hh_geracao = Column(String(8), nullable=True)
+    dt_geracao = Column(Date, nullable=True)
+    hh_geracao = Column(Time, nullable=True)
     ano_eleicao = Column(Integer, nullable=True)
     nr_turno = Column(Integer, nullable=True)
     sq_eleitor = Column(Integer, nullable=True)
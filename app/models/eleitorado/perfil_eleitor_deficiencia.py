@@ -1,8 +1,7 @@
-import uuid
-
-from sqlalchemy import Column, Integer, Numeric, Text, DateTime, Boolean, String
+from sqlalchemy import Column, Integer, Numeric, Text, DateTime, Boolean, String, Date, Time, text
 from sqlalchemy.dialects.postgresql import UUID
 from app.core.database import Base
+from app.core.ids import uuid7
 
 
 class PerfilEleitorDeficiencia(Base):
@@ -10,10 +9,10 @@ class PerfilEleitorDeficiencia(Base):
 
     __tablename__ = "perfil_eleitor_deficiencia"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("uuid_generate_v7()"))
 
-    dt_geracao = Column(String(10), nullable=True)
-    hh_geracao = Column(String(8), nullable=True)
+    dt_geracao = Column(Date, nullable=True)
+    hh_geracao = Column(Time, nullable=True)
     aa_eleicao = Column(Integer, nullable=True)
     sq_eleitor = Column(Integer, nullable=True)
     sg_uf = Column(String(2), nullable=True)
@@ -1,7 +1,7 @@
 import uuid
 
-from sqlalchemy import Column, String, Integer, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 
 from app.core.database import Base
 
@@ -12,6 +12,7 @@ class ETLLog(Base):
     __tablename__ = "etl_log"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    parent_id = Column(UUID(as_uuid=True), ForeignKey("etl_log.id"), nullable=True, index=True)
 
     process_name = Column(String(100), nullable=False, index=True)
     status = Column(String(50), nullable=False)
@@ -19,18 +20,37 @@ class ETLLog(Base):
     end_time = Column(DateTime, nullable=True)
 
     records_processed = Column(Integer, nullable=True)
+    records_rejected = Column(Integer, nullable=True)
     error_message = Column(String(500), nullable=True)
 
+    # Progresso durante a carga (ver ETLLogRepository.heartbeat)
+    stage = Column(String(30), nullable=True)
+    bytes_read = Column(BigInteger, nullable=True)
+    bytes_total = Column(BigInteger, nullable=True)
+    stage_timings = Column(JSONB, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    # Último lote confirmado, para retomar a carga (ver Checkpoint)
+    checkpoint = Column(JSONB, nullable=True)
+
     def __repr__(self):
         return f"<ETLLog(process_name={self.process_name}, status={self.status}, start_time={self.start_time}, end_time={self.end_time})>"
 
     def to_dict(self):
         return {
             "id": str(self.id),
+            "parent_id": str(self.parent_id) if self.parent_id else None,
             "process_name": self.process_name,
             "status": self.status,
             "start_time": self.start_time.isoformat() if self.start_time else None,
             "end_time": self.end_time.isoformat() if self.end_time else None,
             "records_processed": self.records_processed,
+            "records_rejected": self.records_rejected,
             "error_message": self.error_message,
+            "stage": self.stage,
+            "bytes_read": self.bytes_read,
+            "bytes_total": self.bytes_total,
+            "stage_timings": self.stage_timings,
+            "heartbeat_at": self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            "checkpoint": self.checkpoint,
         }
@@ -0,0 +1,32 @@
+import uuid
+
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+
+
+class ETLManifest(Base):
+    """Manifesto de cargas: geração (dt/hh_geracao) e fingerprint do arquivo carregado por tabela, ano e UF."""
+
+    __tablename__ = "etl_manifest"
+    __table_args__ = (
+        UniqueConstraint("table_name", "ano", "uf", name="uq_etl_manifest_partition"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    table_name = Column(String(100), nullable=False)
+    ano = Column(Integer, nullable=False)
+    uf = Column(String(2), nullable=False)
+
+    dt_geracao = Column(String(10), nullable=True)
+    hh_geracao = Column(String(8), nullable=True)
+    fingerprint = Column(String(80), nullable=True)
+
+    records_loaded = Column(Integer, nullable=True)
+    log_id = Column(UUID(as_uuid=True), ForeignKey("etl_log.id"), nullable=True)
+    loaded_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<ETLManifest(table_name={self.table_name}, ano={self.ano}, uf={self.uf}, dt_geracao={self.dt_geracao}, hh_geracao={self.hh_geracao})>"
@@ -0,0 +1,36 @@
+import uuid
+
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+
+
+class ETLWatch(Base):
+    """Última versão vista do arquivo de origem de uma tabela e ano (metadados do CKAN e validadores HTTP)."""
+
+    __tablename__ = "etl_watch"
+    __table_args__ = (
+        UniqueConstraint("table_name", "ano", name="uq_etl_watch_source"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    table_name = Column(String(100), nullable=False)
+    ano = Column(Integer, nullable=False)
+
+    resource_id = Column(String(64), nullable=True)
+    url = Column(Text, nullable=True)
+    last_modified = Column(DateTime, nullable=True)
+    size = Column(BigInteger, nullable=True)
+
+    # Validadores da última resposta do servidor do arquivo (If-None-Match / If-Modified-Since)
+    etag = Column(String(200), nullable=True)
+    http_last_modified = Column(String(64), nullable=True)
+
+    checked_at = Column(DateTime, nullable=False)
+    changed_at = Column(DateTime, nullable=True)
+    log_id = Column(UUID(as_uuid=True), ForeignKey("etl_log.id"), nullable=True)
+
+    def __repr__(self):
+        return f"<ETLWatch(table_name={self.table_name}, ano={self.ano}, last_modified={self.last_modified})>"
@@ -1,8 +1,7 @@
-import uuid
-
-from sqlalchemy import Column, Integer, Numeric, Text, DateTime, Boolean, String
+from sqlalchemy import Column, Integer, Numeric, Text, DateTime, Boolean, String, Date, Time, text
 from sqlalchemy.dialects.postgresql import UUID
 from app.core.database import Base
+from app.core.ids import uuid7
 
 
 class DespesaAnual(Base):
@@ -10,10 +9,10 @@ class DespesaAnual(Base):
 
     __tablename__ = "despesa_anual"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("uuid_generate_v7()"))
 
-    dt_geracao = Column(String(10), nullable=True)
-    hh_geracao = Column(String(8), nullable=True)
+    dt_geracao = Column(Date, nullable=True)
+    hh_geracao = Column(Time, nullable=True)
     aa_exercicio = Column(Integer, nullable=True)
     tp_despesa = Column(String(6), nullable=True)
     cd_tp_esfera_partidaria = Column(Integer, nullable=True)
@@ -22,7 +21,7 @@ class DespesaAnual(Base):
     cd_municipio = Column(Integer, nullable=True)
     nm_municipio = Column(String(28), nullable=True)
     nr_zona = Column(Integer, nullable=True)
-    nr_cnpj_prestador_conta = Column(Integer, nullable=True)
+    nr_cnpj_prestador_conta = Column(String(14), nullable=True)
     sg_partido = Column(String(12), nullable=True)
     nm_partido = Column(String(46), nullable=True)
     cd_tp_documento = Column(String(6), nullable=True)
@@ -32,7 +31,7 @@ class DespesaAnual(Base):
     nr_aidf = Column(Integer, nullable=True)
     cd_tp_fornecedor = Column(String(6), nullable=True)
     ds_tp_fornecedor = Column(String(6), nullable=True)
-    nr_cpf_cnpj_fornecedor = Column(String(6), nullable=True)
+    nr_cpf_cnpj_fornecedor = Column(String(14), nullable=True)
     nm_fornecedor = Column(String(6), nullable=True)
     ds_gasto = Column(String(6), nullable=True)
     dt_pagamento = Column(Text, nullable=True)
@@ -1,8 +1,7 @@
-import uuid
-
-from sqlalchemy import Column, Integer, Numeric, Text, DateTime, Boolean, String
+from sqlalchemy import Column, Integer, Numeric, Text, DateTime, Boolean, String, Date, Time, text
 from sqlalchemy.dialects.postgresql import UUID
 from app.core.database import Base
+from app.core.ids import uuid7
 
 
 class DespesaAnualPartidariaNf(Base):
@@ -10,19 +9,19 @@ class DespesaAnualPartidariaNf(Base):
 
     __tablename__ = "despesa_anual_partidaria_nf"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("uuid_generate_v7()"))
 
-    dt_geracao = Column(String(10), nullable=True)
-    hh_geracao = Column(String(8), nullable=True)
+    dt_geracao = Column(Date, nullable=True)
+    hh_geracao = Column(Time, nullable=True)
     aa_exercicio = Column(Integer, nullable=True)
     tp_despesa = Column(String(1), nullable=True)
     sg_uf = Column(String(2), nullable=True)
     sq_despesa = Column(Text, nullable=True)
-    nr_cnpj_prestador_conta = Column(Integer, nullable=True)
+    nr_cnpj_prestador_conta = Column(String(14), nullable=True)
     sg_partido = Column(String(12), nullable=True)
     nr_documento = Column(String(20), nullable=True)
-    nr_cpf_cnpj_fornecedor = Column(Integer, nullable=True)
+    nr_cpf_cnpj_fornecedor = Column(String(14), nullable=True)
     ds_gasto = Column(String(169), nullable=True)
     dt_pagamento = Column(DateTime(timezone=True), nullable=True)
-    vr_documento = Column(Text, nullable=True)
+    vr_documento = Column(Numeric(15, 2), nullable=True)
     nm_url = Column(String(217), nullable=True)
\ No newline at end of file
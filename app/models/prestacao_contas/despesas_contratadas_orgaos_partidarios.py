@@ -1,9 +1,8 @@
-import uuid
-
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Date, Numeric, Time, text
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.core.database import Base
+from app.core.ids import uuid7
 
 
 class DespesasContratadasOrgaosPartidarios(Base):
@@ -11,15 +10,15 @@ class DespesasContratadasOrgaosPartidarios(Base):
 
     __tablename__ = "despesas_contratadas_orgaos_partidarios"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("uuid_generate_v7()"))
 
-    dt_geracao = Column(String(10), nullable=True)
-    hh_geracao = Column(String(8), nullable=True)
+    dt_geracao = Column(Date, nullable=True)
+    hh_geracao = Column(Time, nullable=True)
     aa_eleicao = Column(Integer, nullable=True)
     cd_tipo_eleicao = Column(Integer, nullable=True)
     nm_tipo_eleicao = Column(String(9), nullable=True)
     tp_prestacao_contas = Column(String(24), nullable=True)
-    dt_prestacao_contas = Column(String(10), nullable=True)
+    dt_prestacao_contas = Column(Date, nullable=True)
     sq_prestador_contas = Column(Integer, nullable=True)
     cd_esfera_partidaria = Column(String(1), nullable=True)
     ds_esfera_partidaria = Column(String(28), nullable=True)
@@ -28,7 +27,7 @@ class DespesasContratadasOrgaosPartidarios(Base):
     nm_ue = Column(String(30), nullable=True)
     cd_municipio = Column(Integer, nullable=True)
     nm_municipio = Column(String(30), nullable=True)
-    nr_cnpj_prestador_conta = Column(Integer, nullable=True)
+    nr_cnpj_prestador_conta = Column(String(14), nullable=True)
     nr_partido = Column(Integer, nullable=True)
     sg_partido = Column(String(13), nullable=True)
     nm_partido = Column(String(46), nullable=True)
@@ -36,7 +35,7 @@ class DespesasContratadasOrgaosPartidarios(Base):
     ds_tipo_fornecedor = Column(String(15), nullable=True)
     cd_cnae_fornecedor = Column(Integer, nullable=True)
     ds_cnae_fornecedor = Column(String(36), nullable=True)
-    nr_cpf_cnpj_fornecedor = Column(Integer, nullable=True)
+    nr_cpf_cnpj_fornecedor = Column(String(14), nullable=True)
     nm_fornecedor = Column(String(72), nullable=True)
     nm_fornecedor_rfb = Column(String(70), nullable=True)
     cd_esfera_part_fornecedor = Column(String(1), nullable=True)
@@ -56,6 +55,6 @@ class DespesasContratadasOrgaosPartidarios(Base):
     cd_origem_despesa = Column(Integer, nullable=True)
     ds_origem_despesa = Column(String(64), nullable=True)
     sq_despesa = Column(Integer, nullable=True)
-    dt_despesa = Column(String(10), nullable=True)
+    dt_despesa = Column(Date, nullable=True)
     ds_despesa = Column(String(61), nullable=True)
-    vr_despesa_contratada = Column(String(10), nullable=True)
+    vr_despesa_contratada = Column(Numeric(15, 2), nullable=True)
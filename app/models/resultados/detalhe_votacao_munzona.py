@@ -1,35 +1,40 @@
-import uuid
-
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Date, Time, text
 from sqlalchemy.dialects.postgresql import UUID
 
-from app.core.database import Base
+from app.core.database import Base, natural_key
+from app.core.ids import uuid7
 
 
 class DetalheVotacaoMunzona(Base):
     """Detalhe da apuração por município e zona"""
 
     __tablename__ = "detalhe_votacao_munzona"
+    # Chave natural, usada pelo upsert do modo merge
+    __table_args__ = (natural_key(
+            "detalhe_votacao_munzona",
+            "ano_eleicao", "sg_uf", "cd_eleicao", "nr_turno", "cd_municipio", "nr_zona", "cd_cargo",
+            "st_voto_em_transito"
+        ),)
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("uuid_generate_v7()"))
 
-    dt_geracao = Column(String(10), nullable=True)
-    hh_geracao = Column(String(8), nullable=True)
-    ano_eleicao = Column(Integer, nullable=True)
+    dt_geracao = Column(Date, nullable=True)
+    hh_geracao = Column(Time, nullable=True)
+    ano_eleicao = Column(Integer, nullable=False)
     cd_tipo_eleicao = Column(Integer, nullable=True)
     nm_tipo_eleicao = Column(String(22), nullable=True)
-    nr_turno = Column(Integer, nullable=True)
-    cd_eleicao = Column(Integer, nullable=True)
+    nr_turno = Column(Integer, nullable=False)
+    cd_eleicao = Column(Integer, nullable=False)
     ds_eleicao = Column(String(38), nullable=True)
-    dt_eleicao = Column(String(10), nullable=True)
+    dt_eleicao = Column(Date, nullable=True)
     tp_abrangencia = Column(String(1), nullable=True)
-    sg_uf = Column(String(2), nullable=True)
+    sg_uf = Column(String(2), nullable=False)
     sg_ue = Column(Integer, nullable=True)
     nm_ue = Column(String(32), nullable=True)
-    cd_municipio = Column(Integer, nullable=True)
+    cd_municipio = Column(Integer, nullable=False)
     nm_municipio = Column(String(32), nullable=True)
-    nr_zona = Column(Integer, nullable=True)
-    cd_cargo = Column(Integer, nullable=True)
+    nr_zona = Column(Integer, nullable=False)
+    cd_cargo = Column(Integer, nullable=False)
     ds_cargo = Column(String(8), nullable=True)
     qt_aptos = Column(Integer, nullable=True)
     qt_secoes_principais = Column(Integer, nullable=True)
@@ -39,7 +44,7 @@ class DetalheVotacaoMunzona(Base):
     qt_comparecimento = Column(Integer, nullable=True)
     qt_eleitores_secoes_nao_instaladas = Column(Integer, nullable=True)
     qt_abstencoes = Column(Integer, nullable=True)
-    st_voto_em_transito = Column(String(1), nullable=True)
+    st_voto_em_transito = Column(String(1), nullable=False)
     qt_votos = Column(Integer, nullable=True)
     qt_votos_concorrentes = Column(Integer, nullable=True)
     qt_total_votos_validos = Column(Integer, nullable=True)
@@ -58,5 +63,5 @@ class DetalheVotacaoMunzona(Base):
     qt_votos_nulos = Column(Integer, nullable=True)
     qt_votos_nulos_tecnicos = Column(Integer, nullable=True)
     qt_votos_anulados_apu_sep = Column(Integer, nullable=True)
-    hh_ultima_totalizacao = Column(String(8), nullable=True)
-    dt_ultima_totalizacao = Column(String(10), nullable=True)
+    hh_ultima_totalizacao = Column(Time, nullable=True)
+    dt_ultima_totalizacao = Column(Date, nullable=True)
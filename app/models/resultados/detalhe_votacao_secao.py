@@ -1,36 +1,45 @@
-import uuid
-
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, text, Date, DateTime, Time
 from sqlalchemy.dialects.postgresql import UUID
 
-from app.core.database import Base
+from app.core.database import Base, natural_key
+from app.core.ids import uuid7
 
 
 class DetalheVotacaoSecao(Base):
     """"Detalhe da apuração por seção eleitoral"""
 
     __tablename__ = "detalhe_votacao_secao"
+    # Particionada por ano e, dentro de cada ano, por UF; as partições são criadas
+    # na carga (ver app.services.etl.partitions). A PK e a chave natural incluem as
+    # chaves de partição; a chave natural é a usada pelo upsert do modo merge.
+    __table_args__ = (
+        natural_key(
+            "detalhe_votacao_secao",
+            "ano_eleicao", "sg_uf", "cd_eleicao", "nr_turno", "cd_municipio", "nr_zona", "nr_secao", "cd_cargo"
+        ),
+        {"postgresql_partition_by": "LIST (ano_eleicao)"},
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("uuid_generate_v7()"))
 
-    dt_geracao = Column(String(10), nullable=True)
-    hh_geracao = Column(String(8), nullable=True)
-    ano_eleicao = Column(Integer, nullable=True)
+    dt_geracao = Column(Date, nullable=True)
+    hh_geracao = Column(Time, nullable=True)
+    ano_eleicao = Column(Integer, primary_key=True)
     cd_tipo_eleicao = Column(Integer, nullable=True)
     nm_tipo_eleicao = Column(String(22), nullable=True)
-    nr_turno = Column(Integer, nullable=True)
-    cd_eleicao = Column(Integer, nullable=True)
+    nr_turno = Column(Integer, nullable=False)
+    cd_eleicao = Column(Integer, nullable=False)
     ds_eleicao = Column(String(38), nullable=True)
-    dt_eleicao = Column(String(10), nullable=True)
+    dt_eleicao = Column(Date, nullable=True)
     tp_abrangencia = Column(String(1), nullable=True)
-    sg_uf = Column(String(2), nullable=True)
+    sg_uf = Column(String(2), primary_key=True)
     sg_ue = Column(Integer, nullable=True)
     nm_ue = Column(String(25), nullable=True)
-    cd_municipio = Column(Integer, nullable=True)
+    cd_municipio = Column(Integer, nullable=False)
     nm_municipio = Column(String(25), nullable=True)
-    nr_zona = Column(Integer, nullable=True)
-    nr_secao = Column(Integer, nullable=True)
-    cd_cargo = Column(Integer, nullable=True)
+    nr_zona = Column(Integer, nullable=False)
+    nr_secao = Column(Integer, nullable=False)
+    cd_cargo = Column(Integer, nullable=False)
     ds_cargo = Column(String(8), nullable=True)
     qt_aptos = Column(Integer, nullable=True)
     qt_comparecimento = Column(Integer, nullable=True)
@@ -43,8 +52,8 @@ class DetalheVotacaoSecao(Base):
     nr_local_votacao = Column(Integer, nullable=True)
     nm_local_votacao = Column(String(70), nullable=True)
     ds_local_votacao_endereco = Column(String(70), nullable=True)
-    dt_recebimento_bu_hor_tse = Column(String(19), nullable=True)
-    dt_prim_tot_parcial_hor_tse = Column(String(19), nullable=True)
+    dt_recebimento_bu_hor_tse = Column(DateTime, nullable=True)
+    dt_prim_tot_parcial_hor_tse = Column(DateTime, nullable=True)
     ds_origem_voto = Column(String(15), nullable=True)
     st_secao_instalada = Column(String(3), nullable=True)
     st_secao_anulada = Column(String(3), nullable=True)
@@ -0,0 +1,98 @@
+from sqlalchemy import Column, Integer, String, BigInteger
+
+from app.core.database import Base
+
+
+# Totais pré-agregados de votacao_candidato_munzona e votacao_partido_munzona,
+# recalculados ao fim de cada carga (ver app.services.etl.rollups). A PK é o
+# grão do total e começa por ano e UF, que é como as cargas os recalculam.
+# Colunas qt_* são somas; as demais, atributos descritivos do grupo.
+
+
+class TotalVotacaoCandidatoUE(Base):
+    """Total de votos por candidato na unidade eleitoral (município ou UF da eleição)"""
+
+    __tablename__ = "total_votacao_candidato_ue"
+
+    ano_eleicao = Column(Integer, primary_key=True)
+    sg_uf = Column(String(2), primary_key=True)
+    cd_eleicao = Column(Integer, primary_key=True)
+    nr_turno = Column(Integer, primary_key=True)
+    sg_ue = Column(Integer, primary_key=True)
+    sq_candidato = Column(BigInteger, primary_key=True)
+
+    nm_ue = Column(String(32), nullable=True)
+    cd_cargo = Column(Integer, nullable=True)
+    ds_cargo = Column(String(8), nullable=True)
+    nr_candidato = Column(Integer, nullable=True)
+    nm_urna_candidato = Column(String(30), nullable=True)
+    sg_partido = Column(String(13), nullable=True)
+    ds_sit_tot_turno = Column(String(50), nullable=True)
+
+    qt_votos_nominais = Column(BigInteger, nullable=True)
+    qt_votos_nominais_validos = Column(BigInteger, nullable=True)
+
+
+class TotalVotacaoCandidatoUF(Base):
+    """Total de votos por candidato na UF"""
+
+    __tablename__ = "total_votacao_candidato_uf"
+
+    ano_eleicao = Column(Integer, primary_key=True)
+    sg_uf = Column(String(2), primary_key=True)
+    cd_eleicao = Column(Integer, primary_key=True)
+    nr_turno = Column(Integer, primary_key=True)
+    sq_candidato = Column(BigInteger, primary_key=True)
+
+    cd_cargo = Column(Integer, nullable=True)
+    ds_cargo = Column(String(8), nullable=True)
+    nr_candidato = Column(Integer, nullable=True)
+    nm_urna_candidato = Column(String(30), nullable=True)
+    sg_partido = Column(String(13), nullable=True)
+
+    qt_votos_nominais = Column(BigInteger, nullable=True)
+    qt_votos_nominais_validos = Column(BigInteger, nullable=True)
+
+
+class TotalVotacaoPartidoMunicipio(Base):
+    """Total de votos por partido e cargo no município"""
+
+    __tablename__ = "total_votacao_partido_municipio"
+
+    ano_eleicao = Column(Integer, primary_key=True)
+    sg_uf = Column(String(2), primary_key=True)
+    cd_eleicao = Column(Integer, primary_key=True)
+    nr_turno = Column(Integer, primary_key=True)
+    cd_municipio = Column(Integer, primary_key=True)
+    cd_cargo = Column(Integer, primary_key=True)
+    nr_partido = Column(Integer, primary_key=True)
+
+    nm_municipio = Column(String(32), nullable=True)
+    ds_cargo = Column(String(8), nullable=True)
+    sg_partido = Column(String(13), nullable=True)
+    nm_partido = Column(String(46), nullable=True)
+
+    qt_votos_nominais_validos = Column(BigInteger, nullable=True)
+    qt_votos_legenda_validos = Column(BigInteger, nullable=True)
+    qt_total_votos_leg_validos = Column(BigInteger, nullable=True)
+
+
+class TotalVotacaoPartidoUF(Base):
+    """Total de votos por partido e cargo na UF"""
+
+    __tablename__ = "total_votacao_partido_uf"
+
+    ano_eleicao = Column(Integer, primary_key=True)
+    sg_uf = Column(String(2), primary_key=True)
+    cd_eleicao = Column(Integer, primary_key=True)
+    nr_turno = Column(Integer, primary_key=True)
+    cd_cargo = Column(Integer, primary_key=True)
+    nr_partido = Column(Integer, primary_key=True)
+
+    ds_cargo = Column(String(8), nullable=True)
+    sg_partido = Column(String(13), nullable=True)
+    nm_partido = Column(String(46), nullable=True)
+
+    qt_votos_nominais_validos = Column(BigInteger, nullable=True)
+    qt_votos_legenda_validos = Column(BigInteger, nullable=True)
+    qt_total_votos_leg_validos = Column(BigInteger, nullable=True)
@@ -1,37 +1,51 @@
-import uuid
-
-from sqlalchemy import Column, Integer, String, BigInteger
+from sqlalchemy import Column, Integer, String, BigInteger, text, Date, Time
 from sqlalchemy.dialects.postgresql import UUID
 
-from app.core.database import Base
+from app.core.database import Base, natural_key
+from app.core.ids import uuid7
 
 
 class VotacaoCandidatoMunZona(Base):
     """Votação em candidato por município e zona"""
 
     __tablename__ = "votacao_candidato_munzona"
+    # Particionada por ano e, dentro de cada ano, por UF; as partições são criadas
+    # na carga (ver app.services.etl.partitions). A PK e a chave natural incluem as
+    # chaves de partição; a chave natural é a usada pelo upsert do modo merge.
+    __table_args__ = (
+        natural_key(
+            "votacao_candidato_munzona",
+            "ano_eleicao", "sg_uf", "nr_turno", "cd_municipio", "nr_zona", "sq_candidato", "st_voto_em_transito"
+        ),
+        {"postgresql_partition_by": "LIST (ano_eleicao)"},
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid7,
+        server_default=text("uuid_generate_v7()")
+    )
 
-    dt_geracao = Column(String(10), nullable=True)
-    hh_geracao = Column(String(8), nullable=True)
-    ano_eleicao = Column(Integer, nullable=True)
+    dt_geracao = Column(Date, nullable=True)
+    hh_geracao = Column(Time, nullable=True)
+    ano_eleicao = Column(Integer, primary_key=True)
     cd_tipo_eleicao = Column(Integer, nullable=True)
     nm_tipo_eleicao = Column(String(30), nullable=True)
-    nr_turno = Column(Integer, nullable=True)
+    nr_turno = Column(Integer, nullable=False)
     cd_eleicao = Column(Integer, nullable=True)
     ds_eleicao = Column(String(50), nullable=True)
-    dt_eleicao = Column(String(10), nullable=True)
+    dt_eleicao = Column(Date, nullable=True)
     tp_abrangencia = Column(String(1), nullable=True)
-    sg_uf = Column(String(2), nullable=True)
+    sg_uf = Column(String(2), primary_key=True)
     sg_ue = Column(Integer, nullable=True)
     nm_ue = Column(String(32), nullable=True)
-    cd_municipio = Column(Integer, nullable=True)
+    cd_municipio = Column(Integer, nullable=False)
     nm_municipio = Column(String(32), nullable=True)
-    nr_zona = Column(Integer, nullable=True)
+    nr_zona = Column(Integer, nullable=False)
     cd_cargo = Column(Integer, nullable=True)
     ds_cargo = Column(String(8), nullable=True)
-    sq_candidato = Column(BigInteger, nullable=True)
+    sq_candidato = Column(BigInteger, nullable=False)
     nr_candidato = Column(Integer, nullable=True)
     nm_candidato = Column(String(100), nullable=True)
     nm_urna_candidato = Column(String(30), nullable=True)
@@ -57,7 +71,7 @@ class VotacaoCandidatoMunZona(Base):
     sq_coligacao = Column(BigInteger, nullable=True)
     nm_coligacao = Column(String(100), nullable=True)
     ds_composicao_coligacao = Column(String(300), nullable=True)
-    st_voto_em_transito = Column(String(1), nullable=True)
+    st_voto_em_transito = Column(String(1), nullable=False)
     qt_votos_nominais = Column(Integer, nullable=True)
     nm_tipo_destinacao_votos = Column(String(18), nullable=True)
     qt_votos_nominais_validos = Column(Integer, nullable=True)
@@ -1,38 +1,53 @@
-import uuid
-
-from sqlalchemy import Column, Integer, String, BigInteger
+from sqlalchemy import Column, Integer, String, BigInteger, text, Date, Time
 from sqlalchemy.dialects.postgresql import UUID
 
-from app.core.database import Base
+from app.core.database import Base, natural_key
+from app.core.ids import uuid7
 
 
 class VotacaoPartidoMunZona(Base):
     """Votação em partido por município e zona"""
 
     __tablename__ = "votacao_partido_munzona"
+    # Particionada por ano e, dentro de cada ano, por UF; as partições são criadas
+    # na carga (ver app.services.etl.partitions). A PK e a chave natural incluem as
+    # chaves de partição; a chave natural é a usada pelo upsert do modo merge.
+    __table_args__ = (
+        natural_key(
+            "votacao_partido_munzona",
+            "ano_eleicao", "sg_uf", "cd_eleicao", "nr_turno", "cd_municipio", "nr_zona", "cd_cargo", "nr_partido",
+            "st_voto_em_transito"
+        ),
+        {"postgresql_partition_by": "LIST (ano_eleicao)"},
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid7,
+        server_default=text("uuid_generate_v7()")
+    )
 
-    dt_geracao = Column(String(10), nullable=True)
-    hh_geracao = Column(String(8), nullable=True)
-    ano_eleicao = Column(Integer, nullable=True)
+    dt_geracao = Column(Date, nullable=True)
+    hh_geracao = Column(Time, nullable=True)
+    ano_eleicao = Column(Integer, primary_key=True)
     cd_tipo_eleicao = Column(Integer, nullable=True)
     nm_tipo_eleicao = Column(String(22), nullable=True)
-    nr_turno = Column(Integer, nullable=True)
-    cd_eleicao = Column(Integer, nullable=True)
+    nr_turno = Column(Integer, nullable=False)
+    cd_eleicao = Column(Integer, nullable=False)
     ds_eleicao = Column(String(38), nullable=True)
-    dt_eleicao = Column(String(10), nullable=True)
+    dt_eleicao = Column(Date, nullable=True)
     tp_abrangencia = Column(String(1), nullable=True)
-    sg_uf = Column(String(2), nullable=True)
+    sg_uf = Column(String(2), primary_key=True)
     sg_ue = Column(Integer, nullable=True)
     nm_ue = Column(String(32), nullable=True)
-    cd_municipio = Column(Integer, nullable=True)
+    cd_municipio = Column(Integer, nullable=False)
     nm_municipio = Column(String(32), nullable=True)
-    nr_zona = Column(Integer, nullable=True)
-    cd_cargo = Column(Integer, nullable=True)
+    nr_zona = Column(Integer, nullable=False)
+    cd_cargo = Column(Integer, nullable=False)
     ds_cargo = Column(String(8), nullable=True)
     tp_agremiacao = Column(String(15), nullable=True)
-    nr_partido = Column(Integer, nullable=True)
+    nr_partido = Column(Integer, nullable=False)
     sg_partido = Column(String(13), nullable=True)
     nm_partido = Column(String(46), nullable=True)
     nr_federacao = Column(Integer, nullable=True)
@@ -42,7 +57,7 @@ class VotacaoPartidoMunZona(Base):
     sq_coligacao = Column(BigInteger, nullable=True)
     nm_coligacao = Column(String(84), nullable=True)
     ds_composicao_coligacao = Column(String(300), nullable=True)
-    st_voto_em_transito = Column(String(1), nullable=True)
+    st_voto_em_transito = Column(String(1), nullable=False)
     qt_votos_legenda_validos = Column(Integer, nullable=True)
     qt_votos_nom_convr_leg_validos = Column(Integer, nullable=True)
     qt_total_votos_leg_validos = Column(Integer, nullable=True)
@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from loguru import logger
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.ckan_catalog import CKANPackage, CKANResource
+
+# Linhas por INSERT: mantém o número de parâmetros bem abaixo do limite do Postgres (32767)
+UPSERT_CHUNK = 1000
+
+
+class CKANCatalogRepository:
+    """Repository para o espelho do catálogo do CKAN (packages e resources)."""
+
+    def __init__(self, session: AsyncSession):
+        """
+        Inicializa o repository.
+
+        Args:
+            session: Sessão assíncrona do SQLAlchemy
+        """
+        self.session = session
+
+    async def _upsert(self, model: type, rows: List[Dict[str, Any]]) -> None:
+        for start in range(0, len(rows), UPSERT_CHUNK):
+            stmt = insert(model).values(rows[start:start + UPSERT_CHUNK])
+            columns = {name: stmt.excluded[name] for name in rows[0] if name != "id"}
+            await self.session.execute(stmt.on_conflict_do_update(index_elements=["id"], set_=columns))
+
+    async def upsert(self, packages: List[Dict[str, Any]], resources: List[Dict[str, Any]]) -> None:
+        """
+        Grava (ou atualiza) uma página de packages e seus resources em uma transação.
+
+        Args:
+            packages: Linhas de ckan_package
+            resources: Linhas de ckan_resource dos packages da página
+        """
+        if packages:
+            await self._upsert(CKANPackage, packages)
+        if resources:
+            await self._upsert(CKANResource, resources)
+        await self.session.commit()
+
+    async def prune(self, synced_at: datetime) -> Tuple[int, int]:
+        """
+        Remove packages e resources que não vieram na sincronização iniciada em synced_at
+        (retirados do portal).
+
+        Returns:
+            (packages removidos, resources removidos)
+        """
+        resources = await self.session.execute(delete(CKANResource).where(CKANResource.synced_at < synced_at))
+        packages = await self.session.execute(delete(CKANPackage).where(CKANPackage.synced_at < synced_at))
+        await self.session.commit()
+        if packages.rowcount or resources.rowcount:
+            logger.info(f"🧹 Catálogo: {packages.rowcount} packages e {resources.rowcount} resources removidos")
+        return packages.rowcount, resources.rowcount
+
+    async def summary(self) -> Dict[str, Any]:
+        """Quantidade de packages e resources espelhados e a última sincronização."""
+        packages, synced_at = (
+            await self.session.execute(select(func.count(), func.max(CKANPackage.synced_at)))
+        ).one()
+        resources = await self.session.scalar(select(func.count()).select_from(CKANResource))
+        return {"packages": packages, "resources": resources, "synced_at": synced_at}
+
+    async def themes(self) -> List[Dict[str, Any]]:
+        """Temas do catálogo, com a quantidade de packages e os anos publicados."""
+        rows = await self.session.execute(
+            select(CKANPackage.tema, func.count(), func.array_agg(func.distinct(CKANPackage.ano)))
+            .group_by(CKANPackage.tema)
+            .order_by(CKANPackage.tema)
+        )
+        return [
+            {"tema": tema, "packages": packages, "anos": sorted(ano for ano in anos if ano is not None)}
+            for tema, packages, anos in rows
+        ]
@@ -1,9 +1,9 @@
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.etl_log import ETLLog
@@ -21,13 +21,15 @@ class ETLLogRepository:
         """
         self.session = session
 
-    async def create_log(self, process_name: str) -> ETLLog:
+    async def create_log(self, process_name: str, parent_id: Optional[uuid.UUID] = None) -> ETLLog:
         """
         Cria novo log de ETL com status pending.
         process_name: Nome do processo (ex: "etl_candidato_2024_SP")
+        parent_id: ID do log da execução pai, quando a carga faz parte de um fan-out por UF
         """
         log = ETLLog(
             process_name=process_name,
+            parent_id=parent_id,
             status='pending',
             start_time=datetime.utcnow()
         )
@@ -50,42 +52,140 @@ class ETLLogRepository:
         )
         return res.scalar_one_or_none()
 
+    async def _update(self, log_id: uuid.UUID, **values) -> Optional[str]:
+        """
+        Atualiza o log com um único UPDATE ... RETURNING, sem carregar o objeto antes.
+
+        Returns:
+            Status do log após a atualização, ou None se o log não existir
+        """
+        result = await self.session.execute(
+            update(ETLLog).where(ETLLog.id == log_id).values(**values).returning(ETLLog.status)
+        )
+        status = result.scalar_one_or_none()
+        await self.session.commit()
+        return status
+
     async def mark_pending(self, log_id: uuid.UUID) -> None:
         """
         Marca o log como pendente.
         """
-        log = await self.get(log_id)
-        if log:
-            log.status = "pending"
-            await self.session.commit()
+        await self._update(log_id, status="pending")
 
     async def mark_processing(self, log_id: uuid.UUID) -> None:
         """
-        Marca o log como em processamento.
+        Marca o log como em processamento (limpando o fim/erro de uma tentativa anterior).
         """
-        log = await self.get(log_id)
-        if log:
-            log.status = "processing"
-            await self.session.commit()
+        await self._update(
+            log_id, status="processing", heartbeat_at=datetime.utcnow(), end_time=None, error_message=None
+        )
 
     async def mark_done(self, log_id: uuid.UUID, records_processed: int) -> None:
         """
         Marca o log como concluído.
         """
-        log = await self.get(log_id)
-        if log:
-            log.status = "done"
-            log.end_time = datetime.utcnow()
-            log.records_processed = records_processed
-            await self.session.commit()
+        await self._update(
+            log_id, status="done", end_time=datetime.utcnow(), records_processed=records_processed
+        )
+
+    async def mark_skipped(self, log_id: uuid.UUID) -> None:
+        """
+        Marca o log como ignorado (arquivo sem mudanças desde a última carga).
+        """
+        await self._update(log_id, status="skipped", end_time=datetime.utcnow(), records_processed=0)
 
-    async def mark_error(self, log_id: uuid.UUID, error_message: str) -> None:
+    async def mark_error(
+            self,
+            log_id: uuid.UUID,
+            error_message: str,
+            records_processed: Optional[int] = None
+    ) -> None:
         """
         Marca o log como erro.
         """
-        log = await self.get(log_id)
-        if log:
-            log.status = "error"
-            log.end_time = datetime.utcnow()
-            log.error_message = error_message
-            await self.session.commit()
+        values = {"status": "error", "end_time": datetime.utcnow(), "error_message": error_message[:500]}
+        if records_processed is not None:
+            values["records_processed"] = records_processed
+        await self._update(log_id, **values)
+
+    async def save_checkpoint(self, log_id: uuid.UUID, checkpoint: Dict) -> None:
+        """
+        Grava o ponto de retomada da carga (ver Checkpoint.state).
+        """
+        await self._update(log_id, checkpoint=checkpoint)
+
+    async def heartbeat(
+            self,
+            log_id: uuid.UUID,
+            records_processed: int,
+            bytes_read: Optional[int] = None,
+            stage: Optional[str] = None,
+            bytes_total: Optional[int] = None,
+            stage_timings: Optional[Dict[str, float]] = None,
+            records_rejected: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Grava o progresso de uma carga em andamento.
+
+        Roda em uma conexão em autocommit: um único UPDATE ... RETURNING, sem
+        BEGIN/COMMIT nem SELECT, barato o bastante para ser chamado a cada
+        segundo (ver ProgressTracker, que agrupa as chamadas por intervalo).
+
+        Args:
+            log_id: ID do log
+            records_processed: Total de registros gravados até agora
+            bytes_read: Total de bytes do CSV lidos até agora
+            stage: Etapa atual (ex: download, load, index, swap)
+            bytes_total: Tamanho total esperado do CSV, quando conhecido (para o ETA)
+            stage_timings: Segundos gastos por etapa
+            records_rejected: Total de linhas desviadas para a quarentena
+
+        Returns:
+            Status atual do log, ou None se o log não existir
+        """
+        values = {"records_processed": records_processed, "heartbeat_at": datetime.utcnow()}
+        if bytes_read is not None:
+            values["bytes_read"] = bytes_read
+        if stage is not None:
+            values["stage"] = stage
+        if bytes_total is not None:
+            values["bytes_total"] = bytes_total
+        if stage_timings is not None:
+            values["stage_timings"] = stage_timings
+        if records_rejected is not None:
+            values["records_rejected"] = records_rejected
+
+        statement = (
+            update(ETLLog.__table__)
+            .where(ETLLog.__table__.c.id == log_id)
+            .values(**values)
+            .returning(ETLLog.__table__.c.status)
+        )
+        async with self.session.bind.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            result = await conn.execute(statement)
+            return result.scalar_one_or_none()
+
+    async def has_open(self, process_name: str) -> bool:
+        """
+        Indica se há uma execução do processo ainda na fila ou em andamento.
+        Args:
+            process_name: Nome do processo (ex: "etl_candidato_2024_SP")
+        """
+        res = await self.session.execute(
+            select(ETLLog.id)
+            .where(ETLLog.process_name == process_name, ETLLog.status.in_(("pending", "processing")))
+            .limit(1)
+        )
+        return res.scalar_one_or_none() is not None
+
+    async def list_children(self, parent_id: uuid.UUID) -> List[ETLLog]:
+        """
+        Lista os logs filhos (por UF) de uma execução.
+        Args:
+            parent_id: ID do log pai
+        """
+        res = await self.session.execute(
+            select(ETLLog).where(ETLLog.parent_id == parent_id).order_by(ETLLog.process_name)
+        )
+        return list(res.scalars().all())
@@ -0,0 +1,76 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.etl_manifest import ETLManifest
+
+
+class ETLManifestRepository:
+    """Repository para o manifesto de cargas (última geração carregada por tabela, ano e UF)."""
+
+    def __init__(self, session: AsyncSession):
+        """
+        Inicializa o repository.
+
+        Args:
+            session: Sessão assíncrona do SQLAlchemy
+        """
+        self.session = session
+
+    async def get(self, table_name: str, ano: int, uf: str) -> Optional[ETLManifest]:
+        """
+        Recupera a entrada do manifesto de uma partição.
+        Args:
+            table_name: Tabela de destino
+            ano: Ano da eleição
+            uf: UF (ou "BR" para arquivos nacionais)
+        """
+        res = await self.session.execute(
+            select(ETLManifest).where(
+                ETLManifest.table_name == table_name,
+                ETLManifest.ano == ano,
+                ETLManifest.uf == uf,
+            )
+        )
+        return res.scalar_one_or_none()
+
+    async def list_all(self) -> List[ETLManifest]:
+        """Lista todas as partições já carregadas."""
+        res = await self.session.execute(
+            select(ETLManifest).order_by(ETLManifest.table_name, ETLManifest.ano, ETLManifest.uf)
+        )
+        return list(res.scalars().all())
+
+    async def upsert(
+            self,
+            table_name: str,
+            ano: int,
+            uf: str,
+            dt_geracao: Optional[str],
+            hh_geracao: Optional[str],
+            fingerprint: Optional[str],
+            records_loaded: int,
+            log_id: Optional[uuid.UUID] = None
+    ) -> None:
+        """
+        Registra a geração carregada de uma partição, substituindo a anterior.
+        """
+        values = dict(
+            dt_geracao=dt_geracao,
+            hh_geracao=hh_geracao,
+            fingerprint=fingerprint,
+            records_loaded=records_loaded,
+            log_id=log_id,
+            loaded_at=datetime.utcnow(),
+        )
+        stmt = insert(ETLManifest).values(id=uuid.uuid4(), table_name=table_name, ano=ano, uf=uf, **values)
+        stmt = stmt.on_conflict_do_update(constraint="uq_etl_manifest_partition", set_=values)
+
+        await self.session.execute(stmt)
+        await self.session.commit()
+        logger.debug(f"🗂️ Manifesto atualizado: {table_name} {ano} {uf} ({dt_geracao} {hh_geracao})")
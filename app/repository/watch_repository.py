@@ -0,0 +1,53 @@
+import uuid
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.etl_watch import ETLWatch
+
+
+class ETLWatchRepository:
+    """Repository para o estado do watcher de arquivos do TSE (última versão vista por tabela e ano)."""
+
+    def __init__(self, session: AsyncSession):
+        """
+        Inicializa o repository.
+
+        Args:
+            session: Sessão assíncrona do SQLAlchemy
+        """
+        self.session = session
+
+    async def get(self, table_name: str, ano: int) -> Optional[ETLWatch]:
+        """
+        Recupera o estado de um arquivo de origem.
+        Args:
+            table_name: Tabela de destino
+            ano: Ano da carga
+        """
+        res = await self.session.execute(
+            select(ETLWatch).where(ETLWatch.table_name == table_name, ETLWatch.ano == ano)
+        )
+        return res.scalar_one_or_none()
+
+    async def list_all(self) -> List[ETLWatch]:
+        """Lista o estado de todos os arquivos acompanhados."""
+        res = await self.session.execute(select(ETLWatch).order_by(ETLWatch.table_name, ETLWatch.ano))
+        return list(res.scalars().all())
+
+    async def upsert(self, table_name: str, ano: int, **values) -> None:
+        """
+        Grava o estado de um arquivo de origem, substituindo o anterior.
+
+        Args:
+            table_name: Tabela de destino
+            ano: Ano da carga
+            values: Colunas de ETLWatch (resource_id, last_modified, etag, checked_at...)
+        """
+        stmt = insert(ETLWatch).values(id=uuid.uuid4(), table_name=table_name, ano=ano, **values)
+        stmt = stmt.on_conflict_do_update(constraint="uq_etl_watch_source", set_=values)
+
+        await self.session.execute(stmt)
+        await self.session.commit()
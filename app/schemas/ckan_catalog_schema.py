@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class CKANPackageResponse(BaseModel):
+    """Package do espelho do catálogo do CKAN."""
+    id: str
+    name: str
+    title: str | None
+    ano: int | None
+    tema: str | None
+    num_resources: int | None
+    metadata_modified: datetime | None
+    synced_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CKANResourceResponse(BaseModel):
+    """Resource (arquivo) do espelho do catálogo do CKAN."""
+    id: str
+    package_id: str
+    package_name: str
+    name: str | None
+    format: str | None
+    mimetype: str | None
+    url: str | None
+    size: int | None
+    ano: int | None
+    tema: str | None
+    last_modified: datetime | None
+    synced_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CKANBulkURLsRequest(BaseModel):
+    """Packages cujas URLs de download serão resolvidas em lote."""
+    package_ids: List[str] = Field(default_factory=list, description="IDs ou nomes dos packages")
+    ano: Optional[int] = Field(None, description="Inclui os packages do ano (ex: 2024)")
+    pattern: Optional[str] = Field(
+        None,
+        description="Inclui os packages cujo nome casa com o padrão (glob, ex: 'resultados-*', 'prestacao-de-contas-*')"
+    )
+
+    @model_validator(mode="after")
+    def validate_selection(self) -> "CKANBulkURLsRequest":
+        """Exige ao menos uma forma de escolher os packages."""
+        if not self.package_ids and self.ano is None and not self.pattern:
+            raise ValueError("Informe package_ids, ano ou pattern")
+        return self
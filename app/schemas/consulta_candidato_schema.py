@@ -1,8 +1,8 @@
-from datetime import datetime, date
+from datetime import date, time
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, field_validator, FieldValidationInfo, ConfigDict
+from pydantic import BaseModel, ConfigDict
 
 
 class ConsultaCandidatoResponse(BaseModel):
@@ -10,7 +10,7 @@ class ConsultaCandidatoResponse(BaseModel):
     id: UUID
 
     dt_geracao: Optional[date] = None
-    hh_geracao: Optional[str] = None
+    hh_geracao: Optional[time] = None
     ano_eleicao: Optional[int] = None
     cd_tipo_eleicao: Optional[int] = None
     nm_tipo_eleicao: Optional[str] = None
@@ -45,7 +45,7 @@ class ConsultaCandidatoResponse(BaseModel):
     nm_coligacao: Optional[str] = None
     ds_composicao_coligacao: Optional[str] = None
     sg_uf_nascimento: Optional[str] = None
-    dt_nascimento: Optional[str] = None
+    dt_nascimento: Optional[date] = None
     nr_titulo_eleitoral_candidato: Optional[int] = None
     cd_genero: Optional[int] = None
     ds_genero: Optional[str] = None
@@ -61,10 +61,3 @@ class ConsultaCandidatoResponse(BaseModel):
     ds_sit_tot_turno: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
-
-    @field_validator("dt_eleicao", "dt_geracao", mode="before")
-    @classmethod
-    def parse_br_date(cls, v: str, info: FieldValidationInfo) -> date:
-        if isinstance(v, date):
-            return v
-        return datetime.strptime(v, "%d/%m/%Y").date()
@@ -3,7 +3,7 @@ from enum import Enum
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, model_validator, ConfigDict
 
 
 class UFEnum(str, Enum):
@@ -38,9 +38,45 @@ class UFEnum(str, Enum):
 
 
 class TipoETLEnum(str, Enum):
-    """Tipos de ETL disponíveis."""
+    """Tipos de ETL disponíveis (um por dataset do registry em app.services.etl.datasets)."""
+    # Resultados
     CANDIDATO = "candidato"
     PARTIDO = "partido"
+    DETALHE_SECAO = "detalhe_secao"
+    DETALHE_MUNZONA = "detalhe_munzona"
+    # Candidatos
+    CONSULTA_CANDIDATO = "consulta_cand"
+    CANDIDATO_COMPLEMENTAR = "consulta_cand_complementar"
+    BEM_CANDIDATO = "bem_candidato"
+    COLIGACAO = "consulta_coligacao"
+    VAGAS = "consulta_vagas"
+    MOTIVO_CASSACAO = "motivo_cassacao"
+    REDE_SOCIAL = "rede_social_candidato"
+    # Comparecimento e abstenção
+    COMPARECIMENTO = "perfil_comparecimento_abstencao"
+    COMPARECIMENTO_DEFICIENCIA = "perfil_comparecimento_abstencao_deficiencia"
+    COMPARECIMENTO_TTE = "perfil_comparecimento_abstencao_tte"
+    # Eleitorado
+    PERFIL_ELEITORADO = "perfil_eleitorado"
+    PERFIL_ELEITOR_DEFICIENCIA = "perfil_eleitor_deficiencia"
+    LOCAL_VOTACAO = "eleitorado_local_votacao"
+    TRANSFERENCIA_TEMPORARIA = "transferencia_temporaria"
+    TRANSFERENCIA_TEMPORARIA_SECAO = "transferencia_temporaria_secao"
+    # Prestação de contas
+    DESPESAS_CONTRATADAS_CANDIDATOS = "despesas_contratadas_candidatos"
+    DESPESAS_PAGAS_CANDIDATOS = "despesas_pagas_candidatos"
+    DESPESAS_CONTRATADAS_ORGAOS = "despesas_contratadas_orgaos_partidarios"
+    DESPESA_ANUAL = "despesa_anual"
+    DESPESA_ANUAL_NF = "despesa_anual_partidaria_nf"
+    EXTRATO_BANCARIO = "extrato_bancario_partido"
+
+
+# Prestação de contas anual dos partidos: o ano é o exercício, não o da eleição
+ANNUAL_TIPOS = frozenset({
+    TipoETLEnum.DESPESA_ANUAL,
+    TipoETLEnum.DESPESA_ANUAL_NF,
+    TipoETLEnum.EXTRATO_BANCARIO,
+})
 
 
 class ETLRequest(BaseModel):
@@ -49,13 +85,27 @@ class ETLRequest(BaseModel):
     uf: Optional[UFEnum] = Field(None, description="UF brasileira (ex: SP, RJ)")
     tipo: TipoETLEnum = Field(
         TipoETLEnum.CANDIDATO,
-        description="Tipo de ETL: candidato ou partido"
+        description="Dataset a carregar (ver TipoETLEnum)"
+    )
+    force: bool = Field(
+        False,
+        description="Recarrega mesmo que a geração do arquivo (dt/hh_geracao) não tenha mudado"
+    )
+    defer_indexes: bool = Field(
+        False,
+        description=(
+            "Nos modos delete e merge, remove os índices secundários durante a recarga e os reconstrói "
+            "ao final, seguido de ANALYZE (primeiras cargas de uma partição sempre fazem isso)"
+        )
     )
 
-    @field_validator('ano')
-    @classmethod
-    def validate_election_year(cls, v: int) -> int:
-        """Valida se é ano de eleição (par)."""
+    @model_validator(mode="after")
+    def validate_election_year(self) -> "ETLRequest":
+        """Valida se é ano de eleição (par); datasets anuais aceitam qualquer ano."""
+        if self.tipo in ANNUAL_TIPOS:
+            return self
+
+        v = self.ano
         if v % 2 != 0:
             raise ValueError(
                 f"Ano {v} é inválido. Eleições ocorrem apenas em anos pares."
@@ -72,7 +122,7 @@ class ETLRequest(BaseModel):
                 f"Anos válidos: {sorted(VALID_ELECTION_YEARS)}"
             )
 
-        return v
+        return self
 
 
 class ETLResponse(BaseModel):
@@ -93,10 +143,30 @@ class ETLLogResponse(BaseModel):
     fim: Optional[str] = None
     duracao: Optional[str] = None
     registros_processados: int = 0
+    registros_rejeitados: int = 0
+    bytes_lidos: int = 0
+    etapa: Optional[str] = None
     erro: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
+    @classmethod
+    def from_log(cls, log) -> "ETLLogResponse":
+        """Monta a resposta a partir de um ETLLog."""
+        return cls(
+            id=log.id,
+            process_name=log.process_name,
+            status=log.status,
+            inicio=cls.format_datetime(log.start_time),
+            fim=cls.format_datetime(log.end_time),
+            duracao=cls.calculate_duration(log.start_time, log.end_time),
+            registros_processados=log.records_processed or 0,
+            registros_rejeitados=log.records_rejected or 0,
+            bytes_lidos=log.bytes_read or 0,
+            etapa=log.stage,
+            erro=log.error_message,
+        )
+
     @staticmethod
     def format_datetime(dt: Optional[datetime]) -> Optional[str]:
         """Formata datetime para padrão brasileiro."""
@@ -122,3 +192,20 @@ class ETLLogResponse(BaseModel):
             return f"{minutes}min {seconds}s"
         else:
             return f"{seconds}s"
+
+
+class ETLWatchResponse(BaseModel):
+    """Estado de um arquivo acompanhado pelo watcher."""
+    table_name: str
+    ano: int
+    resource_id: Optional[str] = None
+    url: Optional[str] = None
+    last_modified: Optional[datetime] = None
+    size: Optional[int] = None
+    etag: Optional[str] = None
+    http_last_modified: Optional[str] = None
+    checked_at: datetime
+    changed_at: Optional[datetime] = None
+    log_id: Optional[UUID] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,3 +1,4 @@
+from datetime import date, time
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
@@ -6,8 +7,8 @@ from pydantic import BaseModel, ConfigDict
 class PerfilComparecimentoAbstencaoResponse(BaseModel):
     id: UUID
 
-    dt_geracao: str | None = None
-    hh_geracao: str | None = None
+    dt_geracao: date | None = None
+    hh_geracao: time | None = None
     ano_eleicao: int | None = None
     nr_turno: int | None = None
     sg_uf: str | None = None
@@ -0,0 +1,54 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class TotalVotacaoCandidatoUFResponse(BaseModel):
+    """Total de votos de um candidato na UF."""
+    ano_eleicao: int
+    sg_uf: str
+    cd_eleicao: int
+    nr_turno: int
+    sq_candidato: int
+
+    cd_cargo: int | None
+    ds_cargo: str | None
+    nr_candidato: int | None
+    nm_urna_candidato: str | None
+    sg_partido: str | None
+
+    qt_votos_nominais: int | None
+    qt_votos_nominais_validos: int | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TotalVotacaoCandidatoUEResponse(TotalVotacaoCandidatoUFResponse):
+    """Total de votos de um candidato na unidade eleitoral."""
+    sg_ue: int
+    nm_ue: str | None
+    ds_sit_tot_turno: str | None
+
+
+class TotalVotacaoPartidoUFResponse(BaseModel):
+    """Total de votos de um partido em um cargo na UF."""
+    ano_eleicao: int
+    sg_uf: str
+    cd_eleicao: int
+    nr_turno: int
+    cd_cargo: int
+    nr_partido: int
+
+    ds_cargo: str | None
+    sg_partido: str | None
+    nm_partido: str | None
+
+    qt_votos_nominais_validos: int | None
+    qt_votos_legenda_validos: int | None
+    qt_total_votos_leg_validos: int | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TotalVotacaoPartidoMunicipioResponse(TotalVotacaoPartidoUFResponse):
+    """Total de votos de um partido em um cargo no município."""
+    cd_municipio: int
+    nm_municipio: str | None
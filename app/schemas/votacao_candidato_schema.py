@@ -1,7 +1,7 @@
-from datetime import datetime, date
+from datetime import date, time
 from uuid import UUID
 
-from pydantic import BaseModel, field_validator, FieldValidationInfo, ConfigDict
+from pydantic import BaseModel, ConfigDict
 
 
 class VotacaoCandidatoMunZonaResponse(BaseModel):
@@ -9,7 +9,7 @@ class VotacaoCandidatoMunZonaResponse(BaseModel):
     id: UUID
 
     dt_geracao: date | None
-    hh_geracao: str | None
+    hh_geracao: time | None
     cd_tipo_eleicao: int | None
     nm_tipo_eleicao: str | None
     nr_turno: int | None
@@ -59,10 +59,3 @@ class VotacaoCandidatoMunZonaResponse(BaseModel):
     ds_sit_tot_turno: str | None
 
     model_config = ConfigDict(from_attributes=True)
-
-    @field_validator("dt_eleicao", "dt_geracao", mode="before")
-    @classmethod
-    def parse_br_date(cls, v: str, info: FieldValidationInfo) -> date:
-        if isinstance(v, date):
-            return v
-        return datetime.strptime(v, "%d/%m/%Y").date()
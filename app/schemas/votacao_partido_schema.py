@@ -1,7 +1,7 @@
-from datetime import datetime, date
+from datetime import date, time
 from uuid import UUID
 
-from pydantic import BaseModel, field_validator, FieldValidationInfo, ConfigDict
+from pydantic import BaseModel, ConfigDict
 
 
 class VotacaoPartidoMunZonaResponse(BaseModel):
@@ -9,7 +9,7 @@ class VotacaoPartidoMunZonaResponse(BaseModel):
     id: UUID
 
     dt_geracao: date | None
-    hh_geracao: str | None
+    hh_geracao: time | None
     ano_eleicao: int | None
     cd_tipo_eleicao: int | None
     nm_tipo_eleicao: str | None
@@ -48,13 +48,3 @@ class VotacaoPartidoMunZonaResponse(BaseModel):
     qt_votos_nominais_anulados: int | None
 
     model_config = ConfigDict(from_attributes=True)
-
-    @field_validator("dt_geracao", "dt_eleicao", mode="before")
-    @classmethod
-    def parse_br_date(cls, v: str | None, info: FieldValidationInfo) -> date | None:
-        if v is None:
-            return None
-        if isinstance(v, date):
-            return v
-        # CSV vem como "DD/MM/AAAA"
-        return datetime.strptime(v, "%d/%m/%Y").date()
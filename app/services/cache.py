@@ -0,0 +1,182 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+from loguru import logger
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    stored_at: float
+    ttl: float
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+
+@dataclass
+class CacheStats:
+    """Contadores do cache (ver TTLCache.stats)."""
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    stale_if_error: int = 0
+    evictions: int = 0
+
+
+@dataclass
+class TTLCache:
+    """
+    Cache em memória com TTL por entrada, limite de entradas (LRU) e
+    stale-while-revalidate.
+
+    - fresca (idade < ttl): devolvida direto
+    - vencida há menos de stale_seconds: devolvida na hora e recarregada em
+      segundo plano (uma recarga por chave)
+    - vencida há mais tempo ou ausente: recarregada antes de responder; se a
+      recarga falhar e houver uma entrada antiga, ela é devolvida
+      (stale-if-error), o que mantém as respostas durante quedas breves da origem
+
+    Pensado para um único event loop (ex: o do uvicorn): não é thread-safe.
+    """
+    max_entries: int
+    stale_seconds: float
+    name: str = "cache"
+    stats: CacheStats = field(default_factory=CacheStats)
+    _entries: "OrderedDict[Hashable, CacheEntry]" = field(default_factory=OrderedDict)
+    _refreshing: Set[Hashable] = field(default_factory=set)
+    _tasks: Set[asyncio.Task] = field(default_factory=set)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        self._entries[key] = CacheEntry(value, time.monotonic(), ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Remove uma chave (ou todas)."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_load(self, key: Hashable, ttl: float, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Valor da chave, carregado por loader() quando necessário.
+
+        Args:
+            key: Chave do cache
+            ttl: Segundos em que o valor é considerado fresco
+            loader: Função assíncrona que busca o valor na origem
+
+        Raises:
+            Exception: O erro de loader(), se não houver entrada antiga para devolver
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if entry.age < entry.ttl:
+                self.stats.hits += 1
+                return entry.value
+            if entry.age < entry.ttl + self.stale_seconds:
+                self.stats.stale_hits += 1
+                self._revalidate(key, ttl, loader)
+                return entry.value
+
+        self.stats.misses += 1
+        try:
+            value = await loader()
+        except Exception as e:
+            if entry is None:
+                raise
+            self.stats.stale_if_error += 1
+            logger.warning(
+                f"⚠️ {self.name}: origem indisponível para {key} ({e}); servindo cópia de {entry.age:.0f}s"
+            )
+            return entry.value
+        self.set(key, value, ttl)
+        return value
+
+    def _revalidate(self, key: Hashable, ttl: float, loader: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(key, ttl, loader))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: Hashable, ttl: float, loader: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            self.set(key, await loader(), ttl)
+            self.stats.refreshes += 1
+        except Exception as e:
+            self.stats.refresh_errors += 1
+            logger.warning(f"⚠️ {self.name}: falha ao revalidar {key}: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Contadores, taxa de acerto e ocupação, para monitoramento."""
+        lookups = self.stats.hits + self.stats.stale_hits + self.stats.misses
+        return {
+            **asdict(self.stats),
+            "hit_ratio": round((self.stats.hits + self.stats.stale_hits) / lookups, 4) if lookups else None,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "refreshing": len(self._refreshing),
+        }
+
+
+@dataclass
+class SingleFlight:
+    """
+    Agrupa chamadas idênticas simultâneas: enquanto a busca de uma chave está
+    em andamento, as demais chamadas com a mesma chave aguardam o mesmo
+    resultado (ou o mesmo erro) em vez de repetir a busca na origem.
+
+    A busca roda em uma task própria: o cancelamento de quem a iniciou não
+    cancela a espera dos outros. Como o TTLCache, vale para um único event loop.
+    """
+    name: str = "single-flight"
+    calls: int = 0
+    shared: int = 0
+    _inflight: Dict[Hashable, asyncio.Task] = field(default_factory=dict)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Resultado de fn() para a chave, compartilhado com as chamadas simultâneas.
+
+        Raises:
+            Exception: O erro de fn(), para todas as chamadas que a aguardavam
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self.shared += 1
+            logger.debug(f"🔗 {self.name}: aguardando busca em andamento de {key}")
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Marca o erro como consumido mesmo se todos os chamadores foram cancelados
+        if not task.cancelled():
+            task.exception()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Buscas feitas, chamadas atendidas por uma busca em andamento e buscas abertas."""
+        return {"calls": self.calls, "shared": self.shared, "inflight": len(self._inflight)}
@@ -0,0 +1,230 @@
+import asyncio
+import fnmatch
+import re
+import uuid
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.celery_app import celery_app, dispatch
+from app.core.config import settings
+from app.models.ckan_catalog import CKANPackage
+from app.repository.catalog_repository import CKANCatalogRepository
+from app.repository.log_repository import ETLLogRepository
+from app.services.ckan_client import CKANTSEClient
+
+PROCESS_NAME = "ckan_catalog_sync"
+
+# Ano no nome do package: "resultados-2024", "prestacao-de-contas-partidarias-2023"...
+YEAR = re.compile(r"(?:^|-)((?:19|20)\d{2})(?=-|$)")
+
+
+def year_of(name: str) -> Optional[int]:
+    """Primeiro ano no nome do package (ex: "candidatos-2024" -> 2024)."""
+    match = YEAR.search(name or "")
+    return int(match.group(1)) if match else None
+
+
+def theme_of(name: str) -> str:
+    """Nome do package sem o ano (ex: "prestacao-de-contas-eleitorais-candidatos-2024" -> "...-candidatos")."""
+    return "-".join(part for part in YEAR.sub("-", name or "").split("-") if part)
+
+
+def ckan_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Data ISO do CKAN como datetime UTC sem fuso (o padrão das colunas DateTime do projeto)."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def ckan_size(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def catalog_rows(package: Dict, synced_at: datetime) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Converte um package do package_search nas linhas de ckan_package e ckan_resource.
+
+    Returns:
+        (linha do package, linhas dos resources)
+    """
+    name = package["name"]
+    ano, tema = year_of(name), theme_of(name)
+    resources = [
+        {
+            "id": resource["id"],
+            "package_id": package["id"],
+            "package_name": name,
+            "name": resource.get("name"),
+            "description": resource.get("description"),
+            "format": (resource.get("format") or "").upper() or None,
+            "mimetype": resource.get("mimetype"),
+            "url": resource.get("url"),
+            "size": ckan_size(resource.get("size")),
+            "ano": ano,
+            "tema": tema,
+            "created": ckan_timestamp(resource.get("created")),
+            "last_modified": ckan_timestamp(resource.get("last_modified")),
+            "synced_at": synced_at,
+        }
+        for resource in package.get("resources") or []
+    ]
+    row = {
+        "id": package["id"],
+        "name": name,
+        "title": package.get("title"),
+        "notes": package.get("notes"),
+        "ano": ano,
+        "tema": tema,
+        "num_resources": len(resources),
+        "metadata_created": ckan_timestamp(package.get("metadata_created")),
+        "metadata_modified": ckan_timestamp(package.get("metadata_modified")),
+        "synced_at": synced_at,
+    }
+    return row, resources
+
+
+async def match_packages(
+        session: AsyncSession,
+        client: CKANTSEClient,
+        ano: Optional[int] = None,
+        pattern: Optional[str] = None
+) -> List[str]:
+    """
+    Nomes dos packages do ano e/ou com nome no padrão (glob), lidos do espelho
+    do catálogo. Sem nenhum package no espelho (ainda não sincronizado), usa
+    o package_list do CKAN (em cache no cliente).
+
+    Args:
+        session: Sessão do banco
+        client: Cliente do CKAN
+        ano: Ano do package (ver year_of)
+        pattern: Padrão do nome (ex: "resultados-*")
+
+    Returns:
+        Nomes dos packages, em ordem alfabética
+    """
+    query = select(CKANPackage.name).distinct().order_by(CKANPackage.name)
+    if ano is not None:
+        query = query.where(CKANPackage.ano == ano)
+    names = list((await session.scalars(query)).all())
+    if not names and not await session.scalar(select(CKANPackage.id).limit(1)):
+        names = sorted(name for name in await client.list_all_packages() if ano is None or year_of(name) == ano)
+    if pattern:
+        names = [name for name in names if fnmatch.fnmatchcase(name, pattern)]
+    return names
+
+
+async def sync_catalog(client: CKANTSEClient, session_maker: async_sessionmaker) -> Dict[str, Any]:
+    """
+    Sincroniza o espelho do catálogo com o CKAN: percorre o package_search em
+    páginas de settings.CKAN_CATALOG_PAGE_SIZE (packages já com os resources),
+    grava cada página com upsert e, se todas as páginas vieram, remove o que
+    saiu do portal. A execução é registrada no ETLLog ("ckan_catalog_sync").
+
+    Args:
+        client: Cliente do CKAN
+        session_maker: Fábrica de sessões do banco
+
+    Returns:
+        {"log_id", "packages", "resources", "removed_packages", "removed_resources"}
+    """
+    synced_at = datetime.utcnow()
+    async with session_maker() as session:
+        logs = ETLLogRepository(session)
+        log = await logs.create_log(PROCESS_NAME)
+        await logs.mark_processing(log.id)
+
+    packages = resources = 0
+    removed = (0, 0)
+    try:
+        start, total = 0, None
+        while total is None or start < total:
+            page = await client.search_packages(rows=settings.CKAN_CATALOG_PAGE_SIZE, start=start)
+            total, results = page["count"], page["results"]
+            if not results:
+                break
+
+            package_rows, resource_rows = [], []
+            for package in results:
+                row, rows = catalog_rows(package, synced_at)
+                package_rows.append(row)
+                resource_rows.extend(rows)
+            async with session_maker() as session:
+                await CKANCatalogRepository(session).upsert(package_rows, resource_rows)
+
+            packages += len(package_rows)
+            resources += len(resource_rows)
+            start += len(results)
+            logger.debug(f"📚 Catálogo: {start}/{total} packages sincronizados")
+
+        # Um package publicado durante a paginação desloca as páginas seguintes: sem
+        # a listagem completa, o que não foi visto não é necessariamente removido do portal
+        if packages >= (total or 0):
+            async with session_maker() as session:
+                removed = await CKANCatalogRepository(session).prune(synced_at)
+        else:
+            logger.warning(
+                f"⚠️ Catálogo: {packages} de {total} packages lidos; remoção fica para a próxima sincronização"
+            )
+    except Exception as e:
+        logger.error(f"❌ Erro ao sincronizar o catálogo do CKAN: {e}")
+        async with session_maker() as session:
+            await ETLLogRepository(session).mark_error(log.id, str(e)[:500], resources)
+        raise
+
+    async with session_maker() as session:
+        await ETLLogRepository(session).mark_done(log.id, resources)
+    logger.info(f"✅ Catálogo do CKAN sincronizado: {packages} packages, {resources} resources")
+    return {
+        "log_id": str(log.id),
+        "packages": packages,
+        "resources": resources,
+        "removed_packages": removed[0],
+        "removed_resources": removed[1],
+    }
+
+
+async def _sync_job() -> Dict[str, Any]:
+    # Engine sem pool e cliente próprios: a thread do worker roda seu próprio event loop
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with CKANTSEClient() as client:
+            session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            return await sync_catalog(client, session_maker)
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="catalog.sync")
+def sync_catalog_job() -> Dict[str, Any]:
+    """Job periódico (celery beat, a cada settings.CKAN_CATALOG_SYNC_INTERVAL) de sincronização do catálogo."""
+    return asyncio.run(_sync_job())
+
+
+async def enqueue_catalog_sync() -> str:
+    """
+    Envia uma sincronização do catálogo para a fila, fora do agendamento.
+
+    Returns:
+        ID da task
+    """
+    task_id = str(uuid.uuid4())
+    send = partial(sync_catalog_job.apply_async, task_id=task_id)
+    await dispatch(send, f"sincronização do catálogo {task_id}")
+    logger.info(f"📨 Sincronização do catálogo enfileirada: {task_id}")
+    return task_id
@@ -1,15 +1,127 @@
-from typing import List, Dict
+import asyncio
+import importlib.util
+from typing import Any, List, Dict, Optional
 
-from ckanapi import RemoteCKAN
+import httpx
 from loguru import logger
 
+from app.core.config import settings
+from app.services.cache import SingleFlight, TTLCache
+
+# HTTP/2 só quando o pacote h2 estiver instalado (httpx[http2]); senão, HTTP/1.1 com keep-alive
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class CKANError(Exception):
+    """Erro retornado pela Action API do CKAN (ex: package ou resource inexistente)."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
 
 class CKANTSEClient:
-    """Cliente para API do CKAN do TSE usando ckanapi."""
+    """
+    Cliente assíncrono para a Action API do CKAN do TSE.
+
+    As chamadas usam um httpx.AsyncClient com pool de conexões (keep-alive,
+    HTTP/2 quando disponível e timeouts de settings.CKAN_*) e não bloqueiam o
+    event loop. O pool é criado no primeiro uso, no loop em que a chamada
+    roda; quem cria o cliente deve fechá-lo com close() (ou usar async with).
 
-    def __init__(self):
-        self.ckan = RemoteCKAN('https://dadosabertos.tse.jus.br/')
+    As actions de catálogo (package_list, package_show, resource_show) passam
+    por um TTLCache com TTL por action (settings.CKAN_CACHE_TTLS), limite de
+    entradas e stale-while-revalidate: consultas repetidas não vão ao portal
+    e quedas breves dele não derrubam as respostas. Chamadas idênticas
+    simultâneas (ex: um dashboard abrindo vários painéis do mesmo package)
+    compartilham uma única requisição ao portal (SingleFlight).
+    """
+
+    def __init__(self, base_url: Optional[str] = None, http: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            base_url: URL do portal CKAN (padrão: settings.CKAN_URL)
+            http: Cliente httpx já configurado (útil para apontar para um servidor local em testes)
+        """
+        self.base_url = (base_url or settings.CKAN_URL).rstrip("/")
         self.organization = 'tribunal-superior-eleitoral'
+        self._http = http
+        self.cache = TTLCache(
+            max_entries=settings.CKAN_CACHE_MAX_ENTRIES,
+            stale_seconds=settings.CKAN_CACHE_STALE_SECONDS,
+            name="CKAN",
+        )
+        self.flight = SingleFlight(name="CKAN")
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                base_url=f"{self.base_url}/api/3/action/",
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(settings.CKAN_TIMEOUT, connect=settings.CKAN_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=settings.CKAN_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.CKAN_MAX_CONNECTIONS,
+                    keepalive_expiry=settings.CKAN_KEEPALIVE_EXPIRY,
+                ),
+                headers={"User-Agent": f"{settings.APP_NAME}/{settings.APP_VERSION}"},
+                follow_redirects=True,
+            )
+        return self._http
+
+    async def close(self) -> None:
+        """Fecha o pool de conexões."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def __aenter__(self) -> "CKANTSEClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _action(self, action: str, **params) -> Any:
+        """
+        Chama uma action da API do CKAN, pelo cache quando a action tem TTL
+        em settings.CKAN_CACHE_TTLS. Chamadas iguais simultâneas que chegam
+        à origem viram uma só requisição.
+
+        Raises:
+            CKANError: Ver _request
+            httpx.HTTPError: Ver _request
+        """
+        key = (action, tuple(sorted(params.items())))
+
+        def load():
+            return self.flight.do(key, lambda: self._request(action, params))
+
+        ttl = settings.CKAN_CACHE_TTLS.get(action)
+        if not ttl:
+            return await load()
+        return await self.cache.get_or_load(key, ttl, load)
+
+    async def _request(self, action: str, params: Dict[str, Any]) -> Any:
+        """
+        Chama uma action da API do CKAN (GET /api/3/action/<action>).
+
+        Raises:
+            CKANError: Se o CKAN responder com success=false ou status de erro
+            httpx.HTTPError: Em falhas de rede ou timeout
+        """
+        response = await self.http.get(action, params=params)
+        try:
+            body = response.json()
+        except ValueError:
+            response.raise_for_status()
+            raise CKANError(f"{action}: resposta inválida do CKAN", response.status_code)
+
+        if not body.get("success"):
+            error = body.get("error") or {}
+            message = error.get("message") or error.get("__type") or f"HTTP {response.status_code}"
+            raise CKANError(f"{action}: {message}", response.status_code)
+        return body["result"]
 
     async def list_all_packages(self) -> List[str]:
         """
@@ -18,12 +130,30 @@ class CKANTSEClient:
             Lista de IDs dos packages
         """
         try:
-            packages = self.ckan.action.package_list()
+            packages = await self._action("package_list")
             return packages
         except Exception as e:
             logger.error(f"Erro ao listar pacotes: {e}")
             raise
 
+    async def search_packages(self, rows: int = 1000, start: int = 0) -> Dict:
+        """
+        Página de packages com todos os metadados e resources (package_search),
+        em ordem de nome. Uma chamada substitui até `rows` chamadas a package_show.
+
+        Args:
+            rows: Packages por página
+            start: Posição do primeiro package da página
+
+        Returns:
+            {"count": total de packages, "results": packages da página}
+        """
+        try:
+            return await self._action("package_search", rows=rows, start=start, sort="name asc")
+        except Exception as e:
+            logger.error(f"Erro ao buscar pacotes (start={start}): {e}")
+            raise
+
     async def get_package_details(self, package_id: str) -> Dict:
         """
         Busca detalhes completos de um package.
@@ -40,7 +170,7 @@ class CKANTSEClient:
 
             package_id = package_id.strip()
             logger.debug(f"Executando package_show para: '{package_id}'")
-            package = self.ckan.action.package_show(id=package_id)
+            package = await self._action("package_show", id=package_id)
             return package
 
         except ValueError as ve:
@@ -78,7 +208,7 @@ class CKANTSEClient:
             Dicionário com metadados do resource
         """
         try:
-            resource = self.ckan.action.resource_show(id=resource_id)
+            resource = await self._action("resource_show", id=resource_id)
             logger.debug(f"✅ Resource '{resource_id}' carregado")
             return resource
         except Exception as e:
@@ -104,7 +234,9 @@ class CKANTSEClient:
                     'state': resource.get('state', ''),
                     'url': resource.get('url', ''),
                     'format': resource.get('format', 'unknown').upper(),
+                    'size': resource.get('size'),
                     'created': resource.get('created', ''),
+                    'last_modified': resource.get('last_modified', ''),
                     'description': resource.get('description', ''),
                     'resource_id': resource.get('id', ''),
                     'package_id': resource.get('package_id', ''),
@@ -115,3 +247,34 @@ class CKANTSEClient:
         except Exception as e:
             logger.error(f"❌ Erro ao extrair URLs: {e}", exc_info=True)
             raise
+
+    async def get_many_download_urls(self, package_ids: List[str], concurrency: Optional[int] = None) -> List[Dict]:
+        """
+        URLs de download de vários packages, buscadas em paralelo com no máximo
+        `concurrency` chamadas simultâneas ao CKAN. A falha de um package não
+        interrompe os demais: cada item traz as URLs ou o próprio erro.
+
+        Args:
+            package_ids: IDs ou nomes dos packages (repetidos são resolvidos uma vez)
+            concurrency: Limite de chamadas simultâneas (padrão: settings.CKAN_BULK_CONCURRENCY)
+
+        Returns:
+            Um item por package, na ordem recebida:
+            {"package_id", "success", "total_files", "urls"} ou {"package_id", "success", "status_code", "error"}
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.CKAN_BULK_CONCURRENCY)
+
+        async def resolve(package_id: str) -> Dict:
+            async with semaphore:
+                try:
+                    urls = await self.get_package_download_urls(package_id)
+                except Exception as e:
+                    return {
+                        "package_id": package_id,
+                        "success": False,
+                        "status_code": getattr(e, "status_code", None),
+                        "error": str(e),
+                    }
+            return {"package_id": package_id, "success": True, "total_files": len(urls), "urls": urls}
+
+        return list(await asyncio.gather(*(resolve(package_id) for package_id in dict.fromkeys(package_ids))))
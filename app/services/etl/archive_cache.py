@@ -0,0 +1,349 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import IO, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+from loguru import logger
+
+from app.core.config import settings
+
+HASH_LENGTHS = {32: "md5", 40: "sha1", 64: "sha256"}
+
+
+class ChecksumError(Exception):
+    """O arquivo baixado não confere com o tamanho ou o hash publicados."""
+
+
+def cache_key(resource: Dict) -> str:
+    """Chave do índice: id do resource + last_modified + tamanho publicados no CKAN."""
+    stamp = resource.get("last_modified") or resource.get("created") or ""
+    raw = f"{resource['id']}|{stamp}|{resource.get('size') or ''}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def expected_hash(resource: Dict) -> Optional[Tuple[str, str]]:
+    """Extrai (algoritmo, hex) do campo hash do resource, se houver (ex: "md5:abc..." ou só o hex)."""
+    value = (resource.get("hash") or "").strip().lower()
+    if not value:
+        return None
+    algorithm, _, digest = value.rpartition(":")
+    algorithm = algorithm or HASH_LENGTHS.get(len(digest))
+    if algorithm not in hashlib.algorithms_available:
+        return None
+    return algorithm, digest
+
+
+class ArchiveCache:
+    """
+    Cache local dos arquivos baixados do TSE, endereçado por conteúdo.
+
+    - objects/<sha256><ext>: o arquivo em si (conteúdos iguais são gravados uma vez)
+    - refs/<chave>.json: aponta o resource (id + last_modified + tamanho) para o objeto
+    - partial/: downloads em andamento, retomados com Range após uma interrupção
+
+    Um acerto no índice não faz nenhuma requisição de rede. O mtime do objeto é
+    atualizado a cada acesso e usado na remoção dos menos usados quando o cache
+    passa de max_bytes (ver evict). Uma carga usa o objeto dentro de use(), que
+    o mantém sob flock compartilhado: o evict nunca remove um objeto em uso.
+    """
+
+    def __init__(
+            self,
+            root: Optional[str] = None,
+            max_bytes: Optional[int] = None,
+            client: Optional[httpx.Client] = None
+    ):
+        """
+        Args:
+            root: Diretório do cache (padrão: settings.ETL_CACHE_DIR)
+            max_bytes: Tamanho máximo do cache (padrão: settings.ETL_CACHE_MAX_BYTES)
+            client: Cliente httpx (útil para apontar para um servidor local em testes)
+        """
+        self.root = Path(root or settings.ETL_CACHE_DIR)
+        self.max_bytes = max_bytes or settings.ETL_CACHE_MAX_BYTES
+        self.client = client
+
+        self.objects_dir = self.root / "objects"
+        self.refs_dir = self.root / "refs"
+        self.partial_dir = self.root / "partial"
+        for directory in (self.objects_dir, self.refs_dir, self.partial_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    async def get(self, resource: Dict) -> Path:
+        """Versão assíncrona de fetch(); o download roda em uma thread."""
+        return await asyncio.to_thread(self.fetch, resource)
+
+    @asynccontextmanager
+    async def use(self, resource: Dict) -> AsyncIterator[Path]:
+        """
+        Arquivo do resource (baixado se necessário) protegido da remoção até o
+        fim do bloco: o objeto fica sob flock compartilhado, que o evict() de
+        qualquer processo respeita. Quem abre o arquivo durante o bloco (ex: os
+        workers do fan-out) não precisa de lock próprio.
+        """
+        path, handle = await asyncio.to_thread(self._acquire, resource)
+        try:
+            yield path
+        finally:
+            handle.close()
+
+    def lookup(self, resource: Dict) -> Optional[Path]:
+        """
+        Procura o resource no cache, sem acessar a rede.
+
+        Returns:
+            Caminho do arquivo ou None se não estiver em cache
+        """
+        ref_path = self.refs_dir / f"{cache_key(resource)}.json"
+        if not ref_path.exists():
+            return None
+
+        ref = json.loads(ref_path.read_text())
+        path = self.objects_dir / ref["object"]
+        if not path.exists() or path.stat().st_size != ref["size"]:
+            ref_path.unlink(missing_ok=True)
+            return None
+
+        os.utime(path)
+        return path
+
+    def fetch(self, resource: Dict) -> Path:
+        """
+        Retorna o arquivo do resource, baixando-o se não estiver em cache. O
+        arquivo não fica protegido do evict(); para usá-lo numa carga, ver use().
+
+        Args:
+            resource: Resource do CKAN (id, url, last_modified, size, hash)
+
+        Raises:
+            ChecksumError: Se o conteúdo baixado não conferir com o publicado
+        """
+        path, handle = self._acquire(resource)
+        handle.close()
+        return path
+
+    def _acquire(self, resource: Dict) -> Tuple[Path, IO[bytes]]:
+        """Busca ou baixa o objeto e o prende (ver _pin) antes de rodar o evict()."""
+        key = cache_key(resource)
+        with self._lock(key):
+            cached = self.lookup(resource)
+            pinned = self._pin(cached) if cached else None
+            if pinned:
+                logger.info(f"📦 Cache hit: {resource['url']}")
+                path = cached
+            else:
+                with self._client() as client:
+                    parts = self._download(client, resource["url"], key)
+                path = self._store(resource, key, parts)
+                pinned = self._pin(path)
+
+        self.evict()
+        return path, pinned
+
+    @staticmethod
+    def _pin(path: Path) -> Optional[IO[bytes]]:
+        """
+        Abre o objeto com flock compartilhado (liberado ao fechar o arquivo).
+        None se outro processo o removeu antes do lock.
+        """
+        try:
+            handle = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        fcntl.flock(handle, fcntl.LOCK_SH)
+        try:
+            if os.stat(path).st_ino == os.fstat(handle.fileno()).st_ino:
+                return handle
+        except FileNotFoundError:
+            pass
+        handle.close()
+        return None
+
+    @contextmanager
+    def _lock(self, key: str):
+        """Impede que dois processos baixem o mesmo resource ao mesmo tempo."""
+        with open(self.partial_dir / f"{key}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _client(self):
+        if self.client is not None:
+            yield self.client
+            return
+        with httpx.Client(timeout=settings.ETL_DOWNLOAD_TIMEOUT, follow_redirects=True) as client:
+            yield client
+
+    def _probe(self, client: httpx.Client, url: str) -> Tuple[Optional[int], bool]:
+        """Tamanho remoto e suporte a Range, via HEAD."""
+        try:
+            response = client.head(url)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return None, False
+        length = response.headers.get("content-length")
+        ranges = response.headers.get("accept-ranges", "").lower() == "bytes"
+        return (int(length) if length and length.isdigit() else None), ranges
+
+    def _download(self, client: httpx.Client, url: str, key: str) -> List[Path]:
+        """Baixa o arquivo em uma ou mais partes, retomando partes incompletas."""
+        size, ranges = self._probe(client, url)
+
+        if size and ranges and size >= settings.ETL_CACHE_PARALLEL_THRESHOLD:
+            count = settings.ETL_CACHE_PARALLEL_PARTS
+            step = -(-size // count)
+            spans = [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+            parts = [self.partial_dir / f"{key}.part{index}" for index in range(len(spans))]
+            logger.info(f"⬇️ {url}: {size} bytes em {len(spans)} partes paralelas")
+
+            with ThreadPoolExecutor(max_workers=len(spans)) as pool:
+                list(pool.map(
+                    lambda item: self._download_part(client, url, item[0], *item[1]),
+                    zip(parts, spans)
+                ))
+            return parts
+
+        part = self.partial_dir / f"{key}.part"
+        logger.info(f"⬇️ {url}: download sequencial")
+        self._download_part(client, url, part, 0, None)
+        return [part]
+
+    def _download_part(self, client: httpx.Client, url: str, path: Path, start: int, end: Optional[int]) -> None:
+        """
+        Baixa o intervalo [start, end] (end=None: até o fim) em path, continuando
+        a partir do que já estiver gravado.
+        """
+        done = path.stat().st_size if path.exists() else 0
+        if end is not None and done >= end - start + 1:
+            return
+
+        offset = start + done
+        headers = {"Range": f"bytes={offset}-{'' if end is None else end}"} if offset or end is not None else {}
+        with client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 416 and end is None:
+                # Parte já completa em uma execução anterior
+                return
+            response.raise_for_status()
+
+            mode = "ab"
+            if headers and response.status_code != 206:
+                if start:
+                    raise httpx.HTTPError(f"{url}: servidor ignorou o Range de uma parte paralela")
+                # Servidor sem suporte a Range: recomeça do zero
+                mode = "wb"
+            elif done:
+                logger.info(f"↪️ Retomando {path.name} a partir do byte {offset}")
+
+            with open(path, mode) as fh:
+                for chunk in response.iter_bytes(settings.ETL_DOWNLOAD_CHUNK_SIZE):
+                    fh.write(chunk)
+
+    def _store(self, resource: Dict, key: str, parts: List[Path]) -> Path:
+        """Junta as partes, confere tamanho e hash e grava o objeto e a referência."""
+        sha256 = hashlib.sha256()
+        published = expected_hash(resource)
+        checker = hashlib.new(published[0]) if published else None
+        assembling = self.partial_dir / f"{key}.assembling"
+
+        size = 0
+        with open(assembling, "wb") as out:
+            for part in parts:
+                with open(part, "rb") as fh:
+                    while block := fh.read(settings.ETL_DOWNLOAD_CHUNK_SIZE):
+                        sha256.update(block)
+                        if checker:
+                            checker.update(block)
+                        out.write(block)
+                        size += len(block)
+
+        published_size = resource.get("size")
+        failure = None
+        if published_size and int(published_size) != size:
+            failure = f"tamanho {size} difere do publicado ({published_size})"
+        elif checker and checker.hexdigest() != published[1]:
+            failure = f"{published[0]} difere do publicado"
+
+        for part in parts:
+            part.unlink(missing_ok=True)
+        if failure:
+            assembling.unlink(missing_ok=True)
+            raise ChecksumError(f"{resource['url']}: {failure}")
+
+        suffix = Path(resource["url"].split("?", 1)[0]).suffix.lower()
+        object_name = f"{sha256.hexdigest()}{suffix}"
+        path = self.objects_dir / object_name
+        if path.exists():
+            assembling.unlink()
+        else:
+            os.replace(assembling, path)
+
+        ref = {
+            "object": object_name,
+            "size": size,
+            "sha256": sha256.hexdigest(),
+            "resource_id": resource["id"],
+            "url": resource["url"],
+            "last_modified": resource.get("last_modified"),
+        }
+        ref_tmp = self.refs_dir / f"{key}.json.tmp"
+        ref_tmp.write_text(json.dumps(ref))
+        os.replace(ref_tmp, self.refs_dir / f"{key}.json")
+
+        logger.info(f"✅ {resource['url']} armazenado no cache ({size} bytes, sha256 {sha256.hexdigest()[:12]})")
+        return path
+
+    def evict(self) -> int:
+        """
+        Remove os objetos acessados há mais tempo até o cache caber em max_bytes.
+
+        Objetos em uso (sob o flock compartilhado de use(), em qualquer processo)
+        são pulados: o evict só remove um objeto se conseguir o flock exclusivo
+        sem esperar. Um objeto removido por outro processo durante a varredura
+        conta como já removido.
+
+        Returns:
+            Bytes liberados
+        """
+        objects = []
+        for entry in self.objects_dir.iterdir():
+            try:
+                info = entry.stat()
+            except FileNotFoundError:
+                continue
+            if stat.S_ISREG(info.st_mode):
+                objects.append((info.st_mtime, info.st_size, entry))
+        objects.sort(key=lambda item: item[0])
+        total = sum(size for _, size, _ in objects)
+        freed = 0
+
+        for _, size, entry in objects:
+            if total <= self.max_bytes:
+                break
+            try:
+                handle = open(entry, "rb")
+            except FileNotFoundError:
+                total -= size
+                continue
+            with handle:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                entry.unlink(missing_ok=True)
+            freed += size
+            total -= size
+            logger.info(f"🧹 Cache: {entry.name} removido ({size} bytes)")
+
+        if total > self.max_bytes:
+            logger.warning(f"⚠️ Cache acima do limite ({total} bytes): os objetos restantes estão em uso")
+        return freed
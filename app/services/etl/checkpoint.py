@@ -0,0 +1,112 @@
+import json
+import uuid
+from dataclasses import asdict, dataclass, fields
+from typing import List, Optional
+
+import asyncpg
+from loguru import logger
+
+from app.services.etl.incremental import SourceStamp
+
+# Cargas que não têm o que retomar
+FINISHED_STATUSES = ("done", "skipped")
+
+
+@dataclass
+class Checkpoint:
+    """
+    Ponto de retomada de uma carga, gravado em etl_log.checkpoint.
+
+    Traz o necessário para refazer a chamada (request, modo, origem) e, nas
+    cargas de um único arquivo, o último lote confirmado: linha do CSV, bytes
+    lidos, registros gravados e rejeitados. Cada lote é gravado em uma
+    transação própria junto com o checkpoint (ver CopyLoader.load_lines), de
+    modo que o checkpoint nunca aponta para linhas não gravadas nem deixa de
+    apontar para linhas gravadas: a retomada pula exatamente o que já entrou.
+
+    indexes guarda os índices secundários removidos para a carga (ver
+    DeferredIndexes), que a retomada reconstrói mesmo que o processo tenha
+    morrido antes de recriá-los.
+    """
+    log_id: uuid.UUID
+    request: dict
+    mode: str
+    download: bool
+    csv_path: Optional[str] = None
+    member_name: Optional[str] = None
+    source: Optional[dict] = None
+    line: int = 0
+    bytes_read: int = 0
+    rows: int = 0
+    rejected: int = 0
+    indexes: Optional[List[List[str]]] = None
+
+    @classmethod
+    def from_log(cls, log) -> Optional["Checkpoint"]:
+        """Checkpoint gravado em um ETLLog, ou None se ele não tiver um."""
+        if not log.checkpoint:
+            return None
+        names = {f.name for f in fields(cls)}
+        return cls(log_id=log.id, **{k: v for k, v in log.checkpoint.items() if k in names})
+
+    @classmethod
+    def for_resume(cls, log) -> "Checkpoint":
+        """
+        Checkpoint de uma carga que pode ser retomada.
+
+        Raises:
+            LookupError: Se o log não existir
+            ValueError: Se a carga já tiver terminado ou não tiver checkpoint
+        """
+        if log is None:
+            raise LookupError("Carga não encontrada")
+        if log.status in FINISHED_STATUSES:
+            raise ValueError(f"Carga {log.id} já terminou ({log.status})")
+        checkpoint = cls.from_log(log)
+        if checkpoint is None:
+            raise ValueError(f"Carga {log.id} não tem checkpoint para retomar")
+        return checkpoint
+
+    def state(self) -> dict:
+        """Conteúdo gravado na coluna (sem o log_id, que é a própria linha)."""
+        data = asdict(self)
+        data.pop("log_id")
+        return data
+
+    @property
+    def started(self) -> bool:
+        """Algum lote já foi confirmado."""
+        return self.line > 0
+
+    def matches(self, stamp: SourceStamp) -> bool:
+        """O arquivo atual é o mesmo da carga interrompida (geração e fingerprint)."""
+        return self.source == _stamp_dict(stamp)
+
+    def restart(self, stamp: Optional[SourceStamp] = None) -> None:
+        """Descarta a posição salva: a carga recomeça do início do arquivo (o de stamp, se informado)."""
+        if stamp is not None:
+            self.source = _stamp_dict(stamp)
+        self.line = self.bytes_read = self.rows = self.rejected = 0
+
+    def advance(self, line: int, bytes_read: int, rows: int, rejected: int) -> None:
+        """Avança para o fim do lote recém-gravado (contadores acumulados)."""
+        self.line = line
+        self.bytes_read = bytes_read
+        self.rows += rows
+        self.rejected = rejected
+
+    async def save(self, conn: asyncpg.Connection) -> None:
+        """
+        Grava o checkpoint na conexão da carga; chamado dentro da transação do
+        lote, ele só vale se o lote for confirmado.
+        """
+        await conn.execute(
+            "UPDATE etl_log SET checkpoint = $1::jsonb WHERE id = $2",
+            json.dumps(self.state()),
+            self.log_id,
+        )
+        logger.debug(f"📌 Checkpoint {self.log_id}: linha {self.line}, {self.rows} registros")
+
+
+def _stamp_dict(stamp: SourceStamp) -> dict:
+    return {"dt_geracao": stamp.dt_geracao, "hh_geracao": stamp.hh_geracao, "fingerprint": stamp.fingerprint}
@@ -0,0 +1,203 @@
+import csv
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import BigInteger, Date, DateTime, Integer, Numeric, SmallInteger, Time
+
+# Marcadores usados pelo TSE para "sem informação" em colunas numéricas.
+NULL_TOKENS = frozenset({"", "#NULO#", "#NULO", "#NE#", "#NE"})
+
+# Datas e horas se repetem muito em um arquivo (dt_geracao é a mesma em todas
+# as linhas, dt_eleicao tem poucos valores): cada texto distinto é convertido uma vez.
+CONVERSION_CACHE_SIZE = 8192
+
+Converter = Callable[[str], object]
+
+
+def to_int(value: str) -> Optional[int]:
+    """Converte um campo numérico do TSE, tratando os marcadores de nulo."""
+    if value in NULL_TOKENS:
+        return None
+    return int(value)
+
+
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+def to_date(value: str) -> Optional[date]:
+    """Converte uma data do TSE ("DD/MM/AAAA")."""
+    if value in NULL_TOKENS:
+        return None
+    day, month, year = value.split("/")
+    return date(int(year), int(month), int(day))
+
+
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+def to_time(value: str) -> Optional[time]:
+    """Converte uma hora do TSE ("HH:MM:SS")."""
+    if value in NULL_TOKENS:
+        return None
+    return time(*(int(part) for part in value.split(":")))
+
+
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+def to_datetime(value: str) -> Optional[datetime]:
+    """Converte data e hora do TSE ("DD/MM/AAAA HH:MM:SS")."""
+    if value in NULL_TOKENS:
+        return None
+    day, clock = value.split(" ", 1)
+    return datetime.combine(to_date(day), to_time(clock))
+
+
+def to_decimal(value: str) -> Optional[Decimal]:
+    """Converte um valor monetário do TSE ("1234,56" ou "1.234,56")."""
+    if value in NULL_TOKENS:
+        return None
+    if "," in value:
+        value = value.replace(".", "").replace(",", ".")
+    return Decimal(value)
+
+
+def to_str(value: str) -> Optional[str]:
+    """Mantém o texto original, convertendo string vazia em NULL."""
+    return value or None
+
+
+def converter_for(column) -> Converter:
+    """Escolhe o conversor de acordo com o tipo SQLAlchemy da coluna."""
+    column_type = column.type
+    if isinstance(column_type, (SmallInteger, Integer, BigInteger)):
+        return to_int
+    if isinstance(column_type, DateTime):
+        return to_datetime
+    if isinstance(column_type, Date):
+        return to_date
+    if isinstance(column_type, Time):
+        return to_time
+    if isinstance(column_type, Numeric):
+        return to_decimal
+    return to_str
+
+
+class CSVBatchReader:
+    """
+    Lê um CSV do TSE linha a linha e produz lotes de tuplas prontas para COPY.
+
+    Apenas um lote fica em memória por vez, então o consumo é constante
+    independentemente do tamanho do arquivo. O id não vem do CSV: fica de fora
+    do COPY e é preenchido pelo server_default da tabela.
+
+    Com uma quarentena, linhas malformadas (CSV inválido, quantidade de campos
+    diferente do cabeçalho, valor que não converte) são desviadas para ela e a
+    leitura continua; sem quarentena, o primeiro erro interrompe a leitura.
+
+    skip_lines retoma uma leitura interrompida (ver Checkpoint): as linhas até
+    ela passam pelo parser de CSV (campos com quebra de linha continuam
+    corretos) mas não são convertidas nem geram lotes.
+    """
+
+    def __init__(
+            self,
+            model,
+            lines: Iterable[str],
+            sep: str = ";",
+            rename: Optional[Dict[str, str]] = None,
+            quarantine=None,
+            skip_lines: int = 0
+    ):
+        """
+        Args:
+            model: Model SQLAlchemy de destino
+            lines: Iterável de linhas de texto (já decodificadas), incluindo o cabeçalho
+            sep: Separador de campos do CSV
+            rename: Cabeçalho do CSV -> coluna do model, para colunas com nome
+                diferente (as demais são casadas pelo próprio nome)
+            quarantine: QuarantineSink que recebe as linhas rejeitadas
+            skip_lines: Linhas do arquivo (contando o cabeçalho) já carregadas antes
+        """
+        self.model = model
+        self.bytes_read = 0
+        self.quarantine = quarantine
+        self.rejected = 0
+        self.batch_lines: List[int] = []
+        self.skip_lines = skip_lines
+        self.reader = csv.reader(self._count_bytes(lines), delimiter=sep, quotechar='"')
+
+        rename = {source.lower(): target for source, target in (rename or {}).items()}
+        header = [name.strip().lower() for name in next(self.reader)]
+        self.width = len(header)
+        header = [rename.get(name, name) for name in header]
+        model_columns = {c.name: c for c in model.__table__.columns}
+
+        self.plan: List[Tuple[int, Converter]] = []
+        self.columns: List[str] = []
+        for index, name in enumerate(header):
+            column = model_columns.get(name)
+            if column is None:
+                continue
+            self.plan.append((index, converter_for(column)))
+            self.columns.append(name)
+
+    def _count_bytes(self, lines: Iterable[str]) -> Iterator[str]:
+        """Repassa as linhas contando o tamanho lido (em latin1, 1 caractere = 1 byte)."""
+        for line in lines:
+            self.bytes_read += len(line)
+            yield line
+
+    @property
+    def line_num(self) -> int:
+        """Última linha do arquivo lida (após cada lote, o fim dele)."""
+        return self.reader.line_num
+
+    def _reject(self, reason: str, row: Optional[List[str]] = None) -> None:
+        """Desvia a linha atual para a quarentena ou, sem ela, interrompe a leitura."""
+        if self.quarantine is None:
+            raise ValueError(f"Linha {self.reader.line_num}: {reason}")
+        self.rejected += 1
+        self.quarantine.reject(self.reader.line_num, reason, row)
+
+    def iter_batches(self, batch_size: int) -> Iterator[List[tuple]]:
+        """
+        Gera lotes com no máximo batch_size registros. Após cada lote,
+        batch_lines traz a linha do arquivo de cada registro.
+
+        Args:
+            batch_size: Quantidade máxima de linhas por lote
+        """
+        plan = self.plan
+        reader = self.reader
+        width = self.width
+        skip = self.skip_lines
+        batch: List[tuple] = []
+        lines: List[int] = []
+
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                if reader.line_num > skip:
+                    self._reject(f"CSV inválido: {e}")
+                continue
+
+            if reader.line_num <= skip:
+                continue
+            if len(row) != width:
+                self._reject(f"{len(row)} campos, esperados {width}", row)
+                continue
+            try:
+                batch.append(tuple([convert(row[index]) for index, convert in plan]))
+            except (ValueError, ArithmeticError) as e:
+                self._reject(f"{type(e).__name__}: {e}", row)
+                continue
+
+            lines.append(reader.line_num)
+            if len(batch) >= batch_size:
+                self.batch_lines = lines
+                yield batch
+                batch, lines = [], []
+
+        if batch:
+            self.batch_lines = lines
+            yield batch
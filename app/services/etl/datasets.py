@@ -0,0 +1,264 @@
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from sqlalchemy import UniqueConstraint
+
+from app.core.config import settings
+from app.core.database import NATURAL_KEY_SUFFIX
+from app.models.candidatos.bem_cand import BemCandidato
+from app.models.candidatos.consulta_cand_complementar import ConsultaCandComplementar
+from app.models.candidatos.consulta_candidato import ConsultaCandidatos
+from app.models.candidatos.consulta_coligacao import ConsultaColigacao
+from app.models.candidatos.consulta_vagas import ConsultaVagas
+from app.models.candidatos.motivo_cassacao import MotivoCassacao
+from app.models.candidatos.rede_social_cand import RedeSocialCandidato
+from app.models.comparecimento_abstencao.perfil_comparecimento_abstencao import PerfilComparecimentoAbstencao
+from app.models.comparecimento_abstencao.perfil_comparecimento_abstencao_eleitor_deficiencia import (
+    PerfilComparecimentoAbstencaoEleitorDeficiencia,
+)
+from app.models.comparecimento_abstencao.perfil_comparecimento_abstencao_eleitor_tte import (
+    PerfilComparecimentoAbstencaoEleitorTte,
+)
+from app.models.eleitorado.eleitorado_local_votacao import EleitoradoLocalVotacao
+from app.models.eleitorado.perfil_eleitor_deficiencia import PerfilEleitorDeficiencia
+from app.models.eleitorado.perfil_eleitorado import PerfilEleitorado
+from app.models.eleitorado.transferencia_temporaria import TransferenciaTemporaria
+from app.models.eleitorado.transferencia_temporaria_secao import TransferenciaTemporariaSecao
+from app.models.prestacao_contas.despesa_anual import DespesaAnual
+from app.models.prestacao_contas.despesa_anual_partidaria_nf import DespesaAnualPartidariaNf
+from app.models.prestacao_contas.despesas_contratadas_candidatos import DespesasContratadasCandidatos
+from app.models.prestacao_contas.despesas_contratadas_orgaos_partidarios import DespesasContratadasOrgaosPartidarios
+from app.models.prestacao_contas.despesas_pagas_candidatos import DespesasPagasCandidatos
+from app.models.prestacao_contas.extrato_bancario_partido import ExtratoBancarioPartido
+from app.models.resultados.detalhe_votacao_munzona import DetalheVotacaoMunzona
+from app.models.resultados.detalhe_votacao_secao import DetalheVotacaoSecao
+from app.models.resultados.votacao_candidato_munzona import VotacaoCandidatoMunZona
+from app.models.resultados.votacao_partido_munzona import VotacaoPartidoMunZona
+from app.schemas.etl_schemas import ETLRequest, TipoETLEnum
+from app.services.ckan_client import CKANTSEClient
+from app.services.etl.archive_cache import ArchiveCache
+from app.services.etl.partitions import is_partitioned
+
+NATIONAL_FILE = "BRASIL"
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """
+    Entrada do registry: onde o TSE publica um dataset e como o CSV vira linhas do model.
+
+    Os nomes aceitam os campos {ano} e {uf}; um member sem {uf} indica um
+    arquivo único (nacional) por ano, carregado sem fan-out por UF.
+    year_column/uf_column delimitam a partição recarregada (uf_column None:
+    o ano inteiro) e rename mapeia cabeçalhos do CSV com nome diferente da coluna.
+    A chave natural (key) vem do model; só datasets com ela aceitam o modo merge.
+    """
+    model: type
+    package: str
+    archive: str
+    member: str
+    year_column: Optional[str] = "ano_eleicao"
+    uf_column: Optional[str] = "sg_uf"
+    rename: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def table_name(self) -> str:
+        return self.model.__tablename__
+
+    @property
+    def key(self) -> Tuple[str, ...]:
+        """Colunas da chave natural do model (ver natural_key); vazia se o dataset não tiver uma."""
+        name = f"{self.table_name}{NATURAL_KEY_SUFFIX}"
+        for constraint in self.model.__table__.constraints:
+            if isinstance(constraint, UniqueConstraint) and constraint.name == name:
+                return tuple(column.name for column in constraint.columns)
+        return ()
+
+    @property
+    def default_mode(self) -> str:
+        """
+        Modo de carga quando nem a chamada nem settings.ETL_LOAD_MODE definem um:
+
+        - swap em tabelas particionadas: a partição é trocada pela staging (DETACH/ATTACH)
+        - merge com chave natural: só as linhas alteradas são gravadas
+        - delete nas demais: DELETE e COPY da UF em uma única transação
+
+        O swap de tabelas não particionadas copia as linhas das demais UFs para
+        a staging e reconstrói todos os índices; só é usado quando pedido.
+        """
+        if is_partitioned(self.model):
+            return "swap"
+        return "merge" if self.key else "delete"
+
+    @property
+    def by_uf(self) -> bool:
+        """O ZIP traz um CSV por UF."""
+        return "{uf}" in self.member
+
+    def package_id(self, ano: int) -> str:
+        return self.package.format(ano=ano)
+
+    def archive_name(self, ano: int) -> str:
+        return self.archive.format(ano=ano)
+
+    def member_name(self, ano: int, uf: Optional[str] = None) -> str:
+        return self.member.format(ano=ano, uf=uf or NATIONAL_FILE)
+
+
+def _tse(model, package: str, name: Optional[str] = None, by_uf: bool = True, **options) -> Dataset:
+    """Dataset no padrão usual do TSE: <nome>_<ano>.zip com <nome>_<ano>[_<UF>].csv dentro."""
+    name = name or model.__tablename__
+    member = f"{name}_{{ano}}_{{uf}}.csv" if by_uf else f"{name}_{{ano}}.csv"
+    return Dataset(model=model, package=package, archive=f"{name}_{{ano}}.zip", member=member, **options)
+
+
+RESULTADOS = "resultados-{ano}"
+CANDIDATOS = "candidatos-{ano}"
+ELEITORADO = "eleitorado-{ano}"
+CONTAS_CANDIDATOS = "prestacao-de-contas-eleitorais-candidatos-{ano}"
+CONTAS_ORGAOS = "prestacao-de-contas-eleitorais-orgaos-partidarios-{ano}"
+CONTAS_PARTIDARIAS = "prestacao-de-contas-partidarias-{ano}"
+
+DATASETS: Dict[TipoETLEnum, Dataset] = {
+    # Resultados
+    TipoETLEnum.CANDIDATO: _tse(VotacaoCandidatoMunZona, RESULTADOS),
+    TipoETLEnum.PARTIDO: _tse(VotacaoPartidoMunZona, RESULTADOS),
+    TipoETLEnum.DETALHE_SECAO: _tse(DetalheVotacaoSecao, RESULTADOS),
+    TipoETLEnum.DETALHE_MUNZONA: _tse(DetalheVotacaoMunzona, RESULTADOS),
+    # Candidatos
+    TipoETLEnum.CONSULTA_CANDIDATO: _tse(ConsultaCandidatos, CANDIDATOS),
+    # Sem coluna de UF na tabela: carrega o arquivo nacional
+    TipoETLEnum.CANDIDATO_COMPLEMENTAR: Dataset(
+        model=ConsultaCandComplementar,
+        package=CANDIDATOS,
+        archive="consulta_cand_complementar_{ano}.zip",
+        member="consulta_cand_complementar_{ano}_BRASIL.csv",
+        uf_column=None,
+    ),
+    TipoETLEnum.BEM_CANDIDATO: _tse(BemCandidato, CANDIDATOS, name="bem_candidato"),
+    TipoETLEnum.COLIGACAO: _tse(ConsultaColigacao, CANDIDATOS),
+    TipoETLEnum.VAGAS: _tse(ConsultaVagas, CANDIDATOS),
+    TipoETLEnum.MOTIVO_CASSACAO: _tse(MotivoCassacao, CANDIDATOS),
+    TipoETLEnum.REDE_SOCIAL: _tse(
+        RedeSocialCandidato, CANDIDATOS, name="rede_social_candidato", year_column="aa_eleicao"
+    ),
+    # Comparecimento e abstenção
+    TipoETLEnum.COMPARECIMENTO: _tse(PerfilComparecimentoAbstencao, RESULTADOS, by_uf=False),
+    TipoETLEnum.COMPARECIMENTO_DEFICIENCIA: _tse(
+        PerfilComparecimentoAbstencaoEleitorDeficiencia, RESULTADOS, by_uf=False
+    ),
+    TipoETLEnum.COMPARECIMENTO_TTE: _tse(
+        PerfilComparecimentoAbstencaoEleitorTte, RESULTADOS, by_uf=False, uf_column="sg_uf_origem"
+    ),
+    # Eleitorado
+    TipoETLEnum.PERFIL_ELEITORADO: _tse(PerfilEleitorado, ELEITORADO, by_uf=False),
+    TipoETLEnum.PERFIL_ELEITOR_DEFICIENCIA: _tse(
+        PerfilEleitorDeficiencia, ELEITORADO, by_uf=False, year_column="aa_eleicao"
+    ),
+    TipoETLEnum.LOCAL_VOTACAO: _tse(EleitoradoLocalVotacao, ELEITORADO, by_uf=False, year_column="aa_eleicao"),
+    TipoETLEnum.TRANSFERENCIA_TEMPORARIA: _tse(
+        TransferenciaTemporaria, ELEITORADO, by_uf=False, year_column="aa_eleicao", uf_column="sg_uf_origem"
+    ),
+    TipoETLEnum.TRANSFERENCIA_TEMPORARIA_SECAO: _tse(
+        TransferenciaTemporariaSecao, ELEITORADO, by_uf=False, year_column="aa_eleicao", uf_column="sg_uf_origem"
+    ),
+    # Prestação de contas eleitorais (um ZIP com vários CSVs por UF)
+    TipoETLEnum.DESPESAS_CONTRATADAS_CANDIDATOS: Dataset(
+        model=DespesasContratadasCandidatos,
+        package=CONTAS_CANDIDATOS,
+        archive="prestacao_de_contas_eleitorais_candidatos_{ano}.zip",
+        member="despesas_contratadas_candidatos_{ano}_{uf}.csv",
+        year_column="aa_eleicao",
+    ),
+    TipoETLEnum.DESPESAS_PAGAS_CANDIDATOS: Dataset(
+        model=DespesasPagasCandidatos,
+        package=CONTAS_CANDIDATOS,
+        archive="prestacao_de_contas_eleitorais_candidatos_{ano}.zip",
+        member="despesas_pagas_candidatos_{ano}_{uf}.csv",
+        year_column="aa_eleicao",
+    ),
+    TipoETLEnum.DESPESAS_CONTRATADAS_ORGAOS: Dataset(
+        model=DespesasContratadasOrgaosPartidarios,
+        package=CONTAS_ORGAOS,
+        archive="prestacao_de_contas_eleitorais_orgaos_partidarios_{ano}.zip",
+        member="despesas_contratadas_orgaos_partidarios_{ano}_{uf}.csv",
+        year_column="aa_eleicao",
+    ),
+    # Prestação de contas anual dos partidos (ano = exercício)
+    TipoETLEnum.DESPESA_ANUAL: _tse(DespesaAnual, CONTAS_PARTIDARIAS, by_uf=False, year_column="aa_exercicio"),
+    TipoETLEnum.DESPESA_ANUAL_NF: _tse(
+        DespesaAnualPartidariaNf, CONTAS_PARTIDARIAS, by_uf=False, year_column="aa_exercicio"
+    ),
+    TipoETLEnum.EXTRATO_BANCARIO: _tse(
+        ExtratoBancarioPartido, CONTAS_PARTIDARIAS, by_uf=False, year_column="aa_referencia", uf_column=None
+    ),
+}
+
+
+def get_dataset(tipo: TipoETLEnum) -> Dataset:
+    """Entrada do registry para o tipo de ETL."""
+    return DATASETS[TipoETLEnum(tipo)]
+
+
+def process_name_for(request: ETLRequest) -> str:
+    """Nome do processo registrado no ETLLog (ex: "etl_candidato_2024_SP")."""
+    uf = request.uf.value if request.uf else "BRASIL"
+    return f"etl_{request.tipo.value}_{request.ano}_{uf}"
+
+
+def resolve_csv_path(request: ETLRequest) -> Path:
+    """
+    Caminho esperado do CSV para a requisição, seguindo o padrão de nomes do TSE
+    (ex: votacao_candidato_munzona_2024_SP.csv) dentro de settings.ETL_DATA_DIR.
+    """
+    dataset = get_dataset(request.tipo)
+    return Path(settings.ETL_DATA_DIR) / dataset.member_name(request.ano, request.uf.value if request.uf else None)
+
+
+def package_id_for(request: ETLRequest) -> str:
+    """Package do CKAN do TSE que publica o dataset no ano (ex: "resultados-2024")."""
+    return get_dataset(request.tipo).package_id(request.ano)
+
+
+def archive_name_for(request: ETLRequest) -> str:
+    """Nome do ZIP publicado pelo TSE (ex: votacao_candidato_munzona_2024.zip)."""
+    return get_dataset(request.tipo).archive_name(request.ano)
+
+
+async def resolve_archive_resource(request: ETLRequest, client: Optional[CKANTSEClient] = None) -> Dict:
+    """
+    Busca no CKAN o resource do ZIP que contém os CSVs por UF da requisição,
+    com os metadados atuais (last_modified, size, hash) de resource_show.
+
+    Raises:
+        FileNotFoundError: Se o package não tiver o arquivo esperado
+    """
+    if client is None:
+        async with CKANTSEClient() as own_client:
+            return await resolve_archive_resource(request, own_client)
+
+    archive_name = archive_name_for(request)
+
+    for resource in await client.get_package_download_urls(package_id_for(request)):
+        if resource["url"].rsplit("/", 1)[-1].lower() == archive_name:
+            return await client.get_resource_data(resource["resource_id"])
+
+    raise FileNotFoundError(f"{archive_name} não encontrado no package {package_id_for(request)}")
+
+
+@asynccontextmanager
+async def archive_location(request: ETLRequest) -> AsyncIterator[str]:
+    """
+    Origem do ZIP para cargas com download, válida até o fim do bloco: o
+    arquivo no ArchiveCache (baixado se necessário e protegido do evict
+    enquanto a carga o usa, ver ArchiveCache.use) ou, com ETL_ARCHIVE_CACHE
+    desligado, a URL para leitura em streaming.
+    """
+    resource = await resolve_archive_resource(request)
+    if not settings.ETL_ARCHIVE_CACHE:
+        yield resource["url"]
+        return
+    async with ArchiveCache().use(resource) as path:
+        yield str(path)
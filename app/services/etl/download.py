@@ -0,0 +1,428 @@
+import io
+import struct
+import zipfile
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+from loguru import logger
+
+from app.core.config import settings
+from app.services.etl.pipeline import BoundedStage, PipelineMeters
+
+LOCAL_HEADER = b"PK\x03\x04"
+DATA_DESCRIPTOR = b"PK\x07\x08"
+CENTRAL_HEADER = b"PK\x01\x02"
+END_OF_CENTRAL_DIR = b"PK\x05\x06"
+ZIP64_END_OF_CENTRAL_DIR = b"PK\x06\x06"
+ZIP64_LOCATOR = b"PK\x06\x07"
+
+FLAG_DATA_DESCRIPTOR = 0x08
+STORED = 0
+DEFLATED = 8
+ZIP64_MARKER = 0xFFFFFFFF
+
+
+class ZipStreamError(Exception):
+    """Erro ao interpretar um ZIP recebido em streaming."""
+
+
+@dataclass
+class ZipMember:
+    """Metadados de um membro do ZIP (cabeçalho local ou diretório central)."""
+    name: str
+    method: int
+    flags: int
+    crc: int
+    compressed_size: int
+    uncompressed_size: int
+    zip64: bool = False
+    header_offset: int = 0
+
+
+class ByteStream:
+    """Buffer de leitura sobre um iterável de blocos de bytes."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+
+    def _fill(self) -> bool:
+        for chunk in self._chunks:
+            if chunk:
+                self._buffer += chunk
+                return True
+        return False
+
+    def read(self, size: int) -> bytes:
+        """Lê exatamente size bytes (menos apenas se o stream terminar)."""
+        while len(self._buffer) < size and self._fill():
+            pass
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def read_some(self, max_size: int) -> bytes:
+        """Lê o que houver no buffer (ou o próximo bloco), até max_size bytes."""
+        if not self._buffer and not self._fill():
+            return b""
+        data = bytes(self._buffer[:max_size])
+        del self._buffer[:max_size]
+        return data
+
+    def skip(self, size: int) -> None:
+        """Descarta size bytes sem copiá-los."""
+        while size > 0:
+            if not self._buffer and not self._fill():
+                raise ZipStreamError("Arquivo ZIP truncado")
+            step = min(size, len(self._buffer))
+            del self._buffer[:step]
+            size -= step
+
+    def unread(self, data: bytes) -> None:
+        """Devolve bytes lidos a mais para o início do buffer."""
+        if data:
+            self._buffer[:0] = data
+
+
+def _apply_zip64_extra(extra: bytes, member: ZipMember, central: bool = False) -> None:
+    """Aplica os tamanhos (e offset) de 64 bits do campo extra 0x0001, se presente."""
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, size = struct.unpack_from("<HH", extra, position)
+        data = extra[position + 4:position + 4 + size]
+        position += 4 + size
+        if header_id != 0x0001:
+            continue
+
+        member.zip64 = True
+        fields = iter(struct.unpack_from(f"<{len(data) // 8}Q", data))
+        if member.uncompressed_size == ZIP64_MARKER or not central:
+            member.uncompressed_size = next(fields, member.uncompressed_size)
+        if member.compressed_size == ZIP64_MARKER or not central:
+            member.compressed_size = next(fields, member.compressed_size)
+        if central and member.header_offset == ZIP64_MARKER:
+            member.header_offset = next(fields, member.header_offset)
+        return
+
+
+def _read_local_header(stream: ByteStream) -> ZipMember:
+    header = stream.read(26)
+    if len(header) < 26:
+        raise ZipStreamError("Cabeçalho local truncado")
+
+    (_, flags, method, _, _, crc, compressed_size, uncompressed_size,
+     name_length, extra_length) = struct.unpack("<HHHHHIIIHH", header)
+    name = stream.read(name_length).decode("cp437" if not flags & 0x800 else "utf-8")
+    extra = stream.read(extra_length)
+
+    member = ZipMember(name, method, flags, crc, compressed_size, uncompressed_size)
+    if compressed_size == ZIP64_MARKER or uncompressed_size == ZIP64_MARKER:
+        _apply_zip64_extra(extra, member)
+    return member
+
+
+class MemberReader:
+    """
+    Dados descompactados de um membro, lidos sob demanda.
+
+    Se o membro não for consumido, discard() pula os bytes compactados sem
+    descompactá-los (quando o tamanho está no cabeçalho local).
+    """
+
+    def __init__(self, stream: ByteStream, member: ZipMember):
+        self.stream = stream
+        self.member = member
+        self.finished = False
+        self._iterator: Optional[Iterator[bytes]] = None
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self._iterator is None:
+            self._iterator = self._inflate()
+        return self._iterator
+
+    def _inflate(self) -> Iterator[bytes]:
+        member, stream = self.member, self.stream
+        read_size = settings.ETL_DOWNLOAD_CHUNK_SIZE
+        crc = 0
+
+        if member.method == STORED:
+            if member.flags & FLAG_DATA_DESCRIPTOR:
+                raise ZipStreamError(f"{member.name}: membro sem compressão e sem tamanho no cabeçalho")
+            remaining = member.compressed_size
+            while remaining:
+                chunk = stream.read_some(min(remaining, read_size))
+                if not chunk:
+                    raise ZipStreamError("Arquivo ZIP truncado")
+                remaining -= len(chunk)
+                crc = zlib.crc32(chunk, crc)
+                yield chunk
+        elif member.method == DEFLATED:
+            decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            while not decompressor.eof:
+                chunk = stream.read_some(read_size)
+                if not chunk:
+                    raise ZipStreamError("Arquivo ZIP truncado")
+                data = decompressor.decompress(chunk)
+                if data:
+                    crc = zlib.crc32(data, crc)
+                    yield data
+            stream.unread(decompressor.unused_data)
+        else:
+            raise ZipStreamError(f"{member.name}: método de compressão {member.method} não suportado")
+
+        expected_crc = self._read_data_descriptor() if member.flags & FLAG_DATA_DESCRIPTOR else member.crc
+        if crc != expected_crc:
+            raise ZipStreamError(f"{member.name}: CRC inválido")
+        self.finished = True
+
+    def _read_data_descriptor(self) -> int:
+        first = self.stream.read(4)
+        crc_bytes = self.stream.read(4) if first == DATA_DESCRIPTOR else first
+        self.stream.skip(16 if self.member.zip64 else 8)
+        return struct.unpack("<I", crc_bytes)[0]
+
+    def discard(self) -> None:
+        """Avança o stream até o fim do membro."""
+        if self.finished:
+            return
+        if self._iterator is None and not self.member.flags & FLAG_DATA_DESCRIPTOR:
+            self.stream.skip(self.member.compressed_size)
+            self.finished = True
+            return
+        for _ in self:
+            pass
+
+
+def iter_zip_members(chunks: Iterable[bytes]) -> Iterator[Tuple[ZipMember, MemberReader]]:
+    """
+    Percorre os membros de um ZIP recebido como stream de bytes, sem acesso
+    aleatório e sem gravar nada em disco.
+
+    Cada membro deve ser consumido (ou ignorado) antes de avançar para o próximo;
+    membros não lidos são descartados automaticamente.
+    """
+    stream = ByteStream(chunks)
+    while True:
+        signature = stream.read(4)
+        if signature != LOCAL_HEADER:
+            # Diretório central, fim do arquivo ou stream vazio
+            return
+
+        member = _read_local_header(stream)
+        reader = MemberReader(stream, member)
+        yield member, reader
+        reader.discard()
+
+
+class _ChunkIO(io.RawIOBase):
+    """Adapta um iterável de bytes para a interface de arquivo binário."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            self._pending = next(self._chunks, None)
+            if self._pending is None:
+                self._pending = b""
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def iter_text_lines(chunks: Iterable[bytes], encoding: Optional[str] = None) -> io.TextIOWrapper:
+    """Decodifica um stream de bytes em linhas de texto (preservando quebras dentro de aspas)."""
+    raw = io.BufferedReader(_ChunkIO(chunks), buffer_size=settings.ETL_DOWNLOAD_CHUNK_SIZE)
+    return io.TextIOWrapper(raw, encoding=encoding or settings.ETL_CSV_ENCODING, newline="")
+
+
+def _total_size(response: httpx.Response) -> Optional[int]:
+    content_range = response.headers.get("content-range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        return int(total) if total.isdigit() else None
+    return None
+
+
+def _get_range(client: httpx.Client, url: str, byte_range: str) -> Optional[httpx.Response]:
+    """
+    GET de um intervalo do arquivo, já com o corpo lido. A resposta chega em
+    streaming: se o servidor ignorar o Range (200 com o arquivo inteiro), ela é
+    fechada sem ler o corpo e None é retornado.
+    """
+    with client.stream("GET", url, headers={"Range": f"bytes={byte_range}"}) as response:
+        if response.status_code != 206:
+            return None
+        response.read()
+    return response
+
+
+def read_central_directory(client: httpx.Client, url: str) -> Optional[List[ZipMember]]:
+    """
+    Lê o diretório central do ZIP remoto usando requisições com Range.
+
+    Returns:
+        Membros com offsets dos cabeçalhos locais, ou None se o servidor não
+        suporta Range (nesse caso o chamador deve ler o arquivo sequencialmente)
+    """
+    tail = _get_range(client, url, "-65557")
+    if tail is None:
+        return None
+
+    total_size = _total_size(tail)
+    data = tail.content
+    position = data.rfind(END_OF_CENTRAL_DIR)
+    if total_size is None or position < 0:
+        raise ZipStreamError("Fim do diretório central não encontrado")
+
+    tail_offset = total_size - len(data)
+    (_, _, _, entries, directory_size, directory_offset, _) = struct.unpack_from("<HHHHIIH", data, position + 4)
+
+    if ZIP64_MARKER in (directory_size, directory_offset) or entries == 0xFFFF:
+        locator = position - 20
+        if locator < 0 or data[locator:locator + 4] != ZIP64_LOCATOR:
+            raise ZipStreamError("Localizador ZIP64 não encontrado")
+        (_, record_offset, _) = struct.unpack_from("<IQI", data, locator + 4)
+        record = _get_range(client, url, f"{record_offset}-{record_offset + 55}")
+        if record is None or record.content[:4] != ZIP64_END_OF_CENTRAL_DIR:
+            raise ZipStreamError("Registro ZIP64 inválido")
+        directory_size, directory_offset = struct.unpack_from("<QQ", record.content, 40)
+
+    if directory_offset >= tail_offset:
+        directory = data[directory_offset - tail_offset:directory_offset - tail_offset + directory_size]
+    else:
+        response = _get_range(client, url, f"{directory_offset}-{directory_offset + directory_size - 1}")
+        if response is None:
+            return None
+        directory = response.content
+
+    members = []
+    position = 0
+    while directory[position:position + 4] == CENTRAL_HEADER:
+        (_, _, flags, method, _, _, crc, compressed_size, uncompressed_size, name_length,
+         extra_length, comment_length, _, _, _, header_offset) = struct.unpack_from(
+            "<HHHHHHIIIHHHHHII", directory, position + 4
+        )
+        start = position + 46
+        name = directory[start:start + name_length].decode("cp437" if not flags & 0x800 else "utf-8")
+        extra = directory[start + name_length:start + name_length + extra_length]
+
+        member = ZipMember(name, method, flags, crc, compressed_size, uncompressed_size,
+                           header_offset=header_offset)
+        _apply_zip64_extra(extra, member, central=True)
+        members.append(member)
+        position = start + name_length + extra_length + comment_length
+
+    return members
+
+
+def member_basename(name: str) -> str:
+    return name.rsplit("/", 1)[-1].lower()
+
+
+def stream_zip_member(
+        url: str,
+        member_name: str,
+        client: Optional[httpx.Client] = None,
+        meters: Optional[PipelineMeters] = None
+) -> Iterator[bytes]:
+    """
+    Gera os bytes descompactados de um membro de um ZIP remoto.
+
+    Com suporte a Range no servidor, apenas os bytes do membro são baixados;
+    caso contrário o arquivo é lido em streaming até o membro desejado.
+
+    O download roda em uma etapa própria (BoundedStage) que mantém até
+    settings.ETL_DOWNLOAD_PREFETCH chunks à frente da descompactação: a rede
+    não espera o parse, e um parse lento faz o download parar em vez de
+    acumular o arquivo em memória.
+
+    Args:
+        url: URL do arquivo ZIP
+        member_name: Nome do arquivo dentro do ZIP (comparação sem diretório e sem caixa)
+        client: Cliente httpx (útil para apontar para um servidor local em testes)
+        meters: Medidores da carga (etapa "download")
+    """
+    own_client = client is None
+    client = client or httpx.Client(timeout=settings.ETL_DOWNLOAD_TIMEOUT, follow_redirects=True)
+    wanted = member_basename(member_name)
+
+    try:
+        members = read_central_directory(client, url)
+        headers = {}
+        if members is not None:
+            match = next((m for m in members if member_basename(m.name) == wanted), None)
+            if match is None:
+                raise FileNotFoundError(f"{member_name} não encontrado em {url}")
+            headers["Range"] = f"bytes={match.header_offset}-"
+            logger.debug(f"🎯 {member_name}: leitura direta a partir do byte {match.header_offset}")
+
+        with client.stream("GET", url, headers=headers) as response:
+            response.raise_for_status()
+            download = BoundedStage(
+                response.iter_bytes(settings.ETL_DOWNLOAD_CHUNK_SIZE),
+                settings.ETL_DOWNLOAD_PREFETCH,
+                meters.stage("download") if meters else None,
+                meters.stage("parse") if meters else None,
+            )
+            with download:
+                for member, reader in iter_zip_members(download):
+                    if member_basename(member.name) == wanted:
+                        yield from reader
+                        return
+        raise FileNotFoundError(f"{member_name} não encontrado em {url}")
+    finally:
+        if own_client:
+            client.close()
+
+
+def stream_csv_lines(
+        url: str,
+        member_name: str,
+        client: Optional[httpx.Client] = None,
+        meters: Optional[PipelineMeters] = None
+) -> Iterator[str]:
+    """
+    Linhas de texto de um CSV dentro de um ZIP remoto, prontas para o CSVBatchReader.
+    O download acontece conforme as linhas são consumidas.
+    """
+    with iter_text_lines(stream_zip_member(url, member_name, client, meters)) as lines:
+        yield from lines
+
+
+def iter_local_zip_lines(path: str, member_name: str) -> Iterator[str]:
+    """Linhas de um CSV dentro de um ZIP local (ex: um arquivo do ArchiveCache)."""
+    wanted = member_basename(member_name)
+    with zipfile.ZipFile(path) as archive:
+        match = next((name for name in archive.namelist() if member_basename(name) == wanted), None)
+        if match is None:
+            raise FileNotFoundError(f"{member_name} não encontrado em {path}")
+        with archive.open(match) as fh:
+            yield from io.TextIOWrapper(fh, encoding=settings.ETL_CSV_ENCODING, newline="")
+
+
+def open_csv_lines(location: str, member_name: str, meters: Optional[PipelineMeters] = None) -> Iterator[str]:
+    """
+    Linhas de um CSV do TSE a partir de qualquer origem suportada:
+    URL de um ZIP (streaming), ZIP local ou o próprio CSV local.
+
+    Args:
+        location: URL, caminho de .zip ou caminho do CSV
+        member_name: Nome do CSV dentro do ZIP (ignorado para CSV local)
+        meters: Medidores da carga (só a origem remota tem a etapa "download")
+    """
+    if location.startswith(("http://", "https://")):
+        yield from stream_csv_lines(location, member_name, meters=meters)
+    elif location.lower().endswith(".zip"):
+        yield from iter_local_zip_lines(location, member_name)
+    else:
+        with open(location, encoding=settings.ETL_CSV_ENCODING, newline="") as fh:
+            yield from fh
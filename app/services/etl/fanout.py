@@ -0,0 +1,658 @@
+import asyncio
+import multiprocessing
+import time
+import uuid
+from contextlib import asynccontextmanager, closing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import asyncpg
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import AsyncSessionMaker, create_copy_connection
+from app.repository.log_repository import ETLLogRepository
+from app.repository.manifest_repository import ETLManifestRepository
+from app.schemas.etl_schemas import ETLRequest, TipoETLEnum, UFEnum
+from app.services.etl.csv_stream import CSVBatchReader
+from app.services.etl.checkpoint import Checkpoint
+from app.services.etl.datasets import archive_location, get_dataset, process_name_for, resolve_csv_path
+from app.services.etl.download import open_csv_lines
+from app.services.etl.indexes import DeferredIndexes
+from app.services.etl.incremental import (
+    SourceStamp,
+    is_current,
+    partition_filter,
+    read_stamp,
+    record_load,
+)
+from app.services.etl.merge import MergeStaging
+from app.services.etl.partitions import (
+    PartitionStaging,
+    is_partitioned,
+    swap_partitions,
+    uf_partition_name,
+)
+from app.services.etl.progress import ProgressTracker
+from app.services.etl.quarantine import QuarantineSink, copy_with_quarantine
+from app.services.etl.rollups import ROLLUPS, refresh_rollups
+from app.services.etl.staging import StagingTable, table_lock
+
+
+def parse_uf_file(
+        tipo: str,
+        uf: str,
+        location: str,
+        member_name: str,
+        chunk_size: int,
+        queue,
+        log_id: str,
+        sent_counts
+) -> None:
+    """
+    Executado no processo worker: faz o parse do CSV de uma UF e envia os lotes
+    tipados para a fila consumida pelos writers de COPY. Linhas malformadas vão
+    para a quarentena da execução (log_id), em um arquivo do parse separado do
+    usado pelos writers, sem interromper a UF.
+
+    location pode ser o CSV local, um ZIP local ou a URL do ZIP (ver open_csv_lines).
+    Cada lote vai como ("batch", uf, colunas, registros, linhas, (bytes lidos,
+    segundos de parse, linhas rejeitadas)) e a UF sempre termina com uma
+    mensagem ("end", uf, lotes_enviados, erro). A contagem de lotes enviados
+    também fica em sent_counts[uf] (dict do Manager), para o processo principal
+    saber quantos lotes esperar se o worker morrer sem a mensagem final.
+
+    Se a fila ficar cheia por settings.ETL_QUEUE_PUT_TIMEOUT segundos (nenhum
+    writer consumindo), o worker desiste com queue.Full em vez de travar a carga.
+    """
+    timeout = settings.ETL_QUEUE_PUT_TIMEOUT
+    dataset = get_dataset(TipoETLEnum(tipo))
+    quarantine = QuarantineSink(uuid.UUID(log_id), member_name, origin="parse")
+    sent = 0
+    try:
+        with closing(open_csv_lines(location, member_name)) as fh:
+            reader = CSVBatchReader(
+                dataset.model, fh, sep=settings.ETL_CSV_SEPARATOR, rename=dataset.rename, quarantine=quarantine
+            )
+            bytes_read = rejected = 0
+            started = time.monotonic()
+            for batch in reader.iter_batches(chunk_size):
+                stats = (reader.bytes_read - bytes_read, time.monotonic() - started, reader.rejected - rejected)
+                queue.put(("batch", uf, reader.columns, batch, reader.batch_lines, stats), timeout=timeout)
+                bytes_read, rejected = reader.bytes_read, reader.rejected
+                sent += 1
+                sent_counts[uf] = sent
+                started = time.monotonic()
+    except Exception as e:
+        queue.put(("end", uf, sent, f"{type(e).__name__}: {e}"), timeout=timeout)
+        return
+
+    queue.put(("end", uf, sent, None), timeout=timeout)
+
+
+@dataclass
+class UFState:
+    """Contadores de uma UF durante o fan-out."""
+    log_id: uuid.UUID
+    rows: int = 0
+    # Lotes consumidos da fila (gravados ou descartados) e enviados pelo worker
+    batches_written: int = 0
+    batches_sent: Optional[int] = None
+    batches_dropped: int = 0
+    error: Optional[str] = None
+    finished: bool = False
+    stamp: Optional[SourceStamp] = None
+    progress: Optional[ProgressTracker] = None
+    quarantine: Optional[QuarantineSink] = None
+
+
+class FanOutLoader:
+    """
+    Carga nacional: o parse de cada UF roda em um processo separado e os lotes
+    são gravados por writers de COPY concorrentes no processo principal.
+
+    Cada UF ganha um ETLLog filho; ao final, o log pai consolida o total de
+    registros e as UFs com erro. UFs cujo arquivo não mudou desde a última carga
+    (ver ETLManifest) são marcadas como ignoradas e nem chegam aos workers.
+
+    No modo "swap" os writers gravam em stagings: em tabelas particionadas, uma
+    PartitionStaging por UF, e as UFs carregadas sem erro trocam de partição
+    juntas ao final; nas demais, uma StagingTable única, trocada pela tabela
+    real só se todas as UFs carregarem sem erro (tudo ou nada).
+
+    No modo "merge" cada UF grava em uma MergeStaging própria, aplicada na
+    tabela por upsert na chave natural quando a UF termina sem erro.
+
+    O modo "delete" não é usado no fan-out: os lotes das UFs se intercalam nos
+    writers, então o DELETE e o COPY de uma UF não caberiam em uma transação e
+    uma UF interrompida ficaria vazia ou pela metade. Pedido o delete, a carga
+    usa merge (tabelas não particionadas com chave natural) ou swap.
+
+    No modo merge, a primeira carga das UFs (ou request.defer_indexes) remove
+    os índices secundários enquanto aplica as stagings, se a tabela não tiver
+    outros dados, e os reconstrói ao final, seguidos de ANALYZE das partições
+    (ver DeferredIndexes).
+
+    Na retomada de uma carga interrompida (resume), os logs das UFs são
+    reaproveitados e as UFs que a própria carga já gravou (manifesto apontando
+    para o log da UF) são ignoradas mesmo com request.force.
+
+    Ao final, as tabelas de totais derivadas da tabela (ver
+    app.services.etl.rollups) são recalculadas para as UFs recarregadas.
+    """
+
+    def __init__(
+            self,
+            request: ETLRequest,
+            workers: Optional[int] = None,
+            writers: Optional[int] = None,
+            chunk_size: Optional[int] = None,
+            download: bool = False,
+            mode: Optional[str] = None,
+            resume: bool = False
+    ):
+        """
+        Args:
+            request: Requisição de ETL (a UF é ignorada; todas as UFs são carregadas)
+            workers: Processos de parse (padrão: settings.ETL_PARSE_WORKERS)
+            writers: Conexões de COPY concorrentes (padrão: settings.ETL_COPY_WRITERS)
+            chunk_size: Linhas por lote (padrão: settings.ETL_CHUNK_SIZE)
+            download: Lê os CSVs do ZIP publicado no CKAN (baixado uma vez para o
+                ArchiveCache ou, sem cache, lido em streaming por cada worker)
+            mode: "delete", "swap" ou "merge" (padrão: settings.ETL_LOAD_MODE ou
+                Dataset.default_mode); delete vira merge ou swap (ver acima)
+            resume: Retoma a carga do log informado em run()
+        """
+        self.request = request
+        self.dataset = get_dataset(request.tipo)
+        self.model = self.dataset.model
+        self.table_name = self.dataset.table_name
+        self.workers = workers or settings.ETL_PARSE_WORKERS
+        self.writers = writers or settings.ETL_COPY_WRITERS
+        self.chunk_size = chunk_size or settings.ETL_CHUNK_SIZE
+        self.download = download
+        self.mode = mode or settings.ETL_LOAD_MODE or self.dataset.default_mode
+        if self.mode == "delete":
+            self.mode = "merge" if self.dataset.key and not is_partitioned(self.model) else "swap"
+            logger.info(f"🔀 {self.table_name}: fan-out no modo {self.mode} (delete não é atômico por UF)")
+        self.resume = resume
+        self.previous_logs: Set[uuid.UUID] = set()
+        self.staging: Optional[StagingTable] = None
+        self.partition_stagings: Dict[str, PartitionStaging] = {}
+        self.merge_stagings: Dict[str, MergeStaging] = {}
+
+        self.states: Dict[str, UFState] = {}
+        self.repository: Optional[ETLLogRepository] = None
+        self.manifest: Optional[ETLManifestRepository] = None
+        self.progress: Optional[ProgressTracker] = None
+        self.log_id: Optional[uuid.UUID] = None
+        self.status_lock = asyncio.Lock()
+        self.checkpoint: Optional[Checkpoint] = None
+        # Erro fatal de um writer (ex: conexão recusada): a carga é abortada
+        self.aborted: Optional[BaseException] = None
+
+    async def run(self, log_id: Optional[uuid.UUID] = None) -> uuid.UUID:
+        """
+        Executa a carga de todas as UFs.
+
+        Args:
+            log_id: ETLLog pai já criado (ex: pela fila de jobs); sem ele, um novo é criado
+
+        Returns:
+            ID do ETLLog pai
+        """
+        async with AsyncSessionMaker() as session:
+            self.repository = ETLLogRepository(session)
+            self.manifest = ETLManifestRepository(session)
+            parent = await self.repository.get(log_id) if log_id else None
+            parent = parent or await self.repository.create_log(process_name_for(self.request))
+            await self.repository.mark_processing(parent.id)
+            self.progress = ProgressTracker(self.repository, parent.id)
+            self.log_id = parent.id
+            previous_checkpoint = Checkpoint.from_log(parent) if self.resume else None
+            self.checkpoint = Checkpoint(
+                parent.id, request=self.request.model_dump(mode="json"), mode=self.mode, download=self.download,
+                indexes=previous_checkpoint.indexes if previous_checkpoint else None,
+            )
+            await self.repository.save_checkpoint(parent.id, self.checkpoint.state())
+
+            previous = {}
+            if self.resume:
+                previous = {child.process_name: child for child in await self.repository.list_children(parent.id)}
+                self.previous_logs = {child.id for child in previous.values()}
+
+            for uf in UFEnum:
+                process_name = process_name_for(self.request.model_copy(update={"uf": uf}))
+                child = previous.get(process_name) or await self.repository.create_log(
+                    process_name, parent_id=parent.id
+                )
+                await self.repository.mark_processing(child.id)
+                self.states[uf.value] = UFState(
+                    log_id=child.id, progress=ProgressTracker(self.repository, child.id)
+                )
+
+            logger.info(
+                f"🚀 Fan-out {parent.process_name}: {len(self.states)} UFs, "
+                f"{self.workers} workers de parse, {self.writers} writers de COPY"
+            )
+
+            try:
+                await self._execute()
+            except Exception as e:
+                logger.error(f"❌ Erro no fan-out {parent.process_name}: {e}")
+                await self.repository.mark_error(parent.id, str(e), self._total_rows())
+                raise
+
+            failed = sorted(uf for uf, state in self.states.items() if state.error)
+            total = self._total_rows()
+            await self.progress.finish()
+            if failed:
+                await self.repository.mark_error(parent.id, f"UFs com erro: {', '.join(failed)}", total)
+                logger.warning(f"⚠️ {parent.process_name}: {total} registros, UFs com erro: {failed}")
+            else:
+                await self.repository.mark_done(parent.id, total)
+                logger.info(f"✅ {parent.process_name}: {total} registros carregados")
+
+            return parent.id
+
+    async def _execute(self) -> None:
+        """
+        Dispara os processos de parse e os writers, aguardando ambos terminarem.
+        No modo swap de tabelas não particionadas, a carga inteira roda com o
+        lock da tabela (ver table_lock).
+        """
+        if self.mode != "swap" or is_partitioned(self.model):
+            await self._load()
+            return
+
+        conn = await create_copy_connection()
+        try:
+            async with table_lock(conn, self.table_name):
+                await self._load()
+        finally:
+            await conn.close()
+
+    async def _load(self) -> None:
+        """Carga a partir dos CSVs locais ou do ZIP baixado, preso no ArchiveCache até o fim."""
+        if not self.download:
+            await self._load_archive(None)
+            return
+
+        await self.progress.set_stage("download")
+        async with archive_location(self.request) as archive:
+            await self._load_archive(archive)
+
+    async def _load_archive(self, archive: Optional[str]) -> None:
+        """Seleciona as UFs com arquivo novo, grava os lotes e aplica as stagings."""
+        pending = await self._select_changed(archive)
+        if not pending:
+            return
+
+        sizes = [self.states[uf].stamp.size for uf in pending]
+        self.progress.set_total(sum(sizes) if None not in sizes else None)
+        await self.progress.set_stage("load")
+        for uf in pending:
+            state = self.states[uf]
+            state.quarantine = QuarantineSink(self.log_id, self._location(uf, archive)[1])
+            state.progress.set_total(state.stamp.size)
+            await state.progress.set_stage("load")
+
+        await self._run_workers(pending, archive)
+
+        if self.partition_stagings:
+            await self._apply_partition_stagings(pending)
+        elif self.staging:
+            await self._apply_staging(pending)
+        elif self.merge_stagings:
+            async with self._bulk_load(await self._deferred_indexes(pending), pending):
+                await self._apply_merges(pending)
+        await self._refresh_rollups(pending)
+
+    async def _run_workers(self, pending: List[str], archive: Optional[str]) -> None:
+        """Processos de parse das UFs pendentes e writers de COPY, até a última UF terminar."""
+        loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context("spawn")
+        with context.Manager() as manager, \
+                ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool, \
+                ThreadPoolExecutor(max_workers=self.writers + 1) as queue_threads:
+            queue = manager.Queue(maxsize=settings.ETL_QUEUE_SIZE)
+            sent_counts = manager.dict()
+            writers = [
+                asyncio.create_task(self._writer(queue, queue_threads, pool))
+                for _ in range(self.writers)
+            ]
+
+            parses = {}
+            for uf in pending:
+                location, member_name = self._location(uf, archive)
+                parses[uf] = loop.run_in_executor(
+                    pool,
+                    parse_uf_file,
+                    self.request.tipo.value,
+                    uf,
+                    location,
+                    member_name,
+                    self.chunk_size,
+                    queue,
+                    str(self.log_id),
+                    sent_counts,
+                )
+            results = await asyncio.gather(*parses.values(), return_exceptions=True)
+
+            # Processos que morreram sem enviar a mensagem final: a UF termina
+            # quando os lotes que o worker chegou a enviar forem consumidos
+            for uf, result in zip(parses, results):
+                if isinstance(result, BaseException):
+                    sent = await loop.run_in_executor(queue_threads, sent_counts.get, uf, 0)
+                    await self._on_end(uf, sent, f"Worker falhou: {result}")
+
+            for _ in writers:
+                await loop.run_in_executor(queue_threads, queue.put, None)
+            await asyncio.gather(*writers)
+
+    async def _deferred_indexes(self, pending: List[str]) -> Optional[DeferredIndexes]:
+        """
+        Carga em massa (modo merge): na primeira carga das UFs, a pedido
+        (request.defer_indexes) ou para recriar os índices removidos por uma
+        carga interrompida.
+        """
+        if self.mode != "merge":
+            return None
+        first_load = True
+        for uf in pending:
+            if await self.manifest.get(self.table_name, self.request.ano, uf) is not None:
+                first_load = False
+                break
+        if self.request.defer_indexes or self.checkpoint.indexes or first_load:
+            return DeferredIndexes(self.table_name, self.checkpoint.indexes)
+        return None
+
+    @asynccontextmanager
+    async def _bulk_load(self, deferred: Optional[DeferredIndexes], pending: List[str]) -> AsyncIterator[None]:
+        """Índices removidos durante o bloco (ver DeferredIndexes.bulk_load)."""
+        if deferred is None:
+            yield
+            return
+
+        relations = [self.table_name]
+        if is_partitioned(self.model):
+            relations = [uf_partition_name(self.table_name, self.request.ano, uf) for uf in pending]
+        conn = await create_copy_connection()
+        try:
+            loaded = partition_filter(self.request.ano, pending, self.dataset.year_column, self.dataset.uf_column)
+            async with deferred.bulk_load(conn, loaded, relations, self.progress, self.checkpoint):
+                yield
+        finally:
+            await conn.close()
+
+    def _location(self, uf: str, archive: Optional[str]) -> Tuple[str, str]:
+        """Origem (location, member_name) do CSV de uma UF."""
+        csv_path = resolve_csv_path(self.request.model_copy(update={"uf": UFEnum(uf)}))
+        return archive or str(csv_path), csv_path.name
+
+    async def _select_changed(self, archive: Optional[str]) -> List[str]:
+        """
+        Compara a geração/fingerprint do arquivo de cada UF com o manifesto.
+        UFs sem mudança são marcadas como ignoradas; para as demais, a staging
+        é criada sem as linhas antigas (modo "swap") ou cada UF ganha uma
+        staging de merge (modo "merge").
+
+        Returns:
+            UFs que precisam ser carregadas
+        """
+        stamps = await asyncio.gather(
+            *(asyncio.to_thread(read_stamp, *self._location(uf, archive)) for uf in self.states),
+            return_exceptions=True
+        )
+
+        pending = []
+        for uf, stamp in zip(list(self.states), stamps):
+            state = self.states[uf]
+            if isinstance(stamp, BaseException):
+                state.error, state.finished = f"{type(stamp).__name__}: {stamp}", True
+                logger.error(f"❌ UF {uf}: arquivo indisponível ({stamp})")
+                await self.repository.mark_error(state.log_id, state.error, 0)
+                continue
+
+            state.stamp = stamp
+            if await self._already_loaded(uf, stamp):
+                state.finished = True
+                await self.repository.mark_skipped(state.log_id)
+                logger.info(f"↪️ UF {uf}: geração {stamp.dt_geracao} {stamp.hh_geracao} já carregada")
+                continue
+            pending.append(uf)
+
+        if pending:
+            conn = await create_copy_connection()
+            try:
+                partitioned = is_partitioned(self.model)
+                if self.mode == "swap" and partitioned:
+                    for uf in pending:
+                        staging = PartitionStaging(self.table_name, self.request.ano, uf, self.log_id)
+                        await staging.create(conn)
+                        self.partition_stagings[uf] = staging
+                elif self.mode == "swap":
+                    self.staging = StagingTable(self.table_name, self.log_id)
+                    await self.staging.create(conn, keep=partition_filter(
+                        self.request.ano, pending, self.dataset.year_column, self.dataset.uf_column
+                    ))
+                else:
+                    for uf in pending:
+                        merge = MergeStaging(self.dataset, self.request.ano, uf, self.log_id)
+                        await merge.create(conn)
+                        self.merge_stagings[uf] = merge
+            finally:
+                await conn.close()
+
+        logger.info(f"🎯 {len(pending)} de {len(self.states)} UFs com arquivo novo ou alterado")
+        return pending
+
+    async def _already_loaded(self, uf: str, stamp: SourceStamp) -> bool:
+        """
+        A UF já tem esta versão do arquivo: carregada antes (sem force) ou
+        gravada por esta mesma carga antes da interrupção (retomada).
+        """
+        if not await is_current(self.manifest, self.table_name, self.request.ano, uf, stamp):
+            return False
+        if not self.request.force:
+            return True
+        entry = await self.manifest.get(self.table_name, self.request.ano, uf)
+        return entry.log_id in self.previous_logs
+
+    def _target(self, uf: str) -> str:
+        """Staging onde os lotes da UF são gravados."""
+        if uf in self.partition_stagings:
+            return self.partition_stagings[uf].name
+        if uf in self.merge_stagings:
+            return self.merge_stagings[uf].name
+        return self.staging.name
+
+    async def _apply_partition_stagings(self, pending: List[str]) -> None:
+        """Troca as partições das UFs carregadas sem erro e descarta as stagings das demais."""
+        loaded = [uf for uf in pending if not self.states[uf].error]
+        conn = await create_copy_connection()
+        try:
+            for uf in pending:
+                if uf not in loaded:
+                    await self.partition_stagings[uf].drop(conn)
+            await self.progress.set_stage("index")
+            for uf in loaded:
+                await self.partition_stagings[uf].finalize(conn)
+            await self.progress.set_stage("swap")
+            await swap_partitions(conn, [self.partition_stagings[uf] for uf in loaded])
+        except Exception:
+            for uf in loaded:
+                await self.partition_stagings[uf].drop(conn)
+            raise
+        finally:
+            await conn.close()
+
+        for uf in loaded:
+            state = self.states[uf]
+            await record_load(
+                self.manifest, self.table_name, self.request.ano, uf, state.stamp, state.rows, state.log_id
+            )
+
+    async def _apply_staging(self, pending: List[str]) -> None:
+        """Troca a tabela pela staging se todas as UFs carregaram; senão a descarta."""
+        loaded = [uf for uf in pending if not self.states[uf].error]
+        conn = await create_copy_connection()
+        try:
+            if len(loaded) < len(pending):
+                await self.staging.drop(conn)
+                for uf in loaded:
+                    state = self.states[uf]
+                    state.error = "Descartada: swap cancelado por erro em outras UFs"
+                    await self.repository.mark_error(state.log_id, state.error, state.rows)
+                return
+
+            await self.progress.set_stage("index")
+            await self.staging.finalize(conn)
+            await self.progress.set_stage("swap")
+            await self.staging.swap(conn)
+        except Exception:
+            await self.staging.drop(conn)
+            raise
+        finally:
+            await conn.close()
+
+        for uf in loaded:
+            state = self.states[uf]
+            await record_load(
+                self.manifest, self.table_name, self.request.ano, uf, state.stamp, state.rows, state.log_id
+            )
+
+    async def _apply_merges(self, pending: List[str]) -> None:
+        """Aplica as stagings das UFs carregadas sem erro e descarta as das demais."""
+        conn = await create_copy_connection()
+        try:
+            await self.progress.set_stage("merge")
+            for uf in pending:
+                state, merge = self.states[uf], self.merge_stagings[uf]
+                if state.error:
+                    await merge.drop(conn)
+                    continue
+                try:
+                    await merge.merge(conn)
+                except Exception as e:
+                    logger.error(f"❌ Erro no merge da UF {uf}: {e}")
+                    await merge.drop(conn)
+                    state.error = f"{type(e).__name__}: {e}"
+                    await self.repository.mark_error(state.log_id, state.error, state.rows)
+                    continue
+                await record_load(
+                    self.manifest, self.table_name, self.request.ano, uf, state.stamp, state.rows, state.log_id
+                )
+        finally:
+            await conn.close()
+
+    async def _refresh_rollups(self, pending: List[str]) -> None:
+        """Recalcula as tabelas de totais das UFs recarregadas (ver app.services.etl.rollups)."""
+        if self.table_name not in ROLLUPS:
+            return
+        conn = await create_copy_connection()
+        try:
+            await self.progress.set_stage("rollup")
+            await refresh_rollups(conn, self.table_name, self.request.ano, pending)
+        finally:
+            await conn.close()
+
+    async def _writer(self, queue, queue_threads: ThreadPoolExecutor, pool: ProcessPoolExecutor) -> None:
+        """
+        Consome a fila e grava cada lote via COPY em uma conexão própria.
+
+        Um erro fora do COPY de uma UF (ex: conexão recusada) aborta a carga:
+        os parses ainda não iniciados são cancelados e o writer continua
+        consumindo a fila, descartando os lotes, até o sentinela; sem isso os
+        workers travariam no put da fila cheia. O erro sobe no fim.
+        """
+        loop = asyncio.get_running_loop()
+        stopped = False
+        try:
+            conn = await create_copy_connection()
+            try:
+                while True:
+                    message = await loop.run_in_executor(queue_threads, queue.get)
+                    if message is None:
+                        stopped = True
+                        break
+                    if self.aborted is None:
+                        await self._write(conn, message)
+            finally:
+                await conn.close()
+        except Exception as e:
+            if self.aborted is None:
+                self.aborted = e
+                logger.error(f"❌ Writer de COPY falhou, abortando o fan-out: {e}")
+                pool.shutdown(wait=False, cancel_futures=True)
+            while not stopped:
+                stopped = await loop.run_in_executor(queue_threads, queue.get) is None
+            raise
+
+    async def _write(self, conn: asyncpg.Connection, message: tuple) -> None:
+        """Grava um lote da fila (ou registra o fim de uma UF)."""
+        kind, uf = message[0], message[1]
+        if kind == "end":
+            await self._on_end(uf, message[2], message[3])
+            return
+
+        columns, batch, lines, (bytes_read, parse_seconds, parse_rejected) = message[2:6]
+        state = self.states[uf]
+        if state.finished or state.error:
+            # UF já encerrada (lote de um worker morto que chegou depois do
+            # fim) ou com erro no COPY: o lote não é gravado, só contado
+            state.batches_dropped += 1
+            if state.finished:
+                logger.warning(f"⚠️ UF {uf}: lote recebido após o fim da UF descartado")
+            else:
+                state.batches_written += 1
+                await self._finish_if_complete(uf)
+            return
+        # As rejeições do parse contam no mesmo limite das recusadas pelo COPY
+        state.quarantine.count += parse_rejected
+        try:
+            started = time.monotonic()
+            loaded = await copy_with_quarantine(
+                conn, self._target(uf), batch, columns, lines, state.quarantine
+            )
+            copy_seconds = time.monotonic() - started
+            rejected = parse_rejected + len(batch) - loaded
+            state.rows += loaded
+            state.progress.add(loaded, bytes_read, parse_seconds, copy_seconds, rejected)
+            self.progress.add(loaded, bytes_read, parse_seconds, copy_seconds, rejected)
+            await state.progress.tick()
+            await self.progress.tick()
+        except Exception as e:
+            logger.error(f"❌ Erro no COPY da UF {uf}: {e}")
+            state.error = state.error or f"{type(e).__name__}: {e}"
+        state.batches_written += 1
+        await self._finish_if_complete(uf)
+
+    async def _on_end(self, uf: str, batches_sent: int, error: Optional[str]) -> None:
+        """Registra a mensagem final de uma UF."""
+        state = self.states[uf]
+        state.batches_sent = batches_sent
+        if error:
+            logger.error(f"❌ Erro no parse da UF {uf}: {error}")
+            state.error = state.error or error
+        await self._finish_if_complete(uf)
+
+    async def _finish_if_complete(self, uf: str) -> None:
+        """Atualiza o ETLLog filho quando todos os lotes da UF foram gravados."""
+        state = self.states[uf]
+        if state.finished or state.batches_sent is None or state.batches_written < state.batches_sent:
+            return
+
+        state.finished = True
+        await state.progress.finish()
+        async with self.status_lock:
+            if state.error:
+                await self.repository.mark_error(state.log_id, state.error, state.rows)
+            else:
+                await self.repository.mark_done(state.log_id, state.rows)
+        dropped = f", {state.batches_dropped} lotes descartados" if state.batches_dropped else ""
+        logger.info(f"📍 UF {uf}: {state.rows} registros ({'erro' if state.error else 'ok'}{dropped})")
+
+    def _total_rows(self) -> int:
+        return sum(state.rows for state in self.states.values())
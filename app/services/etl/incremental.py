@@ -0,0 +1,180 @@
+import csv
+import hashlib
+import os
+import uuid
+import zipfile
+from contextlib import closing
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import asyncpg
+import httpx
+from loguru import logger
+
+from app.core.config import settings
+from app.repository.manifest_repository import ETLManifestRepository
+from app.services.etl.download import member_basename, open_csv_lines, read_central_directory
+
+YEAR_COLUMN = "ano_eleicao"
+UF_COLUMN = "sg_uf"
+NATIONAL = "BR"
+
+
+@dataclass
+class SourceStamp:
+    """Identificação de uma versão do arquivo: geração declarada pelo TSE + fingerprint do conteúdo."""
+    dt_geracao: Optional[str]
+    hh_geracao: Optional[str]
+    fingerprint: Optional[str]
+    size: Optional[int] = None
+
+
+def fingerprint_source(location: str, member_name: str) -> Optional[str]:
+    """
+    Fingerprint barato do CSV de origem.
+
+    - ZIP (local ou remoto): CRC32 + tamanho do membro, lidos do diretório central
+      (nada é descompactado; no remoto só o fim do arquivo é baixado via Range)
+    - CSV local: sha256 do conteúdo
+
+    Returns:
+        Fingerprint ou None quando não é possível calculá-lo sem baixar o arquivo
+    """
+    wanted = member_basename(member_name)
+
+    if location.startswith(("http://", "https://")):
+        with httpx.Client(timeout=settings.ETL_DOWNLOAD_TIMEOUT, follow_redirects=True) as client:
+            members = read_central_directory(client, location)
+        match = next((m for m in members or [] if member_basename(m.name) == wanted), None)
+        return f"crc32:{match.crc:08x}:{match.uncompressed_size}" if match else None
+
+    if location.lower().endswith(".zip"):
+        with zipfile.ZipFile(location) as archive:
+            match = next((info for info in archive.infolist() if member_basename(info.filename) == wanted), None)
+        return f"crc32:{match.CRC:08x}:{match.file_size}" if match else None
+
+    digest = hashlib.sha256()
+    with open(location, "rb") as fh:
+        while block := fh.read(settings.ETL_DOWNLOAD_CHUNK_SIZE):
+            digest.update(block)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def read_generation(location: str, member_name: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Lê dt_geracao/hh_geracao da primeira linha de dados do CSV.
+    Em ZIPs remotos apenas o início do membro é baixado.
+    """
+    with closing(open_csv_lines(location, member_name)) as lines:
+        reader = csv.reader(lines, delimiter=settings.ETL_CSV_SEPARATOR, quotechar='"')
+        header = [name.strip().lower() for name in next(reader, [])]
+        row = next(reader, None)
+
+    if row is None:
+        return None, None
+    values = dict(zip(header, row))
+    return values.get("dt_geracao") or None, values.get("hh_geracao") or None
+
+
+def read_stamp(location: str, member_name: str) -> SourceStamp:
+    """Geração + fingerprint do CSV de origem (bloqueante; usar via asyncio.to_thread)."""
+    dt_geracao, hh_geracao = read_generation(location, member_name)
+    fingerprint = fingerprint_source(location, member_name)
+
+    # Tamanho descompactado do CSV: vem do diretório central nos ZIPs
+    size = None
+    if fingerprint and fingerprint.startswith("crc32:"):
+        size = int(fingerprint.rsplit(":", 1)[1])
+    elif not location.startswith(("http://", "https://")) and not location.lower().endswith(".zip"):
+        size = os.path.getsize(location)
+    return SourceStamp(dt_geracao, hh_geracao, fingerprint, size)
+
+
+def partition_uf(uf: Optional[str]) -> str:
+    """UF usada no manifesto; arquivos nacionais (sem UF) usam "BR"."""
+    return uf or NATIONAL
+
+
+async def is_current(
+        manifest: ETLManifestRepository,
+        table_name: str,
+        ano: int,
+        uf: str,
+        stamp: SourceStamp
+) -> bool:
+    """
+    Verifica se a partição já foi carregada a partir desta mesma versão do arquivo.
+
+    A geração (dt/hh_geracao) precisa ser igual; o fingerprint é comparado quando
+    conhecido dos dois lados, pegando republicações que não mudam a geração.
+    """
+    entry = await manifest.get(table_name, ano, uf)
+    if entry is None or stamp.dt_geracao is None:
+        return False
+    if (entry.dt_geracao, entry.hh_geracao) != (stamp.dt_geracao, stamp.hh_geracao):
+        return False
+    if entry.fingerprint and stamp.fingerprint and entry.fingerprint != stamp.fingerprint:
+        return False
+    return True
+
+
+async def record_load(
+        manifest: ETLManifestRepository,
+        table_name: str,
+        ano: int,
+        uf: str,
+        stamp: SourceStamp,
+        records_loaded: int,
+        log_id: Optional[uuid.UUID] = None
+) -> None:
+    """Grava no manifesto a versão do arquivo que acabou de ser carregada."""
+    await manifest.upsert(
+        table_name, ano, uf,
+        stamp.dt_geracao, stamp.hh_geracao, stamp.fingerprint,
+        records_loaded, log_id
+    )
+
+
+def partition_filter(
+        ano: int,
+        ufs: List[str],
+        year_column: str = YEAR_COLUMN,
+        uf_column: Optional[str] = UF_COLUMN
+) -> Tuple[str, list]:
+    """
+    Condição SQL (com parâmetros $1, $2) que seleciona as partições das UFs
+    informadas no ano; "BR" (carga nacional) ou uma tabela sem coluna de UF
+    seleciona o ano inteiro.
+
+    Args:
+        ano: Ano da partição
+        ufs: UFs da partição ou ["BR"]
+        year_column: Coluna do ano na tabela (ex: aa_eleicao, aa_exercicio)
+        uf_column: Coluna da UF na tabela, ou None se ela não existir
+    """
+    if NATIONAL in ufs or uf_column is None:
+        return f"{year_column} = $1", [ano]
+    return f"{year_column} = $1 AND {uf_column} = ANY($2::text[])", [ano, list(ufs)]
+
+
+async def delete_partition(
+        conn: asyncpg.Connection,
+        table_name: str,
+        ano: int,
+        uf: str,
+        year_column: str = YEAR_COLUMN,
+        uf_column: Optional[str] = UF_COLUMN
+) -> int:
+    """
+    Remove as linhas já carregadas de uma partição (ano + UF, ou só o ano para
+    cargas nacionais) antes de recarregá-la, tornando a recarga idempotente.
+
+    Returns:
+        Quantidade de linhas removidas
+    """
+    condition, args = partition_filter(ano, [uf], year_column, uf_column)
+    status = await conn.execute(f"DELETE FROM {table_name} WHERE {condition}", *args)
+    deleted = int(status.split()[-1])
+    if deleted:
+        logger.info(f"🧹 {table_name} {ano} {uf}: {deleted} registros antigos removidos")
+    return deleted
@@ -0,0 +1,211 @@
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Tuple
+
+import asyncpg
+from loguru import logger
+
+from app.services.etl.checkpoint import Checkpoint
+from app.services.etl.progress import ProgressTracker
+from app.services.etl.staging import MAX_IDENTIFIER
+
+INDEX_TAIL = re.compile(r"^CREATE INDEX \S+ ON (?:ONLY )?\S+ (.*)$", re.DOTALL)
+
+
+def child_index_name(index_name: str, table_name: str, child: str) -> str:
+    """Nome do índice de uma partição, derivado do índice da tabela (ex: ..._2024_sp_ix_cargo)."""
+    suffix = index_name[len(table_name):] if index_name.startswith(table_name) else f"_{index_name}"
+    return f"{child}{suffix}"[:MAX_IDENTIFIER]
+
+
+class DeferredIndexes:
+    """
+    Índices secundários de uma tabela adiados durante uma carga em massa
+    (modos delete e merge, que gravam na própria tabela).
+
+    1. check_live(): os índices só são removidos se a tabela não tiver linhas
+       fora das partições carregadas; com outros dados, o DROP travaria a
+       tabela inteira (ACCESS EXCLUSIVE) e deixaria sem índice as consultas
+       das demais UFs e anos, então a carga grava com os índices mantidos
+    2. read(): lê as definições dos índices que não sustentam PK/UNIQUE
+       (índices UNIQUE são mantidos: sem eles, duplicatas entrariam na carga)
+    3. drop(): remove os índices
+    4. o COPY grava sem manter os índices a cada linha
+    5. rebuild(): recria os índices; nas tabelas particionadas, o índice da
+       tabela pai é criado com ON ONLY e as partições são anexadas a ele
+    6. analyze(): ANALYZE da partição carregada
+
+    Em tabelas particionadas com outros dados, a carga em massa de uma
+    partição é a troca de partição (ver PartitionStaging): o COPY grava numa
+    staging sem índices, indexada só no fim e anexada no lugar da partição.
+
+    Fora de transação, as definições ficam no Checkpoint da carga: se o
+    processo morrer com os índices removidos, a retomada os reconstrói
+    (CONCURRENTLY, se a tabela já estiver em uso).
+    """
+
+    def __init__(self, table_name: str, definitions: Optional[List[List[str]]] = None):
+        """
+        Args:
+            table_name: Tabela da carga
+            definitions: [nome, definição] já lidos (ex: do checkpoint de uma carga interrompida)
+        """
+        self.table_name = table_name
+        self.definitions: List[List[str]] = [list(d) for d in definitions or []]
+        self.live = False
+
+    async def read(self, conn: asyncpg.Connection) -> List[List[str]]:
+        """Lê os índices secundários da tabela (mantém os já conhecidos)."""
+        if not self.definitions:
+            rows = await conn.fetch(
+                """
+                SELECT i.relname AS name, pg_get_indexdef(x.indexrelid) AS definition
+                FROM pg_index x
+                JOIN pg_class i ON i.oid = x.indexrelid
+                WHERE x.indrelid = $1::regclass
+                  AND NOT x.indisunique
+                  AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+                """,
+                self.table_name,
+            )
+            self.definitions = [[row["name"], row["definition"]] for row in rows]
+        return self.definitions
+
+    async def check_live(self, conn: asyncpg.Connection, loaded: Tuple[str, list]) -> bool:
+        """
+        A tabela tem linhas fora das partições carregadas (a API lê dela
+        durante a carga): os índices não são removidos e a reconstrução dos
+        que uma carga interrompida deixou para trás usa CONCURRENTLY.
+
+        Args:
+            loaded: Filtro (sql, args) das partições da carga (ver partition_filter)
+        """
+        condition, args = loaded
+        self.live = await conn.fetchval(
+            f"SELECT EXISTS (SELECT 1 FROM {self.table_name} WHERE NOT COALESCE({condition}, false))", *args
+        )
+        return self.live
+
+    async def _partitioned(self, conn: asyncpg.Connection, relation: str) -> bool:
+        return await conn.fetchval("SELECT relkind = 'p' FROM pg_class WHERE oid = $1::regclass", relation)
+
+    async def drop(self, conn: asyncpg.Connection) -> None:
+        """Remove os índices lidos em read()."""
+        if not self.definitions:
+            return
+
+        start = time.monotonic()
+        for name, definition in self.definitions:
+            logger.debug(f"🗑️ Removendo {name} até o fim da carga: {definition}")
+            await conn.execute(f"DROP INDEX IF EXISTS {name}")
+        logger.info(
+            f"🗑️ {self.table_name}: {len(self.definitions)} índices secundários removidos para a carga "
+            f"em {time.monotonic() - start:.1f}s"
+        )
+
+    async def _create(self, conn: asyncpg.Connection, relation: str, name: str, tail: str) -> None:
+        if not await self._partitioned(conn, relation):
+            # Um CREATE INDEX CONCURRENTLY interrompido deixa o índice inválido
+            if await conn.fetchval("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass($1)", name):
+                await conn.execute(f"DROP INDEX IF EXISTS {name}")
+            concurrently = "CONCURRENTLY " if self.live and not conn.is_in_transaction() else ""
+            await conn.execute(f"CREATE INDEX {concurrently}IF NOT EXISTS {name} ON {relation} {tail}")
+            return
+
+        await conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY {relation} {tail}")
+        children = await conn.fetch(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = $1::regclass",
+            relation,
+        )
+        for child in children:
+            child_name = child_index_name(name, relation, child["relname"])
+            await self._create(conn, child["relname"], child_name, tail)
+            await conn.execute(f"ALTER INDEX {name} ATTACH PARTITION {child_name}")
+
+    async def rebuild(self, conn: asyncpg.Connection) -> None:
+        """Recria os índices removidos (CONCURRENTLY se a tabela estiver em uso e fora de transação)."""
+        if not self.definitions:
+            return
+
+        start = time.monotonic()
+        for name, definition in self.definitions:
+            match = INDEX_TAIL.match(definition)
+            if match is None:
+                await conn.execute(definition.replace("CREATE INDEX ", "CREATE INDEX IF NOT EXISTS ", 1))
+                continue
+            await self._create(conn, self.table_name, name, match.group(1))
+        logger.info(
+            f"🏗️ {self.table_name}: {len(self.definitions)} índices reconstruídos "
+            f"{'(CONCURRENTLY) ' if self.live else ''}em {time.monotonic() - start:.1f}s"
+        )
+
+    async def analyze(self, conn: asyncpg.Connection, relation: Optional[str] = None) -> None:
+        """ANALYZE da relação carregada (partição ou tabela), para o planner enxergar os dados novos."""
+        relation = relation or self.table_name
+        start = time.monotonic()
+        await conn.execute(f"ANALYZE {relation}")
+        logger.info(f"📈 ANALYZE {relation} em {time.monotonic() - start:.1f}s")
+
+    @asynccontextmanager
+    async def bulk_load(
+            self,
+            conn: asyncpg.Connection,
+            loaded: Tuple[str, list],
+            relations: List[str],
+            progress: Optional[ProgressTracker] = None,
+            checkpoint: Optional[Checkpoint] = None
+    ) -> AsyncIterator["DeferredIndexes"]:
+        """
+        Remove os índices (só se a tabela não tiver outros dados, ver
+        check_live), executa o bloco (a carga), os reconstrói e roda o ANALYZE
+        das relações carregadas. O ANALYZE só roda se o bloco terminar sem erro.
+
+        Dentro de uma transação (modo delete), o DROP e a reconstrução fazem
+        parte dela: com erro, o ROLLBACK devolve os índices. Fora dela, com
+        erro, os índices são reconstruídos assim mesmo, para a tabela não
+        ficar sem eles, e o checkpoint guarda as definições até a reconstrução.
+
+        Args:
+            conn: Conexão asyncpg
+            loaded: Filtro (sql, args) das partições da carga (ver partition_filter)
+            relations: Partições (ou a tabela) que recebem o ANALYZE
+            progress: Registra as etapas "index" e "analyze" no ETLLog
+            checkpoint: Recebe as definições antes do DROP (ver Checkpoint.indexes)
+        """
+        # Definições já conhecidas: índices removidos por uma carga interrompida
+        recovering = bool(self.definitions)
+        transactional = conn.is_in_transaction()
+        if not await self.check_live(conn, loaded):
+            await self.read(conn)
+        elif not recovering:
+            logger.info(f"📚 {self.table_name}: tabela com outros dados; índices mantidos durante a carga")
+
+        if self.definitions and checkpoint is not None and not transactional:
+            checkpoint.indexes = self.definitions
+            await checkpoint.save(conn)
+        if not recovering:
+            await self.drop(conn)
+
+        try:
+            yield self
+        except Exception:
+            if transactional:
+                raise
+            try:
+                await self.rebuild(conn)
+            except Exception as e:
+                logger.error(f"❌ Índices de {self.table_name} não reconstruídos ({e}); a retomada os recria")
+            raise
+
+        if progress:
+            await progress.set_stage("index")
+        await self.rebuild(conn)
+        if self.definitions and checkpoint is not None and not transactional:
+            checkpoint.indexes = None
+            await checkpoint.save(conn)
+        if progress:
+            await progress.set_stage("analyze")
+        for relation in relations:
+            await self.analyze(conn, relation)
@@ -0,0 +1,598 @@
+import asyncio
+import time
+import uuid
+from contextlib import AsyncExitStack, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import asyncpg
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import AsyncSessionMaker, create_copy_connection
+from app.repository.log_repository import ETLLogRepository
+from app.repository.manifest_repository import ETLManifestRepository
+from app.schemas.etl_schemas import ETLRequest, TipoETLEnum
+from app.services.etl.checkpoint import Checkpoint
+from app.services.etl.csv_stream import CSVBatchReader
+from app.services.etl.datasets import (
+    DATASETS,
+    Dataset,
+    get_dataset,
+    process_name_for,
+    archive_location,
+    resolve_csv_path,
+)
+from app.services.etl.download import open_csv_lines
+from app.services.etl.fanout import FanOutLoader
+from app.services.etl.indexes import DeferredIndexes
+from app.services.etl.incremental import (
+    NATIONAL,
+    delete_partition,
+    is_current,
+    partition_filter,
+    partition_uf,
+    read_stamp,
+    record_load,
+)
+from app.services.etl.merge import MergeStaging
+from app.services.etl.partitions import (
+    PartitionStaging,
+    ensure_year_partition,
+    is_partitioned,
+    uf_partition_name,
+    year_partition_name,
+)
+from app.services.etl.pipeline import BoundedStage, MemoryBudget, PipelineMeters, log_pipeline
+from app.services.etl.progress import ProgressTracker
+from app.services.etl.quarantine import QuarantineSink, copy_with_quarantine
+from app.services.etl.rollups import ROLLUPS, refresh_rollups
+from app.services.etl.staging import StagingTable, table_lock
+
+
+@dataclass
+class ParsedBatch:
+    """Lote pronto para o COPY e a posição do reader logo após ele (base do checkpoint)."""
+    batch: List[tuple]
+    lines: List[int]
+    line_num: int
+    bytes_read: int
+    rejected: int
+    parse_seconds: float
+
+
+class CopyLoader:
+    """Carrega arquivos CSV do TSE em uma tabela usando COPY do asyncpg."""
+
+    def __init__(
+            self,
+            model,
+            chunk_size: Optional[int] = None,
+            table_name: Optional[str] = None,
+            rename: Optional[Dict[str, str]] = None
+    ):
+        """
+        Args:
+            model: Model SQLAlchemy de destino
+            chunk_size: Linhas por lote enviado ao COPY (padrão: settings.ETL_CHUNK_SIZE)
+            table_name: Tabela onde gravar, se diferente da do model (ex: a staging)
+            rename: Cabeçalho do CSV -> coluna do model (ver Dataset.rename)
+        """
+        self.model = model
+        self.table_name = table_name or model.__tablename__
+        self.chunk_size = chunk_size or settings.ETL_CHUNK_SIZE
+        self.rename = rename
+
+    @classmethod
+    def for_dataset(cls, dataset: Dataset, chunk_size: Optional[int] = None, table_name: Optional[str] = None):
+        """Loader de uma entrada do registry de datasets."""
+        return cls(dataset.model, chunk_size, table_name=table_name, rename=dataset.rename)
+
+    def _parse_batches(self, reader: CSVBatchReader) -> Iterator[ParsedBatch]:
+        """Lotes do reader com a posição no arquivo ao fim de cada um (roda na thread da etapa de parse)."""
+        started = time.monotonic()
+        for batch in reader.iter_batches(self.chunk_size):
+            yield ParsedBatch(
+                batch, reader.batch_lines, reader.line_num, reader.bytes_read, reader.rejected,
+                time.monotonic() - started,
+            )
+            started = time.monotonic()
+
+    async def load_lines(
+            self,
+            conn: asyncpg.Connection,
+            lines: Iterable[str],
+            source: str = "<stream>",
+            progress: Optional[ProgressTracker] = None,
+            quarantine: Optional[QuarantineSink] = None,
+            checkpoint: Optional[Checkpoint] = None,
+            meters: Optional[PipelineMeters] = None
+    ) -> int:
+        """
+        Envia as linhas de um CSV (com cabeçalho) para a tabela em lotes.
+        Cada lote é gravado (e confirmado) em uma transação própria.
+
+        A leitura e o parse rodam em uma etapa própria (BoundedStage, em uma
+        thread) que prepara até settings.ETL_PIPELINE_DEPTH lotes enquanto o
+        COPY grava o anterior; com a fila cheia o parse para, e com ele o
+        download. Acima de settings.ETL_MEMORY_BUDGET_MB de RSS o parse só
+        entrega um lote quando a fila esvazia (ver MemoryBudget).
+        Com quarentena, linhas malformadas ou recusadas pelo banco são desviadas
+        e a carga continua até o limite de rejeições (ver QuarantineSink).
+        Com checkpoint, a leitura começa após a última linha confirmada e o
+        checkpoint avança na mesma transação de cada lote: uma falha custa no
+        máximo o lote em andamento (os lotes já preparados são lidos de novo).
+
+        Args:
+            conn: Conexão asyncpg
+            lines: Linhas de texto já decodificadas
+            source: Nome da origem, usado apenas nos logs
+            progress: Recebe os registros e bytes de cada lote (heartbeat no ETLLog)
+            quarantine: Destino das linhas rejeitadas; sem ela, qualquer linha ruim aborta a carga
+            checkpoint: Ponto de retomada da carga, atualizado a cada lote
+            meters: Medidores das etapas (a etapa "download" é preenchida por open_csv_lines)
+
+        Returns:
+            Quantidade de registros gravados, incluindo os de antes do checkpoint
+        """
+        meters = meters or PipelineMeters()
+        budget = MemoryBudget()
+        reader = await asyncio.to_thread(
+            CSVBatchReader,
+            self.model,
+            lines,
+            settings.ETL_CSV_SEPARATOR,
+            self.rename,
+            quarantine,
+            checkpoint.line if checkpoint else 0,
+        )
+        total = checkpoint.rows if checkpoint else 0
+        bytes_read = checkpoint.bytes_read if checkpoint else 0
+        # Rejeições de antes da retomada, do parse (acumuladas pelo reader) e do COPY
+        rejected_before = checkpoint.rejected if checkpoint else 0
+        parse_rejected = copy_rejected = 0
+        parse, copy = meters.stage("parse"), meters.stage("copy")
+
+        parsing = BoundedStage(
+            self._parse_batches(reader), settings.ETL_PIPELINE_DEPTH, parse, copy, budget
+        ).start()
+        try:
+            async for parsed in parsing:
+                started = time.monotonic()
+                async with conn.transaction():
+                    loaded = await copy_with_quarantine(
+                        conn, self.table_name, parsed.batch, reader.columns, parsed.lines, quarantine
+                    )
+                    if checkpoint:
+                        checkpoint.advance(
+                            parsed.line_num,
+                            parsed.bytes_read,
+                            loaded,
+                            rejected_before + parsed.rejected + copy_rejected + len(parsed.batch) - loaded,
+                        )
+                        await checkpoint.save(conn)
+                copy.busy += time.monotonic() - started
+                copy.items += 1
+                total += loaded
+                rejected_now = parsed.rejected - parse_rejected + len(parsed.batch) - loaded
+                parse_rejected = parsed.rejected
+                copy_rejected += len(parsed.batch) - loaded
+                if progress:
+                    progress.add(
+                        loaded,
+                        parsed.bytes_read - bytes_read,
+                        parsed.parse_seconds,
+                        time.monotonic() - started,
+                        rejected_now,
+                    )
+                    bytes_read = parsed.bytes_read
+                    await progress.tick()
+                logger.debug(f"📦 {source}: {total} registros gravados em {self.table_name}")
+        finally:
+            await asyncio.to_thread(parsing.close)
+            meters.finish()
+            if progress:
+                for name, seconds in meters.timings().items():
+                    progress.timings[name] += seconds
+            log_pipeline(source, meters, budget)
+
+        if quarantine and quarantine.count:
+            logger.warning(f"🚧 {source}: {quarantine.count} linhas rejeitadas (ver {quarantine.path})")
+        logger.info(f"✅ {source}: {total} registros carregados em {self.table_name}")
+        return total
+
+    async def load_file(self, conn: asyncpg.Connection, path: Path) -> int:
+        """
+        Carrega um arquivo CSV local.
+
+        Args:
+            conn: Conexão asyncpg
+            path: Caminho do CSV
+        """
+        return await self.load_source(conn, str(path), path.name)
+
+    async def load_source(
+            self,
+            conn: asyncpg.Connection,
+            location: str,
+            member_name: str,
+            progress: Optional[ProgressTracker] = None,
+            quarantine: Optional[QuarantineSink] = None,
+            checkpoint: Optional[Checkpoint] = None
+    ) -> int:
+        """
+        Carrega um CSV de um ZIP remoto (em streaming, sem gravar em disco), de um
+        ZIP local ou de um CSV local.
+
+        Args:
+            conn: Conexão asyncpg
+            location: URL do ZIP, caminho do ZIP ou caminho do CSV
+            member_name: Nome do CSV dentro do ZIP
+            progress: Ver load_lines
+            quarantine: Ver load_lines
+            checkpoint: Ver load_lines
+        """
+        meters = PipelineMeters()
+        lines = open_csv_lines(location, member_name, meters)
+        try:
+            return await self.load_lines(
+                conn,
+                lines,
+                source=member_name,
+                progress=progress,
+                quarantine=quarantine,
+                checkpoint=checkpoint,
+                meters=meters,
+            )
+        finally:
+            lines.close()
+
+
+LOAD_MODES = ("delete", "swap", "merge")
+
+
+async def replace_partition(
+        conn: asyncpg.Connection,
+        dataset: Dataset,
+        ano: int,
+        uf: str,
+        location: str,
+        member_name: str,
+        mode: str,
+        chunk_size: Optional[int] = None,
+        progress: Optional[ProgressTracker] = None,
+        quarantine: Optional[QuarantineSink] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        deferred: Optional[DeferredIndexes] = None
+) -> int:
+    """
+    Substitui as linhas de uma partição (ano + UF) pelo conteúdo do arquivo.
+    As colunas de ano/UF que delimitam a partição vêm do registry (Dataset).
+
+    - delete: DELETE + COPY na própria tabela em uma única transação: a API
+      nunca vê a partição vazia ou pela metade, mas a carga não é retomável
+    - swap: COPY em uma staging UNLOGGED, índices construídos depois e troca
+      atômica. Em tabelas particionadas só a partição é trocada (DETACH/ATTACH,
+      ver PartitionStaging); nas demais a staging leva o restante da tabela
+      (ver StagingTable) e a carga espera o lock da tabela (ver table_lock)
+    - merge: COPY em uma staging e upsert pela chave natural, reescrevendo só
+      as linhas alteradas (ver MergeStaging)
+
+    Nos modos swap e merge, com checkpoint, cada lote é confirmado junto com o
+    checkpoint e, se a carga falhar durante o COPY, a staging é mantida. Um
+    checkpoint já iniciado retoma a carga: a staging existente é reaberta e a
+    leitura continua após a última linha confirmada. Se a staging não
+    existir mais (ou tiver sido esvaziada por uma queda do Postgres), a carga
+    recomeça do início.
+
+    Com deferred (carga em massa), nos modos delete e merge os índices
+    secundários da tabela são removidos antes de gravar nela e reconstruídos
+    ao final, seguidos de ANALYZE da partição, se a tabela não tiver outros
+    dados (ver DeferredIndexes); no modo delete isso acontece dentro da
+    transação da carga. Em tabelas particionadas, a carga em massa usa o modo
+    swap: a staging da partição só é indexada depois do COPY e é anexada no
+    lugar dela, sem tocar nos índices das demais partições.
+
+    Returns:
+        Quantidade de registros carregados
+    """
+    async def stage(name: str) -> None:
+        if progress:
+            await progress.set_stage(name)
+
+    def resume() -> None:
+        logger.info(
+            f"⏯️ Retomando {dataset.table_name} ({ano}/{uf}) após a linha {checkpoint.line} "
+            f"({checkpoint.rows} registros já gravados)"
+        )
+        if quarantine:
+            quarantine.count = checkpoint.rejected
+        if progress:
+            progress.add(checkpoint.rows, checkpoint.bytes_read, rejected=checkpoint.rejected)
+
+    table_name = dataset.table_name
+    partitioned = is_partitioned(dataset.model)
+    resuming = checkpoint is not None and checkpoint.started
+    if deferred is not None and partitioned and mode != "swap" and not deferred.definitions:
+        logger.info(f"🔀 {table_name} ({ano}/{uf}): carga em massa pela troca de partição (modo swap)")
+        mode = "swap"
+    bulk_load = nullcontext()
+    if deferred is not None and mode in ("delete", "merge"):
+        relation = table_name
+        if partitioned and uf == NATIONAL:
+            relation = year_partition_name(table_name, ano)
+        elif partitioned:
+            relation = uf_partition_name(table_name, ano, uf)
+        bulk_load = deferred.bulk_load(
+            conn,
+            partition_filter(ano, [uf], dataset.year_column, dataset.uf_column),
+            [relation],
+            progress,
+            checkpoint,
+        )
+
+    if mode == "delete":
+        # Sem retomada: os lotes não são confirmados um a um, senão o DELETE deixaria
+        # de ser atômico; os índices removidos (bulk_load) voltam com o ROLLBACK
+        if resuming:
+            logger.warning(f"⚠️ {table_name} ({ano}/{uf}): o modo delete não retoma cargas; recomeçando")
+        async with conn.transaction():
+            async with bulk_load:
+                if partitioned:
+                    await ensure_year_partition(conn, table_name, ano)
+                await delete_partition(conn, table_name, ano, uf, dataset.year_column, dataset.uf_column)
+                await stage("load")
+                loader = CopyLoader.for_dataset(dataset, chunk_size)
+                return await loader.load_source(conn, location, member_name, progress, quarantine)
+
+    keep, lock = None, nullcontext()
+    if mode == "merge":
+        staging = MergeStaging(dataset, ano, uf, checkpoint.log_id if checkpoint else None)
+    elif partitioned:
+        staging = PartitionStaging(table_name, ano, uf, checkpoint.log_id if checkpoint else None)
+    else:
+        # A staging leva as linhas das demais UFs: cargas simultâneas da tabela esperam a vez
+        staging = StagingTable(table_name, checkpoint.log_id if checkpoint else None)
+        keep = partition_filter(ano, [uf], dataset.year_column, dataset.uf_column)
+        lock = table_lock(conn, table_name)
+
+    async with lock:
+        if resuming and not await staging.reopen(conn, has_rows=checkpoint.rows > 0):
+            logger.warning(f"⚠️ Staging {staging.name} não pode ser retomada; a carga recomeça do início")
+            checkpoint.restart()
+            resuming = False
+        if resuming:
+            resume()
+            if keep is not None:
+                await staging.refresh(conn, keep)
+        elif keep is not None:
+            await staging.create(conn, keep=keep)
+        else:
+            await staging.create(conn)
+
+        try:
+            await stage("load")
+            staged_loader = CopyLoader.for_dataset(dataset, chunk_size, table_name=staging.name)
+            total = await staged_loader.load_source(conn, location, member_name, progress, quarantine, checkpoint)
+        except Exception:
+            if checkpoint is None:
+                await staging.drop(conn)
+            else:
+                logger.warning(f"⏸️ Staging {staging.name} mantida para retomada (linha {checkpoint.line})")
+            raise
+
+        try:
+            if mode == "merge":
+                async with bulk_load:
+                    await stage("merge")
+                    await staging.merge(conn)
+            else:
+                await stage("index")
+                await staging.finalize(conn)
+                await stage("swap")
+                await staging.swap(conn)
+        except Exception:
+            await staging.drop(conn)
+            raise
+        return total
+
+
+async def run_etl(
+        request: ETLRequest,
+        csv_path: Optional[Path] = None,
+        download: bool = False,
+        mode: Optional[str] = None,
+        log_id: Optional[uuid.UUID] = None,
+        resume: bool = False
+) -> uuid.UUID:
+    """
+    Executa a carga descrita pelo ETLRequest, registrando o andamento no ETLLog.
+    O model, o arquivo do TSE e as colunas da partição vêm do registry (DATASETS).
+    Sem UF (e sem csv_path explícito), datasets publicados por UF cobrem as 27
+    UFs em paralelo via FanOutLoader; os nacionais carregam o arquivo único do ano.
+
+    A carga é incremental: se o manifesto indica que a partição (tabela, ano, UF)
+    já foi carregada com a mesma geração (dt/hh_geracao) e fingerprint, ela é
+    ignorada (a menos que request.force). Caso contrário, a partição é
+    substituída conforme o modo (ver replace_partition) e as tabelas de totais
+    derivadas dela são recalculadas (ver app.services.etl.rollups).
+
+    O ETLLog guarda um Checkpoint com os parâmetros da carga e, nas cargas de
+    um único arquivo nos modos swap e merge, o último lote confirmado; com
+    resume, a carga continua dele (ver resume_etl). No modo delete a carga é
+    uma única transação e a retomada a refaz do início. Se o arquivo mudou desde a carga interrompida, ela
+    recomeça do início.
+
+    Args:
+        request: Ano, UF e tipo da carga
+        csv_path: Caminho do CSV (padrão: resolve_csv_path(request))
+        download: Lê o CSV do ZIP publicado no CKAN do TSE (via ArchiveCache ou em streaming)
+        mode: "delete", "swap" ou "merge" (padrão: settings.ETL_LOAD_MODE ou Dataset.default_mode)
+        log_id: ETLLog já criado para a execução (ex: pela fila de jobs, ver
+            app.services.etl.tasks); sem ele, um novo é criado
+        resume: Retoma a carga do checkpoint gravado em log_id
+
+    Returns:
+        ID do ETLLog da execução
+    """
+    dataset = get_dataset(request.tipo)
+    mode = mode or settings.ETL_LOAD_MODE or dataset.default_mode
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Modo de carga inválido: {mode} (use {' ou '.join(LOAD_MODES)})")
+    if mode == "merge" and not dataset.key:
+        raise ValueError(f"{request.tipo.value} não tem chave natural; use o modo delete ou swap")
+    if request.uf is not None and not dataset.by_uf:
+        raise ValueError(f"{request.tipo.value} é publicado em arquivo nacional; não informe a UF")
+
+    if request.uf is None and csv_path is None and dataset.by_uf:
+        return await FanOutLoader(request, download=download, mode=mode, resume=resume).run(log_id)
+
+    explicit_path = str(csv_path) if csv_path else None
+    csv_path = csv_path or resolve_csv_path(request)
+    table_name = dataset.table_name
+    uf = partition_uf(request.uf.value if request.uf else None)
+
+    # resources: o ZIP do ArchiveCache fica preso (ver ArchiveCache.use) até o fim da carga
+    async with AsyncSessionMaker() as session, AsyncExitStack() as resources:
+        repository = ETLLogRepository(session)
+        manifest = ETLManifestRepository(session)
+        log = await repository.get(log_id) if log_id else None
+        log = log or await repository.create_log(process_name_for(request))
+        progress = ProgressTracker(repository, log.id)
+        checkpoint = Checkpoint.from_log(log) if resume else None
+        checkpoint = checkpoint or Checkpoint(
+            log.id,
+            request=request.model_dump(mode="json"),
+            mode=mode,
+            download=download,
+            csv_path=explicit_path,
+            member_name=csv_path.name,
+        )
+
+        try:
+            if download:
+                await progress.set_stage("download")
+            location = await resources.enter_async_context(archive_location(request)) if download else str(csv_path)
+            stamp = await asyncio.to_thread(read_stamp, location, csv_path.name)
+        except Exception as e:
+            logger.error(f"❌ Arquivo indisponível para {log.process_name}: {e}")
+            await repository.mark_error(log.id, str(e))
+            raise
+
+        if not checkpoint.matches(stamp):
+            if checkpoint.started:
+                logger.warning(f"⚠️ {log.process_name}: o arquivo mudou desde a carga interrompida; recomeçando")
+            checkpoint.restart(stamp)
+
+        # Uma carga interrompida no meio nunca é ignorada: a partição está incompleta
+        if not request.force and not checkpoint.started and await is_current(
+                manifest, table_name, request.ano, uf, stamp
+        ):
+            logger.info(f"↪️ {log.process_name}: geração {stamp.dt_geracao} {stamp.hh_geracao} já carregada")
+            await repository.mark_skipped(log.id)
+            return log.id
+
+        await repository.mark_processing(log.id)
+        await repository.save_checkpoint(log.id, checkpoint.state())
+        progress.set_total(stamp.size)
+
+        # Carga em massa: na primeira carga da partição, a pedido (defer_indexes)
+        # ou para recriar índices removidos por uma carga interrompida
+        deferred = None
+        if request.defer_indexes or checkpoint.indexes or await manifest.get(table_name, request.ano, uf) is None:
+            deferred = DeferredIndexes(table_name, checkpoint.indexes)
+
+        conn = await create_copy_connection()
+        try:
+            total = await replace_partition(
+                conn, dataset, request.ano, uf, location, csv_path.name, mode,
+                progress=progress, quarantine=QuarantineSink(log.id, csv_path.name), checkpoint=checkpoint,
+                deferred=deferred
+            )
+            if table_name in ROLLUPS:
+                await progress.set_stage("rollup")
+                await refresh_rollups(conn, table_name, request.ano, [uf])
+        except Exception as e:
+            logger.error(f"❌ Erro na carga {log.process_name}: {e}")
+            await progress.finish()
+            await repository.mark_error(log.id, str(e))
+            raise
+        finally:
+            await conn.close()
+
+        await record_load(manifest, table_name, request.ano, uf, stamp, total, log.id)
+        await progress.finish()
+        await repository.mark_done(log.id, total)
+        return log.id
+
+
+async def resume_etl(log_id: uuid.UUID) -> uuid.UUID:
+    """
+    Retoma uma carga interrompida (processo morto, erro no meio do COPY) a
+    partir do checkpoint do seu ETLLog, com os mesmos parâmetros e no mesmo log.
+
+    - Arquivo único: continua após o último lote confirmado, sem duplicar
+      linhas; no modo delete (uma única transação) recomeça do início
+    - Fan-out por UF: as UFs já gravadas pela carga são ignoradas e as demais
+      são carregadas de novo
+
+    Args:
+        log_id: ID do ETLLog da carga
+
+    Returns:
+        ID do ETLLog da execução
+
+    Raises:
+        LookupError: Se o log não existir
+        ValueError: Se a carga já tiver terminado ou não tiver checkpoint
+    """
+    async with AsyncSessionMaker() as session:
+        checkpoint = Checkpoint.for_resume(await ETLLogRepository(session).get(log_id))
+
+    return await run_etl(
+        ETLRequest(**checkpoint.request),
+        Path(checkpoint.csv_path) if checkpoint.csv_path else None,
+        download=checkpoint.download,
+        mode=checkpoint.mode,
+        log_id=checkpoint.log_id,
+        resume=True,
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Carrega um CSV do TSE via COPY.")
+    parser.add_argument("ano", type=int, nargs="?", help="Ano da eleição")
+    parser.add_argument("--uf", type=str, default=None, help="UF (padrão: todas as UFs em paralelo)")
+    parser.add_argument(
+        "--tipo",
+        choices=[tipo.value for tipo in DATASETS],
+        default=TipoETLEnum.CANDIDATO.value,
+        help="Dataset a carregar (padrão: candidato)"
+    )
+    parser.add_argument("--file", type=str, default=None, help="Caminho do CSV (padrão: ETL_DATA_DIR)")
+    parser.add_argument("--download", action="store_true", help="Lê direto do ZIP publicado no CKAN do TSE")
+    parser.add_argument(
+        "--mode", choices=LOAD_MODES, default=None, help="delete, swap ou merge (padrão: ETL_LOAD_MODE ou o da tabela)"
+    )
+    parser.add_argument("--force", action="store_true", help="Recarrega mesmo sem mudança na geração do arquivo")
+    parser.add_argument(
+        "--defer-indexes",
+        action="store_true",
+        help="Remove os índices secundários durante a recarga e os reconstrói ao final",
+    )
+    parser.add_argument("--resume", type=uuid.UUID, default=None, help="Retoma a carga interrompida deste ETLLog")
+    args = parser.parse_args()
+
+    if args.resume:
+        asyncio.run(resume_etl(args.resume))
+        raise SystemExit(0)
+    if args.ano is None:
+        parser.error("informe o ano ou --resume")
+
+    etl_request = ETLRequest(
+        ano=args.ano, uf=args.uf, tipo=args.tipo, force=args.force, defer_indexes=args.defer_indexes
+    )
+    asyncio.run(run_etl(etl_request, Path(args.file) if args.file else None, download=args.download, mode=args.mode))
@@ -0,0 +1,129 @@
+import time
+import uuid
+from typing import Optional, Tuple
+
+import asyncpg
+from loguru import logger
+
+from app.services.etl.datasets import Dataset
+from app.services.etl.incremental import partition_filter
+from app.services.etl.partitions import ensure_year_partition, is_partitioned
+from app.services.etl.staging import staged_name
+
+# Mudam a cada publicação do TSE: compará-las faria o merge reescrever todas as
+# linhas do arquivo, mesmo as que não mudaram
+GENERATION_COLUMNS = ("dt_geracao", "hh_geracao")
+
+
+def _count(status: str) -> int:
+    return int(status.split()[-1])
+
+
+class MergeStaging:
+    """
+    Recarga de uma partição (ano + UF) por upsert na chave natural (modo "merge").
+
+    1. create(): cria uma staging UNLOGGED vazia com as colunas da tabela
+    2. o COPY grava nela (name) em vez da tabela real
+    3. merge(): em uma transação, remove da partição as chaves que sumiram do
+       arquivo e faz INSERT ... ON CONFLICT (chave natural) DO UPDATE apenas
+       nas linhas que mudaram; a staging é descartada
+
+    As linhas já gravadas mantêm o id e só as alteradas são reescritas:
+    recarregar o mesmo arquivo não gera escrita na tabela nem nos índices.
+    """
+
+    def __init__(self, dataset: Dataset, ano: int, uf: str, log_id: Optional[uuid.UUID] = None):
+        """
+        Args:
+            dataset: Dataset com chave natural (Dataset.key)
+            ano: Ano da partição
+            uf: UF da partição ou "BR" para o ano inteiro
+            log_id: ETLLog da carga; o nome da staging leva o final do id (ver StagingTable)
+
+        Raises:
+            ValueError: Se o model do dataset não tiver chave natural
+        """
+        if not dataset.key:
+            raise ValueError(f"{dataset.table_name} não tem chave natural; use o modo delete ou swap")
+
+        self.dataset = dataset
+        self.table_name = dataset.table_name
+        self.ano = int(ano)
+        self.uf = uf
+        self.name = staged_name(f"mrg_{self.ano}_{uf.lower()}_{self.table_name}", log_id.hex[-8:] if log_id else None)
+        # O id não vai para a staging: linhas novas recebem o default da tabela
+        self.columns = [column.name for column in dataset.model.__table__.columns if column.name != "id"]
+
+    async def create(self, conn: asyncpg.Connection) -> None:
+        """Cria a staging vazia (e, em tabelas particionadas, a partição do ano)."""
+        if is_partitioned(self.dataset.model):
+            await ensure_year_partition(conn, self.table_name, self.ano)
+
+        columns = ", ".join(self.columns)
+        await conn.execute(f"DROP TABLE IF EXISTS {self.name}")
+        await conn.execute(
+            f"CREATE UNLOGGED TABLE {self.name} AS SELECT {columns} FROM {self.table_name} WITH NO DATA"
+        )
+        # O CREATE TABLE AS não herda o NOT NULL: sem ele uma linha com chave nula
+        # passaria pelo COPY e só falharia no INSERT, derrubando o merge inteiro
+        await conn.execute(
+            f"ALTER TABLE {self.name} "
+            + ", ".join(f"ALTER COLUMN {column} SET NOT NULL" for column in self.dataset.key)
+        )
+        logger.info(f"🧱 Staging {self.name} criada para merge em {self.table_name}")
+
+    async def reopen(self, conn: asyncpg.Connection, has_rows: bool) -> bool:
+        """Reabre a staging de uma carga interrompida (ver StagingTable.reopen)."""
+        if not await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", self.name):
+            return False
+        if has_rows and not await conn.fetchval(f"SELECT EXISTS (SELECT 1 FROM {self.name})"):
+            return False
+        logger.info(f"🧱 Staging {self.name} reaberta para retomar a carga")
+        return True
+
+    async def merge(self, conn: asyncpg.Connection) -> Tuple[int, int]:
+        """
+        Aplica a staging na tabela e a descarta.
+
+        Linhas repetidas no arquivo (mesma chave) entram uma única vez.
+
+        Returns:
+            (linhas inseridas ou atualizadas, linhas removidas)
+        """
+        key = ", ".join(self.dataset.key)
+        columns = ", ".join(self.columns)
+        updates = [column for column in self.columns if column not in self.dataset.key]
+        compared = [column for column in updates if column not in GENERATION_COLUMNS]
+        condition, args = partition_filter(self.ano, [self.uf], self.dataset.year_column, self.dataset.uf_column)
+        match = " AND ".join(f"s.{column} = t.{column}" for column in self.dataset.key)
+        start = time.monotonic()
+
+        await conn.execute(f"ANALYZE {self.name}")
+        async with conn.transaction():
+            deleted = await conn.execute(
+                f"DELETE FROM {self.table_name} t WHERE {condition} "
+                f"AND NOT EXISTS (SELECT 1 FROM {self.name} s WHERE {match})",
+                *args,
+            )
+            upserted = await conn.execute(
+                f"INSERT INTO {self.table_name} ({columns}) "
+                f"SELECT DISTINCT ON ({key}) {columns} FROM {self.name} ORDER BY {key} "
+                f"ON CONFLICT ({key}) DO UPDATE SET "
+                + ", ".join(f"{column} = EXCLUDED.{column}" for column in updates)
+                + f" WHERE ({', '.join(f'{self.table_name}.{column}' for column in compared)}) "
+                f"IS DISTINCT FROM ({', '.join(f'EXCLUDED.{column}' for column in compared)})"
+            )
+            await conn.execute(f"DROP TABLE {self.name}")
+
+        upserted, deleted = _count(upserted), _count(deleted)
+        logger.info(
+            f"🔀 {self.table_name} ({self.ano}/{self.uf}): {upserted} linhas inseridas/alteradas e "
+            f"{deleted} removidas em {time.monotonic() - start:.1f}s"
+        )
+        return upserted, deleted
+
+    async def drop(self, conn: asyncpg.Connection) -> None:
+        """Descarta a staging (carga com erro); a tabela fica intacta."""
+        await conn.execute(f"DROP TABLE IF EXISTS {self.name}")
+        logger.warning(f"🧹 Staging {self.name} descartada")
@@ -0,0 +1,192 @@
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+import asyncpg
+from loguru import logger
+
+from app.core.config import settings
+from app.schemas.etl_schemas import UFEnum
+from app.services.etl.incremental import NATIONAL, UF_COLUMN, YEAR_COLUMN
+from app.services.etl.staging import MAX_IDENTIFIER, StagingTable, staged_name
+
+
+def is_partitioned(model) -> bool:
+    """Indica se o model é uma tabela particionada (postgresql_partition_by em __table_args__)."""
+    return bool(model.__table__.kwargs.get("postgresql_partition_by"))
+
+
+def year_partition_name(table_name: str, ano: int) -> str:
+    """Partição do ano (ex: votacao_candidato_munzona_2024), subparticionada por UF."""
+    return f"{table_name}_{ano}"
+
+
+def uf_partition_name(table_name: str, ano: int, uf: str) -> str:
+    """Partição folha de uma UF no ano (ex: votacao_candidato_munzona_2024_sp)."""
+    return f"{table_name}_{ano}_{uf.lower()}"
+
+
+def default_partition_name(table_name: str, ano: int) -> str:
+    """Partição DEFAULT do ano, para siglas fora das 27 UFs (ex: ZZ, exterior)."""
+    return f"{table_name}_{ano}_default"
+
+
+async def ensure_year_partition(conn: asyncpg.Connection, table_name: str, ano: int) -> None:
+    """
+    Cria, se ainda não existirem, a partição do ano com uma partição por UF
+    e a partição DEFAULT.
+
+    Todas as UFs são criadas de uma vez: criar uma UF depois exigiria mover
+    suas linhas para fora da partição DEFAULT.
+    """
+    year_partition = year_partition_name(table_name, ano)
+    await conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {year_partition} PARTITION OF {table_name} "
+        f"FOR VALUES IN ({int(ano)}) PARTITION BY LIST ({UF_COLUMN})"
+    )
+    for uf in UFEnum:
+        await conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {uf_partition_name(table_name, ano, uf.value)} "
+            f"PARTITION OF {year_partition} FOR VALUES IN ('{uf.value}')"
+        )
+    await conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {default_partition_name(table_name, ano)} PARTITION OF {year_partition} DEFAULT"
+    )
+
+
+class PartitionStaging(StagingTable):
+    """
+    Staging para recarga de uma única partição de uma tabela particionada.
+
+    Em vez de copiar o restante da tabela (StagingTable), a staging recebe só
+    os dados da partição e, no swap, a partição antiga é desanexada e removida
+    e a staging é anexada no lugar (DETACH/ATTACH PARTITION). Uma constraint
+    CHECK com os limites da partição evita a varredura de validação no ATTACH.
+
+    - UF: a staging é uma tabela UNLOGGED comum, anexada à partição do ano
+    - "BR" (arquivo nacional): a staging é particionada por UF e substitui a
+      partição do ano inteira
+    """
+
+    def __init__(self, table_name: str, ano: int, uf: str, log_id: Optional[uuid.UUID] = None):
+        """
+        Args:
+            table_name: Tabela particionada
+            ano: Ano da eleição
+            uf: UF da partição ou "BR" para o ano inteiro
+            log_id: ETLLog da carga; o nome da staging leva o final do id (ver StagingTable)
+        """
+        super().__init__(table_name, log_id)
+        self.ano = int(ano)
+        self.uf = uf
+        self.national = uf == NATIONAL
+
+        if self.national:
+            self.partition = year_partition_name(table_name, self.ano)
+            self.attach_to = table_name
+            self.bound = f"({self.ano})"
+            self.check = f"{YEAR_COLUMN} = {self.ano}"
+        else:
+            self.partition = uf_partition_name(table_name, self.ano, uf)
+            self.attach_to = year_partition_name(table_name, self.ano)
+            self.bound = f"('{uf}')"
+            self.check = f"{YEAR_COLUMN} = {self.ano} AND {UF_COLUMN} = '{uf}'"
+
+        self.name = staged_name(self.partition, self.tag)
+        self.check_name = staged_name(f"{self.partition}_bound")
+
+    def final_name(self, name: str) -> str:
+        """Constraints/índices da partição levam o nome dela (ex: ..._2024_sp_pkey)."""
+        if name.startswith(self.table_name):
+            name = name[len(self.table_name):]
+        else:
+            name = f"_{name}"
+        return f"{self.partition}{name}"[:MAX_IDENTIFIER]
+
+    def _leaves(self) -> List[Tuple[str, Optional[str]]]:
+        """(nome final, UF) das partições folha de uma staging nacional; UF None = DEFAULT."""
+        leaves = [(uf_partition_name(self.table_name, self.ano, uf.value), uf.value) for uf in UFEnum]
+        leaves.append((default_partition_name(self.table_name, self.ano), None))
+        return leaves
+
+    def _staged_leaf(self, leaf: str) -> str:
+        """Partição folha de uma staging nacional, com a mesma marca da carga."""
+        return staged_name(leaf, self.tag)
+
+    async def create(self, conn: asyncpg.Connection, keep: Optional[Tuple[str, list]] = None) -> int:
+        """
+        Cria a staging vazia da partição. keep é ignorado: a partição é
+        substituída inteira, as demais não são tocadas.
+        """
+        await self._read_definitions(conn)
+        if not self.national:
+            await ensure_year_partition(conn, self.table_name, self.ano)
+
+        await conn.execute(f"DROP TABLE IF EXISTS {self.name}")
+        like = f"(LIKE {self.table_name} INCLUDING DEFAULTS INCLUDING GENERATED)"
+        if self.national:
+            await conn.execute(f"CREATE TABLE {self.name} {like} PARTITION BY LIST ({UF_COLUMN})")
+            for leaf, uf in self._leaves():
+                bound = f"FOR VALUES IN ('{uf}')" if uf else "DEFAULT"
+                await conn.execute(f"CREATE UNLOGGED TABLE {self._staged_leaf(leaf)} PARTITION OF {self.name} {bound}")
+        else:
+            await conn.execute(f"CREATE UNLOGGED TABLE {self.name} {like}")
+
+        logger.info(f"🧱 Staging {self.name} criada para a partição {self.partition}")
+        return 0
+
+    async def finalize(self, conn: asyncpg.Connection) -> None:
+        """SET LOGGED, constraints/índices, CHECK com os limites da partição e ANALYZE."""
+        start = time.monotonic()
+        if self.national:
+            for leaf, _ in self._leaves():
+                await conn.execute(f"ALTER TABLE {self._staged_leaf(leaf)} SET LOGGED")
+        else:
+            await conn.execute(f"ALTER TABLE {self.name} SET LOGGED")
+
+        await self._build_indexes(conn)
+        await conn.execute(f"ALTER TABLE {self.name} ADD CONSTRAINT {self.check_name} CHECK ({self.check})")
+        await conn.execute(f"ANALYZE {self.name}")
+        logger.info(f"🧱 Staging {self.name}: índices construídos em {time.monotonic() - start:.1f}s")
+
+    async def exchange(self, conn: asyncpg.Connection) -> None:
+        """
+        Troca a partição pela staging. Deve rodar dentro de uma transação
+        (ver swap() e swap_partitions()).
+        """
+        if await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", self.partition):
+            await conn.execute(f"ALTER TABLE {self.attach_to} DETACH PARTITION {self.partition}")
+            await conn.execute(f"DROP TABLE {self.partition}")
+
+        await conn.execute(f"ALTER TABLE {self.name} RENAME TO {self.partition}")
+        await conn.execute(
+            f"ALTER TABLE {self.attach_to} ATTACH PARTITION {self.partition} FOR VALUES IN {self.bound}"
+        )
+        await conn.execute(f"ALTER TABLE {self.partition} DROP CONSTRAINT {self.check_name}")
+        await self._rename_indexes(conn, self.partition)
+
+        if self.national:
+            for leaf, _ in self._leaves():
+                await conn.execute(f"ALTER TABLE {self._staged_leaf(leaf)} RENAME TO {leaf}")
+
+    async def swap(self, conn: asyncpg.Connection) -> None:
+        """Troca a partição pela staging em uma única transação curta."""
+        await swap_partitions(conn, [self])
+
+
+async def swap_partitions(conn: asyncpg.Connection, stagings: List[PartitionStaging]) -> None:
+    """
+    Troca várias partições (ex: as UFs de um fan-out) em uma única transação,
+    de modo que a API passa a ver todas as UFs novas ao mesmo tempo.
+    """
+    if not stagings:
+        return
+
+    start = time.monotonic()
+    async with conn.transaction():
+        await conn.execute(f"SET LOCAL lock_timeout = '{settings.ETL_SWAP_LOCK_TIMEOUT}'")
+        for staging in stagings:
+            await staging.exchange(conn)
+
+    partitions = ", ".join(staging.partition for staging in stagings)
+    logger.info(f"🔁 Partições substituídas em {(time.monotonic() - start) * 1000:.0f}ms: {partitions}")
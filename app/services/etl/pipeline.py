@@ -0,0 +1,261 @@
+import asyncio
+import queue
+import resource
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+
+# Intervalo das esperas com timeout (fila cheia, memória acima do orçamento,
+# leitura assíncrona): limita o tempo até uma etapa perceber o close()
+POLL_SECONDS = 0.1
+
+_DONE = object()
+
+
+def current_rss() -> Optional[int]:
+    """RSS atual do processo em bytes (/proc/self/statm); None fora do Linux."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss() -> int:
+    """Pico de RSS do processo em bytes (ru_maxrss vem em KB no Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemoryBudget:
+    """
+    Orçamento de memória (RSS) do processo de carga.
+
+    Acima do orçamento, uma etapa só entrega um novo item quando a fila de saída
+    está vazia: o pipeline cai para um lote em cada etapa e o consumo deixa de
+    crescer com o tamanho do arquivo ou a velocidade do download.
+    """
+
+    def __init__(self, limit_mb: Optional[int] = None):
+        """
+        Args:
+            limit_mb: Limite em MB (padrão: settings.ETL_MEMORY_BUDGET_MB; 0 desativa)
+        """
+        limit_mb = settings.ETL_MEMORY_BUDGET_MB if limit_mb is None else limit_mb
+        self.limit = limit_mb * 1024 * 1024
+        self.throttled = 0
+
+    def exceeded(self) -> bool:
+        if not self.limit:
+            return False
+        rss = current_rss()
+        return rss is not None and rss > self.limit
+
+
+@dataclass
+class StageMeter:
+    """
+    Contadores de uma etapa do pipeline.
+
+    busy: segundos produzindo itens; idle: esperando itens da etapa anterior;
+    blocked: esperando a etapa seguinte (fila cheia ou memória acima do orçamento).
+    """
+    name: str
+    items: int = 0
+    busy: float = 0.0
+    idle: float = 0.0
+    blocked: float = 0.0
+
+    def utilization(self, wall: float) -> float:
+        """Fração do tempo de relógio em que a etapa esteve ocupada."""
+        return min(self.busy / wall, 1.0) if wall > 0 else 0.0
+
+
+@dataclass
+class PipelineMeters:
+    """Medidores das etapas de uma carga (download, parse e copy)."""
+    stages: Dict[str, StageMeter] = field(default_factory=dict)
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+
+    def stage(self, name: str) -> StageMeter:
+        if name not in self.stages:
+            self.stages[name] = StageMeter(name)
+        return self.stages[name]
+
+    def finish(self) -> None:
+        self.finished = time.monotonic()
+
+    @property
+    def wall(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    def timings(self) -> Dict[str, float]:
+        """Tempos de espera por etapa, somados aos stage_timings do ETLLog ("parse_blocked", "copy_idle"...)."""
+        timings = {}
+        for meter in self.stages.values():
+            timings[f"{meter.name}_idle"] = meter.idle
+            timings[f"{meter.name}_blocked"] = meter.blocked
+        return timings
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{m.name} {m.utilization(self.wall):.0%} ({m.items} itens, "
+            f"{m.idle:.1f}s ociosa, {m.blocked:.1f}s bloqueada)"
+            for m in self.stages.values()
+        )
+
+
+class BoundedStage:
+    """
+    Etapa do pipeline: consome um iterador em uma thread própria e entrega os
+    itens por uma fila limitada a depth itens.
+
+    Com a fila cheia a thread para de puxar do iterador, e a espera se propaga
+    para as etapas anteriores até o download: o volume em memória fica limitado
+    a depth itens por etapa, seja qual for o tamanho do arquivo. Erros do
+    iterador são repassados ao consumidor no fim da fila.
+
+    O consumidor lê com get()/iteração (em outra thread) ou com async for (no
+    event loop) e deve chamar close() (ou usar a etapa como context manager)
+    se parar antes do fim: a thread é encerrada e o iterador fechado.
+    """
+
+    def __init__(
+            self,
+            source: Iterator,
+            depth: int,
+            meter: Optional[StageMeter] = None,
+            consumer: Optional[StageMeter] = None,
+            budget: Optional[MemoryBudget] = None
+    ):
+        """
+        Args:
+            source: Iterador da etapa (ex: chunks do download, lotes do parse)
+            depth: Itens prontos que podem aguardar na fila
+            meter: Medidor desta etapa
+            consumer: Medidor da etapa seguinte (recebe o tempo ocioso de espera)
+            budget: Orçamento de memória verificado antes de cada entrega
+        """
+        self.source = source
+        self.meter = meter or StageMeter("stage")
+        self.consumer = consumer
+        self.budget = budget
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, depth))
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._done = False
+        self._thread = threading.Thread(target=self._run, name=f"etl-{self.meter.name}", daemon=True)
+
+    def start(self) -> "BoundedStage":
+        self._thread.start()
+        return self
+
+    def __enter__(self) -> "BoundedStage":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                started = time.monotonic()
+                idle = self.meter.idle
+                try:
+                    item = next(self.source)
+                except StopIteration:
+                    break
+                # O tempo esperando a etapa anterior já foi contado como ocioso
+                self.meter.busy += time.monotonic() - started - (self.meter.idle - idle)
+                self.meter.items += 1
+                if not self._put(item):
+                    break
+        except BaseException as e:
+            self._error = e
+        finally:
+            close = getattr(self.source, "close", None)
+            if close:
+                close()
+            self._put(_DONE)
+
+    def _put(self, item) -> bool:
+        started = time.monotonic()
+        try:
+            if self.budget and item is not _DONE and self.budget.exceeded() and not self._queue.empty():
+                self.budget.throttled += 1
+                while self.budget.exceeded() and not self._queue.empty() and not self._stop.is_set():
+                    time.sleep(POLL_SECONDS)
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(item, timeout=POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            self.meter.blocked += time.monotonic() - started
+
+    def _take(self, item):
+        if item is _DONE:
+            self._done = True
+            if self._error is not None:
+                raise self._error
+            raise StopIteration
+        return item
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self):
+        if self._done:
+            raise StopIteration
+        started = time.monotonic()
+        item = self._queue.get()
+        if self.consumer:
+            self.consumer.idle += time.monotonic() - started
+        return self._take(item)
+
+    def __aiter__(self) -> "BoundedStage":
+        return self
+
+    async def __anext__(self):
+        if self._done:
+            raise StopAsyncIteration
+        started = time.monotonic()
+        while True:
+            try:
+                item = await asyncio.to_thread(self._queue.get, True, POLL_SECONDS)
+                break
+            except queue.Empty:
+                continue
+        if self.consumer:
+            self.consumer.idle += time.monotonic() - started
+        try:
+            return self._take(item)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+    def close(self) -> None:
+        """Interrompe a etapa (se ainda estiver rodando) e espera a thread terminar."""
+        if not self._thread.is_alive():
+            return
+        self._stop.set()
+        while self._thread.is_alive():
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                self._thread.join(POLL_SECONDS)
+        self._done = True
+
+
+def log_pipeline(source: str, meters: PipelineMeters, budget: Optional[MemoryBudget] = None) -> None:
+    """Registra a utilização das etapas e o pico de memória de uma carga."""
+    throttled = f", {budget.throttled} pausas por memória" if budget and budget.throttled else ""
+    logger.info(
+        f"🚦 {source}: {meters.summary()}; pico de RSS {peak_rss() / 1024 ** 2:.0f} MB{throttled}"
+    )
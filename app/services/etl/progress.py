@@ -0,0 +1,122 @@
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+from app.repository.log_repository import ETLLogRepository
+
+
+class ProgressTracker:
+    """
+    Acumula o progresso de uma carga (registros, bytes lidos, etapa e tempo
+    por etapa) e o grava no ETLLog via ETLLogRepository.heartbeat no máximo
+    uma vez por intervalo.
+
+    add() só soma contadores em memória; tick() grava se o intervalo já passou;
+    set_stage(), flush() e finish() gravam na hora. Falhas no heartbeat não
+    interrompem a carga.
+
+    Os tempos de "parse" e "copy" são somados lote a lote (tempo ocupado, que
+    no fan-out soma todas as UFs); as demais etapas usam o tempo de relógio.
+    """
+
+    def __init__(self, repository: ETLLogRepository, log_id: uuid.UUID, interval: Optional[float] = None):
+        """
+        Args:
+            repository: Repository do ETLLog
+            log_id: ID do log da carga
+            interval: Segundos mínimos entre gravações (padrão: settings.ETL_PROGRESS_INTERVAL)
+        """
+        self.repository = repository
+        self.log_id = log_id
+        self.interval = settings.ETL_PROGRESS_INTERVAL if interval is None else interval
+        self.rows = 0
+        self.rejected = 0
+        self.bytes_read = 0
+        self.bytes_total: Optional[int] = None
+        self.stage: Optional[str] = None
+        self.timings: Dict[str, float] = defaultdict(float)
+        self._stage_started = time.monotonic()
+        self._dirty = False
+        self._flushing = False
+        self._last_flush = 0.0
+
+    def add(
+            self,
+            rows: int = 0,
+            bytes_read: int = 0,
+            parse_seconds: float = 0.0,
+            copy_seconds: float = 0.0,
+            rejected: int = 0
+    ) -> None:
+        """Soma registros gravados, bytes lidos, tempos de parse/COPY e linhas rejeitadas desde a última chamada."""
+        self.rows += rows
+        self.rejected += rejected
+        self.bytes_read += bytes_read
+        self.timings["parse"] += parse_seconds
+        self.timings["copy"] += copy_seconds
+        self._dirty = True
+
+    def set_total(self, bytes_total: Optional[int]) -> None:
+        """Tamanho total esperado do CSV (usado no cálculo do ETA)."""
+        self.bytes_total = bytes_total
+        self._dirty = True
+
+    async def tick(self) -> None:
+        """Grava o progresso se houver novidade e o intervalo já tiver passado."""
+        if self._dirty and time.monotonic() - self._last_flush >= self.interval:
+            await self.flush()
+
+    def _close_stage(self) -> None:
+        now = time.monotonic()
+        if self.stage:
+            self.timings[self.stage] += now - self._stage_started
+        self._stage_started = now
+
+    async def set_stage(self, stage: str) -> None:
+        """Encerra a etapa atual, muda para a próxima e grava imediatamente."""
+        self._close_stage()
+        self.stage = stage
+        self._dirty = True
+        await self.flush()
+
+    async def finish(self) -> None:
+        """Encerra a etapa atual e grava o progresso final."""
+        self._close_stage()
+        self.stage = None
+        self._dirty = True
+        await self.flush()
+
+    def stage_timings(self) -> Dict[str, float]:
+        """Segundos por etapa, incluindo o tempo já decorrido da etapa atual."""
+        timings = dict(self.timings)
+        if self.stage:
+            timings[self.stage] = timings.get(self.stage, 0.0) + time.monotonic() - self._stage_started
+        return {stage: round(seconds, 3) for stage, seconds in timings.items() if seconds}
+
+    async def flush(self) -> None:
+        """Grava o progresso acumulado (um UPDATE ... RETURNING)."""
+        if self._flushing or not self._dirty:
+            return
+
+        self._flushing = True
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        try:
+            await self.repository.heartbeat(
+                self.log_id,
+                self.rows,
+                self.bytes_read,
+                self.stage,
+                bytes_total=self.bytes_total,
+                stage_timings=self.stage_timings(),
+                records_rejected=self.rejected,
+            )
+        except Exception as e:
+            self._dirty = True
+            logger.warning(f"⚠️ Heartbeat do log {self.log_id} falhou: {e}")
+        finally:
+            self._flushing = False
@@ -0,0 +1,152 @@
+import asyncio
+import json
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional, Set
+
+import asyncpg
+from loguru import logger
+
+from app.core.database import create_copy_connection
+
+CHANNEL = "etl_progress"
+FINAL_STATUSES = frozenset({"done", "error", "skipped"})
+
+# Eventos por cliente aguardando envio; um cliente lento perde os mais antigos
+SUBSCRIBER_QUEUE_SIZE = 64
+# Peso da última medição na média móvel das taxas
+RATE_SMOOTHING = 0.3
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class ThroughputMeter:
+    """Taxas (registros/s, bytes/s) e ETA de uma carga, a partir dos heartbeats consecutivos."""
+
+    def __init__(self):
+        self.last_time: Optional[datetime] = None
+        self.last_rows = 0
+        self.last_bytes = 0
+        self.rows_per_s: Optional[float] = None
+        self.bytes_per_s: Optional[float] = None
+
+    @staticmethod
+    def _smooth(previous: Optional[float], current: float) -> float:
+        if previous is None:
+            return current
+        return RATE_SMOOTHING * current + (1 - RATE_SMOOTHING) * previous
+
+    def update(self, event: dict) -> dict:
+        """
+        Acrescenta ao evento as métricas calculadas.
+
+        Returns:
+            O próprio evento com rows_per_s, bytes_per_s e eta_seconds
+        """
+        rows = event.get("records_processed") or 0
+        bytes_read = event.get("bytes_read") or 0
+        moment = _parse_time(event.get("heartbeat_at"))
+
+        if moment and self.last_time and moment > self.last_time:
+            elapsed = (moment - self.last_time).total_seconds()
+            self.rows_per_s = self._smooth(self.rows_per_s, max(rows - self.last_rows, 0) / elapsed)
+            self.bytes_per_s = self._smooth(self.bytes_per_s, max(bytes_read - self.last_bytes, 0) / elapsed)
+        if moment:
+            self.last_time, self.last_rows, self.last_bytes = moment, rows, bytes_read
+
+        eta = None
+        bytes_total = event.get("bytes_total")
+        if bytes_total and self.bytes_per_s and event.get("status") not in FINAL_STATUSES:
+            eta = max(bytes_total - bytes_read, 0) / self.bytes_per_s
+
+        event["rows_per_s"] = round(self.rows_per_s, 1) if self.rows_per_s is not None else None
+        event["bytes_per_s"] = round(self.bytes_per_s, 1) if self.bytes_per_s is not None else None
+        event["eta_seconds"] = round(eta, 1) if eta is not None else None
+        return event
+
+
+class ProgressBroadcaster:
+    """
+    Repassa as notificações do canal etl_progress (trigger em etl_log, a cada
+    heartbeat ou mudança de status) para os clientes inscritos.
+
+    Uma única conexão com LISTEN atende todos os clientes da API: quantos
+    dashboards estiverem abertos, o banco não recebe consultas por eles. As
+    métricas são calculadas uma vez por evento, não por cliente, e só para
+    as cargas com inscritos: os medidores ficam em meters[log_id inscrito] e
+    saem junto com o último inscrito, mesmo que a carga nunca termine.
+    """
+
+    def __init__(self):
+        self.conn: Optional[asyncpg.Connection] = None
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        # log_id inscrito -> medidores da carga e das UFs dela
+        self.meters: Dict[str, Dict[str, ThroughputMeter]] = {}
+        self._lock = asyncio.Lock()
+
+    async def ensure_listening(self) -> None:
+        """Abre (ou reabre, após queda) a conexão com LISTEN."""
+        async with self._lock:
+            if self.conn is not None and not self.conn.is_closed():
+                return
+            self.conn = await create_copy_connection()
+            await self.conn.add_listener(CHANNEL, self._on_notify)
+            self.conn.add_termination_listener(self._on_terminated)
+            logger.info(f"📡 Escutando o canal {CHANNEL}")
+
+    def _on_terminated(self, conn: asyncpg.Connection) -> None:
+        logger.warning(f"⚠️ Conexão do canal {CHANNEL} encerrada; será reaberta no próximo keepalive")
+        self.conn = None
+
+    def _on_notify(self, conn: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        event = json.loads(payload)
+        log_id = event["id"]
+
+        # Quem acompanha a carga pai recebe também os eventos das UFs
+        for key in {log_id, event.get("parent_id")}:
+            queues = self.subscribers.get(key)
+            if not queues:
+                continue
+            meters = self.meters.setdefault(key, {})
+            measured = meters.setdefault(log_id, ThroughputMeter()).update(dict(event))
+            if measured.get("status") in FINAL_STATUSES:
+                meters.pop(log_id, None)
+            for queue in queues:
+                self._offer(queue, measured)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: dict) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self, log_id: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        Inscreve um cliente nos eventos de uma carga (e das UFs dela).
+
+        Args:
+            log_id: ID do ETLLog
+        """
+        await self.ensure_listening()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers[log_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self.subscribers[log_id].discard(queue)
+            if not self.subscribers[log_id]:
+                del self.subscribers[log_id]
+                self.meters.pop(log_id, None)
+
+    async def close(self) -> None:
+        """Fecha a conexão com LISTEN (encerramento da API)."""
+        if self.conn is not None and not self.conn.is_closed():
+            await self.conn.close()
+        self.conn = None
+
+
+progress_broadcaster = ProgressBroadcaster()
@@ -0,0 +1,120 @@
+import csv
+import threading
+import uuid
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import asyncpg
+from loguru import logger
+
+from app.core.config import settings
+from app.services.etl.download import member_basename
+
+# Erros de COPY causados pelo conteúdo de uma linha (valor longo demais, fora do
+# intervalo, NOT NULL...): o lote é dividido até isolar as linhas ruins
+ROW_ERRORS = (asyncpg.DataError, asyncpg.IntegrityConstraintViolationError)
+
+
+class RejectionBudgetExceeded(Exception):
+    """Mais linhas rejeitadas do que o limite permitido para um arquivo."""
+
+
+class QuarantineSink:
+    """
+    Arquivo de quarentena das linhas rejeitadas de um CSV, em
+    settings.ETL_QUARANTINE_DIR/<log_id>/<arquivo>[.<origem>].rejected.csv,
+    com arquivo, linha, motivo e o conteúdo original.
+
+    O arquivo só é criado na primeira rejeição. O lock protege apenas as
+    threads de um processo: no fan-out, o processo de parse (linhas inválidas)
+    grava com origin="parse" em um arquivo próprio, separado do arquivo das
+    linhas recusadas pelo COPY no processo principal.
+    """
+
+    def __init__(
+            self,
+            log_id: uuid.UUID,
+            member_name: str,
+            budget: Optional[int] = None,
+            origin: Optional[str] = None
+    ):
+        """
+        Args:
+            log_id: ID do ETLLog da execução (pai, no fan-out)
+            member_name: Nome do CSV de origem
+            budget: Máximo de linhas rejeitadas antes de abortar (padrão: settings.ETL_REJECT_BUDGET)
+            origin: Sufixo do arquivo para um processo que grava em paralelo (ex: "parse")
+        """
+        self.source = member_basename(member_name)
+        stem = f"{Path(self.source).stem}.{origin}" if origin else Path(self.source).stem
+        self.path = Path(settings.ETL_QUARANTINE_DIR) / str(log_id) / f"{stem}.rejected.csv"
+        self.budget = settings.ETL_REJECT_BUDGET if budget is None else budget
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def reject(self, line: int, reason: str, values: Optional[Sequence] = None) -> None:
+        """
+        Grava uma linha rejeitada.
+
+        Raises:
+            RejectionBudgetExceeded: Se o total de rejeições passar do limite
+        """
+        with self._lock:
+            self.count += 1
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            new_file = not self.path.exists()
+            with open(self.path, "a", newline="", encoding=settings.ETL_CSV_ENCODING, errors="replace") as fh:
+                writer = csv.writer(fh, delimiter=settings.ETL_CSV_SEPARATOR)
+                if new_file:
+                    writer.writerow(["arquivo", "linha", "motivo", "conteudo"])
+                content = settings.ETL_CSV_SEPARATOR.join("" if v is None else str(v) for v in values or ())
+                writer.writerow([self.source, line, reason[:500], content])
+
+        logger.debug(f"🚧 {self.source}:{line} rejeitada: {reason}")
+        if self.count > self.budget:
+            raise RejectionBudgetExceeded(
+                f"{self.source}: {self.count} linhas rejeitadas, acima do limite de {self.budget} (ver {self.path})"
+            )
+
+
+async def copy_with_quarantine(
+        conn: asyncpg.Connection,
+        table_name: str,
+        batch: List[tuple],
+        columns: List[str],
+        lines: List[int],
+        sink: Optional[QuarantineSink]
+) -> int:
+    """
+    Envia um lote via COPY; se o banco recusar alguma linha, o lote é dividido
+    ao meio (cada metade em um savepoint) até isolar as linhas ruins, que vão
+    para a quarentena. Lotes sem erro custam um único COPY.
+
+    Args:
+        conn: Conexão asyncpg
+        table_name: Tabela de destino
+        batch: Registros do lote
+        columns: Colunas do COPY
+        lines: Linha do CSV de cada registro (mesma ordem do lote)
+        sink: Quarentena; sem ela, o erro do COPY é propagado
+
+    Returns:
+        Quantidade de registros gravados
+    """
+    if sink is None:
+        await conn.copy_records_to_table(table_name, records=batch, columns=columns)
+        return len(batch)
+
+    try:
+        async with conn.transaction():
+            await conn.copy_records_to_table(table_name, records=batch, columns=columns)
+        return len(batch)
+    except ROW_ERRORS as e:
+        if len(batch) == 1:
+            sink.reject(lines[0], f"{type(e).__name__}: {e}", batch[0])
+            return 0
+
+    middle = len(batch) // 2
+    loaded = await copy_with_quarantine(conn, table_name, batch[:middle], columns, lines[:middle], sink)
+    loaded += await copy_with_quarantine(conn, table_name, batch[middle:], columns, lines[middle:], sink)
+    return loaded
@@ -0,0 +1,110 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import asyncpg
+from loguru import logger
+
+from app.models.resultados.totais_votacao import (
+    TotalVotacaoCandidatoUE,
+    TotalVotacaoCandidatoUF,
+    TotalVotacaoPartidoMunicipio,
+    TotalVotacaoPartidoUF,
+)
+from app.services.etl.incremental import partition_filter
+
+
+@dataclass(frozen=True)
+class Rollup:
+    """
+    Tabela de totais pré-agregados de uma tabela de resultados.
+
+    O grão é a PK do model; colunas qt_* são somadas e as demais colunas
+    (nome, partido, cargo...) vêm do próprio grupo, onde são constantes.
+    """
+    model: type
+    source: str
+
+    @property
+    def table_name(self) -> str:
+        return self.model.__tablename__
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        return tuple(column.name for column in self.model.__table__.primary_key.columns)
+
+    @property
+    def sums(self) -> Tuple[str, ...]:
+        return tuple(column.name for column in self.model.__table__.columns if column.name.startswith("qt_"))
+
+    @property
+    def labels(self) -> Tuple[str, ...]:
+        return tuple(
+            column.name for column in self.model.__table__.columns
+            if column.name not in self.keys and column.name not in self.sums
+        )
+
+    def select_sql(self, condition: str) -> str:
+        """SELECT agregado da tabela de origem nas partições da condição (parâmetros de partition_filter)."""
+        keys = ", ".join(self.keys)
+        columns = [*self.keys, *(f"MAX({c})" for c in self.labels), *(f"SUM({c})" for c in self.sums)]
+        not_null = " AND ".join(f"{c} IS NOT NULL" for c in self.keys)
+        return f"SELECT {', '.join(columns)} FROM {self.source} WHERE {condition} AND {not_null} GROUP BY {keys}"
+
+    async def refresh(self, conn: asyncpg.Connection, ano: int, ufs: List[str]) -> int:
+        """
+        Recalcula os totais das UFs no ano ("BR": o ano inteiro) em uma
+        transação: a API nunca lê o total de uma UF pela metade.
+
+        Returns:
+            Quantidade de linhas de totais gravadas
+        """
+        condition, args = partition_filter(ano, ufs)
+        columns = ", ".join((*self.keys, *self.labels, *self.sums))
+        async with conn.transaction():
+            await conn.execute(f"DELETE FROM {self.table_name} WHERE {condition}", *args)
+            status = await conn.execute(
+                f"INSERT INTO {self.table_name} ({columns}) {self.select_sql(condition)}", *args
+            )
+        return int(status.split()[-1])
+
+
+ROLLUPS: Dict[str, List[Rollup]] = {
+    "votacao_candidato_munzona": [
+        Rollup(TotalVotacaoCandidatoUE, "votacao_candidato_munzona"),
+        Rollup(TotalVotacaoCandidatoUF, "votacao_candidato_munzona"),
+    ],
+    "votacao_partido_munzona": [
+        Rollup(TotalVotacaoPartidoMunicipio, "votacao_partido_munzona"),
+        Rollup(TotalVotacaoPartidoUF, "votacao_partido_munzona"),
+    ],
+}
+
+
+async def refresh_rollups(conn: asyncpg.Connection, table_name: str, ano: int, ufs: List[str]) -> int:
+    """
+    Recalcula as tabelas de totais derivadas de table_name para as UFs
+    recarregadas; tabelas sem totais não fazem nada.
+
+    Args:
+        conn: Conexão asyncpg
+        table_name: Tabela de resultados recém-carregada
+        ano: Ano da carga
+        ufs: UFs recarregadas ou ["BR"]
+
+    Returns:
+        Linhas de totais gravadas (todas as tabelas)
+    """
+    rollups = ROLLUPS.get(table_name, [])
+    if not rollups or not ufs:
+        return 0
+
+    total = 0
+    for rollup in rollups:
+        started = time.monotonic()
+        rows = await rollup.refresh(conn, ano, ufs)
+        total += rows
+        logger.info(
+            f"📊 {rollup.table_name} ({ano}/{', '.join(ufs)}): {rows} totais em {time.monotonic() - started:.2f}s"
+        )
+    return total
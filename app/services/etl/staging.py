@@ -0,0 +1,235 @@
+import re
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Tuple
+
+import asyncpg
+from loguru import logger
+
+from app.core.config import settings
+
+MAX_IDENTIFIER = 63
+STAGING_SUFFIX = "__stg"
+LOCK_PREFIX = "etl_staging:"
+
+
+def staged_name(name: str, tag: Optional[str] = None) -> str:
+    """
+    Nome temporário de um objeto da staging, respeitando o limite de 63 caracteres do Postgres.
+
+    Args:
+        name: Nome definitivo do objeto
+        tag: Sufixo que torna o nome exclusivo de uma carga; nunca é truncado
+    """
+    suffix = f"_{tag}{STAGING_SUFFIX}" if tag else STAGING_SUFFIX
+    return f"{name[:MAX_IDENTIFIER - len(suffix)]}{suffix}"
+
+
+@asynccontextmanager
+async def table_lock(conn: asyncpg.Connection, table_name: str) -> AsyncIterator[None]:
+    """
+    Advisory lock de sessão (pg_advisory_lock) de uma tabela durante o bloco.
+
+    Envolve create → COPY → swap de uma StagingTable: a staging leva as linhas
+    das demais UFs, então duas cargas simultâneas da mesma tabela (ex: UFs
+    diferentes de um dataset não particionado) fariam o último swap desfazer
+    a recarga do outro. Com o lock, a segunda espera a primeira terminar. O
+    lock é de sessão porque o COPY confirma um lote por transação; se o
+    processo morrer, o Postgres o libera ao fechar a conexão.
+    """
+    key = f"{LOCK_PREFIX}{table_name}"
+    if not await conn.fetchval("SELECT pg_try_advisory_lock(hashtext($1))", key):
+        logger.info(f"⏳ Outra carga está trocando {table_name}; aguardando o lock")
+        await conn.execute("SELECT pg_advisory_lock(hashtext($1))", key)
+    try:
+        yield
+    finally:
+        if not conn.is_closed():
+            await conn.execute("SELECT pg_advisory_unlock(hashtext($1))", key)
+
+
+class StagingTable:
+    """
+    Tabela de staging para recargas sem downtime.
+
+    1. create(): cria uma cópia UNLOGGED da tabela (sem índices), opcionalmente
+       já com as linhas que não fazem parte da recarga
+    2. o COPY grava nela (name) em vez da tabela real
+    3. finalize(): SET LOGGED, recria PK/UNIQUE/índices e roda ANALYZE
+    4. swap(): troca as tabelas em uma transação curta (só renames e DROP)
+
+    Enquanto os passos 1 a 3 rodam, a API continua lendo a tabela original
+    sem disputar locks nem ver dados parciais. Cargas da mesma tabela devem
+    rodar os passos 1 a 4 dentro de table_lock.
+    """
+
+    def __init__(self, table_name: str, log_id: Optional[uuid.UUID] = None):
+        """
+        Args:
+            table_name: Tabela que será substituída
+            log_id: ETLLog da carga; o nome da staging leva o final do id, de modo
+                que uma carga não descarta a staging de outra (ex: mantida para retomada)
+        """
+        self.table_name = table_name
+        self.tag = log_id.hex[-8:] if log_id else None
+        self.name = staged_name(table_name, self.tag)
+        self.constraints: List[asyncpg.Record] = []
+        self.indexes: List[asyncpg.Record] = []
+
+    async def create(self, conn: asyncpg.Connection, keep: Optional[Tuple[str, list]] = None) -> int:
+        """
+        Cria a staging e copia as linhas que devem ser preservadas.
+
+        Args:
+            conn: Conexão asyncpg
+            keep: Filtro (sql, args) das linhas a substituir; as demais linhas da
+                tabela são copiadas para a staging. None: staging começa vazia.
+
+        Returns:
+            Quantidade de linhas preservadas
+        """
+        await self._read_definitions(conn)
+
+        await conn.execute(f"DROP TABLE IF EXISTS {self.name}")
+        await conn.execute(
+            f"CREATE UNLOGGED TABLE {self.name} (LIKE {self.table_name} INCLUDING DEFAULTS INCLUDING GENERATED)"
+        )
+
+        kept = await self._copy_kept(conn, keep) if keep is not None else 0
+        logger.info(f"🧱 Staging {self.name} criada ({kept} registros preservados de {self.table_name})")
+        return kept
+
+    async def reopen(self, conn: asyncpg.Connection, has_rows: bool) -> bool:
+        """
+        Reabre a staging deixada por uma carga interrompida (ver Checkpoint).
+
+        Args:
+            conn: Conexão asyncpg
+            has_rows: O checkpoint indica linhas já gravadas nela
+
+        Returns:
+            False se a staging não existe mais ou foi esvaziada (tabelas UNLOGGED
+            são truncadas quando o Postgres reinicia após uma queda)
+        """
+        if not await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", self.name):
+            return False
+        if has_rows and not await conn.fetchval(f"SELECT EXISTS (SELECT 1 FROM {self.name})"):
+            return False
+
+        await self._read_definitions(conn)
+        logger.info(f"🧱 Staging {self.name} reaberta para retomar a carga")
+        return True
+
+    async def refresh(self, conn: asyncpg.Connection, keep: Tuple[str, list]) -> int:
+        """
+        Copia de novo, para uma staging reaberta, as linhas preservadas: outra
+        carga da tabela pode tê-las trocado enquanto esta estava interrompida.
+
+        Returns:
+            Quantidade de linhas preservadas
+        """
+        condition, args = keep
+        async with conn.transaction():
+            await conn.execute(f"DELETE FROM {self.name} WHERE NOT COALESCE({condition}, false)", *args)
+            kept = await self._copy_kept(conn, keep)
+        logger.info(f"🧱 Staging {self.name}: {kept} registros preservados recopiados de {self.table_name}")
+        return kept
+
+    async def _copy_kept(self, conn: asyncpg.Connection, keep: Tuple[str, list]) -> int:
+        condition, args = keep
+        status = await conn.execute(
+            f"INSERT INTO {self.name} SELECT * FROM {self.table_name} WHERE NOT COALESCE({condition}, false)",
+            *args,
+        )
+        return int(status.split()[-1])
+
+    async def _read_definitions(self, conn: asyncpg.Connection) -> None:
+        """Lê as constraints PK/UNIQUE e os demais índices da tabela, para recriá-los na staging."""
+        self.constraints = await conn.fetch(
+            """
+            SELECT conname AS name, pg_get_constraintdef(oid) AS definition
+            FROM pg_constraint
+            WHERE conrelid = $1::regclass AND contype IN ('p', 'u')
+            """,
+            self.table_name,
+        )
+        self.indexes = await conn.fetch(
+            """
+            SELECT i.relname AS name, pg_get_indexdef(x.indexrelid) AS definition
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            WHERE x.indrelid = $1::regclass
+              AND NOT EXISTS (
+                  SELECT 1 FROM pg_constraint c
+                  WHERE c.conindid = x.indexrelid AND c.conrelid = x.indrelid
+              )
+            """,
+            self.table_name,
+        )
+
+    def final_name(self, name: str) -> str:
+        """Nome definitivo de uma constraint/índice da staging após o swap."""
+        return name
+
+    def _staged(self, name: str) -> str:
+        return staged_name(self.final_name(name))
+
+    async def finalize(self, conn: asyncpg.Connection) -> None:
+        """Torna a staging durável e constrói constraints e índices após a carga."""
+        start = time.monotonic()
+        await conn.execute(f"ALTER TABLE {self.name} SET LOGGED")
+        await self._build_indexes(conn)
+        await conn.execute(f"ANALYZE {self.name}")
+        logger.info(
+            f"🧱 Staging {self.name}: {len(self.constraints)} constraints e {len(self.indexes)} índices "
+            f"construídos em {time.monotonic() - start:.1f}s"
+        )
+
+    async def _build_indexes(self, conn: asyncpg.Connection) -> None:
+        for constraint in self.constraints:
+            await conn.execute(
+                f"ALTER TABLE {self.name} ADD CONSTRAINT {self._staged(constraint['name'])} {constraint['definition']}"
+            )
+        for index in self.indexes:
+            definition = re.sub(
+                r"^CREATE (UNIQUE )?INDEX \S+ ON (ONLY )?\S+",
+                lambda m: f"CREATE {m.group(1) or ''}INDEX {self._staged(index['name'])} ON {self.name}",
+                index["definition"],
+            )
+            await conn.execute(definition)
+
+    async def _rename_indexes(self, conn: asyncpg.Connection, table_name: str) -> None:
+        """Devolve às constraints/índices da staging (já renomeada para table_name) seus nomes definitivos."""
+        for constraint in self.constraints:
+            await conn.execute(
+                f"ALTER TABLE {table_name} RENAME CONSTRAINT "
+                f"{self._staged(constraint['name'])} TO {self.final_name(constraint['name'])}"
+            )
+        for index in self.indexes:
+            await conn.execute(
+                f"ALTER INDEX {self._staged(index['name'])} RENAME TO {self.final_name(index['name'])}"
+            )
+
+    async def swap(self, conn: asyncpg.Connection) -> None:
+        """
+        Substitui a tabela pela staging em uma única transação curta.
+        Leitores em andamento terminam na tabela antiga; os seguintes já veem a nova.
+        """
+        retired = staged_name(f"{self.table_name}_old")
+        start = time.monotonic()
+
+        async with conn.transaction():
+            await conn.execute(f"SET LOCAL lock_timeout = '{settings.ETL_SWAP_LOCK_TIMEOUT}'")
+            await conn.execute(f"LOCK TABLE {self.table_name} IN ACCESS EXCLUSIVE MODE")
+            await conn.execute(f"ALTER TABLE {self.table_name} RENAME TO {retired}")
+            await conn.execute(f"ALTER TABLE {self.name} RENAME TO {self.table_name}")
+            await conn.execute(f"DROP TABLE {retired}")
+            await self._rename_indexes(conn, self.table_name)
+
+        logger.info(f"🔁 {self.table_name} substituída pela staging em {(time.monotonic() - start) * 1000:.0f}ms")
+
+    async def drop(self, conn: asyncpg.Connection) -> None:
+        """Descarta a staging (carga com erro); a tabela original fica intacta."""
+        await conn.execute(f"DROP TABLE IF EXISTS {self.name}")
+        logger.warning(f"🧹 Staging {self.name} descartada")
@@ -0,0 +1,165 @@
+import asyncio
+import multiprocessing
+import uuid
+from functools import partial
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.celery_app import celery_app, dispatch
+from app.core.config import settings
+from app.core.database import AsyncSessionMaker
+from app.models.etl_log import ETLLog
+from app.repository.log_repository import ETLLogRepository
+from app.schemas.etl_schemas import ETLRequest
+from app.services.etl.checkpoint import Checkpoint
+from app.services.etl.datasets import process_name_for
+
+# Estados em que o log ainda não foi encerrado pela própria carga
+OPEN_STATUSES = ("pending", "processing")
+
+
+def run_job(payload: dict) -> None:
+    """
+    Executado no processo do job: roda a carga com engine e event loop próprios,
+    isolada das threads do worker e da API. Com payload["resume"], a carga
+    continua do checkpoint do log (ver run_etl).
+    """
+    from app.services.etl.loader import run_etl
+
+    asyncio.run(run_etl(
+        ETLRequest(**payload["request"]),
+        download=payload["download"],
+        mode=payload["mode"],
+        log_id=uuid.UUID(payload["log_id"]),
+        resume=payload.get("resume", False),
+    ))
+
+
+async def _close_log(log_id: uuid.UUID, message: str) -> None:
+    """
+    Marca como erro um log que a carga não chegou a encerrar (processo morto,
+    requisição inválida). Usa uma engine sem pool: a thread do worker não
+    compartilha conexões entre event loops.
+    """
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+            repository = ETLLogRepository(session)
+            log = await repository.get(log_id)
+            if log and log.status in OPEN_STATUSES:
+                await repository.mark_error(log_id, message, log.records_processed)
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="etl.run", bind=True)
+def run_etl_job(self, payload: dict) -> str:
+    """
+    Job da fila: executa run_etl em um processo filho (spawn) e aguarda o fim.
+
+    O processo é necessário porque o fan-out por UF abre seu próprio pool de
+    processos de parse, o que não é permitido dentro de processos daemon, e
+    mantém o parse (CPU) fora do processo da API quando a fila roda em modo eager.
+
+    Um job reentregue pelo broker (worker perdido no meio da carga, ver
+    acks_late) retoma do checkpoint em vez de recomeçar.
+
+    Args:
+        payload: {"request": ETLRequest serializado, "download", "mode", "log_id", "resume"}
+
+    Returns:
+        ID do ETLLog do job
+    """
+    log_id = payload["log_id"]
+    if (self.request.delivery_info or {}).get("redelivered"):
+        payload = {**payload, "resume": True}
+    context = multiprocessing.get_context("spawn")
+    process = context.Process(target=run_job, args=(payload,), name=f"etl-{log_id}")
+
+    logger.info(f"🚀 Job {self.request.id}: iniciando carga do log {log_id}")
+    process.start()
+    process.join()
+
+    if process.exitcode != 0:
+        message = f"Processo do job terminou com código {process.exitcode}"
+        logger.error(f"❌ Job {self.request.id}: {message}")
+        asyncio.run(_close_log(uuid.UUID(log_id), message))
+        raise RuntimeError(message)
+
+    logger.info(f"✅ Job {self.request.id}: carga do log {log_id} concluída")
+    return log_id
+
+
+async def enqueue_etl(
+        request: ETLRequest,
+        download: bool = True,
+        mode: Optional[str] = None,
+        session_maker: async_sessionmaker = AsyncSessionMaker
+) -> ETLLog:
+    """
+    Registra o ETLLog (pending) e envia a carga para a fila.
+    O andamento é acompanhado pelo próprio log (ver ETLLogRepository).
+
+    Args:
+        request: Ano, UF e tipo da carga
+        download: Lê o CSV do ZIP publicado no CKAN do TSE
+        mode: "delete", "swap" ou "merge" (padrão: settings.ETL_LOAD_MODE ou Dataset.default_mode)
+        session_maker: Fábrica de sessões (jobs do worker usam uma engine própria, ver watcher)
+
+    Returns:
+        ETLLog criado para o job
+    """
+    async with session_maker() as session:
+        log = await ETLLogRepository(session).create_log(process_name_for(request))
+
+    await _send({
+        "request": request.model_dump(mode="json"),
+        "download": download,
+        "mode": mode,
+        "log_id": str(log.id),
+    })
+    logger.info(f"📨 Job enfileirado: {log.id} - {log.process_name}")
+    return log
+
+
+async def enqueue_resume(log_id: uuid.UUID) -> ETLLog:
+    """
+    Envia para a fila a retomada de uma carga interrompida, no mesmo ETLLog
+    e com os parâmetros gravados no checkpoint (ver resume_etl).
+
+    Args:
+        log_id: ID do ETLLog da carga
+
+    Returns:
+        ETLLog da carga, de volta a pending
+
+    Raises:
+        LookupError: Se a carga não existir
+        ValueError: Se a carga já tiver terminado, estiver em andamento ou não tiver checkpoint
+    """
+    async with AsyncSessionMaker() as session:
+        repository = ETLLogRepository(session)
+        log = await repository.get(log_id)
+        checkpoint = Checkpoint.for_resume(log)
+        if log.status in OPEN_STATUSES:
+            raise ValueError(f"Carga {log_id} ainda está em andamento ({log.status})")
+        await repository.mark_pending(log.id)
+    log.status = "pending"
+
+    await _send({
+        "request": checkpoint.request,
+        "download": checkpoint.download,
+        "mode": checkpoint.mode,
+        "log_id": str(log.id),
+        "resume": True,
+    })
+    logger.info(f"📨 Retomada enfileirada: {log.id} - {log.process_name}")
+    return log
+
+
+async def _send(payload: dict) -> None:
+    send = partial(run_etl_job.apply_async, args=(payload,), task_id=payload["log_id"])
+    await dispatch(send, f"ETL {payload['log_id']}")
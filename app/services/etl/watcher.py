@@ -0,0 +1,262 @@
+import asyncio
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.celery_app import celery_app, dispatch
+from app.core.config import settings
+from app.core.database import AsyncSessionMaker
+from app.models.etl_manifest import ETLManifest
+from app.models.etl_watch import ETLWatch
+from app.repository.log_repository import ETLLogRepository
+from app.repository.manifest_repository import ETLManifestRepository
+from app.repository.watch_repository import ETLWatchRepository
+from app.schemas.etl_schemas import ETLRequest, TipoETLEnum, UFEnum
+from app.services.catalog import ckan_size, ckan_timestamp
+from app.services.ckan_client import CKANTSEClient
+from app.services.etl.datasets import DATASETS, process_name_for, resolve_archive_resource
+from app.services.etl.incremental import NATIONAL
+from app.services.etl.tasks import enqueue_etl
+
+TIPOS_BY_TABLE = {dataset.table_name: tipo for tipo, dataset in DATASETS.items()}
+ALL_UFS = frozenset(uf.value for uf in UFEnum)
+
+
+@dataclass
+class WatchTarget:
+    """Arquivo de origem acompanhado: um dataset e ano com partições já carregadas (ver ETLManifest)."""
+    tipo: TipoETLEnum
+    ano: int
+    ufs: List[str]
+    loaded_at: datetime
+
+    @property
+    def table_name(self) -> str:
+        return DATASETS[self.tipo].table_name
+
+    def requests(self) -> List[ETLRequest]:
+        """
+        Cargas que atualizam só o que já foi carregado: arquivo nacional ou todas
+        as UFs, uma carga com fan-out; senão, uma carga por UF.
+        """
+        if NATIONAL in self.ufs or ALL_UFS <= set(self.ufs):
+            return [ETLRequest(tipo=self.tipo, ano=self.ano)]
+        return [ETLRequest(tipo=self.tipo, ano=self.ano, uf=UFEnum(uf)) for uf in self.ufs if uf in ALL_UFS]
+
+
+def watch_targets(entries: List[ETLManifest]) -> List[WatchTarget]:
+    """Agrupa as partições do manifesto por tabela e ano; loaded_at é o da carga mais antiga."""
+    groups: Dict[Tuple[str, int], List[ETLManifest]] = defaultdict(list)
+    for entry in entries:
+        if entry.table_name in TIPOS_BY_TABLE:
+            groups[(entry.table_name, entry.ano)].append(entry)
+
+    return [
+        WatchTarget(
+            tipo=TIPOS_BY_TABLE[table_name],
+            ano=ano,
+            ufs=sorted(entry.uf for entry in group),
+            loaded_at=min(entry.loaded_at for entry in group),
+        )
+        for (table_name, ano), group in sorted(groups.items())
+    ]
+
+
+async def probe(http: httpx.AsyncClient, url: str, state: Optional[ETLWatch]) -> Tuple[Optional[bool], Dict]:
+    """
+    HEAD condicional no arquivo, com os validadores da última verificação
+    (If-None-Match / If-Modified-Since): nada é baixado.
+
+    Returns:
+        (mudou, validadores novos): mudou é False com 304 ou validadores iguais,
+        True com validadores diferentes e None quando não há como comparar
+    """
+    headers = {}
+    if state is not None and state.url == url:
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.http_last_modified:
+            headers["If-Modified-Since"] = state.http_last_modified
+
+    response = await http.head(url, headers=headers)
+    if response.status_code == httpx.codes.NOT_MODIFIED:
+        return False, {}
+    response.raise_for_status()
+
+    validators = {
+        name: value
+        for name, value in (("etag", response.headers.get("etag")),
+                            ("http_last_modified", response.headers.get("last-modified")))
+        if value
+    }
+    if not headers:
+        return None, validators
+    pairs = [(value, getattr(state, name)) for name, value in validators.items() if getattr(state, name)]
+    if not pairs:
+        return None, validators
+    return any(new != old for new, old in pairs), validators
+
+
+async def check_source(
+        target: WatchTarget,
+        client: CKANTSEClient,
+        http: httpx.AsyncClient,
+        session_maker: async_sessionmaker
+) -> Dict[str, Any]:
+    """
+    Verifica se o arquivo de origem de um alvo mudou desde a última carga e,
+    se mudou, enfileira as cargas das partições já carregadas.
+
+    - metadados do CKAN (last_modified e size do resource) contra a última verificação
+    - HEAD condicional no arquivo: um 304 (ou ETag/Last-Modified iguais) prevalece
+      sobre metadados editados sem troca do arquivo
+    - sem verificação anterior: mudou se o resource foi modificado depois da carga
+
+    As cargas enfileiradas continuam incrementais (ver is_current): uma mudança
+    que não altere dt/hh_geracao termina como skipped. Partições com carga ainda
+    na fila ficam de fora e o estado não avança até que todas sejam enfileiradas.
+
+    Returns:
+        {"table_name", "ano", "changed", "jobs"}
+    """
+    resource = await resolve_archive_resource(ETLRequest(tipo=target.tipo, ano=target.ano), client)
+    last_modified = ckan_timestamp(resource.get("last_modified") or resource.get("created"))
+    size = ckan_size(resource.get("size"))
+
+    async with session_maker() as session:
+        state = await ETLWatchRepository(session).get(target.table_name, target.ano)
+
+    try:
+        http_changed, validators = await probe(http, resource["url"], state)
+    except httpx.HTTPError as e:
+        logger.warning(f"⚠️ HEAD em {resource['url']} falhou ({e}); usando só os metadados do CKAN")
+        http_changed, validators = None, {}
+
+    if state is None:
+        changed = last_modified is None or last_modified > target.loaded_at
+    elif http_changed is not None:
+        changed = http_changed
+    else:
+        changed = (state.last_modified, state.size) != (last_modified, size)
+
+    jobs, busy = [], False
+    if changed:
+        for request in target.requests():
+            async with session_maker() as session:
+                if await ETLLogRepository(session).has_open(process_name_for(request)):
+                    busy = True
+                    continue
+            log = await enqueue_etl(request, session_maker=session_maker)
+            jobs.append(log.id)
+
+    now = datetime.utcnow()
+    if busy:
+        # Alguma partição ainda tinha carga na fila: o estado não avança, e a próxima
+        # verificação vê a mudança de novo e enfileira as que ficaram de fora (as já
+        # enfileiradas terminam como skipped se a geração não mudar, ver is_current)
+        values = {"checked_at": now}
+    else:
+        values = dict(
+            resource_id=resource.get("id"),
+            url=resource.get("url"),
+            last_modified=last_modified,
+            size=size,
+            checked_at=now,
+            **validators,
+        )
+        if changed:
+            values["changed_at"] = now
+        if jobs:
+            values["log_id"] = jobs[-1]
+    async with session_maker() as session:
+        await ETLWatchRepository(session).upsert(target.table_name, target.ano, **values)
+
+    if changed:
+        logger.info(f"🔔 {target.table_name} {target.ano}: arquivo mudou, {len(jobs)} cargas enfileiradas")
+    return {
+        "table_name": target.table_name,
+        "ano": target.ano,
+        "changed": changed,
+        "jobs": [str(job) for job in jobs],
+    }
+
+
+async def watch_sources(
+        session_maker: async_sessionmaker = AsyncSessionMaker,
+        client: Optional[CKANTSEClient] = None
+) -> Dict[str, Any]:
+    """
+    Verifica todos os arquivos com partições carregadas (no máximo
+    settings.ETL_WATCH_CONCURRENCY ao mesmo tempo) e enfileira as cargas dos
+    que mudaram. A falha de um arquivo não interrompe os demais.
+
+    Returns:
+        {"checked", "changed", "jobs", "errors", "sources"}
+    """
+    if client is None:
+        async with CKANTSEClient() as own_client:
+            return await watch_sources(session_maker, own_client)
+
+    async with session_maker() as session:
+        targets = watch_targets(await ETLManifestRepository(session).list_all())
+
+    semaphore = asyncio.Semaphore(settings.ETL_WATCH_CONCURRENCY)
+    async with httpx.AsyncClient(timeout=settings.ETL_DOWNLOAD_TIMEOUT, follow_redirects=True) as http:
+        async def run(target: WatchTarget) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await check_source(target, client, http, session_maker)
+                except Exception as e:
+                    logger.error(f"❌ Erro ao verificar {target.table_name} {target.ano}: {e}")
+                    return {"table_name": target.table_name, "ano": target.ano, "error": str(e)}
+
+        sources = list(await asyncio.gather(*(run(target) for target in targets)))
+
+    summary = {
+        "checked": len(sources),
+        "changed": sum(1 for source in sources if source.get("changed")),
+        "jobs": sum(len(source.get("jobs", [])) for source in sources),
+        "errors": sum(1 for source in sources if "error" in source),
+    }
+    logger.info(
+        f"👀 Watcher: {summary['checked']} arquivos verificados, {summary['changed']} mudaram, "
+        f"{summary['jobs']} cargas enfileiradas, {summary['errors']} erros"
+    )
+    return {**summary, "sources": sources}
+
+
+async def _watch_job() -> Dict[str, Any]:
+    # Engine sem pool própria: a thread do worker roda seu próprio event loop
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        return await watch_sources(async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="etl.watch")
+def watch_sources_job() -> Dict[str, Any]:
+    """Job periódico (celery beat, a cada settings.ETL_WATCH_INTERVAL) do watcher de arquivos."""
+    return asyncio.run(_watch_job())
+
+
+async def enqueue_watch() -> str:
+    """
+    Envia uma verificação dos arquivos para a fila, fora do agendamento.
+
+    Returns:
+        ID da task
+    """
+    task_id = str(uuid.uuid4())
+    send = partial(watch_sources_job.apply_async, task_id=task_id)
+    await dispatch(send, f"verificação de arquivos {task_id}")
+    logger.info(f"📨 Verificação de arquivos enfileirada: {task_id}")
+    return task_id
@@ -1,9 +1,40 @@
+import csv
+import hashlib
+import heapq
 import keyword
 import re
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 import pandas as pd
 
+from app.services.etl.csv_stream import NULL_TOKENS
+
+INT_RE = re.compile(r"-?\d+")
+DECIMAL_RE = re.compile(r"-?(\d{1,3}(?:\.\d{3})+|\d+)(?:,(\d+))?")
+DATE_RE = re.compile(r"\d{2}/\d{2}/\d{4}")
+TIME_RE = re.compile(r"\d{2}:\d{2}:\d{2}")
+DATETIME_RE = re.compile(r"\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}")
+
+SMALLINT_RANGE = (-32768, 32767)
+INTEGER_RANGE = (-2147483648, 2147483647)
+BIGINT_RANGE = (-9223372036854775808, 9223372036854775807)
+
+# CPF/CNPJ são identificadores: números com zeros à esquerda que estouram o INTEGER
+DOCUMENT_RE = re.compile(r"(^|_)(cpf|cnpj)(_|$)")
+
+# Colunas de ano/UF usadas como filtro (e chave de recarga) em quase toda consulta
+YEAR_COLUMNS = ("ano_eleicao", "aa_eleicao", "aa_exercicio", "aa_referencia")
+UF_COLUMNS = ("sg_uf", "sg_uf_origem")
+KEY_PREFIXES = ("sq_", "cd_", "nr_")
+
+DISTINCT_LIMIT = 10_000
+SKETCH_SIZE = 1024
+INDEX_MIN_DISTINCT = 1_000
+DICTIONARY_MAX_DISTINCT = 256
+DICTIONARY_MIN_LENGTH = 8
+MAX_VARCHAR = 255
+
 
 def sanititze_column_name(col_name: str) -> str:
     """
@@ -72,51 +103,392 @@ def infer_pg_type(series: pd.Series) -> tuple[str, int | None]:
     return "VARCHAR", length
 
 
+class DistinctCounter:
+    """
+    Contagem de valores distintos em memória constante: exata até `limit`
+    valores e, acima disso, estimada por um sketch KMV (k menores hashes).
+    """
+
+    def __init__(self, limit: int = DISTINCT_LIMIT, k: int = SKETCH_SIZE):
+        self.limit = limit
+        self.k = k
+        self.values: Optional[set] = set()
+        self.heap: List[int] = []  # max-heap (negativos) dos k menores hashes
+        self.hashes: set = set()
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+    def add(self, value: str) -> None:
+        if self.values is not None:
+            self.values.add(value)
+            if len(self.values) > self.limit:
+                for seen in self.values:
+                    self._add_hash(self._hash(seen))
+                self.values = None
+            return
+        self._add_hash(self._hash(value))
+
+    def _add_hash(self, hashed: int) -> None:
+        if hashed in self.hashes:
+            return
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, -hashed)
+            self.hashes.add(hashed)
+        elif hashed < -self.heap[0]:
+            removed = -heapq.heappushpop(self.heap, -hashed)
+            self.hashes.discard(removed)
+            self.hashes.add(hashed)
+
+    @property
+    def exact(self) -> bool:
+        return self.values is not None
+
+    def count(self) -> int:
+        if self.values is not None:
+            return len(self.values)
+        return int((self.k - 1) / (-self.heap[0] / 2 ** 64))
+
+
+class ColumnProfile:
+    """
+    Estatísticas de uma coluna acumuladas linha a linha: nulos, tamanho
+    máximo, mínimo/máximo, cardinalidade e os tipos ainda compatíveis com
+    todos os valores vistos.
+    """
+
+    __slots__ = (
+        "name", "rows", "nulls", "max_length", "total_length", "kinds", "leading_zero",
+        "int_min", "int_max", "int_digits", "scale", "text_min", "text_max", "distinct",
+    )
+
+    def __init__(self, name: str, distinct_limit: int = DISTINCT_LIMIT):
+        self.name = name
+        self.rows = 0
+        self.nulls = 0
+        self.max_length = 0
+        self.total_length = 0
+        self.kinds = {"int", "decimal", "date", "time", "datetime"}
+        self.leading_zero = False
+        self.int_min: Optional[int] = None
+        self.int_max: Optional[int] = None
+        self.int_digits = 0
+        self.scale = 0
+        self.text_min: Optional[str] = None
+        self.text_max: Optional[str] = None
+        self.distinct = DistinctCounter(distinct_limit)
+
+    def add(self, value: str) -> None:
+        self.rows += 1
+        value = value.strip()
+        if value in NULL_TOKENS:
+            self.nulls += 1
+            return
+
+        length = len(value)
+        self.total_length += length
+        if length > self.max_length:
+            self.max_length = length
+        self.distinct.add(value)
+
+        kinds = self.kinds
+        if "int" in kinds:
+            if INT_RE.fullmatch(value):
+                number = int(value)
+                if self.int_min is None or number < self.int_min:
+                    self.int_min = number
+                if self.int_max is None or number > self.int_max:
+                    self.int_max = number
+                if length > 1 and value.lstrip("-").startswith("0"):
+                    self.leading_zero = True
+            else:
+                kinds.discard("int")
+        if "decimal" in kinds:
+            match = DECIMAL_RE.fullmatch(value)
+            if match:
+                self.int_digits = max(self.int_digits, len(match.group(1).replace(".", "")))
+                self.scale = max(self.scale, len(match.group(2) or ""))
+            else:
+                kinds.discard("decimal")
+        for kind, pattern in (("date", DATE_RE), ("time", TIME_RE), ("datetime", DATETIME_RE)):
+            if kind in kinds and not pattern.fullmatch(value):
+                kinds.discard(kind)
+
+        # Datas DD/MM/AAAA só ordenam corretamente como AAAAMMDD
+        key = value[6:10] + value[3:5] + value[:2] + value[10:] if kinds & {"date", "datetime"} else value
+        if self.text_min is None or key < self.text_min:
+            self.text_min = key
+        if self.text_max is None or key > self.text_max:
+            self.text_max = key
+
+    @property
+    def non_null(self) -> int:
+        return self.rows - self.nulls
+
+    @property
+    def null_ratio(self) -> float:
+        return self.nulls / self.rows if self.rows else 1.0
+
+    @property
+    def cardinality(self) -> int:
+        return self.distinct.count()
+
+    @property
+    def avg_length(self) -> float:
+        return self.total_length / self.non_null if self.non_null else 0.0
+
+    def bounds(self) -> Tuple[Optional[str], Optional[str]]:
+        """Menor e maior valor, no formato original do CSV."""
+        if self.non_null == 0:
+            return None, None
+        if "int" in self.kinds and not self.leading_zero:
+            return str(self.int_min), str(self.int_max)
+        if self.kinds & {"date", "datetime"}:
+            return tuple(f"{key[6:8]}/{key[4:6]}/{key[:4]}{key[8:]}" for key in (self.text_min, self.text_max))
+        return self.text_min, self.text_max
+
+    def pg_type(self) -> Tuple[str, Optional[int], Optional[int]]:
+        """
+        Tipo PostgreSQL compatível com todos os valores do arquivo.
+
+        Returns:
+            (tipo, length/precision, scale)
+        """
+        if self.non_null == 0:
+            return "TEXT", None, None
+
+        kinds = self.kinds
+        is_document = DOCUMENT_RE.search(self.name) is not None
+        if "int" in kinds and not self.leading_zero and not is_document:
+            for pg_type, (low, high) in (
+                    ("SMALLINT", SMALLINT_RANGE), ("INTEGER", INTEGER_RANGE), ("BIGINT", BIGINT_RANGE)
+            ):
+                if low <= self.int_min and self.int_max <= high:
+                    return pg_type, None, None
+        if "int" in kinds:
+            # Códigos numéricos (CPF, CNPJ, CEP...) viram texto para manter os zeros à esquerda
+            length = max(self.max_length, 14 if "cnpj" in self.name else 11 if is_document else 0)
+            return "VARCHAR", length, None
+        if "datetime" in kinds:
+            return "TIMESTAMP", None, None
+        if "date" in kinds:
+            return "DATE", None, None
+        if "time" in kinds:
+            return "TIME", None, None
+        if "decimal" in kinds:
+            return "NUMERIC", max(15, self.int_digits + self.scale), self.scale
+        if self.max_length > MAX_VARCHAR:
+            return "TEXT", None, None
+        return "VARCHAR", self.max_length, None
+
+
+def profile_csv(
+        csv_path: str,
+        sep: str = ";",
+        encoding: str = "latin1",
+        distinct_limit: int = DISTINCT_LIMIT,
+        progress_every: int = 1_000_000
+) -> Tuple[List[str], List[ColumnProfile]]:
+    """
+    Percorre o CSV inteiro linha a linha, em memória constante, acumulando o
+    perfil de cada coluna.
+
+    Args:
+        csv_path: Caminho do CSV
+        sep: Separador do CSV
+        encoding: Codificação do CSV
+        distinct_limit: Valores distintos contados exatamente antes de passar à estimativa
+        progress_every: Intervalo (em linhas) das mensagens de progresso
+
+    Returns:
+        (nomes originais das colunas, perfis)
+    """
+    with open(csv_path, newline="", encoding=encoding) as fh:
+        reader = csv.reader(fh, delimiter=sep, quotechar='"')
+        raw_cols = next(reader)
+        profiles = [ColumnProfile(sanititze_column_name(c), distinct_limit) for c in raw_cols]
+        adders = [profile.add for profile in profiles]
+
+        for line_number, row in enumerate(reader, start=1):
+            for add, value in zip(adders, row):
+                add(value)
+            if line_number % progress_every == 0:
+                print(f"... {line_number} linhas lidas")
+
+    return raw_cols, profiles
+
+
+def suggest_indexes(table_name: str, profiles: List[ColumnProfile]) -> List[Tuple[str, List[str]]]:
+    """
+    Índices sugeridos: (ano, UF), filtro de quase toda consulta e chave das
+    recargas, e colunas de identificadores (sq_/cd_/nr_) com muitos valores distintos.
+
+    Returns:
+        Lista de (nome do índice, colunas)
+    """
+    by_name = {profile.name: profile for profile in profiles}
+    indexes = []
+
+    year = next((name for name in YEAR_COLUMNS if name in by_name), None)
+    uf = next((name for name in UF_COLUMNS if name in by_name), None)
+    partition_key = [name for name in (year, uf) if name]
+    if partition_key:
+        indexes.append((f"ix_{table_name}_{'_'.join(partition_key)}", partition_key))
+
+    for profile in profiles:
+        if profile.name in partition_key or not profile.name.startswith(KEY_PREFIXES):
+            continue
+        if profile.cardinality >= INDEX_MIN_DISTINCT and profile.null_ratio < 0.5:
+            indexes.append((f"ix_{table_name}_{profile.name}", [profile.name]))
+
+    return indexes
+
+
+def dictionary_candidates(profiles: List[ColumnProfile]) -> List[ColumnProfile]:
+    """
+    Colunas de texto longas com poucos valores distintos (ds_*, nm_* repetidos
+    em milhões de linhas): candidatas a tabela de domínio ou ENUM, guardando
+    apenas o código na tabela principal.
+    """
+    return [
+        profile for profile in profiles
+        if profile.pg_type()[0] in ("VARCHAR", "TEXT")
+        and profile.distinct.exact
+        and profile.cardinality <= DICTIONARY_MAX_DISTINCT
+        and profile.avg_length >= DICTIONARY_MIN_LENGTH
+        and profile.non_null > profile.cardinality * 10
+    ]
+
+
+def format_profile_report(
+        profiles: List[ColumnProfile],
+        indexes: List[Tuple[str, List[str]]],
+        dictionaries: List[ColumnProfile]
+) -> str:
+    """Relatório em texto com o perfil de cada coluna e as sugestões."""
+    rows = profiles[0].rows if profiles else 0
+    lines = [f"Linhas: {rows}", ""]
+    lines.append(f"{'coluna':<40} {'tipo':<16} {'nulos':>7} {'distintos':>11} {'max_len':>7}  min .. max")
+    for profile in profiles:
+        pg_type, length, scale = profile.pg_type()
+        if scale is not None:
+            pg_type = f"{pg_type}({length},{scale})"
+        elif length:
+            pg_type = f"{pg_type}({length})"
+        distinct = f"{'' if profile.distinct.exact else '~'}{profile.cardinality}"
+        low, high = profile.bounds()
+        lines.append(
+            f"{profile.name:<40} {pg_type:<16} {profile.null_ratio:>7.1%} {distinct:>11} "
+            f"{profile.max_length:>7}  {low} .. {high}"
+        )
+
+    lines.append("")
+    lines.append("Índices sugeridos:")
+    lines.extend(f"  {name} ({', '.join(columns)})" for name, columns in indexes or [("(nenhum)", [])])
+
+    lines.append("")
+    lines.append("Candidatas a dicionário (tabela de domínio/ENUM):")
+    for profile in dictionaries:
+        saved = profile.total_length - profile.non_null * 2
+        lines.append(
+            f"  {profile.name}: {profile.cardinality} valores, "
+            f"média {profile.avg_length:.0f} caracteres, ~{saved / 1024 ** 2:.1f} MB de texto repetido"
+        )
+    if not dictionaries:
+        lines.append("  (nenhuma)")
+    return "\n".join(lines)
+
+
+def sa_type_for(pg_type: str, length: Optional[int], scale: Optional[int]) -> str:
+    """Tipo SQLAlchemy (como código) para o tipo PostgreSQL inferido."""
+    if pg_type == "VARCHAR" and length:
+        return f"String({length})"
+    if pg_type == "NUMERIC" and length:
+        return f"Numeric({length}, {scale})"
+    return TYPE_MAP.get(pg_type, "Text")
+
+
+def pg_type_sql(pg_type: str, length: Optional[int], scale: Optional[int]) -> str:
+    """Tipo PostgreSQL (como SQL) para o CREATE TABLE."""
+    if pg_type == "VARCHAR" and length:
+        return f"VARCHAR({length})"
+    if pg_type == "NUMERIC" and length:
+        return f"NUMERIC({length}, {scale})"
+    return pg_type
+
+
+TYPE_MAP = {
+    "SMALLINT": "SmallInteger",
+    "INTEGER": "Integer",
+    "BIGINT": "BigInteger",
+    "NUMERIC": "Numeric",
+    "TEXT": "Text",
+    "TIMESTAMP": "DateTime",
+    "DATE": "Date",
+    "TIME": "Time",
+    "DOUBLE PRECISION": "Float",
+    "VARCHAR": "String",
+    "BOOLEAN": "Boolean",
+}
+
+
 def generate_from_csv(
         csv_path: str,
         table_name: str,
         sep: str = ";",
         encoding: str = "latin1",
-        sample_rows: int = 5000
+        sample_rows: int = 5000,
+        profile: bool = False
 ):
-    csv_path = Path(csv_path)
-    df = pd.read_csv(csv_path, sep=sep, encoding=encoding, low_memory=False, nrows=sample_rows)
+    """
+    Gera o CREATE TABLE e o model SQLAlchemy de um CSV.
 
-    raw_cols = list(df.columns)
-    sanitized_cols = [sanititze_column_name(c) for c in raw_cols]
-    inferred = [infer_pg_type(df[c]) for c in raw_cols]
+    Args:
+        csv_path: Caminho do CSV
+        table_name: Nome da tabela
+        sep: Separador do CSV
+        encoding: Codificação do CSV
+        sample_rows: Linhas lidas pelo pandas para inferir os tipos (sem profile)
+        profile: Percorre o arquivo inteiro em streaming (ver profile_csv), com
+            tipos válidos para todas as linhas e índices sugeridos
 
-    # CREATE TABLE
-    col_defs = []
-    for name, (pg_type, length) in zip(sanitized_cols, inferred):
-        if pg_type == "VARCHAR" and length:
-            col_defs.append(f'    "{name}" VARCHAR({length}) NULL')
-        else:
-            col_defs.append(f'    "{name}" {pg_type} NULL')
+    Returns:
+        (create_sql, model_code, model_name, report); report é None sem profile
+    """
+    csv_path = Path(csv_path)
+    indexes: List[Tuple[str, List[str]]] = []
+    report = None
+
+    if profile:
+        raw_cols, profiles = profile_csv(str(csv_path), sep=sep, encoding=encoding)
+        sanitized_cols = [p.name for p in profiles]
+        inferred = [p.pg_type() for p in profiles]
+        indexes = suggest_indexes(table_name, profiles)
+        report = format_profile_report(profiles, indexes, dictionary_candidates(profiles))
+    else:
+        df = pd.read_csv(csv_path, sep=sep, encoding=encoding, low_memory=False, nrows=sample_rows)
+        raw_cols = list(df.columns)
+        sanitized_cols = [sanititze_column_name(c) for c in raw_cols]
+        inferred = [(*infer_pg_type(df[c]), None) for c in raw_cols]
 
+    # CREATE TABLE
+    col_defs = [f'    "{name}" {pg_type_sql(*pg)} NULL' for name, pg in zip(sanitized_cols, inferred)]
     create_sql = f"CREATE TABLE {table_name} (\n" + ",\n".join(col_defs) + "\n);\n"
+    for index_name, columns in indexes:
+        create_sql += f"CREATE INDEX {index_name} ON {table_name} ({', '.join(columns)});\n"
 
     # Model SQLAlchemy
-    type_map = {
-        "SMALLINT": "SmallInteger",
-        "INTEGER": "Integer",
-        "BIGINT": "BigInteger",
-        "NUMERIC": "Numeric",
-        "TEXT": "Text",
-        "TIMESTAMP": "DateTime(timezone=True)",
-        "DOUBLE PRECISION": "Float",
-        "VARCHAR": "String",
-        "BOOLEAN": "Boolean",
-    }
-
     model_name = "".join(part.capitalize() for part in table_name.split("_"))
+    single_indexes = {columns[0] for _, columns in indexes if len(columns) == 1}
+    composite_indexes = [(name, columns) for name, columns in indexes if len(columns) > 1]
 
     lines = []
     lines.append("import uuid")
     lines.append("")
     lines.append(
         "from sqlalchemy import Column, SmallInteger, Integer, BigInteger, Numeric, "
-        "Text, DateTime, Boolean, String, Float"
+        "Text, DateTime, Date, Time, Boolean, String, Float, Index, text"
     )
     lines.append("from sqlalchemy.dialects.postgresql import UUID")
     lines.append("from app.core.database import Base")
@@ -124,21 +496,25 @@ def generate_from_csv(
     lines.append("")
     lines.append(f"class {model_name}(Base):")
     lines.append(f'    __tablename__ = "{table_name}"')
+    if composite_indexes:
+        lines.append("    __table_args__ = (")
+        for index_name, columns in composite_indexes:
+            quoted = ", ".join(f'"{c}"' for c in columns)
+            lines.append(f'        Index("{index_name}", {quoted}),')
+        lines.append("    )")
     lines.append("")
-    lines.append("    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)")
+    lines.append(
+        '    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, '
+        'server_default=text("gen_random_uuid()"))'
+    )
     lines.append("")
 
-    for orig, name, (pg_type, length) in zip(raw_cols, sanitized_cols, inferred):
-        sa_type = type_map.get(pg_type, "Text")
-        if pg_type == "VARCHAR" and length:
-            field_type = f"String({length})"
-        else:
-            field_type = sa_type
-
-        lines.append(f"    {name} = Column({field_type}, nullable=True)")
+    for name, pg in zip(sanitized_cols, inferred):
+        index = ", index=True" if name in single_indexes else ""
+        lines.append(f"    {name} = Column({sa_type_for(*pg)}, nullable=True{index})")
 
-    model_code = "\n".join(lines)
-    return create_sql, model_code, model_name
+    model_code = "\n".join(lines) + "\n"
+    return create_sql, model_code, model_name, report
 
 
 if __name__ == "__main__":
@@ -155,6 +531,11 @@ if __name__ == "__main__":
     parser.add_argument(
         "--encoding", type=str, default="latin1", help="Codificação do CSV"
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Lê o arquivo inteiro em streaming para inferir os tipos e sugerir índices",
+    )
     parser.add_argument(
         "--output-models-dir",
         type=str,
@@ -175,13 +556,17 @@ if __name__ == "__main__":
         out = input("Diretório para salvar o modelo (ENTER para não salvar): ").strip()
         args.output_models_dir = out or None
 
-    create_sql, model_code, model_name = generate_from_csv(
+    create_sql, model_code, model_name, report = generate_from_csv(
         csv_path=args.csv_path,
         table_name=args.table_name,
         sep=args.sep,
         encoding=args.encoding,
+        profile=args.profile,
     )
 
+    if report:
+        print(f"\n{report}")
+
     suggested_filename = f"{args.table_name}.py".lower()
     print(f"\nSugestão de arquivo para a model: {suggested_filename}")
 
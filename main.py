@@ -14,9 +14,11 @@ from app.api.v1 import (
     perfil_comparecimento_abstencao_routes,
     consulta_candidato_routes,
     ckan_routes,
+    etl_routes,
 )
 from app.core.config import settings
 from app.core.database import init_db, create_database_if_not_exists
+from app.services.etl.progress_stream import progress_broadcaster
 
 logger.remove()
 logger.add(
@@ -52,6 +54,8 @@ async def lifespan(app: FastAPI):
 
     yield
     logger.info("👋 Encerrando aplicação...")
+    await progress_broadcaster.close()
+    await ckan_routes.client.close()
 
 
 app = FastAPI(
@@ -77,6 +81,7 @@ app.include_router(votacao_partido_routes.router, prefix="/api/v1", tags=["Vota
 app.include_router(perfil_comparecimento_abstencao_routes.router, prefix="/api/v1", tags=["Perfil de Votação - TSE"])
 app.include_router(consulta_candidato_routes.router, prefix="/api/v1", tags=["Consulta de Candidatos - TSE"])
 app.include_router(ckan_routes.router, prefix="/api/v1", tags=["CKAN - TSE"])
+app.include_router(etl_routes.router, prefix="/api/v1", tags=["ETL - Jobs"])
 
 if __name__ == "__main__":
     import uvicorn
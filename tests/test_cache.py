@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+
+from app.services import cache as cache_module
+from app.services.cache import SingleFlight, TTLCache
+
+
+class _Clock:
+    """Relógio manual no lugar do time.monotonic do módulo."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def _loader(values, calls):
+    async def load():
+        calls.append(1)
+        value = values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+    return load
+
+
+def test_fresh_entry_is_served_without_loading(clock):
+    cache = TTLCache(max_entries=10, stale_seconds=60)
+    calls = []
+
+    async def run():
+        first = await cache.get_or_load("k", 30, _loader(["v1"], calls))
+        clock.now += 10
+        second = await cache.get_or_load("k", 30, _loader(["v2"], calls))
+        return first, second
+
+    assert asyncio.run(run()) == ("v1", "v1")
+    assert len(calls) == 1
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+
+def test_stale_entry_is_served_and_revalidated_in_background(clock):
+    cache = TTLCache(max_entries=10, stale_seconds=60)
+    calls = []
+
+    async def run():
+        await cache.get_or_load("k", 30, _loader(["v1"], calls))
+        clock.now += 45
+        # Vencida há menos de stale_seconds: responde na hora com o valor antigo
+        stale = await cache.get_or_load("k", 30, _loader(["v2"], calls))
+        # Uma só recarga por chave, mesmo com várias leituras vencidas
+        await cache.get_or_load("k", 30, _loader(["v3"], calls))
+        await asyncio.gather(*cache._tasks)
+        return stale, await cache.get_or_load("k", 30, _loader([], calls))
+
+    assert asyncio.run(run()) == ("v1", "v2")
+    assert len(calls) == 2
+    assert cache.stats.stale_hits == 2 and cache.stats.refreshes == 1
+
+
+def test_expired_entry_is_served_when_the_origin_fails(clock):
+    cache = TTLCache(max_entries=10, stale_seconds=60)
+    calls = []
+
+    async def run():
+        await cache.get_or_load("k", 30, _loader(["v1"], calls))
+        clock.now += 500
+        return await cache.get_or_load("k", 30, _loader([RuntimeError("CKAN fora do ar")], calls))
+
+    assert asyncio.run(run()) == "v1"
+    assert cache.stats.stale_if_error == 1
+
+
+def test_missing_entry_propagates_the_origin_error(clock):
+    cache = TTLCache(max_entries=10, stale_seconds=60)
+
+    with pytest.raises(RuntimeError, match="CKAN fora do ar"):
+        asyncio.run(cache.get_or_load("k", 30, _loader([RuntimeError("CKAN fora do ar")], [])))
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(max_entries=2, stale_seconds=60)
+    cache.set("a", 1, 30)
+    cache.set("b", 2, 30)
+
+    # Leitura de "a" o torna o mais recente: "b" sai na próxima inserção
+    assert asyncio.run(cache.get_or_load("a", 30, _loader([], []))) == 1
+    cache.set("c", 3, 30)
+
+    assert sorted(cache._entries) == ["a", "c"]
+    assert cache.stats.evictions == 1
+
+
+def test_single_flight_shares_one_call_between_concurrent_callers():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"package": "eleitorado"}
+
+    async def run():
+        return await asyncio.gather(*(flight.do("pkg", fetch) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.snapshot() == {"calls": 1, "shared": 4, "inflight": 0}
+
+
+def test_single_flight_propagates_the_error_to_every_caller():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("CKAN fora do ar")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("pkg", fetch) for _ in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert [str(error) for error in errors] == ["CKAN fora do ar"] * 3
+    assert flight.calls == 1 and not flight._inflight
+
+
+def test_single_flight_survives_cancellation_of_the_first_caller():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def run():
+        first = asyncio.create_task(flight.do("pkg", fetch))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.do("pkg", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "ok"
+    assert flight.calls == 1
@@ -0,0 +1,117 @@
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.etl.checkpoint import Checkpoint
+from app.services.etl.incremental import SourceStamp
+
+LOG_ID = uuid.UUID("0192f0a1-7c3e-7000-8000-000000000001")
+STAMP = SourceStamp(dt_geracao="07/10/2024", hh_geracao="10:15:00", fingerprint="crc32:1a2b3c4d:1048576", size=10)
+
+
+def _checkpoint(**values) -> Checkpoint:
+    return Checkpoint(
+        log_id=LOG_ID,
+        request={"tipo": "candidato", "ano": 2024, "uf": "SP"},
+        mode="swap",
+        download=True,
+        **values,
+    )
+
+
+def _log(status: str = "failed", checkpoint=None) -> SimpleNamespace:
+    return SimpleNamespace(id=LOG_ID, status=status, checkpoint=checkpoint)
+
+
+class _Connection:
+    def __init__(self):
+        self.executed = []
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+
+
+def test_state_round_trips_through_the_log():
+    checkpoint = _checkpoint(member_name="votacao_candidato_munzona_2024_SP.csv", indexes=[["ix", "CREATE INDEX"]])
+    checkpoint.restart(STAMP)
+    checkpoint.advance(line=5001, bytes_read=80_000, rows=5000, rejected=0)
+
+    state = json.loads(json.dumps(checkpoint.state()))
+
+    assert "log_id" not in state
+    assert Checkpoint.from_log(_log(checkpoint=state)) == checkpoint
+
+
+def test_from_log_ignores_unknown_keys():
+    state = _checkpoint().state()
+    state["campo_de_outra_versao"] = 1
+
+    assert Checkpoint.from_log(_log(checkpoint=state)) == _checkpoint()
+
+
+def test_from_log_without_checkpoint():
+    assert Checkpoint.from_log(_log(checkpoint=None)) is None
+    assert Checkpoint.from_log(_log(checkpoint={})) is None
+
+
+def test_advance_accumulates_rows():
+    checkpoint = _checkpoint()
+    assert not checkpoint.started
+
+    checkpoint.advance(line=1001, bytes_read=100, rows=1000, rejected=1)
+    checkpoint.advance(line=2001, bytes_read=200, rows=999, rejected=2)
+
+    assert checkpoint.started
+    assert (checkpoint.line, checkpoint.bytes_read, checkpoint.rows, checkpoint.rejected) == (2001, 200, 1999, 2)
+
+
+def test_matches_generation_and_fingerprint():
+    checkpoint = _checkpoint()
+    checkpoint.restart(STAMP)
+
+    assert checkpoint.matches(STAMP)
+    # size não faz parte da comparação, só geração e fingerprint
+    assert checkpoint.matches(SourceStamp(STAMP.dt_geracao, STAMP.hh_geracao, STAMP.fingerprint, size=99))
+    assert not checkpoint.matches(SourceStamp(STAMP.dt_geracao, "11:00:00", STAMP.fingerprint))
+
+
+def test_restart_discards_position_and_keeps_indexes():
+    checkpoint = _checkpoint(indexes=[["ix", "CREATE INDEX"]])
+    checkpoint.advance(line=1001, bytes_read=100, rows=1000, rejected=3)
+
+    checkpoint.restart()
+
+    assert (checkpoint.line, checkpoint.bytes_read, checkpoint.rows, checkpoint.rejected) == (0, 0, 0, 0)
+    assert checkpoint.source is None
+    assert checkpoint.indexes == [["ix", "CREATE INDEX"]]
+
+
+def test_for_resume_returns_the_checkpoint():
+    assert Checkpoint.for_resume(_log(checkpoint=_checkpoint().state())) == _checkpoint()
+
+
+@pytest.mark.parametrize("log, error", [
+    (None, LookupError),
+    (_log(status="done", checkpoint={"mode": "swap"}), ValueError),
+    (_log(status="skipped", checkpoint={"mode": "swap"}), ValueError),
+    (_log(status="failed", checkpoint=None), ValueError),
+])
+def test_for_resume_rejects(log, error):
+    with pytest.raises(error):
+        Checkpoint.for_resume(log)
+
+
+def test_save_updates_the_log_row():
+    conn = _Connection()
+    checkpoint = _checkpoint()
+    checkpoint.advance(line=11, bytes_read=10, rows=10, rejected=0)
+
+    asyncio.run(checkpoint.save(conn))
+
+    (query, (state, log_id)), = conn.executed
+    assert query.startswith("UPDATE etl_log SET checkpoint")
+    assert log_id == LOG_ID
+    assert json.loads(state)["line"] == 11
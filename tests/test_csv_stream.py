@@ -0,0 +1,160 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import Column, Date, DateTime, Integer, Numeric, String, Time
+from sqlalchemy.orm import declarative_base
+
+from app.services.etl.csv_stream import (
+    CSVBatchReader,
+    converter_for,
+    to_date,
+    to_datetime,
+    to_decimal,
+    to_int,
+    to_str,
+    to_time,
+)
+
+Base = declarative_base()
+
+
+class _Bem(Base):
+    """Model mínimo no formato das tabelas do TSE."""
+
+    __tablename__ = "bem"
+
+    id = Column(Integer, primary_key=True)
+    ano_eleicao = Column(Integer)
+    dt_geracao = Column(Date)
+    ds_bem = Column(String)
+    vr_bem = Column(Numeric(18, 2))
+
+
+class _Quarantine:
+    def __init__(self):
+        self.rows = []
+
+    def reject(self, line, reason, values=None):
+        self.rows.append((line, reason))
+
+
+HEADER = '"ANO_ELEICAO";"DT_GERACAO";"DS_BEM";"VR_BEM";"NM_IGNORADA"\n'
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1234,56", Decimal("1234.56")),
+    ("1.234,56", Decimal("1234.56")),
+    ("1.234.567,89", Decimal("1234567.89")),
+    # Sem vírgula o ponto é o separador decimal, como nos arquivos com "1234.56"
+    ("1.234", Decimal("1.234")),
+    ("0", Decimal("0")),
+])
+def test_to_decimal(value, expected):
+    assert to_decimal(value) == expected
+
+
+@pytest.mark.parametrize("token", ["", "#NULO#", "#NULO", "#NE#", "#NE"])
+def test_null_tokens(token):
+    assert to_int(token) is None
+    assert to_decimal(token) is None
+    assert to_date(token) is None
+    assert to_time(token) is None
+    assert to_datetime(token) is None
+
+
+def test_dates_and_times():
+    assert to_date("06/10/2024") == date(2024, 10, 6)
+    assert to_time("08:05:00") == time(8, 5)
+    assert to_datetime("06/10/2024 17:30:15") == datetime(2024, 10, 6, 17, 30, 15)
+
+
+def test_invalid_values_raise_value_error():
+    with pytest.raises(ValueError):
+        to_int("abc")
+    with pytest.raises(ValueError):
+        to_date("2024-10-06")
+    with pytest.raises(ArithmeticError):
+        to_decimal("R$ 10,00")
+
+
+def test_to_str_keeps_text_and_nulls_empty():
+    assert to_str("#NULO#") == "#NULO#"
+    assert to_str("") is None
+
+
+def test_converter_for_column_types():
+    columns = {
+        "int": Column(Integer),
+        "date": Column(Date),
+        "datetime": Column(DateTime),
+        "time": Column(Time),
+        "numeric": Column(Numeric(18, 2)),
+        "str": Column(String),
+    }
+    converters = {name: converter_for(column) for name, column in columns.items()}
+    assert converters == {
+        "int": to_int,
+        "date": to_date,
+        "datetime": to_datetime,
+        "time": to_time,
+        "numeric": to_decimal,
+        "str": to_str,
+    }
+
+
+def test_batches_follow_the_model_columns():
+    lines = [HEADER] + [f'"2024";"01/09/2024";"CASA {n}";"1.000,{n:02d}";"x"\n' for n in range(5)]
+    reader = CSVBatchReader(_Bem, lines)
+
+    batches = list(reader.iter_batches(2))
+
+    assert reader.columns == ["ano_eleicao", "dt_geracao", "ds_bem", "vr_bem"]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[0][1] == (2024, date(2024, 9, 1), "CASA 1", Decimal("1000.01"))
+    assert reader.batch_lines == [6]
+    assert reader.bytes_read == sum(len(line) for line in lines)
+
+
+def test_rename_maps_header_to_model_column():
+    lines = ['"AA_ELEICAO";"VR_BEM"\n', '"2022";"10,00"\n']
+    reader = CSVBatchReader(_Bem, lines, rename={"AA_ELEICAO": "ano_eleicao"})
+
+    assert list(reader.iter_batches(10)) == [[(2022, Decimal("10.00"))]]
+
+
+def test_bad_rows_go_to_quarantine():
+    lines = [
+        HEADER,
+        '"2024";"01/09/2024";"CASA";"10,00";"x"\n',
+        '"2024";"01/09/2024";"CASA"\n',
+        '"ANO";"01/09/2024";"CASA";"10,00";"x"\n',
+        '"2024";"01/09/2024";"APTO";"20,00";"x"\n',
+    ]
+    quarantine = _Quarantine()
+    reader = CSVBatchReader(_Bem, lines, quarantine=quarantine)
+
+    batches = list(reader.iter_batches(10))
+
+    assert [row[2] for row in batches[0]] == ["CASA", "APTO"]
+    assert reader.batch_lines == [2, 5]
+    assert [line for line, _ in quarantine.rows] == [3, 4]
+    assert quarantine.rows[0][1] == "3 campos, esperados 5"
+    assert reader.rejected == 2
+
+
+def test_bad_row_without_quarantine_stops_reading():
+    lines = [HEADER, '"2024";"01/09/2024";"CASA"\n']
+
+    with pytest.raises(ValueError, match="Linha 2"):
+        list(CSVBatchReader(_Bem, lines).iter_batches(10))
+
+
+def test_skip_lines_resumes_after_loaded_rows():
+    lines = [HEADER] + [f'"2024";"01/09/2024";"CASA {n}";"1,00";"x"\n' for n in range(4)]
+    reader = CSVBatchReader(_Bem, lines, skip_lines=3)
+
+    batches = list(reader.iter_batches(10))
+
+    assert [row[2] for row in batches[0]] == ["CASA 2", "CASA 3"]
+    assert reader.batch_lines == [4, 5]
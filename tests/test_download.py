@@ -0,0 +1,152 @@
+import io
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import httpx
+import pytest
+
+from app.services.etl.download import FLAG_DATA_DESCRIPTOR, read_central_directory, stream_zip_member
+
+CSV = "\n".join(f'"2024";"SP";"{n}";"CANDIDATO {n}"' for n in range(5000)).encode("latin-1")
+OTHER = b"leia-me\n" * 1000
+
+
+class _Unseekable:
+    """Destino sem seek/tell: o zipfile grava os membros com data descriptor."""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def write(self, data: bytes) -> int:
+        return self.buffer.write(data)
+
+    def flush(self) -> None:
+        pass
+
+
+def _zip(compression: int, data_descriptor: bool = False) -> bytes:
+    target = _Unseekable() if data_descriptor else io.BytesIO()
+    with zipfile.ZipFile(target, "w", compression=compression) as archive:
+        archive.writestr("leiame.txt", OTHER)
+        archive.writestr("dados/votacao_candidato_munzona_2024_SP.csv", CSV)
+    return target.buffer.getvalue() if data_descriptor else target.getvalue()
+
+
+class _Server:
+    """Servidor HTTP local que serve ZIPs, com ou sem suporte a Range."""
+
+    def __init__(self, files: Dict[str, bytes], ranges: bool):
+        self.files = files
+        self.ranges = ranges
+        self.requests: List[str] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                body = server.files[self.path]
+                header = self.headers.get("Range")
+                server.requests.append(header or "")
+                if server.ranges and header:
+                    start, end = header.removeprefix("bytes=").split("-")
+                    if not start:
+                        start, end = max(len(body) - int(end), 0), len(body) - 1
+                    start, end = int(start), int(end) if end else len(body) - 1
+                    part = body[start:end + 1]
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+                    self.send_header("Content-Length", str(len(part)))
+                    self.end_headers()
+                    self.wfile.write(part)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}{path}"
+
+    def __enter__(self) -> "_Server":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+ARCHIVES = {
+    "/stored.zip": _zip(zipfile.ZIP_STORED),
+    "/deflate.zip": _zip(zipfile.ZIP_DEFLATED),
+    "/descriptor.zip": _zip(zipfile.ZIP_DEFLATED, data_descriptor=True),
+}
+
+
+@pytest.fixture
+def range_server():
+    with _Server(ARCHIVES, ranges=True) as server:
+        yield server
+
+
+@pytest.fixture
+def plain_server():
+    with _Server(ARCHIVES, ranges=False) as server:
+        yield server
+
+
+def _read(url: str, client: httpx.Client) -> bytes:
+    return b"".join(stream_zip_member(url, "votacao_candidato_munzona_2024_sp.csv", client))
+
+
+@pytest.mark.parametrize("path", list(ARCHIVES))
+def test_central_directory_with_range(range_server, path):
+    with httpx.Client() as client:
+        members = read_central_directory(client, range_server.url(path))
+
+    assert [member.name for member in members] == ["leiame.txt", "dados/votacao_candidato_munzona_2024_SP.csv"]
+    assert members[1].uncompressed_size == len(CSV)
+    assert members[1].crc == zipfile.ZipFile(io.BytesIO(ARCHIVES[path])).infolist()[1].CRC
+    assert all(header.startswith("bytes=") for header in range_server.requests)
+
+
+def test_data_descriptor_fixture():
+    flags = [info.flag_bits for info in zipfile.ZipFile(io.BytesIO(ARCHIVES["/descriptor.zip"])).infolist()]
+    assert all(flag & FLAG_DATA_DESCRIPTOR for flag in flags)
+
+
+@pytest.mark.parametrize("path", list(ARCHIVES))
+def test_stream_member_with_range(range_server, path):
+    with httpx.Client() as client:
+        assert _read(range_server.url(path), client) == CSV
+
+    # Fim do arquivo (diretório central) e depois só a partir do cabeçalho do membro
+    assert range_server.requests[0] == "bytes=-65557"
+    assert range_server.requests[-1] != "bytes=0-"
+
+
+@pytest.mark.parametrize("path", list(ARCHIVES))
+def test_stream_member_without_range(plain_server, path):
+    with httpx.Client() as client:
+        assert _read(plain_server.url(path), client) == CSV
+
+
+@pytest.mark.parametrize("path", list(ARCHIVES))
+def test_range_probe_does_not_download_ignored_range(plain_server, path):
+    responses: List[httpx.Response] = []
+    with httpx.Client(event_hooks={"response": [responses.append]}) as client:
+        assert read_central_directory(client, plain_server.url(path)) is None
+
+    # O servidor respondeu 200 com o arquivo inteiro: a resposta é fechada sem ler o corpo
+    assert [response.status_code for response in responses] == [200]
+    assert responses[0].num_bytes_downloaded == 0
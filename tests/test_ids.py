@@ -0,0 +1,40 @@
+import uuid
+
+from app.core import ids as ids_module
+from app.core.ids import uuid7
+
+
+def test_uuid7_version_and_variant():
+    value = uuid7()
+
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+
+def test_uuid7_carries_the_timestamp_in_ms(monkeypatch):
+    monkeypatch.setattr(ids_module.time, "time_ns", lambda: 1_760_000_000_123_456_789)
+
+    assert uuid7().int >> 80 == 1_760_000_000_123
+
+
+def test_uuid7_is_ordered_by_time(monkeypatch):
+    now = [1_760_000_000_000_000_000]
+
+    def time_ns() -> int:
+        now[0] += 1_000_000
+        return now[0]
+
+    monkeypatch.setattr(ids_module.time, "time_ns", time_ns)
+    values = [uuid7() for _ in range(1000)]
+
+    # Um ms a mais já basta para ordenar, independentemente dos bits aleatórios
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_uuid7_random_bits_change_within_the_same_ms(monkeypatch):
+    monkeypatch.setattr(ids_module.time, "time_ns", lambda: 1_760_000_000_000_000_000)
+    values = {uuid7() for _ in range(1000)}
+
+    assert len(values) == 1000
+    assert len({value.int >> 80 for value in values}) == 1
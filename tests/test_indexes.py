@@ -0,0 +1,150 @@
+import asyncio
+import uuid
+from typing import Dict, List, Optional
+
+import pytest
+
+from app.services.etl.checkpoint import Checkpoint
+from app.services.etl.incremental import partition_filter
+from app.services.etl.indexes import INDEX_TAIL, DeferredIndexes, child_index_name
+from app.services.etl.staging import MAX_IDENTIFIER
+
+TABLE = "votacao_candidato_munzona"
+DEFINITION = f"CREATE INDEX {TABLE}_ix_cargo ON public.{TABLE} USING btree (cd_cargo)"
+INDEX = [f"{TABLE}_ix_cargo", DEFINITION]
+
+
+class _Connection:
+    """Conexão asyncpg falsa: registra os comandos e responde às consultas do catálogo."""
+
+    def __init__(self, live: bool = False, in_transaction: bool = False, partitions: Optional[List[str]] = None):
+        self.live = live
+        self.in_transaction = in_transaction
+        self.partitions = partitions
+        self.executed: List[str] = []
+
+    def is_in_transaction(self) -> bool:
+        return self.in_transaction
+
+    async def fetchval(self, query: str, *args):
+        if query.startswith("SELECT EXISTS"):
+            return self.live
+        if "relkind" in query:
+            return self.partitions is not None and args[0] == TABLE
+        return False
+
+    async def fetch(self, query: str, *args) -> List[Dict[str, str]]:
+        if "pg_inherits" in query:
+            return [{"relname": partition} for partition in self.partitions]
+        return [{"name": INDEX[0], "definition": INDEX[1]}]
+
+    async def execute(self, query: str, *args) -> None:
+        self.executed.append(query.split(" WHERE ")[0] if query.startswith("UPDATE") else query)
+
+
+def _bulk_load(indexes: DeferredIndexes, conn: _Connection, checkpoint: Optional[Checkpoint] = None, error=None):
+    async def run():
+        async with indexes.bulk_load(conn, partition_filter(2024, ["SP"]), [f"{TABLE}_2024_sp"],
+                                     checkpoint=checkpoint):
+            conn.executed.append("COPY")
+            if error is not None:
+                raise error
+
+    asyncio.run(run())
+
+
+def _checkpoint() -> Checkpoint:
+    return Checkpoint(log_id=uuid.uuid4(), request={}, mode="delete", download=True)
+
+
+@pytest.mark.parametrize("index_name, child, expected", [
+    (f"{TABLE}_ix_cargo", f"{TABLE}_2024_sp", f"{TABLE}_2024_sp_ix_cargo"),
+    ("ix_cargo", f"{TABLE}_2024_sp", f"{TABLE}_2024_sp_ix_cargo"),
+])
+def test_child_index_name(index_name, child, expected):
+    assert child_index_name(index_name, TABLE, child) == expected
+
+
+def test_child_index_name_fits_postgres_identifiers():
+    child = "perfil_comparecimento_abstencao_eleitor_deficiencia_2024_sp"
+    name = child_index_name("perfil_comparecimento_abstencao_eleitor_deficiencia_ix_municipio",
+                            "perfil_comparecimento_abstencao_eleitor_deficiencia", child)
+
+    assert len(name) == MAX_IDENTIFIER
+    assert name.startswith(f"{child}_ix")
+
+
+def test_index_tail_keeps_method_and_columns():
+    assert INDEX_TAIL.match(DEFINITION).group(1) == "USING btree (cd_cargo)"
+    assert INDEX_TAIL.match(f"CREATE INDEX ix ON ONLY public.{TABLE} USING gin (nm_urna_candidato)").group(1) == \
+        "USING gin (nm_urna_candidato)"
+
+
+def test_empty_table_drops_rebuilds_and_analyzes():
+    conn = _Connection()
+    checkpoint = _checkpoint()
+
+    _bulk_load(DeferredIndexes(TABLE), conn, checkpoint)
+
+    assert conn.executed == [
+        "UPDATE etl_log SET checkpoint = $1::jsonb",
+        f"DROP INDEX IF EXISTS {TABLE}_ix_cargo",
+        "COPY",
+        f"CREATE INDEX IF NOT EXISTS {TABLE}_ix_cargo ON {TABLE} USING btree (cd_cargo)",
+        "UPDATE etl_log SET checkpoint = $1::jsonb",
+        f"ANALYZE {TABLE}_2024_sp",
+    ]
+    assert checkpoint.indexes is None
+
+
+def test_live_table_keeps_its_indexes():
+    conn = _Connection(live=True)
+
+    _bulk_load(DeferredIndexes(TABLE), conn, _checkpoint())
+
+    assert conn.executed == ["COPY", f"ANALYZE {TABLE}_2024_sp"]
+
+
+def test_recovered_indexes_are_rebuilt_concurrently_on_a_live_table():
+    conn = _Connection(live=True)
+
+    _bulk_load(DeferredIndexes(TABLE, [INDEX]), conn, _checkpoint())
+
+    assert f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {TABLE}_ix_cargo ON {TABLE} USING btree (cd_cargo)" in \
+        conn.executed
+    assert not any(query.startswith("DROP") for query in conn.executed)
+
+
+def test_partitioned_table_attaches_the_partition_indexes():
+    conn = _Connection(partitions=[f"{TABLE}_2024_sp"])
+
+    _bulk_load(DeferredIndexes(TABLE), conn)
+
+    assert conn.executed[2:5] == [
+        f"CREATE INDEX IF NOT EXISTS {TABLE}_ix_cargo ON ONLY {TABLE} USING btree (cd_cargo)",
+        f"CREATE INDEX IF NOT EXISTS {TABLE}_2024_sp_ix_cargo ON {TABLE}_2024_sp USING btree (cd_cargo)",
+        f"ALTER INDEX {TABLE}_ix_cargo ATTACH PARTITION {TABLE}_2024_sp_ix_cargo",
+    ]
+
+
+def test_failed_load_outside_a_transaction_still_rebuilds():
+    conn = _Connection()
+    checkpoint = _checkpoint()
+
+    with pytest.raises(RuntimeError):
+        _bulk_load(DeferredIndexes(TABLE), conn, checkpoint, error=RuntimeError("COPY falhou"))
+
+    assert conn.executed[-1].startswith(f"CREATE INDEX IF NOT EXISTS {TABLE}_ix_cargo")
+    # As definições ficam no checkpoint até uma reconstrução bem-sucedida
+    assert checkpoint.indexes == [INDEX]
+
+
+def test_failed_load_inside_a_transaction_leaves_it_to_the_rollback():
+    conn = _Connection(in_transaction=True)
+    checkpoint = _checkpoint()
+
+    with pytest.raises(RuntimeError):
+        _bulk_load(DeferredIndexes(TABLE), conn, checkpoint, error=RuntimeError("COPY falhou"))
+
+    assert conn.executed == [f"DROP INDEX IF EXISTS {TABLE}_ix_cargo", "COPY"]
+    assert checkpoint.indexes is None
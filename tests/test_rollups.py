@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from app.core.database import Base
+from app.models.resultados.totais_votacao import TotalVotacaoCandidatoUF
+from app.models.resultados.votacao_candidato_munzona import VotacaoCandidatoMunZona  # noqa: F401
+from app.models.resultados.votacao_partido_munzona import VotacaoPartidoMunZona  # noqa: F401
+from app.services.etl.incremental import partition_filter
+from app.services.etl.rollups import ROLLUPS, Rollup, refresh_rollups
+
+ALL_ROLLUPS = [rollup for rollups in ROLLUPS.values() for rollup in rollups]
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        self.conn.executed.append("BEGIN")
+
+    async def __aexit__(self, *exc):
+        self.conn.executed.append("COMMIT")
+
+
+class _Connection:
+    def __init__(self):
+        self.executed = []
+
+    def transaction(self):
+        return _Transaction(self)
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+        return "INSERT 0 42" if query.startswith("INSERT") else "DELETE 40"
+
+
+def test_select_sql_groups_by_the_primary_key():
+    rollup = Rollup(TotalVotacaoCandidatoUF, "votacao_candidato_munzona")
+    condition, _ = partition_filter(2024, ["SP"])
+
+    sql = rollup.select_sql(condition)
+
+    keys = "ano_eleicao, sg_uf, cd_eleicao, nr_turno, sq_candidato"
+    assert sql.startswith(f"SELECT {keys}, MAX(cd_cargo), ")
+    assert "SUM(qt_votos_nominais), SUM(qt_votos_nominais_validos) FROM votacao_candidato_munzona" in sql
+    assert "WHERE ano_eleicao = $1 AND sg_uf = ANY($2::text[]) AND ano_eleicao IS NOT NULL" in sql
+    assert "sq_candidato IS NOT NULL" in sql
+    assert sql.endswith(f"GROUP BY {keys}")
+
+
+@pytest.mark.parametrize("rollup", ALL_ROLLUPS, ids=lambda rollup: rollup.table_name)
+def test_rollup_columns_exist_in_the_source_table(rollup):
+    source = set(Base.metadata.tables[rollup.source].columns.keys())
+
+    assert set(rollup.keys) | set(rollup.labels) | set(rollup.sums) <= source
+    assert rollup.sums and not set(rollup.keys) & set(rollup.sums)
+
+
+def test_refresh_replaces_the_partitions_in_one_transaction():
+    conn = _Connection()
+    rollup = Rollup(TotalVotacaoCandidatoUF, "votacao_candidato_munzona")
+
+    rows = asyncio.run(rollup.refresh(conn, 2024, ["SP", "RJ"]))
+
+    begin, (delete, delete_args), (insert, insert_args), commit = conn.executed
+    assert (begin, commit) == ("BEGIN", "COMMIT")
+    assert delete == "DELETE FROM total_votacao_candidato_uf WHERE ano_eleicao = $1 AND sg_uf = ANY($2::text[])"
+    assert insert.startswith("INSERT INTO total_votacao_candidato_uf (ano_eleicao, sg_uf, ")
+    assert delete_args == insert_args == (2024, ["SP", "RJ"])
+    assert rows == 42
+
+
+def test_refresh_rollups_of_a_national_load():
+    conn = _Connection()
+
+    rows = asyncio.run(refresh_rollups(conn, "votacao_partido_munzona", 2024, ["BR"]))
+
+    deletes = [entry[0] for entry in conn.executed if isinstance(entry, tuple) and entry[0].startswith("DELETE")]
+    assert rows == 84
+    assert deletes == [
+        "DELETE FROM total_votacao_partido_municipio WHERE ano_eleicao = $1",
+        "DELETE FROM total_votacao_partido_uf WHERE ano_eleicao = $1",
+    ]
+
+
+@pytest.mark.parametrize("table_name, ufs", [("bem_cand", ["SP"]), ("votacao_candidato_munzona", [])])
+def test_refresh_rollups_without_work(table_name, ufs):
+    conn = _Connection()
+
+    assert asyncio.run(refresh_rollups(conn, table_name, 2024, ufs)) == 0
+    assert conn.executed == []
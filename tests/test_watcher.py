@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+import pytest
+
+from app.models.etl_manifest import ETLManifest
+from app.models.etl_watch import ETLWatch
+from app.schemas.etl_schemas import TipoETLEnum, UFEnum
+from app.services.etl.watcher import ALL_UFS, WatchTarget, probe, watch_targets
+
+URL = "https://cdn.tse.jus.br/estatistica/sead/odsele/votacao_candidato_munzona/votacao_2024.zip"
+ETAG = '"5f1-62a"'
+LAST_MODIFIED = "Mon, 07 Oct 2024 10:00:00 GMT"
+
+
+def _entry(table_name: str, ano: int, uf: str, day: int) -> ETLManifest:
+    return ETLManifest(table_name=table_name, ano=ano, uf=uf, loaded_at=datetime(2024, 10, day))
+
+
+def _probe(state: Optional[ETLWatch], respond, sent: List[Dict[str, str]]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == "HEAD"
+        sent.append(dict(request.headers))
+        return respond(request)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            return await probe(http, URL, state)
+
+    return asyncio.run(run())
+
+
+def _state(**values) -> ETLWatch:
+    return ETLWatch(table_name="votacao_candidato_munzona", ano=2024, url=URL, **values)
+
+
+def test_watch_targets_group_manifest_by_table_and_year():
+    entries = [
+        _entry("votacao_candidato_munzona", 2024, "SP", 8),
+        _entry("votacao_candidato_munzona", 2024, "AC", 7),
+        _entry("votacao_candidato_munzona", 2022, "RJ", 9),
+        _entry("tabela_fora_do_catalogo", 2024, "SP", 1),
+    ]
+
+    targets = watch_targets(entries)
+
+    assert [(target.table_name, target.ano, target.ufs) for target in targets] == [
+        ("votacao_candidato_munzona", 2022, ["RJ"]),
+        ("votacao_candidato_munzona", 2024, ["AC", "SP"]),
+    ]
+    # A carga mais antiga do grupo decide se o arquivo mudou depois dela
+    assert targets[1].loaded_at == datetime(2024, 10, 7)
+    assert targets[1].tipo == TipoETLEnum.CANDIDATO
+
+
+def test_target_requests_one_load_per_uf():
+    target = WatchTarget(tipo=TipoETLEnum.CANDIDATO, ano=2024, ufs=["AC", "SP"], loaded_at=datetime(2024, 10, 7))
+
+    assert [(request.ano, request.uf) for request in target.requests()] == [(2024, UFEnum.AC), (2024, UFEnum.SP)]
+
+
+@pytest.mark.parametrize("ufs", [["BR"], sorted(ALL_UFS)])
+def test_target_requests_national_or_all_ufs_in_one_load(ufs):
+    target = WatchTarget(tipo=TipoETLEnum.CANDIDATO, ano=2024, ufs=ufs, loaded_at=datetime(2024, 10, 7))
+
+    requests = target.requests()
+
+    assert len(requests) == 1
+    assert requests[0].uf is None
+
+
+def test_probe_without_state_sends_no_validators():
+    sent = []
+    response = httpx.Response(200, headers={"ETag": ETAG, "Last-Modified": LAST_MODIFIED})
+
+    changed, validators = _probe(None, lambda request: response, sent)
+
+    assert changed is None
+    assert validators == {"etag": ETAG, "http_last_modified": LAST_MODIFIED}
+    assert "if-none-match" not in sent[0] and "if-modified-since" not in sent[0]
+
+
+def test_probe_not_modified():
+    sent = []
+
+    changed, validators = _probe(
+        _state(etag=ETAG, http_last_modified=LAST_MODIFIED), lambda request: httpx.Response(304), sent
+    )
+
+    assert (changed, validators) == (False, {})
+    assert sent[0]["if-none-match"] == ETAG
+    assert sent[0]["if-modified-since"] == LAST_MODIFIED
+
+
+def test_probe_compares_validators_when_server_ignores_conditionals():
+    state = _state(etag=ETAG)
+
+    same, _ = _probe(state, lambda request: httpx.Response(200, headers={"ETag": ETAG}), [])
+    other, validators = _probe(state, lambda request: httpx.Response(200, headers={"ETag": '"6a0-71b"'}), [])
+
+    assert same is False
+    assert other is True
+    assert validators == {"etag": '"6a0-71b"'}
+
+
+def test_probe_ignores_state_of_another_url():
+    sent = []
+    state = ETLWatch(table_name="votacao_candidato_munzona", ano=2024, url=URL + ".old", etag=ETAG)
+
+    changed, _ = _probe(state, lambda request: httpx.Response(200, headers={"ETag": ETAG}), sent)
+
+    assert changed is None
+    assert "if-none-match" not in sent[0]
+
+
+def test_probe_raises_on_http_error():
+    with pytest.raises(httpx.HTTPStatusError):
+        _probe(None, lambda request: httpx.Response(503), [])